@@ -0,0 +1,91 @@
+"""
+Casting micro-benchmark: per-message request casting and per-response parsing.
+
+Responses are real SDK objects built from canned payloads, so the numbers
+reflect the attribute access the handlers do on every call.
+
+    python benchmarks/bench_casting.py --number 20000
+"""
+import argparse
+import timeit
+from collections.abc import Callable
+from anthropic.types import Message
+from openai.types.chat import ChatCompletion
+from llms.types.messages import ModelMessage, UserModelMessage, AssistantModelMessage
+from llms.types.parts import TextPart, ImagePart, ToolCallPart
+from llms.utilities.casting import (
+    cast_message_to_openai,
+    cast_message_to_anthropic,
+    cast_openai_response_to_parts,
+    cast_anthropic_response_to_parts
+)
+
+
+OPENAI_RESPONSE: ChatCompletion = ChatCompletion.model_validate({
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o",
+    "choices": [{
+        "index": 0,
+        "finish_reason": "tool_calls",
+        "message": {
+            "role": "assistant",
+            "content": "Let me look that up.",
+            "tool_calls": [
+                {"id": f"call_{index}", "type": "function", "function": {"name": "search", "arguments": '{"q": "x"}'}}
+                for index in range(2)
+            ]
+        }
+    }]
+})
+
+ANTHROPIC_RESPONSE: Message = Message.model_validate({
+    "id": "msg_bench",
+    "type": "message",
+    "role": "assistant",
+    "model": "claude-sonnet-4-5",
+    "stop_reason": "tool_use",
+    "usage": {"input_tokens": 1, "output_tokens": 1},
+    "content": [
+        {"type": "text", "text": "Let me look that up."},
+        {"type": "tool_use", "id": "toolu_0", "name": "search", "input": {"q": "x"}},
+        {"type": "tool_use", "id": "toolu_1", "name": "search", "input": {"q": "y"}}
+    ]
+})
+
+MESSAGE: ModelMessage = UserModelMessage(content=[
+    TextPart(text="Describe these images.", provider_options={}),
+    ImagePart(image="https://example.com/a.png", media_type="image/png", provider_options={}),
+    ImagePart(image="https://example.com/b.png", media_type="image/png", provider_options={"detail": "low"}),
+    TextPart(text="Be brief.", provider_options={})
+])
+
+TOOL_MESSAGE: ModelMessage = AssistantModelMessage(content=[
+    TextPart(text="Calling a tool.", provider_options={}),
+    ToolCallPart(tool_call_id="call_0", tool_name="search", input={"q": "x"}, provider_options={}, provider_executed=None)
+])
+
+CASES: dict[str, Callable[[], object]] = {
+    "openai message (4 parts)": lambda: cast_message_to_openai(MESSAGE),
+    "anthropic message (4 parts)": lambda: cast_message_to_anthropic(MESSAGE),
+    "openai tool message": lambda: cast_message_to_openai(TOOL_MESSAGE),
+    "anthropic tool message": lambda: cast_message_to_anthropic(TOOL_MESSAGE),
+    "openai response (3 parts)": lambda: cast_openai_response_to_parts(OPENAI_RESPONSE),
+    "anthropic response (3 parts)": lambda: cast_anthropic_response_to_parts(ANTHROPIC_RESPONSE),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, case in CASES.items():
+        best = min(timeit.repeat(case, number=args.number, repeat=args.repeat)) / args.number
+        print(f"{label:<30} {best * 1e6:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
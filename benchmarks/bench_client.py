@@ -0,0 +1,314 @@
+"""
+Client benchmark against the local mock provider server.
+
+Reports, for the OpenAI and Anthropic code paths:
+  * per-call client overhead: generate_text / stream_text time minus a raw
+    httpx round trip to the same zero-latency server
+  * throughput at each --concurrency level, for SyncLLM called from a thread pool and
+    AsyncLLM (generate_many)
+  * Python heap held per in-flight request, for SyncLLM and AsyncLLM
+
+Results are written as JSON (default benchmarks/results/<version>-<commit>.json);
+pass --compare with an earlier file to print the change of every metric.
+
+    python benchmarks/bench_client.py --concurrency 1 8 32 --latency 0.05
+"""
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any
+import httpx
+from mock_server import MockProviderServer, MockServerConfig
+from llms._async.client import AsyncLLM
+from llms._sync.client import SyncLLM
+from llms.types.enums import Role
+from llms.types.messages import ModelMessage
+from llms.types.requests import GenerateTextRequest
+
+
+MESSAGES: list[ModelMessage] = [
+    ModelMessage(role=Role.SYSTEM, content="You are a terse assistant."),
+    ModelMessage(role=Role.USER, content="Say something.")
+]
+
+# provider label -> (model name, raw endpoint path, raw request payload)
+PROVIDERS: dict[str, tuple[str, str, dict[str, Any]]] = {
+    "openai": ("gpt-4o", "/v1/chat/completions", {
+        "model": "gpt-4o",
+        "messages": [{"role": "user", "content": "Say something."}]
+    }),
+    "anthropic": ("claude-sonnet-4-5", "/v1/messages", {
+        "model": "claude-sonnet-4-5",
+        "max_tokens": 1024,
+        "messages": [{"role": "user", "content": "Say something."}]
+    }),
+}
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def make_sync_client(server: MockProviderServer) -> SyncLLM:
+    return SyncLLM(
+        openai_key="test",
+        anthropic_key="test",
+        openai_base_url=server.openai_base_url,
+        anthropic_base_url=server.anthropic_base_url
+    )
+
+
+def make_async_client(server: MockProviderServer) -> AsyncLLM:
+    return AsyncLLM(
+        openai_key="test",
+        anthropic_key="test",
+        openai_base_url=server.openai_base_url,
+        anthropic_base_url=server.anthropic_base_url
+    )
+
+
+async def close_async_client(client: AsyncLLM) -> None:
+    # Close the provider clients that were built while the loop that owns their connections is still running
+    for name in ("openai_client", "anthropic_client", "fireworks_client"):
+        if name in vars(client):
+            await getattr(client, name).close()
+
+
+def median_seconds(call: Callable[[], object], calls: int) -> float:
+    call()
+    samples: list[float] = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def measure_overhead(server: MockProviderServer, calls: int) -> dict[str, dict[str, float]]:
+    """Median microseconds per call through the client and through raw httpx."""
+    server.config = MockServerConfig()
+    client = make_sync_client(server)
+    raw_client = httpx.Client()
+    results: dict[str, dict[str, float]] = {}
+    try:
+        for provider, (model_name, path, payload) in PROVIDERS.items():
+            url = server.url + path
+            raw = median_seconds(lambda: raw_client.post(url, json=payload).json(), calls)
+            raw_stream = median_seconds(lambda: raw_client.post(url, json={**payload, "stream": True}).read(), calls)
+            generate = median_seconds(lambda: client.generate_text(model_name=model_name, messages=MESSAGES), calls)
+            stream = median_seconds(lambda: list(client.stream_text(model_name=model_name, messages=MESSAGES)), calls)
+            results[provider] = {
+                "raw_us": raw * 1e6,
+                "generate_us": generate * 1e6,
+                "generate_overhead_us": (generate - raw) * 1e6,
+                "raw_stream_us": raw_stream * 1e6,
+                "stream_us": stream * 1e6,
+                "stream_overhead_us": (stream - raw_stream) * 1e6
+            }
+    finally:
+        raw_client.close()
+    return results
+
+
+def measure_sync_throughput(server: MockProviderServer, model_name: str, concurrency: int, total: int) -> float:
+    client = make_sync_client(server)
+
+    def call(_: int) -> None:
+        try:
+            client.generate_text(model_name=model_name, messages=MESSAGES)
+        except Exception:
+            pass
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, range(concurrency)))
+        started = time.perf_counter()
+        list(pool.map(call, range(total)))
+        return total / (time.perf_counter() - started)
+
+
+def measure_async_throughput(server: MockProviderServer, model_name: str, concurrency: int, total: int) -> float:
+    client = make_async_client(server)
+
+    async def run(count: int) -> None:
+        requests = (GenerateTextRequest(model_name=model_name, messages=MESSAGES) for _ in range(count))
+        async for _ in client.generate_many(requests, max_concurrency=concurrency, return_exceptions=True):
+            pass
+
+    async def main() -> float:
+        await run(concurrency)
+        started = time.perf_counter()
+        await run(total)
+        elapsed = time.perf_counter() - started
+        await close_async_client(client)
+        return total / elapsed
+
+    return asyncio.run(main())
+
+
+def measure_throughput(
+    server: MockProviderServer,
+    config: MockServerConfig,
+    concurrency_levels: list[int],
+    requests_per_worker: int
+) -> dict[str, dict[str, dict[str, float]]]:
+    """Requests per second by client kind, provider and concurrency level."""
+    server.config = config
+    results: dict[str, dict[str, dict[str, float]]] = {"sync": {}, "async": {}}
+    for provider, (model_name, _, _) in PROVIDERS.items():
+        for kind, measure in (("sync", measure_sync_throughput), ("async", measure_async_throughput)):
+            levels = results[kind].setdefault(provider, {})
+            for concurrency in concurrency_levels:
+                total = max(concurrency * requests_per_worker, requests_per_worker)
+                levels[str(concurrency)] = measure(server, model_name, concurrency, total)
+    return results
+
+
+def wait_for_in_flight(server: MockProviderServer, in_flight: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while server.stats.in_flight < in_flight:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"only {server.stats.in_flight} of {in_flight} requests reached the server")
+        time.sleep(0.01)
+
+
+def measure_sync_memory(server: MockProviderServer, model_name: str, in_flight: int, hold: float) -> float:
+    client = make_sync_client(server)
+    with ThreadPoolExecutor(max_workers=in_flight) as pool:
+        # Warm the client, its connection pool and the worker threads before measuring
+        server.config = MockServerConfig()
+        list(pool.map(lambda _: client.generate_text(model_name=model_name, messages=MESSAGES), range(in_flight)))
+        server.config = MockServerConfig(latency=hold)
+
+        gc.collect()
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        futures = [pool.submit(client.generate_text, model_name=model_name, messages=MESSAGES) for _ in range(in_flight)]
+        wait_for_in_flight(server, in_flight)
+        held = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+        for future in futures:
+            future.result()
+    return held / in_flight
+
+
+def measure_async_memory(server: MockProviderServer, model_name: str, in_flight: int, hold: float) -> float:
+    client = make_async_client(server)
+
+    async def main() -> float:
+        server.config = MockServerConfig()
+        await asyncio.gather(*(client.generate_text(model_name=model_name, messages=MESSAGES) for _ in range(in_flight)))
+        server.config = MockServerConfig(latency=hold)
+
+        gc.collect()
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        tasks = [asyncio.create_task(client.generate_text(model_name=model_name, messages=MESSAGES)) for _ in range(in_flight)]
+        await asyncio.to_thread(wait_for_in_flight, server, in_flight)
+        held = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+        await asyncio.gather(*tasks)
+        await close_async_client(client)
+        return held / in_flight
+
+    return asyncio.run(main())
+
+
+def measure_memory(server: MockProviderServer, in_flight: int, hold: float) -> dict[str, dict[str, float]]:
+    """Kilobytes of Python heap held per in-flight request (thread stacks excluded)."""
+    results: dict[str, dict[str, float]] = {"sync": {}, "async": {}}
+    for provider, (model_name, _, _) in PROVIDERS.items():
+        results["sync"][provider] = measure_sync_memory(server, model_name, in_flight, hold) / 1024
+        results["async"][provider] = measure_async_memory(server, model_name, in_flight, hold) / 1024
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def package_version() -> str:
+    try:
+        return version("llms")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def flatten(metrics: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    flat: dict[str, float] = {}
+    for key, value in metrics.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def print_metrics(metrics: dict[str, Any], previous: dict[str, Any] | None) -> None:
+    old = flatten(previous) if previous else {}
+    for key, value in flatten(metrics).items():
+        line = f"{key:<48} {value:12.1f}"
+        if key in old and old[key]:
+            line += f"   was {old[key]:12.1f}  ({(value - old[key]) / old[key] * 100:+6.1f}%)"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200, help="calls per overhead measurement")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests-per-worker", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05, help="server latency during throughput runs")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--in-flight", type=int, default=64, help="concurrent requests for the memory measurement")
+    parser.add_argument("--hold", type=float, default=2.0, help="server latency keeping the memory measurement's requests open")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None, help="earlier results file to diff against")
+    args = parser.parse_args()
+
+    with MockProviderServer() as server:
+        throughput_config = MockServerConfig(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate)
+        metrics = {
+            "overhead": measure_overhead(server, args.calls),
+            "throughput_rps": measure_throughput(server, throughput_config, args.concurrency, args.requests_per_worker),
+            "memory_kb_per_request": measure_memory(server, args.in_flight, args.hold)
+        }
+
+    commit = git_commit()
+    results = {
+        "version": package_version(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "arguments": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        "metrics": metrics
+    }
+
+    previous = json.loads(args.compare.read_text())["metrics"] if args.compare else None
+    print_metrics(metrics, previous)
+
+    output = args.output or RESULTS_DIR / f"{results['version']}-{commit or datetime.now().strftime('%Y%m%d%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"results written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
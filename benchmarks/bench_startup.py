@@ -0,0 +1,61 @@
+"""
+Startup benchmark: cold import time of the package and time to first request.
+
+Each measurement runs in a fresh interpreter so nothing is already imported.
+The first request goes to the local mock provider server, so no network or
+API keys are needed.
+
+    python benchmarks/bench_startup.py --runs 10
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from mock_server import MockProviderServer
+
+
+IMPORT_SNIPPET = """
+import time
+started = time.perf_counter()
+import {module}
+print(time.perf_counter() - started)
+"""
+
+FIRST_REQUEST_SNIPPET = """
+import time
+started = time.perf_counter()
+from llms._sync.client import SyncLLM
+from llms.types.enums import Role
+from llms.types.messages import ModelMessage
+client = SyncLLM(openai_key="test", openai_base_url="{base_url}")
+client.generate_text(model_name="gpt-4o", messages=[ModelMessage(role=Role.USER, content="Hello")])
+print(time.perf_counter() - started)
+"""
+
+
+def time_snippet(snippet: str, runs: int) -> list[float]:
+    return [
+        float(subprocess.run([sys.executable, "-c", snippet], check=True, capture_output=True, text=True).stdout)
+        for _ in range(runs)
+    ]
+
+
+def report(label: str, samples: list[float]) -> None:
+    print(f"{label:<28} median {statistics.median(samples) * 1000:8.1f} ms   min {min(samples) * 1000:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    for module in ("llms", "llms._sync.client", "llms._async.client"):
+        report(f"import {module}", time_snippet(IMPORT_SNIPPET.format(module=module), args.runs))
+
+    with MockProviderServer() as server:
+        snippet = FIRST_REQUEST_SNIPPET.format(base_url=server.openai_base_url)
+        report("first request (openai)", time_snippet(snippet, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+A local stand-in for the provider APIs, for offline benchmarks.
+
+It speaks enough of the OpenAI chat-completions protocol (also used for
+Fireworks) and the Anthropic messages protocol for the SDKs to parse its
+replies, including server-sent-event streams. Latency, streaming pace and
+error rate are configurable and can be changed while the server runs.
+
+    with MockProviderServer(MockServerConfig(latency=0.05)) as server:
+        client = SyncLLM(openai_key="test", openai_base_url=server.openai_base_url)
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from pydantic import BaseModel
+
+
+class MockServerConfig(BaseModel):
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    chunks: int = 8
+    chunk_delay: float = 0.0
+    chunk_text: str = "lorem "
+
+
+class MockServerStats(BaseModel):
+    requests: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections under benchmark concurrency
+    request_queue_size = 1024
+
+    config: MockServerConfig
+    stats: MockServerStats
+    stats_lock: threading.Lock
+
+
+def _sse(data: dict[str, Any], event: str | None = None) -> bytes:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n".encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, like the real APIs; streamed replies close their connection instead
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+    server: _Server
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        body: dict[str, Any] = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        config = self.server.config
+        stats = self.server.stats
+        with self.server.stats_lock:
+            stats.requests += 1
+            stats.in_flight += 1
+            stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        try:
+            time.sleep(config.latency + random.uniform(0, config.jitter))
+            if random.random() < config.error_rate:
+                with self.server.stats_lock:
+                    stats.errors += 1
+                self._send_error(config.error_status)
+            elif self.path.endswith("/chat/completions"):
+                self._send_openai(body, config)
+            elif self.path.endswith("/messages"):
+                self._send_anthropic(body, config)
+            else:
+                self.send_error(404)
+        finally:
+            with self.server.stats_lock:
+                stats.in_flight -= 1
+
+    def _send_request_id(self) -> None:
+        request_id = f"req_mock_{self.server.stats.requests}"
+        self.send_header("request-id" if self.path.endswith("/messages") else "x-request-id", request_id)
+
+    def _send_json(self, status: int, payload: dict[str, Any]) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self._send_request_id()
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, events: list[bytes], chunk_delay: float) -> None:
+        self.send_response(200)
+        self._send_request_id()
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        for event in events:
+            if chunk_delay:
+                time.sleep(chunk_delay)
+            self.wfile.write(event)
+            self.wfile.flush()
+
+    def _send_error(self, status: int) -> None:
+        if self.path.endswith("/messages"):
+            self._send_json(status, {"type": "error", "error": {"type": "api_error", "message": "mock error"}})
+        else:
+            self._send_json(status, {"error": {"message": "mock error", "type": "server_error", "code": None}})
+
+    def _send_openai(self, body: dict[str, Any], config: MockServerConfig) -> None:
+        model = body.get("model", "mock")
+        usage = {"prompt_tokens": 16, "completion_tokens": config.chunks, "total_tokens": 16 + config.chunks}
+        if not body.get("stream"):
+            self._send_json(200, {
+                "id": "chatcmpl-mock",
+                "object": "chat.completion",
+                "created": 0,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": config.chunk_text * config.chunks},
+                    "finish_reason": "stop"
+                }],
+                "usage": usage
+            })
+            return
+
+        def chunk(choices: list[dict[str, Any]], **extra: Any) -> bytes:
+            return _sse({"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": 0, "model": model, "choices": choices, **extra})
+
+        events = [
+            chunk([{"index": 0, "delta": {"content": config.chunk_text}, "finish_reason": None}])
+            for _ in range(config.chunks)
+        ]
+        events.append(chunk([{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+        events.append(chunk([], usage=usage))
+        events.append(b"data: [DONE]\n\n")
+        self._send_stream(events, config.chunk_delay)
+
+    def _send_anthropic(self, body: dict[str, Any], config: MockServerConfig) -> None:
+        model = body.get("model", "mock")
+        if not body.get("stream"):
+            self._send_json(200, {
+                "id": "msg_mock",
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": [{"type": "text", "text": config.chunk_text * config.chunks}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": 16, "output_tokens": config.chunks}
+            })
+            return
+
+        events = [
+            _sse({"type": "message_start", "message": {
+                "id": "msg_mock", "type": "message", "role": "assistant", "model": model, "content": [],
+                "stop_reason": None, "stop_sequence": None, "usage": {"input_tokens": 16, "output_tokens": 1}
+            }}, "message_start"),
+            _sse({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}, "content_block_start")
+        ]
+        events.extend(
+            _sse({"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": config.chunk_text}}, "content_block_delta")
+            for _ in range(config.chunks)
+        )
+        events.append(_sse({"type": "content_block_stop", "index": 0}, "content_block_stop"))
+        events.append(_sse({
+            "type": "message_delta",
+            "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+            "usage": {"output_tokens": config.chunks}
+        }, "message_delta"))
+        events.append(_sse({"type": "message_stop"}, "message_stop"))
+        self._send_stream(events, config.chunk_delay)
+
+
+class MockProviderServer:
+    """Runs the stand-in API on a free local port in a background thread."""
+
+    def __init__(self, config: MockServerConfig | None = None):
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.config = config or MockServerConfig()
+        self._server.stats = MockServerStats()
+        self._server.stats_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def config(self) -> MockServerConfig:
+        return self._server.config
+
+    @config.setter
+    def config(self, config: MockServerConfig) -> None:
+        self._server.config = config
+
+    @property
+    def stats(self) -> MockServerStats:
+        with self._server.stats_lock:
+            return self._server.stats.model_copy()
+
+    def reset_stats(self) -> None:
+        with self._server.stats_lock:
+            self._server.stats = MockServerStats()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    @property
+    def openai_base_url(self) -> str:
+        return f"{self.url}/v1"
+
+    @property
+    def anthropic_base_url(self) -> str:
+        # The Anthropic SDK appends /v1/messages itself
+        return self.url
+
+    def start(self) -> "MockProviderServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-provider", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockProviderServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
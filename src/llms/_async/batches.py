@@ -0,0 +1,134 @@
+from __future__ import annotations
+import asyncio
+import os
+import tempfile
+from collections.abc import AsyncIterator, Iterable
+from typing import IO, TYPE_CHECKING
+from llms.types.batches import BatchRequest, BatchJob, BatchResult
+from llms.utilities.batches import (
+    OPENAI_BATCH_ENDPOINT,
+    OPENAI_BATCH_COMPLETION_WINDOW,
+    build_openai_batch_line,
+    iter_anthropic_batch_body,
+    build_anthropic_batch_request,
+    anthropic_transport_errors,
+    cast_anthropic_batch_response,
+    cast_openai_batch,
+    cast_anthropic_batch,
+    cast_openai_batch_line,
+    cast_anthropic_batch_result
+)
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+    from anthropic import AsyncAnthropic
+
+
+SPOOL_CHUNK_SIZE = 1 << 20
+
+
+async def submit_openai_batch(openai_client: AsyncOpenAI, requests: Iterable[BatchRequest], prompt_caching: bool = False) -> BatchJob:
+    """
+    Submit requests as an OpenAI Batch job. The input file is spooled to a temporary
+    file one line at a time, on a worker thread so building and writing the lines
+    does not block the event loop, and streamed from disk by the upload.
+
+    Args:
+        openai_client: The OpenAI async client instance
+        requests: BatchRequests for OpenAI models, consumed lazily on the worker thread
+        prompt_caching: Whether to enable the provider's prompt caching
+
+    Returns:
+        The created BatchJob
+    """
+    spool = await asyncio.to_thread(_spool_openai_batch, requests, prompt_caching)
+    with spool:
+        input_file = await openai_client.files.create(file=("batch.jsonl", spool), purpose="batch")
+
+    batch = await openai_client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=OPENAI_BATCH_ENDPOINT,
+        completion_window=OPENAI_BATCH_COMPLETION_WINDOW
+    )
+    return cast_openai_batch(batch)
+
+
+def _spool_openai_batch(requests: Iterable[BatchRequest], prompt_caching: bool) -> IO[bytes]:
+    spool = tempfile.TemporaryFile()
+    try:
+        for request in requests:
+            spool.write(build_openai_batch_line(request, prompt_caching))
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+async def submit_anthropic_batch(anthropic_client: AsyncAnthropic, requests: Iterable[BatchRequest], prompt_caching: bool = False) -> BatchJob:
+    """
+    Submit requests as an Anthropic Message Batches job. The SDK only accepts the
+    whole request list in memory, so the body is spooled to a temporary file on a
+    worker thread, as for OpenAI, and streamed from disk through the SDK's HTTP
+    client instead; failures raise the SDK's errors.
+
+    Args:
+        anthropic_client: The Anthropic async client instance
+        requests: BatchRequests for Anthropic models, consumed lazily on the worker thread
+        prompt_caching: Whether to enable the provider's prompt caching
+
+    Returns:
+        The created BatchJob
+    """
+    spool = await asyncio.to_thread(_spool_anthropic_batch, requests, prompt_caching)
+    with spool:
+        size = os.fstat(spool.fileno()).st_size
+        request = build_anthropic_batch_request(anthropic_client, _read_spool(spool), size)
+        with anthropic_transport_errors(request):
+            response = await anthropic_client._client.send(request)
+    return cast_anthropic_batch_response(anthropic_client, response)
+
+
+def _spool_anthropic_batch(requests: Iterable[BatchRequest], prompt_caching: bool) -> IO[bytes]:
+    spool = tempfile.TemporaryFile()
+    try:
+        for chunk in iter_anthropic_batch_body(requests, prompt_caching):
+            spool.write(chunk)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+async def _read_spool(spool: IO[bytes]) -> AsyncIterator[bytes]:
+    # httpx.AsyncClient only streams async iterables; reads stay off the event loop
+    while chunk := await asyncio.to_thread(spool.read, SPOOL_CHUNK_SIZE):
+        yield chunk
+
+
+async def poll_openai_batch(openai_client: AsyncOpenAI, batch_id: str) -> BatchJob:
+    """Fetch the current state of an OpenAI Batch job."""
+    return cast_openai_batch(await openai_client.batches.retrieve(batch_id))
+
+
+async def poll_anthropic_batch(anthropic_client: AsyncAnthropic, batch_id: str) -> BatchJob:
+    """Fetch the current state of an Anthropic Message Batches job."""
+    return cast_anthropic_batch(await anthropic_client.messages.batches.retrieve(batch_id))
+
+
+async def iter_openai_batch_results(openai_client: AsyncOpenAI, job: BatchJob) -> AsyncIterator[BatchResult]:
+    """Stream the output and error files of a finished OpenAI Batch job line by line."""
+    for file_id in (job.output_file_id, job.error_file_id):
+        if file_id is None:
+            continue
+        async with openai_client.files.with_streaming_response.content(file_id) as response:
+            async for line in response.iter_lines():
+                if line:
+                    yield cast_openai_batch_line(line)
+
+
+async def iter_anthropic_batch_results(anthropic_client: AsyncAnthropic, job: BatchJob) -> AsyncIterator[BatchResult]:
+    """Stream the results of a finished Anthropic Message Batches job."""
+    async for item in await anthropic_client.messages.batches.results(job.id):
+        yield cast_anthropic_batch_result(item)
@@ -1,30 +1,1064 @@
-from openai import AsyncOpenAI
-from anthropic import AsyncAnthropic
-from llms.types.messages import ModelMessage
-from llms.types.results import GenerateTextResult
-from llms.models import MODEL_MAP
+from __future__ import annotations
+import asyncio
+import itertools
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Sequence, Sized
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from pydantic import BaseModel
+from llms.conversation import Conversation
+from llms.types.messages import ModelMessage, AssistantModelMessage
+from llms.types.batches import BatchRequest, BatchJob, BatchResult
+from llms.types.requests import GenerateTextRequest
+from llms.types.results import GenerateTextResult, GenerateObjectResult, Timings, Step, GenerateManyResult
+from llms.types.streams import StreamEvent, FinishEvent, PartialObjectEvent, ObjectStreamEvent, TextDeltaEvent, ToolCallDeltaEvent
+from llms.types.objects import ObjectSchema
+from llms.types.tools import Tool
+from llms.types.endpoints import Endpoint
+from llms.models import MODEL_MAP, CONTEXT_WINDOWS
+from llms.cache.base import ResponseCache, make_cache_key
+from llms.ratelimit import RateLimiter, Reservation
+from llms.fallback import FallbackPolicy, LatencyTracker, is_retryable_error
+from llms.routing import EndpointRouter, EndpointPool
+from llms.concurrency import ConcurrencyLimiter
+from llms.deadlines import DeadlineExceeded, deadline_scope, no_deadline, resolve_deadline, remaining, expired
+from llms.trimming import TrimPolicy
+from llms.singleflight import SingleFlight
+from llms.hooks import Hooks, BeforeRequestEvent, AfterResponseEvent, ErrorEvent, StreamChunkEvent
 from llms.types.enums import Provider
-from llms._async.handlers import handle_openai_generate_text
+from llms.utilities.tokens import estimate_request_tokens
+from llms.utilities.tools import tool_calls, tool_results_message, total_usage
+from llms.utilities.objects import object_schema, cast_result_to_object
+from llms.utilities.partial_json import PartialJSONParser
+from llms.utilities.streaming import StreamAccumulator
+from llms._async.fanout import fan_out
+from llms._async.hedging import run_with_fallback
+from llms._async.tools import run_tool_calls
+from llms._async.handlers import (
+    handle_openai_generate_text,
+    handle_openai_generate_conversation,
+    handle_anthropic_generate_text,
+    handle_fireworks_generate_text,
+    handle_openai_stream_text,
+    handle_anthropic_stream_text,
+    handle_fireworks_stream_text
+)
+from llms._async.batches import (
+    submit_openai_batch,
+    submit_anthropic_batch,
+    poll_openai_batch,
+    poll_anthropic_batch,
+    iter_openai_batch_results,
+    iter_anthropic_batch_results
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+    from llms.pool import AsyncHTTPPool
+    from llms.cache.semantic import SemanticCache
+    from openai import AsyncOpenAI
+    from anthropic import AsyncAnthropic
+
+# Fireworks serves an OpenAI-compatible API
+FIREWORKS_BASE_URL = "https://api.fireworks.ai/inference/v1"
 
 class AsyncLLM():
-    openai_client: AsyncOpenAI
-    anthropic_client: AsyncAnthropic
-    fireworks_client: AsyncOpenAI
+    cache: ResponseCache | None
+    prompt_caching: bool
+    rate_limiter: RateLimiter | None
+    fallback_policy: FallbackPolicy | None
+    hooks: list[Hooks]
+    trim_policy: TrimPolicy | None
+    single_flight: SingleFlight | None
+    router: EndpointRouter
+    concurrency_limiter: ConcurrencyLimiter | None
+    semantic_cache: SemanticCache | None
+    http_pool: AsyncHTTPPool | None
+
+
+    def __init__(
+        self,
+        openai_key: str | None = None,
+        anthropic_key: str | None = None,
+        fireworks_key: str | None = None,
+        openai_base_url: str | None = None,
+        anthropic_base_url: str | None = None,
+        fireworks_base_url: str = FIREWORKS_BASE_URL,
+        cache: ResponseCache | None = None,
+        prompt_caching: bool = False,
+        rate_limiter: RateLimiter | None = None,
+        fallback_policy: FallbackPolicy | None = None,
+        hooks: list[Hooks] | None = None,
+        http_pool: AsyncHTTPPool | None = None,
+        trim_policy: TrimPolicy | None = None,
+        single_flight: SingleFlight | None = None,
+        router: EndpointRouter | None = None,
+        concurrency_limiter: ConcurrencyLimiter | None = None,
+        semantic_cache: SemanticCache | None = None
+    ):
+        """
+        Args:
+            openai_key: API key for OpenAI models
+            anthropic_key: API key for Anthropic models
+            fireworks_key: API key for Fireworks models
+            openai_base_url: Optional OpenAI API endpoint override
+            anthropic_base_url: Optional Anthropic API endpoint override
+            fireworks_base_url: Fireworks API endpoint
+            cache: Optional response cache for generate_text
+            prompt_caching: Enable provider-side prompt caching (Anthropic cache
+                breakpoints, OpenAI and Fireworks prompt-cache routing keys)
+            rate_limiter: Optional client-side RPM/TPM limiter, which may be shared
+                between clients to enforce one budget across tasks
+            fallback_policy: Optional retry, hedging and cross-provider fallback policy
+                for generate_text
+            hooks: Optional instrumentation hooks, called for every provider call
+            http_pool: Optional connection pool; by default clients share their event loop's
+                pool, see `llms.pool.shared_async_pool`
+            trim_policy: Optional policy fitting histories to the model's context window
+                before they are sent (see llms.trimming)
+            single_flight: Optional group coalescing concurrent identical generate_text
+                calls into one provider request (see llms.singleflight)
+            router: Optional endpoint router balancing requests across several keys or
+                servers per provider or model (see llms.routing); models registered
+                with endpoints in MODEL_MAP are balanced either way
+            concurrency_limiter: Optional adaptive limit on generate_text requests in
+                flight per model (see llms.concurrency), which may be shared between clients
+            semantic_cache: Optional cache reusing replies to similar final user messages
+                (see llms.cache.semantic), consulted after `cache` misses
+        """
+        # Provider clients (and their SDKs) are only built when first used
+        self._openai_key = openai_key
+        self._anthropic_key = anthropic_key
+        self._fireworks_key = fireworks_key
+        self._openai_base_url = openai_base_url
+        self._anthropic_base_url = anthropic_base_url
+        self._fireworks_base_url = fireworks_base_url
+        self.cache = cache
+        self.prompt_caching = prompt_caching
+        self.rate_limiter = rate_limiter
+        self.fallback_policy = fallback_policy
+        self.hooks = list(hooks or [])
+        self.http_pool = http_pool
+        self.trim_policy = trim_policy
+        self.single_flight = single_flight
+        self.router = router or EndpointRouter()
+        self.concurrency_limiter = concurrency_limiter
+        self.semantic_cache = semantic_cache
+        self._latency_tracker = LatencyTracker(fallback_policy.window if fallback_policy else 200)
+
+    def _pool(self) -> AsyncHTTPPool:
+        if self.http_pool is None:
+            from llms.pool import shared_async_pool
+            return shared_async_pool()
+        return self.http_pool
+
+    @cached_property
+    def openai_client(self) -> AsyncOpenAI:
+        from openai import AsyncOpenAI
+        return self._pool().sdk_client(AsyncOpenAI, self._openai_key, self._openai_base_url)
+
+    @cached_property
+    def anthropic_client(self) -> AsyncAnthropic:
+        from anthropic import AsyncAnthropic
+        return self._pool().sdk_client(AsyncAnthropic, self._anthropic_key, self._anthropic_base_url)
+
+    @cached_property
+    def fireworks_client(self) -> AsyncOpenAI:
+        from openai import AsyncOpenAI
+        return self._pool().sdk_client(AsyncOpenAI, self._fireworks_key, self._fireworks_base_url)
+
+    def _endpoint_client(self, provider: Provider, endpoint: Endpoint) -> AsyncOpenAI | AsyncAnthropic:
+        # Fields the endpoint leaves unset fall back to the client's own for the provider
+        match provider:
+            case Provider.OPENAI:
+                from openai import AsyncOpenAI
+                return self._pool().sdk_client(AsyncOpenAI, endpoint.api_key or self._openai_key, endpoint.base_url or self._openai_base_url)
+            case Provider.ANTHROPIC:
+                from anthropic import AsyncAnthropic
+                return self._pool().sdk_client(AsyncAnthropic, endpoint.api_key or self._anthropic_key, endpoint.base_url or self._anthropic_base_url)
+            case Provider.FIREWORKS:
+                from openai import AsyncOpenAI
+                return self._pool().sdk_client(AsyncOpenAI, endpoint.api_key or self._fireworks_key, endpoint.base_url or self._fireworks_base_url)
+            case _:
+                raise ValueError("Did not recognize LLM provider")
+
+    def _budgeted_client(self, provider: Provider, client: AsyncOpenAI | AsyncAnthropic | None, budget: float) -> AsyncOpenAI | AsyncAnthropic:
+        # SDK retries would each get the full timeout again, so under a deadline
+        # retrying is left to the fallback policy, which stops once the budget is spent
+        match provider:
+            case Provider.OPENAI:
+                client = client or self.openai_client
+            case Provider.ANTHROPIC:
+                client = client or self.anthropic_client
+            case Provider.FIREWORKS:
+                client = client or self.fireworks_client
+            case _:
+                raise ValueError("Did not recognize LLM provider")
+        return client.with_options(timeout=budget, max_retries=0)
 
+    async def generate_text(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        bypass_cache: bool = False,
+        prompt_cache_key: str | None = None,
+        tools: list[Tool] | None = None,
+        max_steps: int = 8,
+        timeout: float | None = None,
+        deadline: float | None = None
+    ) -> GenerateTextResult:
+        """
+        Generate a completion. When the client has a cache, identical requests are
+        served from it unless `bypass_cache` is set. Passing `prompt_cache_key`
+        enables prompt caching for this call with an explicit routing key.
 
-    def __init__(self, openai_key: str | None = None, anthropic_key: str | None = None, fireworks_key: str | None = None):
-        self.openai_client = AsyncOpenAI(api_key=openai_key)
-        self.anthropic_client = AsyncAnthropic(api_key=anthropic_key)
-        self.fireworks_client = AsyncOpenAI(api_key=fireworks_key, base_url="https://api.fireworks.ai/inference/v1")
+        With `tools`, the model may call them: the calls of each reply run
+        concurrently on the event loop and their results are sent back, for at
+        most `max_steps` model calls. The result is the last reply, with every
+        step and its latencies in `steps` and the usage of all of them.
 
-    async def generate_text(self, model_name: str, messages: list[ModelMessage]) -> GenerateTextResult:
+        `timeout` (seconds) or `deadline` (a time.monotonic() timestamp) bounds the
+        whole call: queueing in the limiters, retries and every provider request,
+        each of which is sent with the remaining budget as its timeout. Running
+        out of it cancels whatever is in flight, closing its HTTP request, and
+        raises DeadlineExceeded.
+        """
         assert model_name in MODEL_MAP, f"Model {model_name} not found"
-        match MODEL_MAP[model_name]:
+        deadline = resolve_deadline(timeout, deadline)
+        with deadline_scope(deadline):
+            try:
+                async with asyncio.timeout(None if deadline is None else deadline - time.monotonic()):
+                    if tools:
+                        result = await self._run_tools(model_name, messages, bypass_cache, prompt_cache_key, tools, max_steps)
+                    else:
+                        result = await self._generate_step(model_name, messages, bypass_cache, prompt_cache_key)
+            except Exception as error:
+                # The timeout cancels the call; a request may also hit its SDK timeout first
+                if deadline is not None and not isinstance(error, DeadlineExceeded) and expired():
+                    raise DeadlineExceeded("Deadline exceeded") from error
+                raise
+        # A Conversation records the reply as its next turn
+        if isinstance(messages, Conversation):
+            messages.add_result(result)
+        return result
+
+    async def _generate_step(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        bypass_cache: bool,
+        prompt_cache_key: str | None,
+        tools: list[Tool] | None = None,
+        output_schema: ObjectSchema | None = None
+    ) -> GenerateTextResult:
+        request_messages, trimmed_tokens = await self._trim(model_name, messages)
+        if bypass_cache or (self.cache is None and self.semantic_cache is None):
+            result = await self._generate_shared(model_name, request_messages, prompt_cache_key, tools, output_schema)
+        else:
+            result = await self._generate_cached(model_name, request_messages, prompt_cache_key, tools, output_schema)
+
+        if trimmed_tokens:
+            result = result.model_copy(update={"trimmed_tokens": trimmed_tokens})
+        return result
+
+    async def _generate_cached(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        prompt_cache_key: str | None,
+        tools: list[Tool] | None,
+        output_schema: ObjectSchema | None
+    ) -> GenerateTextResult:
+        key = None
+        if self.cache is not None:
+            key = make_cache_key(model_name, messages, tools, output_schema)
+            result = await self.cache.aget(key)
+            if result is not None:
+                return result
+        # Exact matches are cheaper to find, so similar requests are only looked for after a miss
+        lookup = None
+        if self.semantic_cache is not None:
+            lookup = await self.semantic_cache.alookup(model_name, messages, tools, output_schema)
+            if lookup is not None and lookup.result is not None:
+                return lookup.result
+
+        result = await self._generate_shared(model_name, messages, prompt_cache_key, tools, output_schema, key)
+        if key is not None:
+            await self.cache.aset(key, result)
+        if lookup is not None:
+            await self.semantic_cache.astore(lookup, result)
+        return result
+
+    async def _generate_shared(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        prompt_cache_key: str | None,
+        tools: list[Tool] | None,
+        output_schema: ObjectSchema | None,
+        key: str | None = None
+    ) -> GenerateTextResult:
+        if self.single_flight is None:
+            return await self._generate_with_policy(model_name, messages, prompt_cache_key, tools, output_schema)
+        # Identical requests already in flight share one provider call
+        return await self.single_flight.run(
+            key or make_cache_key(model_name, messages, tools, output_schema),
+            lambda: self._generate_unbounded(model_name, messages, prompt_cache_key, tools, output_schema)
+        )
+
+    async def _generate_unbounded(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        prompt_cache_key: str | None,
+        tools: list[Tool] | None,
+        output_schema: ObjectSchema | None
+    ) -> GenerateTextResult:
+        # The shared call serves callers with different budgets, so it must not inherit the first
+        # one's: each caller times out on its own, and the call is cancelled once all have gone
+        with no_deadline():
+            return await self._generate_with_policy(model_name, messages, prompt_cache_key, tools, output_schema)
+
+    async def _run_tools(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        bypass_cache: bool,
+        prompt_cache_key: str | None,
+        tools: list[Tool],
+        max_steps: int
+    ) -> GenerateTextResult:
+        tool_map = {tool.name: tool for tool in tools}
+        # A Conversation records the intermediate turns; a message list is left as it was
+        history = messages if isinstance(messages, Conversation) else list(messages)
+        steps: list[Step] = []
+        while True:
+            started = time.perf_counter()
+            result = await self._generate_step(model_name, history, bypass_cache, prompt_cache_key, tools)
+            generate_seconds = time.perf_counter() - started
+            calls = tool_calls(result)
+            # Tools requested on the last step are returned to the caller unrun
+            if not calls or len(steps) + 1 >= max_steps:
+                steps.append(Step(result=result, generate_seconds=generate_seconds))
+                break
+
+            started = time.perf_counter()
+            executions = await run_tool_calls(tool_map, calls)
+            steps.append(Step(
+                result=result,
+                tool_executions=executions,
+                generate_seconds=generate_seconds,
+                tools_seconds=time.perf_counter() - started
+            ))
+            if isinstance(history, Conversation):
+                history.add_result(result)
+            else:
+                history.append(AssistantModelMessage(content=result.parts))
+            history.append(tool_results_message(executions))
+
+        return result.model_copy(update={"steps": steps, "usage": total_usage(steps)})
+
+    async def _trim(self, model_name: str, messages: list[ModelMessage] | Conversation) -> tuple[list[ModelMessage] | Conversation, int]:
+        # A Conversation kept server-side is not re-sent, so there is nothing to trim
+        if self.trim_policy is None or (isinstance(messages, Conversation) and messages.server_state):
+            return messages, 0
+        # With fallbacks, fit the smallest context window the request may go to
+        target = model_name
+        if self.fallback_policy is not None:
+            target = min(self.fallback_policy.targets(model_name), key=lambda name: CONTEXT_WINDOWS.get(name, float("inf")))
+        trim = await self.trim_policy.atrim(target, messages)
+        return trim.messages, trim.tokens_removed
+
+    async def _generate_with_policy(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        prompt_cache_key: str | None,
+        tools: list[Tool] | None = None,
+        output_schema: ObjectSchema | None = None
+    ) -> GenerateTextResult:
+        if self.fallback_policy is None:
+            return await self._generate_text(model_name, messages, prompt_cache_key, tools, output_schema)
+
+        for target in self.fallback_policy.targets(model_name):
+            assert target in MODEL_MAP, f"Fallback model {target} not found"
+        return await run_with_fallback(
+            call=lambda target: self._generate_text(target, messages, prompt_cache_key, tools, output_schema),
+            model_name=model_name,
+            policy=self.fallback_policy,
+            tracker=self._latency_tracker
+        )
+
+    async def _generate_text(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        prompt_cache_key: str | None,
+        tools: list[Tool] | None = None,
+        output_schema: ObjectSchema | None = None
+    ) -> GenerateTextResult:
+        if self.concurrency_limiter is None:
+            return await self._route_generate_text(model_name, messages, prompt_cache_key, tools, output_schema)
+
+        permit = await self.concurrency_limiter.acquire_async(model_name)
+        started = time.perf_counter()
+        seconds: float | None = None
+        output_tokens: int | None = None
+        overloaded = False
+        try:
+            result = await self._route_generate_text(model_name, messages, prompt_cache_key, tools, output_schema)
+            # Latency is judged per output token, so replies without usage are not sampled
+            if result.usage is not None:
+                seconds = time.perf_counter() - started
+                output_tokens = result.usage.output_tokens
+            return result
+        except Exception as error:
+            # 429s, 5xx and connection errors mean the provider is overloaded, unless the caller's budget ran out
+            overloaded = is_retryable_error(error) and not expired()
+            raise
+        finally:
+            self.concurrency_limiter.release(permit, seconds, overloaded, output_tokens)
+
+    async def _route_generate_text(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        prompt_cache_key: str | None,
+        tools: list[Tool] | None = None,
+        output_schema: ObjectSchema | None = None
+    ) -> GenerateTextResult:
+        pool = self.router.pool(model_name)
+        if pool is None:
+            return await self._send_generate_text(model_name, messages, prompt_cache_key, tools, output_schema)
+
+        endpoint = pool.acquire()
+        started = time.perf_counter()
+        seconds: float | None = None
+        failed = False
+        try:
+            result = await self._send_generate_text(model_name, messages, prompt_cache_key, tools, output_schema, endpoint)
+            seconds = time.perf_counter() - started
+            return result
+        except Exception as error:
+            # Only errors that say something about the endpoint count towards ejecting it
+            failed = is_retryable_error(error) and not expired()
+            raise
+        finally:
+            # Cancelled attempts, e.g. lost hedges, release the endpoint without a latency
+            pool.release(endpoint, seconds, failed)
+
+    async def _send_generate_text(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        prompt_cache_key: str | None,
+        tools: list[Tool] | None = None,
+        output_schema: ObjectSchema | None = None,
+        endpoint: Endpoint | None = None
+    ) -> GenerateTextResult:
+        # Without a limiter or hooks there is nothing to do around the call
+        if self.rate_limiter is None and not self.hooks:
+            return await self._dispatch_generate_text(model_name, messages, prompt_cache_key, tools, output_schema, endpoint=endpoint)
+
+        timings = Timings()
+        reservations: list[Reservation] = []
+        try:
+            result = await self._dispatch_generate_text(
+                model_name, messages, prompt_cache_key, tools, output_schema, self._before_send(model_name, timings, reservations), timings, endpoint
+            )
+        except Exception as error:
+            self._notify_error(model_name, error, timings)
+            raise
+        if self.rate_limiter is not None:
+            for reservation in reservations:
+                self.rate_limiter.reconcile(reservation, result.usage)
+        self._notify_response(model_name, result)
+        return result
+
+    def _before_send(self, model_name: str, timings: Timings, reservations: list[Reservation]) -> Callable[[dict[str, Any]], Awaitable[None]]:
+        async def before_send(api_params: dict[str, Any]) -> None:
+            # Hooks run first so that the rate limiter sees any changes they make
+            if self.hooks:
+                event = BeforeRequestEvent(model_name=model_name, provider=MODEL_MAP[model_name], api_params=api_params, timings=timings)
+                for hook in self.hooks:
+                    hook.before_request(event)
+            if self.rate_limiter is not None:
+                reservations.append(await self.rate_limiter.acquire_async(model_name, estimate_request_tokens(api_params)))
+        return before_send
+
+    def _notify_response(self, model_name: str, result: GenerateTextResult) -> None:
+        if self.hooks:
+            event = AfterResponseEvent(model_name=model_name, provider=MODEL_MAP[model_name], result=result, timings=result.timings)
+            for hook in self.hooks:
+                hook.after_response(event)
+
+    def _notify_error(self, model_name: str, error: Exception, timings: Timings) -> None:
+        if self.hooks:
+            event = ErrorEvent(model_name=model_name, provider=MODEL_MAP[model_name], error=error, timings=timings)
+            for hook in self.hooks:
+                hook.on_error(event)
+
+    async def _dispatch_generate_text(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        prompt_cache_key: str | None,
+        tools: list[Tool] | None = None,
+        output_schema: ObjectSchema | None = None,
+        before_send: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+        timings: Timings | None = None,
+        endpoint: Endpoint | None = None
+    ) -> GenerateTextResult:
+        prompt_caching = self.prompt_caching or prompt_cache_key is not None
+        provider = MODEL_MAP[model_name]
+        client = None
+        if endpoint is not None:
+            client = self._endpoint_client(provider, endpoint)
+            model_name = endpoint.model_name or model_name
+        budget = remaining()
+        if budget is not None:
+            client = self._budgeted_client(provider, client, budget)
+        match provider:
+            case Provider.OPENAI if isinstance(messages, Conversation) and messages.server_state:
+                return await handle_openai_generate_conversation(
+                    openai_client=client or self.openai_client,
+                    model_name=model_name,
+                    conversation=messages,
+                    prompt_caching=prompt_caching,
+                    prompt_cache_key=prompt_cache_key,
+                    tools=tools,
+                    output_schema=output_schema,
+                    before_send=before_send,
+                    timings=timings
+                )
             case Provider.OPENAI:
-                return await handle_openai_generate_text(openai_client=self.openai_client, model_name=model_name, messages=messages)
+                return await handle_openai_generate_text(
+                    openai_client=client or self.openai_client,
+                    model_name=model_name,
+                    messages=messages,
+                    prompt_caching=prompt_caching,
+                    prompt_cache_key=prompt_cache_key,
+                    tools=tools,
+                    output_schema=output_schema,
+                    before_send=before_send,
+                    timings=timings
+                )
             case Provider.ANTHROPIC:
-                return await self.anthropic_client.messages.create(model=model_name, messages=messages)
+                return await handle_anthropic_generate_text(
+                    anthropic_client=client or self.anthropic_client,
+                    model_name=model_name,
+                    messages=messages,
+                    prompt_caching=prompt_caching,
+                    prompt_cache_key=prompt_cache_key,
+                    tools=tools,
+                    output_schema=output_schema,
+                    before_send=before_send,
+                    timings=timings
+                )
             case Provider.FIREWORKS:
-                return await self.fireworks_client.chat.completions.create(model=model_name, messages=messages)
+                return await handle_fireworks_generate_text(
+                    fireworks_client=client or self.fireworks_client,
+                    model_name=model_name,
+                    messages=messages,
+                    prompt_caching=prompt_caching,
+                    prompt_cache_key=prompt_cache_key,
+                    tools=tools,
+                    output_schema=output_schema,
+                    before_send=before_send,
+                    timings=timings
+                )
             case _:
-                raise ValueError("Did not recognize LLM model name")
\ No newline at end of file
+                raise ValueError("Did not recognize LLM model name")
+
+    def stream_text(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        prompt_cache_key: str | None = None,
+        timeout: float | None = None,
+        deadline: float | None = None
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Stream a completion as normalized delta events. The last event is a
+        FinishEvent carrying the aggregated GenerateTextResult.
+
+        With `timeout` or `deadline` (see generate_text), a stream still running
+        when the budget is spent is cancelled, and the FinishEvent carries what had
+        arrived, marked `truncated`.
+        """
+        assert model_name in MODEL_MAP, f"Model {model_name} not found"
+        deadline = resolve_deadline(timeout, deadline)
+        if self.trim_policy is not None:
+            # Trimming may await a summarizer, so it runs once the stream is iterated
+            return self._trim_and_stream(model_name, messages, prompt_cache_key, deadline)
+        with deadline_scope(deadline):
+            return self._start_stream(model_name, messages, messages, prompt_cache_key, 0, deadline=deadline)
+
+    async def _trim_and_stream(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        prompt_cache_key: str | None,
+        deadline: float | None = None
+    ) -> AsyncIterator[StreamEvent]:
+        with deadline_scope(deadline):
+            request_messages, trimmed_tokens = await self._trim(model_name, messages)
+            stream = self._start_stream(model_name, messages, request_messages, prompt_cache_key, trimmed_tokens, deadline=deadline)
+        async for event in stream:
+            yield event
+
+    def _start_stream(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        request_messages: list[ModelMessage] | Conversation,
+        prompt_cache_key: str | None,
+        trimmed_tokens: int,
+        output_schema: ObjectSchema | None = None,
+        deadline: float | None = None
+    ) -> AsyncIterator[StreamEvent]:
+        pool = self.router.pool(model_name)
+        if pool is None:
+            stream = self._send_stream_text(model_name, request_messages, prompt_cache_key, output_schema)
+        else:
+            stream = self._route_stream(pool, lambda endpoint: self._send_stream_text(
+                model_name, request_messages, prompt_cache_key, output_schema, endpoint
+            ))
+        if deadline is not None:
+            stream = self._stream_until(stream, deadline)
+
+        if isinstance(messages, Conversation) or trimmed_tokens or output_schema is not None:
+            return self._finish_stream(stream, messages, trimmed_tokens, output_schema)
+        return stream
+
+    def _send_stream_text(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        prompt_cache_key: str | None,
+        output_schema: ObjectSchema | None = None,
+        endpoint: Endpoint | None = None
+    ) -> AsyncIterator[StreamEvent]:
+        if self.rate_limiter is None and not self.hooks:
+            return self._dispatch_stream_text(model_name, messages, prompt_cache_key, output_schema, endpoint=endpoint)
+        timings = Timings()
+        reservations: list[Reservation] = []
+        return self._observe_stream(model_name, self._dispatch_stream_text(
+            model_name, messages, prompt_cache_key, output_schema, self._before_send(model_name, timings, reservations), timings, endpoint
+        ), timings, reservations)
+
+    async def _route_stream(self, pool: EndpointPool, start: Callable[[Endpoint], AsyncIterator[StreamEvent]]) -> AsyncIterator[StreamEvent]:
+        # The endpoint is chosen when the stream is first iterated, as the request is only sent then
+        endpoint = pool.acquire()
+        started = time.perf_counter()
+        seconds: float | None = None
+        failed = False
+        try:
+            async for event in start(endpoint):
+                # Streams are timed to their first event, which does not grow with the reply
+                if seconds is None:
+                    seconds = time.perf_counter() - started
+                yield event
+        except Exception as error:
+            failed = is_retryable_error(error) and not expired()
+            raise
+        finally:
+            pool.release(endpoint, seconds, failed)
+
+    async def _stream_until(self, stream: AsyncIterator[StreamEvent], deadline: float) -> AsyncIterator[StreamEvent]:
+        accumulator = StreamAccumulator()
+        try:
+            while True:
+                # Only the stream's own steps run under the deadline, not the caller's code between events
+                with deadline_scope(deadline):
+                    try:
+                        async with asyncio.timeout(deadline - time.monotonic()):
+                            event = await anext(stream)
+                    except StopAsyncIteration:
+                        return
+                    except Exception as error:
+                        if not isinstance(error, TimeoutError) and not expired():
+                            raise
+                        break
+                if isinstance(event, FinishEvent):
+                    yield event
+                    return
+                accumulator.add(event)
+                yield event
+                if time.monotonic() >= deadline:
+                    break
+        finally:
+            # Closing the stream closes its HTTP response
+            await stream.aclose()
+
+        result = accumulator.build_result()
+        result.truncated = True
+        yield FinishEvent(result=result)
+
+    async def _finish_stream(
+        self,
+        stream: AsyncIterator[StreamEvent],
+        messages: list[ModelMessage] | Conversation,
+        trimmed_tokens: int,
+        output_schema: ObjectSchema | None = None
+    ) -> AsyncIterator[StreamEvent]:
+        async for event in stream:
+            if isinstance(event, FinishEvent):
+                event.result.trimmed_tokens = trimmed_tokens
+                if output_schema is not None:
+                    event = FinishEvent(result=cast_result_to_object(event.result, output_schema))
+                # A Conversation records the reply once the stream finishes
+                if isinstance(messages, Conversation):
+                    messages.add_result(event.result)
+            yield event
+
+    async def _observe_stream(
+        self,
+        model_name: str,
+        stream: AsyncIterator[StreamEvent],
+        timings: Timings,
+        reservations: list[Reservation]
+    ) -> AsyncIterator[StreamEvent]:
+        started = time.perf_counter()
+        try:
+            async for event in stream:
+                if isinstance(event, FinishEvent):
+                    if self.rate_limiter is not None:
+                        for reservation in reservations:
+                            self.rate_limiter.reconcile(reservation, event.result.usage)
+                    self._notify_response(model_name, event.result)
+                elif self.hooks:
+                    chunk_event = StreamChunkEvent(
+                        model_name=model_name,
+                        provider=MODEL_MAP[model_name],
+                        event=event,
+                        elapsed=time.perf_counter() - started,
+                        timings=timings
+                    )
+                    for hook in self.hooks:
+                        hook.on_stream_chunk(chunk_event)
+                yield event
+        except Exception as error:
+            self._notify_error(model_name, error, timings)
+            raise
+
+    def _dispatch_stream_text(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        prompt_cache_key: str | None,
+        output_schema: ObjectSchema | None = None,
+        before_send: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+        timings: Timings | None = None,
+        endpoint: Endpoint | None = None
+    ) -> AsyncIterator[StreamEvent]:
+        prompt_caching = self.prompt_caching or prompt_cache_key is not None
+        provider = MODEL_MAP[model_name]
+        client = None
+        if endpoint is not None:
+            client = self._endpoint_client(provider, endpoint)
+            model_name = endpoint.model_name or model_name
+        budget = remaining()
+        if budget is not None:
+            client = self._budgeted_client(provider, client, budget)
+        match provider:
+            case Provider.OPENAI:
+                return handle_openai_stream_text(
+                    openai_client=client or self.openai_client,
+                    model_name=model_name,
+                    messages=messages,
+                    prompt_caching=prompt_caching,
+                    prompt_cache_key=prompt_cache_key,
+                    output_schema=output_schema,
+                    before_send=before_send,
+                    timings=timings
+                )
+            case Provider.ANTHROPIC:
+                return handle_anthropic_stream_text(
+                    anthropic_client=client or self.anthropic_client,
+                    model_name=model_name,
+                    messages=messages,
+                    prompt_caching=prompt_caching,
+                    prompt_cache_key=prompt_cache_key,
+                    output_schema=output_schema,
+                    before_send=before_send,
+                    timings=timings
+                )
+            case Provider.FIREWORKS:
+                return handle_fireworks_stream_text(
+                    fireworks_client=client or self.fireworks_client,
+                    model_name=model_name,
+                    messages=messages,
+                    prompt_caching=prompt_caching,
+                    prompt_cache_key=prompt_cache_key,
+                    output_schema=output_schema,
+                    before_send=before_send,
+                    timings=timings
+                )
+            case _:
+                raise ValueError("Did not recognize LLM model name")
+
+    async def generate_object(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        schema: type[BaseModel],
+        bypass_cache: bool = False,
+        prompt_cache_key: str | None = None
+    ) -> GenerateObjectResult:
+        """
+        Generate an instance of the pydantic model `schema` with the provider's
+        structured-output mode: a JSON schema response format for OpenAI and
+        Fireworks, a forced tool call for Anthropic. The result's `object` is the
+        validated instance; a reply that does not validate raises pydantic's
+        ValidationError.
+        """
+        assert model_name in MODEL_MAP, f"Model {model_name} not found"
+        output_schema = object_schema(schema)
+        result = await self._generate_step(model_name, messages, bypass_cache, prompt_cache_key, output_schema=output_schema)
+        result = cast_result_to_object(result, output_schema)
+        # A Conversation records the reply as its next turn
+        if isinstance(messages, Conversation):
+            messages.add_result(result)
+        return result
+
+    def stream_object(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        schema: type[BaseModel],
+        prompt_cache_key: str | None = None
+    ) -> AsyncIterator[ObjectStreamEvent]:
+        """
+        Stream an instance of the pydantic model `schema` (see generate_object). The
+        reply's JSON is parsed incrementally, each fragment once, and every fragment
+        is followed by a PartialObjectEvent with the object so far. The last event is
+        a FinishEvent carrying the GenerateObjectResult.
+        """
+        assert model_name in MODEL_MAP, f"Model {model_name} not found"
+        return self._stream_object(model_name, messages, object_schema(schema), prompt_cache_key)
+
+    async def _stream_object(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        output_schema: ObjectSchema,
+        prompt_cache_key: str | None
+    ) -> AsyncIterator[ObjectStreamEvent]:
+        # Trimming may await a summarizer, so it runs once the stream is iterated
+        request_messages, trimmed_tokens = await self._trim(model_name, messages)
+        parser = PartialJSONParser()
+        async for event in self._start_stream(model_name, messages, request_messages, prompt_cache_key, trimmed_tokens, output_schema):
+            if isinstance(event, FinishEvent):
+                yield event
+            # The object streams as text (OpenAI, Fireworks) or as the forced tool call's input (Anthropic)
+            elif isinstance(event, (TextDeltaEvent, ToolCallDeltaEvent)):
+                parser.feed(event.text if isinstance(event, TextDeltaEvent) else event.input_delta)
+                yield PartialObjectEvent(object=parser.partial())
+
+    async def embed(self, model_name: str, texts: Sequence[str], dimensions: int | None = None, max_concurrency: int = 8) -> np.ndarray:
+        """
+        Embed texts with an embedding model. The texts are packed into as few
+        requests as the model's item and token limits allow, which run concurrently
+        and write into one preallocated float32 array, returned with a row per text
+        in input order.
+
+        Args:
+            model_name: Embedding model, see EMBEDDING_LIMITS
+            texts: Texts to embed
+            dimensions: Optional output dimensions, for models that support shortening
+            max_concurrency: Maximum requests in flight
+        """
+        import numpy as np
+        return await self._embed_into(
+            model_name, texts, len(texts), lambda width: np.empty((len(texts), width), dtype=np.float32), dimensions, max_concurrency
+        )
+
+    async def embed_to_file(
+        self,
+        model_name: str,
+        texts: Iterable[str],
+        path: str | Path,
+        count: int | None = None,
+        dimensions: int | None = None,
+        max_concurrency: int = 8
+    ) -> np.memmap:
+        """
+        Embed a corpus too big for memory into a memory-mapped `.npy` file (see embed).
+        Texts are read lazily, a chunk at a time, so `texts` may be a generator over
+        a file; pass its length as `count`. Returns the array mapped from `path`.
+        """
+        import numpy as np
+        count = len(texts) if count is None and isinstance(texts, Sized) else count
+        assert count is not None, "count is required for texts without a length"
+        array = await self._embed_into(
+            model_name,
+            texts,
+            count,
+            lambda width: np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(count, width)),
+            dimensions,
+            max_concurrency
+        )
+        array.flush()
+        return array
+
+    async def _embed_into(
+        self,
+        model_name: str,
+        texts: Iterable[str],
+        count: int,
+        allocate: Callable[[int], np.ndarray],
+        dimensions: int | None,
+        max_concurrency: int
+    ) -> np.ndarray:
+        from llms.utilities.embeddings import embedding_limits, iter_embedding_chunks
+
+        assert model_name in MODEL_MAP, f"Model {model_name} not found"
+        limits = embedding_limits(model_name)
+        # The output is allocated once the first chunk shows the embeddings' width
+        output: np.ndarray | None = None
+        pending: set[asyncio.Task] = set()
+        embedded = 0
+
+        def write(done: set[asyncio.Task]) -> None:
+            nonlocal output
+            for task in done:
+                offset, vectors = task.result()
+                if output is None:
+                    output = allocate(vectors.shape[1])
+                output[offset:offset + len(vectors)] = vectors
+
+        try:
+            for offset, chunk in iter_embedding_chunks(texts, limits):
+                embedded = offset + len(chunk)
+                if embedded > count:
+                    raise ValueError(f"Got more than {count} texts")
+                # Chunks are only packed as fast as requests finish, so a corpus is never held whole
+                if len(pending) >= max_concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    write(done)
+                pending.add(asyncio.ensure_future(self._embed_chunk(model_name, offset, chunk, dimensions)))
+            if pending:
+                done, pending = await asyncio.wait(pending)
+                write(done)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+
+        if embedded < count:
+            raise ValueError(f"Expected {count} texts, got {embedded}")
+        return output if output is not None else allocate(dimensions or 0)
+
+    async def _embed_chunk(self, model_name: str, offset: int, texts: list[str], dimensions: int | None) -> tuple[int, np.ndarray]:
+        from llms._async.embeddings import handle_openai_embed, handle_fireworks_embed
+
+        match MODEL_MAP[model_name]:
+            case Provider.OPENAI:
+                return offset, await handle_openai_embed(self.openai_client, model_name, texts, dimensions)
+            case Provider.FIREWORKS:
+                return offset, await handle_fireworks_embed(self.fireworks_client, model_name, texts, dimensions)
+            case _:
+                raise ValueError(f"{MODEL_MAP[model_name].value} has no embeddings API")
+
+    async def submit_batch(self, requests: Iterable[BatchRequest]) -> BatchJob:
+        """
+        Submit requests as a provider batch job (OpenAI Batch or Anthropic Message
+        Batches), which costs less than interactive calls and does not count against
+        their rate limits. Results come back within 24 hours.
+
+        Args:
+            requests: BatchRequests, all for models of one provider; consumed lazily
+                and streamed to the provider
+
+        Returns:
+            The created BatchJob
+        """
+        requests = iter(requests)
+        first = next(requests, None)
+        if first is None:
+            raise ValueError("A batch needs at least one request")
+        assert first.model_name in MODEL_MAP, f"Model {first.model_name} not found"
+        requests = itertools.chain([first], requests)
+
+        match MODEL_MAP[first.model_name]:
+            case Provider.OPENAI:
+                return await submit_openai_batch(self.openai_client, requests, self.prompt_caching)
+            case Provider.ANTHROPIC:
+                return await submit_anthropic_batch(self.anthropic_client, requests, self.prompt_caching)
+            case provider:
+                raise ValueError(f"Batch jobs are not supported for {provider.value} models")
+
+    async def poll_batch(self, job: BatchJob, wait: bool = False, poll_interval: float = 30.0) -> BatchJob:
+        """
+        Fetch the current state of a batch job.
+
+        Args:
+            job: The BatchJob returned by submit_batch
+            wait: Keep polling until the job is done
+            poll_interval: Seconds between polls when waiting
+
+        Returns:
+            The refreshed BatchJob
+        """
+        while True:
+            match job.provider:
+                case Provider.OPENAI:
+                    job = await poll_openai_batch(self.openai_client, job.id)
+                case Provider.ANTHROPIC:
+                    job = await poll_anthropic_batch(self.anthropic_client, job.id)
+                case provider:
+                    raise ValueError(f"Batch jobs are not supported for {provider.value} models")
+            if job.done or not wait:
+                return job
+            await asyncio.sleep(poll_interval)
+
+    def iter_batch_results(self, job: BatchJob) -> AsyncIterator[BatchResult]:
+        """
+        Stream the results of a finished batch job, in no particular order. Match
+        them to their requests by `custom_id`.
+
+        Args:
+            job: A BatchJob that is done
+
+        Returns:
+            Async iterator of BatchResult objects, one per request
+        """
+        match job.provider:
+            case Provider.OPENAI:
+                return iter_openai_batch_results(self.openai_client, job)
+            case Provider.ANTHROPIC:
+                return iter_anthropic_batch_results(self.anthropic_client, job)
+            case provider:
+                raise ValueError(f"Batch jobs are not supported for {provider.value} models")
+
+    def generate_many(
+        self,
+        requests: Iterable[GenerateTextRequest] | AsyncIterable[GenerateTextRequest],
+        max_concurrency: int = 16,
+        per_provider_limits: dict[Provider, int] | None = None,
+        ordered: bool = False,
+        return_exceptions: bool = False
+    ) -> AsyncIterator[GenerateManyResult]:
+        """
+        Generate text for many requests concurrently, pulling them lazily from `requests`.
+
+        Args:
+            requests: Iterable or async iterable of GenerateTextRequest objects
+            max_concurrency: Maximum number of requests in flight across all providers
+            per_provider_limits: Optional per-provider caps, e.g. {Provider.ANTHROPIC: 4}
+            ordered: Yield results in input order instead of as they complete
+            return_exceptions: Attach failures to their GenerateManyResult instead of raising
+
+        Returns:
+            Async iterator of GenerateManyResult objects
+        """
+        return fan_out(
+            generate=lambda model_name, messages: self.generate_text(model_name=model_name, messages=messages),
+            requests=requests,
+            max_concurrency=max_concurrency,
+            per_provider_limits=per_provider_limits,
+            ordered=ordered,
+            return_exceptions=return_exceptions
+        )
@@ -0,0 +1,53 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import numpy as np
+from llms.utilities.embeddings import build_openai_embedding_params, build_fireworks_embedding_params, cast_openai_embeddings
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+
+async def handle_openai_embed(openai_client: AsyncOpenAI, model_name: str, texts: list[str], dimensions: int | None = None) -> np.ndarray:
+    """
+    Embed one chunk of texts with OpenAI.
+
+    Args:
+        openai_client: The OpenAI async client instance
+        model_name: Embedding model
+        texts: Texts within the model's request limits
+        dimensions: Optional output dimensions, for models that support shortening
+
+    Returns:
+        A float32 matrix with one row per text
+    """
+    # Step 1: Build parameters
+    api_params = build_openai_embedding_params(model_name, texts, dimensions)
+
+    # Step 2: Call API
+    response = await openai_client.embeddings.create(**api_params)
+
+    # Step 3: Cast the response
+    return cast_openai_embeddings(response.data, len(texts))
+
+
+async def handle_fireworks_embed(fireworks_client: AsyncOpenAI, model_name: str, texts: list[str], dimensions: int | None = None) -> np.ndarray:
+    """
+    Embed one chunk of texts with Fireworks.
+
+    Args:
+        fireworks_client: The OpenAI async client instance configured for Fireworks API
+        model_name: Embedding model
+        texts: Texts within the model's request limits
+        dimensions: Optional output dimensions, for models that support shortening
+
+    Returns:
+        A float32 matrix with one row per text
+    """
+    # Step 1: Build parameters
+    api_params = build_fireworks_embedding_params(model_name, texts, dimensions)
+
+    # Step 2: Call API
+    response = await fireworks_client.embeddings.create(**api_params)
+
+    # Step 3: Cast the response
+    return cast_openai_embeddings(response.data, len(texts))
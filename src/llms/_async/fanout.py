@@ -0,0 +1,128 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
+from llms.models import MODEL_MAP
+from llms.types.enums import Provider
+from llms.types.messages import ModelMessage
+from llms.types.requests import GenerateTextRequest
+from llms.types.results import GenerateTextResult, GenerateManyResult
+
+
+async def _iterate(requests: Iterable[GenerateTextRequest] | AsyncIterable[GenerateTextRequest]) -> AsyncIterator[GenerateTextRequest]:
+    if isinstance(requests, AsyncIterable):
+        async for request in requests:
+            yield request
+    else:
+        for request in requests:
+            yield request
+
+
+async def fan_out(
+    generate: Callable[[str, list[ModelMessage]], Awaitable[GenerateTextResult]],
+    requests: Iterable[GenerateTextRequest] | AsyncIterable[GenerateTextRequest],
+    max_concurrency: int,
+    per_provider_limits: dict[Provider, int] | None = None,
+    ordered: bool = False,
+    return_exceptions: bool = False
+) -> AsyncIterator[GenerateManyResult]:
+    """
+    Run `generate` over a lazily consumed stream of requests with bounded concurrency.
+
+    Requests are pulled from the input only when a slot frees up, so at most
+    `max_concurrency` requests run at once. In ordered mode, completed results
+    waiting on an earlier request also count towards that bound. A request whose
+    provider is at its `per_provider_limits` takes no slot: it waits in a queue
+    for that provider, holding at most `max_concurrency` requests across
+    providers, so a throttled provider cannot keep the others' requests waiting.
+
+    Args:
+        generate: Coroutine function called as generate(model_name, messages)
+        requests: Iterable or async iterable of requests, consumed lazily
+        max_concurrency: Maximum number of requests running or completed but not yet yielded
+        per_provider_limits: Optional maximum number of in-flight calls per provider
+        ordered: Yield results in input order instead of completion order
+        return_exceptions: Attach failures to their result instead of raising
+
+    Yields:
+        GenerateManyResult for each request
+    """
+    assert max_concurrency > 0, "max_concurrency must be positive"
+
+    provider_limits = per_provider_limits or {}
+    provider_in_flight: dict[Provider, int] = dict.fromkeys(provider_limits, 0)
+    # Requests pulled while their provider was at its limit, oldest first
+    waiting: dict[Provider, deque[tuple[int, GenerateTextRequest]]] = {provider: deque() for provider in provider_limits}
+
+    async def run(index: int, request: GenerateTextRequest) -> GenerateManyResult:
+        try:
+            result = await generate(request.model_name, request.messages)
+        except Exception as error:
+            if not return_exceptions:
+                raise
+            return GenerateManyResult(index=index, request=request, error=error)
+        return GenerateManyResult(index=index, request=request, result=result)
+
+    def has_capacity(provider: Provider | None) -> bool:
+        return provider not in provider_limits or provider_in_flight[provider] < provider_limits[provider]
+
+    def launch(index: int, request: GenerateTextRequest, provider: Provider | None) -> None:
+        if provider in provider_in_flight:
+            provider_in_flight[provider] += 1
+        running[asyncio.create_task(run(index, request))] = provider
+
+    source = _iterate(requests)
+    exhausted = False
+    running: dict[asyncio.Task[GenerateManyResult], Provider | None] = {}
+    # Out-of-order results held back in ordered mode
+    completed: dict[int, GenerateManyResult] = {}
+    next_index = 0
+    next_to_yield = 0
+
+    try:
+        while True:
+            # Waiting requests whose provider has freed up go first, oldest first
+            while len(running) + len(completed) < max_concurrency:
+                ready = [provider for provider, queue in waiting.items() if queue and has_capacity(provider)]
+                if not ready:
+                    break
+                provider = min(ready, key=lambda provider: waiting[provider][0][0])
+                index, request = waiting[provider].popleft()
+                launch(index, request, provider)
+
+            # Then top up the window from the input
+            while not exhausted and len(running) + len(completed) < max_concurrency and sum(map(len, waiting.values())) < max_concurrency:
+                try:
+                    request = await anext(source)
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                provider = MODEL_MAP.get(request.model_name)
+                if has_capacity(provider):
+                    launch(next_index, request, provider)
+                else:
+                    waiting[provider].append((next_index, request))
+                next_index += 1
+
+            if not running:
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                provider = running.pop(task)
+                if provider in provider_in_flight:
+                    provider_in_flight[provider] -= 1
+                item = task.result()
+                if ordered:
+                    completed[item.index] = item
+                else:
+                    yield item
+
+            while next_to_yield in completed:
+                yield completed.pop(next_to_yield)
+                next_to_yield += 1
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        await source.aclose()
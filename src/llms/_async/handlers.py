@@ -1,93 +1,390 @@
-from openai import AsyncOpenAI
-from anthropic import AsyncAnthropic
+from __future__ import annotations
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+from llms.conversation import Conversation
 from llms.types.messages import ModelMessage
-from llms.types.results import GenerateTextResult
+from llms.types.results import GenerateTextResult, Timings
+from llms.types.objects import ObjectSchema
+from llms.types.tools import Tool
+from llms.types.streams import StreamEvent, FinishEvent
 from llms.utilities.casting import (
-    cast_message_to_openai,
-    cast_openai_response_to_parts,
-    cast_message_to_anthropic,
-    cast_anthropic_response_to_parts,
-    cast_parts_to_text
+    cast_openai_response_to_result,
+    cast_anthropic_response_to_result,
+    cast_openai_responses_response_to_result,
+    cast_openai_chunk_to_events,
+    cast_anthropic_event_to_events,
+    cast_openai_usage,
+    cast_anthropic_usage,
+    cast_openai_finish_reason,
+    cast_anthropic_finish_reason
 )
+from llms.utilities.params import build_openai_params, build_fireworks_params, build_anthropic_params, build_openai_responses_params
+from llms.utilities.streaming import StreamAccumulator
+from llms.utilities.timing import CallTimer
+
+# The SDKs are only needed for annotations here; they load when a client is built
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+    from anthropic import AsyncAnthropic
 
 
 async def handle_openai_generate_text(
-    openai_client: AsyncOpenAI, 
-    model_name: str, 
-    messages: list[ModelMessage]
+    openai_client: AsyncOpenAI,
+    model_name: str,
+    messages: list[ModelMessage] | Conversation,
+    prompt_caching: bool = False,
+    prompt_cache_key: str | None = None,
+    tools: list[Tool] | None = None,
+    output_schema: ObjectSchema | None = None,
+    before_send: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+    timings: Timings | None = None
 ) -> GenerateTextResult:
     """
     Handle OpenAI text generation by converting internal messages to OpenAI format,
     calling the API, and converting the response back to internal Parts.
-    
+
     Args:
         openai_client: The OpenAI async client instance
         model_name: The name of the OpenAI model to use
         messages: List of internal ModelMessage objects
-        
+        prompt_caching: Whether to enable the provider's prompt caching
+        prompt_cache_key: Optional cache routing key, derived from the system prompt if omitted
+        tools: Optional tools the model may call
+        output_schema: Optional schema the reply must follow (see generate_object)
+        before_send: Optional callback invoked with the request parameters right before sending
+        timings: Optional Timings to fill in, so the caller can read them even if the call fails
+
     Returns:
         GenerateTextResult containing both the text response and structured parts
     """
     # Convert internal ModelMessage format to OpenAI format
-    openai_messages = [cast_message_to_openai(msg) for msg in messages]
-    
+    timer = CallTimer(timings)
+    api_params = build_openai_params(model_name, messages, prompt_caching, prompt_cache_key, tools, output_schema)
+    timer.messages_cast()
+
+    # Let the client inspect the request (e.g. for rate limiting) before it is sent
+    if before_send is not None:
+        await before_send(api_params)
+
     # Call OpenAI chat completions API
-    response = await openai_client.chat.completions.create(
-        model=model_name,
-        messages=openai_messages
-    )
-    
-    # Convert OpenAI response to internal Parts format
-    parts = cast_openai_response_to_parts(response)
-    
-    # Convert parts to text for backward compatibility
-    text = cast_parts_to_text(parts)
-    
-    return GenerateTextResult(text=text, parts=parts)
+    with timer.request():
+        response = await openai_client.chat.completions.create(**api_params)
+
+    # Convert OpenAI response to an internal GenerateTextResult
+    result = cast_openai_response_to_result(response, timer.timings)
+    timer.finished()
+    return result
+
+
+async def handle_openai_generate_conversation(
+    openai_client: AsyncOpenAI,
+    model_name: str,
+    conversation: Conversation,
+    prompt_caching: bool = False,
+    prompt_cache_key: str | None = None,
+    tools: list[Tool] | None = None,
+    output_schema: ObjectSchema | None = None,
+    before_send: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+    timings: Timings | None = None
+) -> GenerateTextResult:
+    """
+    Handle OpenAI text generation for a Conversation with server-side state through
+    the Responses API, sending only the messages the server has not stored yet.
+
+    Args:
+        openai_client: The OpenAI async client instance
+        model_name: The name of the OpenAI model to use
+        conversation: The Conversation to continue
+        prompt_caching: Whether to enable the provider's prompt caching
+        prompt_cache_key: Optional cache routing key, derived from the system prompt if omitted
+        tools: Optional tools the model may call
+        output_schema: Optional schema the reply must follow (see generate_object)
+        before_send: Optional callback invoked with the request parameters right before sending
+        timings: Optional Timings to fill in, so the caller can read them even if the call fails
+
+    Returns:
+        GenerateTextResult whose stored_response_id continues the conversation
+    """
+    # Convert the unstored messages to Responses input items
+    timer = CallTimer(timings)
+    api_params = build_openai_responses_params(model_name, conversation, prompt_caching, prompt_cache_key, tools, output_schema)
+    timer.messages_cast()
+
+    # Let the client inspect the request (e.g. for rate limiting) before it is sent
+    if before_send is not None:
+        await before_send(api_params)
+
+    # Call OpenAI responses API
+    with timer.request():
+        response = await openai_client.responses.create(**api_params)
+
+    # Convert OpenAI response to an internal GenerateTextResult
+    result = cast_openai_responses_response_to_result(response, timer.timings)
+    timer.finished()
+    return result
 
 
 async def handle_anthropic_generate_text(
     anthropic_client: AsyncAnthropic,
     model_name: str,
-    messages: list[ModelMessage]
+    messages: list[ModelMessage] | Conversation,
+    prompt_caching: bool = False,
+    prompt_cache_key: str | None = None,
+    tools: list[Tool] | None = None,
+    output_schema: ObjectSchema | None = None,
+    before_send: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+    timings: Timings | None = None
 ) -> GenerateTextResult:
     """
     Handle Anthropic text generation by converting internal messages to Anthropic format,
     calling the API, and converting the response back to internal Parts.
-    
+
     Args:
         anthropic_client: The Anthropic async client instance
         model_name: The name of the Anthropic model to use
         messages: List of internal ModelMessage objects
-        
+        prompt_caching: Whether to enable the provider's prompt caching
+        prompt_cache_key: Optional cache routing key, derived from the system prompt if omitted
+        tools: Optional tools the model may call
+        output_schema: Optional schema the reply must follow (see generate_object)
+        before_send: Optional callback invoked with the request parameters right before sending
+        timings: Optional Timings to fill in, so the caller can read them even if the call fails
+
     Returns:
         GenerateTextResult containing both the text response and structured parts
     """
     # Convert internal ModelMessage format to Anthropic format
-    # Note: Anthropic separates system messages from the messages array
-    system_messages = [msg for msg in messages if msg.role.value == "system"]
-    non_system_messages = [msg for msg in messages if msg.role.value != "system"]
-    
-    anthropic_messages = [cast_message_to_anthropic(msg) for msg in non_system_messages]
-    
-    # Build API call parameters
-    api_params = {
-        "model": model_name,
-        "max_tokens": 1024,  # Required parameter for Anthropic
-        "messages": anthropic_messages
-    }
-    
-    # Add system message if present
-    if system_messages:
-        api_params["system"] = system_messages[0].content
-    
+    timer = CallTimer(timings)
+    api_params = build_anthropic_params(model_name, messages, prompt_caching, prompt_cache_key, tools, output_schema)
+    timer.messages_cast()
+
+    # Let the client inspect the request (e.g. for rate limiting) before it is sent
+    if before_send is not None:
+        await before_send(api_params)
+
     # Call Anthropic messages API
-    response = await anthropic_client.messages.create(**api_params)
-    
-    # Convert Anthropic response to internal Parts format
-    parts = cast_anthropic_response_to_parts(response)
-    
-    # Convert parts to text for backward compatibility
-    text = cast_parts_to_text(parts)
-    
-    return GenerateTextResult(text=text, parts=parts)
\ No newline at end of file
+    with timer.request():
+        response = await anthropic_client.messages.create(**api_params)
+
+    # Convert Anthropic response to an internal GenerateTextResult
+    result = cast_anthropic_response_to_result(response, timer.timings)
+    timer.finished()
+    return result
+
+
+async def handle_fireworks_generate_text(
+    fireworks_client: AsyncOpenAI,
+    model_name: str,
+    messages: list[ModelMessage] | Conversation,
+    prompt_caching: bool = False,
+    prompt_cache_key: str | None = None,
+    tools: list[Tool] | None = None,
+    output_schema: ObjectSchema | None = None,
+    before_send: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+    timings: Timings | None = None
+) -> GenerateTextResult:
+    """
+    Handle Fireworks text generation by converting internal messages to OpenAI format,
+    calling the Fireworks API (which is OpenAI-compatible), and converting the response
+    back to internal Parts.
+
+    Args:
+        fireworks_client: The OpenAI async client instance configured for Fireworks API
+        model_name: The name of the Fireworks model to use
+        messages: List of internal ModelMessage objects
+        prompt_caching: Whether to enable the provider's prompt caching
+        prompt_cache_key: Optional cache routing key, derived from the system prompt if omitted
+        tools: Optional tools the model may call
+        output_schema: Optional schema the reply must follow (see generate_object)
+        before_send: Optional callback invoked with the request parameters right before sending
+        timings: Optional Timings to fill in, so the caller can read them even if the call fails
+
+    Returns:
+        GenerateTextResult containing both the text response and structured parts
+    """
+    # Convert internal ModelMessage format to OpenAI format
+    # Fireworks uses OpenAI-compatible API format
+    timer = CallTimer(timings)
+    api_params = build_fireworks_params(model_name, messages, prompt_caching, prompt_cache_key, tools, output_schema)
+    timer.messages_cast()
+
+    # Let the client inspect the request (e.g. for rate limiting) before it is sent
+    if before_send is not None:
+        await before_send(api_params)
+
+    # Call Fireworks chat completions API (OpenAI-compatible)
+    with timer.request():
+        response = await fireworks_client.chat.completions.create(**api_params)
+
+    # Convert response to an internal GenerateTextResult
+    result = cast_openai_response_to_result(response, timer.timings)
+    timer.finished()
+    return result
+
+
+async def handle_openai_stream_text(
+    openai_client: AsyncOpenAI,
+    model_name: str,
+    messages: list[ModelMessage] | Conversation,
+    prompt_caching: bool = False,
+    prompt_cache_key: str | None = None,
+    output_schema: ObjectSchema | None = None,
+    before_send: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+    timings: Timings | None = None
+) -> AsyncIterator[StreamEvent]:
+    """
+    Handle OpenAI text streaming by converting internal messages to OpenAI format,
+    calling the API in streaming mode, and converting each chunk to delta events.
+
+    Args:
+        openai_client: The OpenAI async client instance
+        model_name: The name of the OpenAI model to use
+        messages: List of internal ModelMessage objects
+        prompt_caching: Whether to enable the provider's prompt caching
+        prompt_cache_key: Optional cache routing key, derived from the system prompt if omitted
+        output_schema: Optional schema the reply must follow (see stream_object)
+        before_send: Optional callback invoked with the request parameters right before sending
+        timings: Optional Timings to fill in, so the caller can read them even if the call fails
+
+    Yields:
+        Delta events as they arrive, followed by a FinishEvent with the aggregated result
+    """
+    timer = CallTimer(timings)
+    api_params = build_openai_params(model_name, messages, prompt_caching, prompt_cache_key, output_schema=output_schema)
+    timer.messages_cast()
+    async for event in _stream_openai_compatible(openai_client, api_params, before_send, timer):
+        yield event
+
+
+async def handle_anthropic_stream_text(
+    anthropic_client: AsyncAnthropic,
+    model_name: str,
+    messages: list[ModelMessage] | Conversation,
+    prompt_caching: bool = False,
+    prompt_cache_key: str | None = None,
+    output_schema: ObjectSchema | None = None,
+    before_send: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+    timings: Timings | None = None
+) -> AsyncIterator[StreamEvent]:
+    """
+    Handle Anthropic text streaming by converting internal messages to Anthropic format,
+    calling the API in streaming mode, and converting each raw event to delta events.
+
+    Args:
+        anthropic_client: The Anthropic async client instance
+        model_name: The name of the Anthropic model to use
+        messages: List of internal ModelMessage objects
+        prompt_caching: Whether to enable the provider's prompt caching
+        prompt_cache_key: Optional cache routing key, derived from the system prompt if omitted
+        output_schema: Optional schema the reply must follow (see stream_object)
+        before_send: Optional callback invoked with the request parameters right before sending
+        timings: Optional Timings to fill in, so the caller can read them even if the call fails
+
+    Yields:
+        Delta events as they arrive, followed by a FinishEvent with the aggregated result
+    """
+    timer = CallTimer(timings)
+    api_params = build_anthropic_params(model_name, messages, prompt_caching, prompt_cache_key, output_schema=output_schema)
+    timer.messages_cast()
+    # Anthropic streams tool inputs as JSON fragments of a dict
+    accumulator = StreamAccumulator(parse_tool_input=True)
+
+    if before_send is not None:
+        await before_send(api_params)
+
+    with timer.request():
+        stream = await anthropic_client.messages.create(**api_params, stream=True)
+    timer.stream_opened()
+    accumulator.request_id = stream.response.headers.get("request-id")
+
+    async with stream:
+        async for raw_event in stream:
+            timer.chunk_received()
+            # Input usage arrives with message_start, the output count and stop reason with message_delta
+            if raw_event.type == "message_start":
+                accumulator.usage = cast_anthropic_usage(raw_event.message.usage)
+            elif raw_event.type == "message_delta":
+                accumulator.finish_reason = cast_anthropic_finish_reason(raw_event.delta.stop_reason)
+                if accumulator.usage is not None:
+                    accumulator.usage.output_tokens = raw_event.usage.output_tokens
+            events = cast_anthropic_event_to_events(raw_event)
+            for event in events:
+                accumulator.add(event)
+            timer.chunk_cast()
+            for event in events:
+                yield event
+
+    timer.stream_closed()
+    result = accumulator.build_result(timer.timings)
+    timer.finished()
+    yield FinishEvent(result=result)
+
+
+async def handle_fireworks_stream_text(
+    fireworks_client: AsyncOpenAI,
+    model_name: str,
+    messages: list[ModelMessage] | Conversation,
+    prompt_caching: bool = False,
+    prompt_cache_key: str | None = None,
+    output_schema: ObjectSchema | None = None,
+    before_send: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+    timings: Timings | None = None
+) -> AsyncIterator[StreamEvent]:
+    """
+    Handle Fireworks text streaming through its OpenAI-compatible API.
+
+    Args:
+        fireworks_client: The OpenAI async client instance configured for Fireworks API
+        model_name: The name of the Fireworks model to use
+        messages: List of internal ModelMessage objects
+        prompt_caching: Whether to enable the provider's prompt caching
+        prompt_cache_key: Optional cache routing key, derived from the system prompt if omitted
+        output_schema: Optional schema the reply must follow (see stream_object)
+        before_send: Optional callback invoked with the request parameters right before sending
+        timings: Optional Timings to fill in, so the caller can read them even if the call fails
+
+    Yields:
+        Delta events as they arrive, followed by a FinishEvent with the aggregated result
+    """
+    timer = CallTimer(timings)
+    api_params = build_fireworks_params(model_name, messages, prompt_caching, prompt_cache_key, output_schema=output_schema)
+    timer.messages_cast()
+    async for event in _stream_openai_compatible(fireworks_client, api_params, before_send, timer):
+        yield event
+
+
+async def _stream_openai_compatible(
+    client: AsyncOpenAI,
+    api_params: dict[str, Any],
+    before_send: Callable[[dict[str, Any]], Awaitable[None]] | None,
+    timer: CallTimer
+) -> AsyncIterator[StreamEvent]:
+    accumulator = StreamAccumulator()
+
+    if before_send is not None:
+        await before_send(api_params)
+
+    with timer.request():
+        stream = await client.chat.completions.create(**api_params, stream=True, stream_options={"include_usage": True})
+    timer.stream_opened()
+    accumulator.request_id = stream.response.headers.get("x-request-id")
+
+    async with stream:
+        async for chunk in stream:
+            timer.chunk_received()
+            # The final chunk carries usage and no choices
+            if chunk.usage is not None:
+                accumulator.usage = cast_openai_usage(chunk.usage)
+            if chunk.choices and chunk.choices[0].finish_reason is not None:
+                accumulator.finish_reason = cast_openai_finish_reason(chunk.choices[0].finish_reason)
+            events = cast_openai_chunk_to_events(chunk)
+            for event in events:
+                accumulator.add(event)
+            timer.chunk_cast()
+            for event in events:
+                yield event
+
+    timer.stream_closed()
+    result = accumulator.build_result(timer.timings)
+    timer.finished()
+    yield FinishEvent(result=result)
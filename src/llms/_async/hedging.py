@@ -0,0 +1,104 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from llms.deadlines import current_deadline, expired
+from llms.fallback import FallbackPolicy, LatencyTracker, is_retryable_error
+from llms.types.results import GenerateTextResult
+
+
+async def run_with_fallback(
+    call: Callable[[str], Awaitable[GenerateTextResult]],
+    model_name: str,
+    policy: FallbackPolicy,
+    tracker: LatencyTracker
+) -> GenerateTextResult:
+    """
+    Run `call` against `model_name` and its fallback chain according to `policy`.
+
+    Each target retries retryable errors with jittered backoff. A slow target is
+    hedged by starting the next one; a failed target falls over to the next one.
+    The first success wins and every other attempt is cancelled. Under a deadline
+    (see llms.deadlines), no retry or fallback starts once it could not finish in time.
+
+    Args:
+        call: Coroutine function performing a single request against a model name
+        model_name: The requested model
+        policy: Retry, hedging and fallback configuration
+        tracker: Latency history used to derive the hedge delay
+
+    Returns:
+        The first successful GenerateTextResult
+    """
+    targets = policy.targets(model_name)
+    running: set[asyncio.Task[GenerateTextResult]] = set()
+    next_target = 0
+    launched_at = 0.0
+    last_error: BaseException | None = None
+
+    async def attempt(target: str) -> GenerateTextResult:
+        retry = 0
+        while True:
+            started = time.monotonic()
+            try:
+                result = await call(target)
+            except asyncio.CancelledError:
+                # Losers are cancelled; without their time the slowest latencies would go unrecorded
+                tracker.record_censored(target, time.monotonic() - started)
+                raise
+            except Exception as error:
+                if not is_retryable_error(error) or retry == policy.max_retries:
+                    raise
+                retry += 1
+                delay = policy.backoff(retry)
+                # A retry that could only start after the deadline is not worth waiting for
+                deadline = current_deadline()
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            tracker.record(target, time.monotonic() - started)
+            return result
+
+    def launch() -> None:
+        nonlocal next_target, launched_at
+        running.add(asyncio.create_task(attempt(targets[next_target])))
+        next_target += 1
+        launched_at = time.monotonic()
+
+    launch()
+    try:
+        while running:
+            # Hedge onto the next target once the latest one is slower than usual
+            timeout = None
+            if next_target < len(targets):
+                delay = tracker.hedge_delay(targets[next_target - 1], policy)
+                if delay is not None:
+                    timeout = max(0.0, launched_at + delay - time.monotonic())
+
+            done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                launch()
+                continue
+
+            running -= done
+            # A success wins over errors that completed in the same wakeup
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+            for task in done:
+                error = task.exception()
+                if not is_retryable_error(error):
+                    raise error
+                last_error = error
+
+            # Fall over to the next target when nothing else is still trying
+            if not running and next_target < len(targets) and not expired():
+                launch()
+
+        assert last_error is not None
+        raise last_error
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
@@ -0,0 +1,40 @@
+import asyncio
+import inspect
+import time
+from llms.types.parts import ToolCallPart
+from llms.types.results import ToolExecution
+from llms.types.tools import Tool
+from llms.utilities.tools import tool_arguments, tool_execution, unknown_tool_execution, timed_out_execution, failed_execution
+
+
+async def run_tool_calls(tools: dict[str, Tool], calls: list[ToolCallPart]) -> list[ToolExecution]:
+    """
+    Run the tool calls of one step concurrently. Coroutine functions run on the
+    event loop and plain functions in worker threads. A call that fails or times
+    out becomes an error output for the model rather than an exception.
+
+    Args:
+        tools: The available tools by name
+        calls: The tool calls of one reply
+
+    Returns:
+        One ToolExecution per call, in call order
+    """
+    return list(await asyncio.gather(*(_run_tool_call(tools.get(call.tool_name), call) for call in calls)))
+
+
+async def _run_tool_call(tool: Tool | None, call: ToolCallPart) -> ToolExecution:
+    started = time.perf_counter()
+    if tool is None:
+        return unknown_tool_execution(call, started)
+    try:
+        if inspect.iscoroutinefunction(tool.function):
+            pending = tool.function(**tool_arguments(call))
+        else:
+            pending = asyncio.to_thread(tool.function, **tool_arguments(call))
+        output = await asyncio.wait_for(pending, tool.timeout)
+    except TimeoutError:
+        return timed_out_execution(call, tool, started)
+    except Exception as error:
+        return failed_execution(call, error, started)
+    return tool_execution(call, started, output)
@@ -1,30 +1,242 @@
-from openai import OpenAI
-from anthropic import Anthropic
-from llms.types.messages import ModelMessage
-from llms.types.results import GenerateTextResult
-from llms.models import MODEL_MAP
+from __future__ import annotations
+from collections.abc import AsyncIterable, Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+from pydantic import BaseModel
+from llms._async.client import AsyncLLM, FIREWORKS_BASE_URL
+from llms._sync.compat import ThreadedPool, as_async_client
+from llms.conversation import Conversation
+from llms.loop import BackgroundLoop, shared_loop
+from llms.types.batches import BatchRequest, BatchJob, BatchResult
 from llms.types.enums import Provider
-from llms._sync.handlers import handle_openai_generate_text, handle_anthropic_generate_text, handle_fireworks_generate_text
+from llms.types.messages import ModelMessage
+from llms.types.requests import GenerateTextRequest
+from llms.types.results import GenerateTextResult, GenerateObjectResult, GenerateManyResult
+from llms.types.streams import StreamEvent, ObjectStreamEvent
+from llms.types.tools import Tool
+from llms.cache.base import ResponseCache
+from llms.ratelimit import RateLimiter
+from llms.fallback import FallbackPolicy
+from llms.hooks import Hooks
+from llms.trimming import TrimPolicy
+from llms.singleflight import SingleFlight
+from llms.routing import EndpointRouter
+from llms.concurrency import ConcurrencyLimiter
+
+if TYPE_CHECKING:
+    import numpy as np
+    from llms.pool import AsyncHTTPPool, HTTPPool
+    from llms.cache.semantic import SemanticCache
+    from openai import AsyncOpenAI
+    from anthropic import AsyncAnthropic
+
+
+T = TypeVar("T")
+
+
+class _Forwarded(Generic[T]):
+    # An attribute read from and written to the wrapped AsyncLLM
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: SyncLLM | None, owner: type | None = None) -> T:
+        if instance is None:
+            return self
+        return getattr(instance.client, self.name)
+
+    def __set__(self, instance: SyncLLM, value: T) -> None:
+        setattr(instance.client, self.name, value)
+
+
+class _ProviderClient(_Forwarded[T]):
+    # A provider client of the wrapped AsyncLLM; sync SDK clients are adapted when set
+    def __get__(self, instance: SyncLLM | None, owner: type | None = None) -> T:
+        if instance is None:
+            return self
+        # Built on the loop, so that it uses the loop's shared connection pool
+        return instance.loop.run(_attribute(instance.client, self.name))
+
+    def __set__(self, instance: SyncLLM, value: Any) -> None:
+        setattr(instance.client, self.name, as_async_client(value))
+
+
+class _Pool(_Forwarded["AsyncHTTPPool | ThreadedPool | None"]):
+    # A pool built for sync SDK clients is served through the compatibility shim
+    def __set__(self, instance: SyncLLM, value: AsyncHTTPPool | HTTPPool | None) -> None:
+        if value is not None:
+            from llms.pool import HTTPPool
+            if isinstance(value, HTTPPool):
+                value = ThreadedPool(value)
+        setattr(instance.client, self.name, value)
+
+
+async def _attribute(client: AsyncLLM, name: str) -> Any:
+    return getattr(client, name)
+
 
 class SyncLLM():
-    openai_client: OpenAI
-    anthropic_client: Anthropic
-    fireworks_client: OpenAI
-
-
-    def __init__(self, openai_key: str | None = None, anthropic_key: str | None = None, fireworks_key: str | None = None):
-        self.openai_client = OpenAI(api_key=openai_key)
-        self.anthropic_client = Anthropic(api_key=anthropic_key)
-        self.fireworks_client = OpenAI(api_key=fireworks_key, base_url="https://api.fireworks.ai/inference/v1")
-
-    def generate_text(self, model_name: str, messages: list[ModelMessage]) -> GenerateTextResult:
-        assert model_name in MODEL_MAP, f"Model {model_name} not found"
-        match MODEL_MAP[model_name]:
-            case Provider.OPENAI:
-                return handle_openai_generate_text(openai_client=self.openai_client, model_name=model_name, messages=messages)
-            case Provider.ANTHROPIC:
-                return handle_anthropic_generate_text(anthropic_client=self.anthropic_client, model_name=model_name, messages=messages)
-            case Provider.FIREWORKS:
-                return handle_fireworks_generate_text(fireworks_client=self.fireworks_client, model_name=model_name, messages=messages)
-            case _:
-                raise ValueError("Did not recognize LLM model name")
+    """
+    A blocking client that runs an AsyncLLM on a background event loop. Calls
+    from any number of threads are submitted to one loop, so in-flight requests
+    share the loop's connection pool and wait on it instead of holding an OS
+    thread and connection each.
+
+    Clients default to the process-wide loop (see `llms.loop.shared_loop`), so
+    every SyncLLM in a process shares its connections. Tools, hooks and hedged
+    attempts run as with AsyncLLM: on the loop, with plain tool functions on
+    worker threads.
+
+    The provider clients are the async SDK clients. Sync OpenAI and Anthropic
+    clients assigned to `openai_client`, `anthropic_client` or `fireworks_client`
+    still work: their requests are sent through their own httpx.Client on worker
+    threads (see `llms._sync.compat`).
+    """
+    cache = _Forwarded[ResponseCache | None]()
+    prompt_caching = _Forwarded[bool]()
+    rate_limiter = _Forwarded[RateLimiter | None]()
+    fallback_policy = _Forwarded[FallbackPolicy | None]()
+    hooks = _Forwarded[list[Hooks]]()
+    trim_policy = _Forwarded[TrimPolicy | None]()
+    single_flight = _Forwarded[SingleFlight | None]()
+    router = _Forwarded[EndpointRouter]()
+    concurrency_limiter = _Forwarded[ConcurrencyLimiter | None]()
+    semantic_cache = _Forwarded["SemanticCache | None"]()
+    http_pool = _Pool()
+    openai_client = _ProviderClient["AsyncOpenAI"]()
+    anthropic_client = _ProviderClient["AsyncAnthropic"]()
+    fireworks_client = _ProviderClient["AsyncOpenAI"]()
+
+
+    def __init__(
+        self,
+        openai_key: str | None = None,
+        anthropic_key: str | None = None,
+        fireworks_key: str | None = None,
+        openai_base_url: str | None = None,
+        anthropic_base_url: str | None = None,
+        fireworks_base_url: str = FIREWORKS_BASE_URL,
+        cache: ResponseCache | None = None,
+        prompt_caching: bool = False,
+        rate_limiter: RateLimiter | None = None,
+        fallback_policy: FallbackPolicy | None = None,
+        hooks: list[Hooks] | None = None,
+        http_pool: AsyncHTTPPool | HTTPPool | None = None,
+        trim_policy: TrimPolicy | None = None,
+        single_flight: SingleFlight | None = None,
+        router: EndpointRouter | None = None,
+        concurrency_limiter: ConcurrencyLimiter | None = None,
+        semantic_cache: SemanticCache | None = None,
+        loop: BackgroundLoop | None = None
+    ):
+        """
+        Args:
+            openai_key ... semantic_cache: As for AsyncLLM; `http_pool` defaults to
+                the loop's shared pool, and an HTTPPool is used through
+                `llms._sync.compat.ThreadedPool`
+            loop: Event loop to run on, the process-wide one by default
+        """
+        self.client = AsyncLLM(
+            openai_key=openai_key,
+            anthropic_key=anthropic_key,
+            fireworks_key=fireworks_key,
+            openai_base_url=openai_base_url,
+            anthropic_base_url=anthropic_base_url,
+            fireworks_base_url=fireworks_base_url,
+            cache=cache,
+            prompt_caching=prompt_caching,
+            rate_limiter=rate_limiter,
+            fallback_policy=fallback_policy,
+            hooks=hooks,
+            trim_policy=trim_policy,
+            single_flight=single_flight,
+            router=router,
+            concurrency_limiter=concurrency_limiter,
+            semantic_cache=semantic_cache
+        )
+        self.http_pool = http_pool
+        self.loop = loop or shared_loop()
+
+    def generate_text(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        bypass_cache: bool = False,
+        prompt_cache_key: str | None = None,
+        tools: list[Tool] | None = None,
+        max_steps: int = 8,
+        timeout: float | None = None,
+        deadline: float | None = None
+    ) -> GenerateTextResult:
+        """Generate a completion, see AsyncLLM.generate_text."""
+        return self.loop.run(self.client.generate_text(model_name, messages, bypass_cache, prompt_cache_key, tools, max_steps, timeout, deadline))
+
+    def stream_text(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        prompt_cache_key: str | None = None,
+        timeout: float | None = None,
+        deadline: float | None = None
+    ) -> Iterator[StreamEvent]:
+        """Stream a completion, see AsyncLLM.stream_text."""
+        return self.loop.iterate(self.client.stream_text(model_name, messages, prompt_cache_key, timeout, deadline))
+
+    def generate_object(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        schema: type[BaseModel],
+        bypass_cache: bool = False,
+        prompt_cache_key: str | None = None
+    ) -> GenerateObjectResult:
+        """Generate an instance of `schema`, see AsyncLLM.generate_object."""
+        return self.loop.run(self.client.generate_object(model_name, messages, schema, bypass_cache, prompt_cache_key))
+
+    def stream_object(
+        self,
+        model_name: str,
+        messages: list[ModelMessage] | Conversation,
+        schema: type[BaseModel],
+        prompt_cache_key: str | None = None
+    ) -> Iterator[ObjectStreamEvent]:
+        """Stream an instance of `schema`, see AsyncLLM.stream_object."""
+        return self.loop.iterate(self.client.stream_object(model_name, messages, schema, prompt_cache_key))
+
+    def generate_many(
+        self,
+        requests: Iterable[GenerateTextRequest] | AsyncIterable[GenerateTextRequest],
+        max_concurrency: int = 16,
+        per_provider_limits: dict[Provider, int] | None = None,
+        ordered: bool = False,
+        return_exceptions: bool = False
+    ) -> Iterator[GenerateManyResult]:
+        """Generate text for many requests concurrently on the loop, see AsyncLLM.generate_many."""
+        return self.loop.iterate(self.client.generate_many(requests, max_concurrency, per_provider_limits, ordered, return_exceptions))
+
+    def embed(self, model_name: str, texts: Sequence[str], dimensions: int | None = None, max_concurrency: int = 8) -> np.ndarray:
+        """Embed texts into one float32 array, see AsyncLLM.embed."""
+        return self.loop.run(self.client.embed(model_name, texts, dimensions, max_concurrency))
+
+    def embed_to_file(
+        self,
+        model_name: str,
+        texts: Iterable[str],
+        path: str | Path,
+        count: int | None = None,
+        dimensions: int | None = None,
+        max_concurrency: int = 8
+    ) -> np.memmap:
+        """Embed a corpus into a memory-mapped file, see AsyncLLM.embed_to_file."""
+        return self.loop.run(self.client.embed_to_file(model_name, texts, path, count, dimensions, max_concurrency))
+
+    def submit_batch(self, requests: Iterable[BatchRequest]) -> BatchJob:
+        """Submit requests as a provider batch job, see AsyncLLM.submit_batch."""
+        return self.loop.run(self.client.submit_batch(requests))
+
+    def poll_batch(self, job: BatchJob, wait: bool = False, poll_interval: float = 30.0) -> BatchJob:
+        """Refresh a batch job's status, see AsyncLLM.poll_batch."""
+        return self.loop.run(self.client.poll_batch(job, wait, poll_interval))
+
+    def iter_batch_results(self, job: BatchJob) -> Iterator[BatchResult]:
+        """Stream the results of a finished batch job, see AsyncLLM.iter_batch_results."""
+        return self.loop.iterate(self.client.iter_batch_results(job))
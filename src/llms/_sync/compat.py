@@ -0,0 +1,121 @@
+from __future__ import annotations
+import asyncio
+import sys
+import threading
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Any, TypeVar
+import httpx
+
+if TYPE_CHECKING:
+    from llms.pool import HTTPPool, PoolStats
+
+
+SDKClient = TypeVar("SDKClient")
+
+
+class _ThreadedStream(httpx.AsyncByteStream):
+    # Reads a sync response body chunk by chunk on worker threads
+    def __init__(self, response: httpx.Response):
+        self._response = response
+        self._chunks = response.iter_raw()
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        while (chunk := await asyncio.to_thread(next, self._chunks, None)) is not None:
+            yield chunk
+
+    async def aclose(self) -> None:
+        await asyncio.to_thread(self._response.close)
+
+
+def _close_response(sent: asyncio.Future) -> None:
+    if not sent.cancelled() and sent.exception() is None:
+        sent.result().close()
+
+
+class ThreadedTransport(httpx.AsyncBaseTransport):
+    """
+    Sends an httpx.AsyncClient's requests through a sync httpx.Client on worker
+    threads, so the sync client's transport, event hooks and connections still
+    apply. Each request in flight holds a thread, as it would with the sync client.
+    """
+
+    def __init__(self, http_client: httpx.Client):
+        self.http_client = http_client
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not isinstance(request.stream, httpx.SyncByteStream):
+            # Bodies only an async client can stream, e.g. Anthropic batches, are read first
+            await request.aread()
+        sent = asyncio.ensure_future(asyncio.to_thread(self.http_client.send, request, stream=True))
+        try:
+            response = await asyncio.shield(sent)
+        except asyncio.CancelledError:
+            # The thread runs on; release its connection once it returns
+            sent.add_done_callback(_close_response)
+            raise
+        if response.is_stream_consumed:
+            # Already read, e.g. by an event hook or a mock transport: pass the decoded body on
+            headers = [(name, value) for name, value in response.headers.multi_items() if name.lower() != "content-encoding"]
+            return httpx.Response(response.status_code, headers=headers, content=response.content, extensions=response.extensions)
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_ThreadedStream(response),
+            extensions=response.extensions
+        )
+
+
+def as_async_client(client: Any) -> Any:
+    """
+    The async SDK client for a provider client. Async clients are returned as they
+    are. Sync OpenAI and Anthropic clients, as SyncLLM exposed before it ran on an
+    event loop, become async clients with the same key, endpoint, headers, timeout
+    and retries, which send through the sync client's httpx.Client.
+    """
+    if isinstance(client._client, httpx.AsyncClient):
+        return client
+    options: dict[str, Any] = {
+        "api_key": client.api_key,
+        "base_url": client.base_url,
+        "timeout": client.timeout,
+        "max_retries": client.max_retries,
+        "default_headers": client._custom_headers,
+        "default_query": client._custom_query,
+        "http_client": httpx.AsyncClient(transport=ThreadedTransport(client._client))
+    }
+    if type(client).__module__.startswith("anthropic"):
+        from anthropic import AsyncAnthropic
+        return AsyncAnthropic(auth_token=client.auth_token, **options)
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(organization=client.organization, project=client.project, **options)
+
+
+class ThreadedPool:
+    """
+    An HTTPPool serving async SDK clients, for SyncLLMs given a pool built for
+    sync clients: requests go over its connections and count in its stats, but
+    hold a worker thread each.
+    """
+
+    def __init__(self, pool: HTTPPool):
+        self.pool = pool
+        self._sdk_clients: dict[tuple[type, str | None, str | None], Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def closed(self) -> bool:
+        return self.pool.closed
+
+    def sdk_client(self, sdk_class: type[SDKClient], api_key: str | None, base_url: str | None) -> SDKClient:
+        """Get the async provider client for an SDK, API key and endpoint, building it on first use."""
+        key = (sdk_class, api_key, base_url)
+        with self._lock:
+            client = self._sdk_clients.get(key)
+            if client is None:
+                # AsyncOpenAI is served by the pool's OpenAI client, AsyncAnthropic by its Anthropic one
+                sync_class = getattr(sys.modules[sdk_class.__module__.split(".")[0]], sdk_class.__name__.removeprefix("Async"))
+                client = self._sdk_clients[key] = as_async_client(self.pool.sdk_client(sync_class, api_key, base_url))
+            return client
+
+    def stats(self) -> PoolStats:
+        return self.pool.stats()
@@ -0,0 +1,87 @@
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from typing import Any
+from pydantic import BaseModel
+from llms.models import MODEL_MAP
+from llms.types.enums import Provider
+from llms.types.messages import ModelMessage
+from llms.types.results import GenerateTextResult
+from llms.types.objects import ObjectSchema
+from llms.types.tools import Tool
+from llms.utilities.casting import cast_dict_to_part
+from llms.utilities.params import build_openai_params, build_fireworks_params, build_anthropic_params
+
+
+class CacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+def make_cache_key(
+    model_name: str,
+    messages: list[ModelMessage],
+    tools: list[Tool] | None = None,
+    output_schema: ObjectSchema | None = None
+) -> str:
+    """
+    Build a canonical key for a request: the SHA-256 of the provider request
+    parameters, so two message lists that cast to the same payload share a key.
+    """
+    match MODEL_MAP[model_name]:
+        case Provider.OPENAI:
+            api_params = build_openai_params(model_name, messages, tools=tools, output_schema=output_schema)
+        case Provider.ANTHROPIC:
+            api_params = build_anthropic_params(model_name, messages, tools=tools, output_schema=output_schema)
+        case Provider.FIREWORKS:
+            api_params = build_fireworks_params(model_name, messages, tools=tools, output_schema=output_schema)
+        case _:
+            raise ValueError("Did not recognize LLM model name")
+
+    canonical = json.dumps(api_params, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def dump_result(result: GenerateTextResult) -> str:
+    """Serialize a result for storage."""
+    return result.model_dump_json()
+
+
+def _restore_parts(data: dict[str, Any]) -> dict[str, Any]:
+    data["parts"] = [cast_dict_to_part(part) for part in data["parts"]]
+    for step in data.get("steps") or []:
+        _restore_parts(step["result"])
+    return data
+
+
+def load_result(raw: str) -> GenerateTextResult:
+    """Deserialize a stored result, restoring each Part, those of tool loop steps included, to its own class."""
+    return GenerateTextResult.model_validate(_restore_parts(json.loads(raw)))
+
+
+class ResponseCache(ABC):
+    """
+    Interface for generate_text response caches. Backends implement the blocking
+    `get`/`set`; the async client calls `aget`/`aset`, which backends doing I/O
+    override to keep the event loop free.
+    """
+    stats: CacheStats
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    @abstractmethod
+    def get(self, key: str) -> GenerateTextResult | None:
+        """Return the cached result for `key`, or None on a miss."""
+
+    @abstractmethod
+    def set(self, key: str, result: GenerateTextResult) -> None:
+        """Store `result` under `key`."""
+
+    async def aget(self, key: str) -> GenerateTextResult | None:
+        return self.get(key)
+
+    async def aset(self, key: str, result: GenerateTextResult) -> None:
+        self.set(key, result)
+
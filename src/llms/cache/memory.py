@@ -0,0 +1,54 @@
+import threading
+import time
+from collections import OrderedDict
+from llms.cache.base import ResponseCache
+from llms.types.results import GenerateTextResult
+
+
+class InMemoryCache(ResponseCache):
+    """
+    A thread-safe LRU cache bounded by entry count and, optionally, entry age.
+    Cached results are shared between callers, so treat them as read-only.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float | None = None):
+        """
+        Args:
+            max_size: Maximum number of entries before the least recently used is evicted
+            ttl: Optional time to live of an entry, in seconds
+        """
+        super().__init__()
+        assert max_size > 0, "max_size must be positive"
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, GenerateTextResult]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> GenerateTextResult | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            stored_at, result = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.stats.evictions += 1
+                self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return result
+
+    def set(self, key: str, result: GenerateTextResult) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,312 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+import numpy as np
+from pydantic import BaseModel
+from llms.cache.base import CacheStats, make_cache_key, dump_result, load_result
+from llms.embedders import Embedder
+from llms.types.enums import Role
+from llms.types.messages import ModelMessage
+from llms.types.objects import ObjectSchema
+from llms.types.parts import TextPart
+from llms.types.results import GenerateTextResult
+from llms.types.tools import Tool
+
+
+# Rows allocated per model up front; the matrix doubles as it fills, up to max_size
+_INITIAL_CAPACITY = 1024
+
+class SemanticMatch(BaseModel):
+    text: str
+    score: float
+
+
+class SemanticLookup:
+    """
+    A request's place in the index, returned by `SemanticCache.lookup`: the cached
+    result on a hit, and what `store` needs to add the fresh result on a miss.
+    """
+    __slots__ = ("namespace", "text", "context", "vector", "result")
+
+    def __init__(self, namespace: str, text: str, context: int, vector: np.ndarray, result: GenerateTextResult | None):
+        self.namespace = namespace
+        self.text = text
+        self.context = context
+        self.vector = vector
+        self.result = result
+
+
+class _Namespace:
+    """The index of one model: a contiguous matrix of vectors, one row per entry."""
+
+    def __init__(self, name: str, dimensions: int, capacity: int, file: Path | None):
+        self.name = name
+        self.dimensions = dimensions
+        self.file = file
+        self.size = 0
+        self.vectors = self._allocate(capacity)
+        self.contexts = np.zeros(capacity, dtype=np.int64)
+        self.last_used = np.zeros(capacity, dtype=np.int64)
+        self.texts: list[str] = []
+        # None marks a result still in the database
+        self.results: list[GenerateTextResult | None] = []
+
+    @property
+    def capacity(self) -> int:
+        return len(self.vectors)
+
+    def _allocate(self, capacity: int) -> np.ndarray:
+        if self.file is None:
+            vectors = np.zeros((capacity, self.dimensions), dtype=np.float32)
+            if self.size:
+                vectors[:self.size] = self.vectors[:self.size]
+            return vectors
+        # Rows are laid out one after another, so growing the file keeps the rows already in it
+        needed = capacity * self.dimensions * 4
+        with open(self.file, "ab") as file:
+            if file.tell() < needed:
+                file.truncate(needed)
+        return np.memmap(self.file, dtype=np.float32, mode="r+", shape=(capacity, self.dimensions))
+
+    def grow(self, capacity: int) -> None:
+        if isinstance(self.vectors, np.memmap):
+            self.vectors.flush()
+        self.vectors = self._allocate(capacity)
+        for name in ("contexts", "last_used"):
+            grown = np.zeros(capacity, dtype=np.int64)
+            grown[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, grown)
+
+    def top(self, vector: np.ndarray, k: int, context: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """The rows of the `k` most similar entries and their cosine similarities, best first."""
+        scores = self.vectors[:self.size] @ vector
+        if context is not None:
+            scores = np.where(self.contexts[:self.size] == context, scores, -np.inf)
+        k = min(k, self.size)
+        rows = np.argpartition(scores, -k)[-k:] if k < self.size else np.arange(self.size)
+        rows = rows[np.argsort(scores[rows])[::-1]]
+        return rows, scores[rows]
+
+
+class SemanticCache:
+    """
+    A cache that answers requests whose final user message is close in meaning to
+    one answered before, e.g. the same support question worded differently.
+
+    The final user message is embedded and compared by cosine similarity with the
+    cached ones of the same model, in one matrix product over a contiguous NumPy
+    matrix per model. A cached reply is reused when its similarity reaches
+    `threshold` and everything before the final message (system prompt, earlier
+    turns, tools, output schema) is identical. Both depend on each other: a
+    threshold only means something for the embedder it was tuned on, and a
+    reused reply to a different question is a wrong answer, so neither has a
+    default. Each model holds at most `max_size`
+    entries, evicting the least recently used.
+
+    With a `path`, the vectors live in memory-mapped files and the replies in a
+    SQLite database in that directory, so a restarted process reopens the index
+    without embedding anything again. One process should own a directory at a time.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        threshold: float,
+        max_size: int = 10_000,
+        path: str | Path | None = None
+    ):
+        """
+        Args:
+            embedder: Embedder for user messages, ideally a semantic embedding model
+            threshold: Minimum cosine similarity for a cached reply to be reused, tuned for `embedder`
+            max_size: Maximum entries per model before the least recently used is evicted
+            path: Optional directory persisting the index, created if missing
+        """
+        assert max_size > 0, "max_size must be positive"
+        assert 0.0 < threshold <= 1.0, "threshold must be in (0, 1]"
+        self.embedder = embedder
+        self.threshold = threshold
+        self.max_size = max_size
+        self.path = Path(path) if path is not None else None
+        self.stats = CacheStats()
+        self._namespaces: dict[str, _Namespace] = {}
+        self._tick = 0
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        if self.path is not None:
+            self._open()
+
+    def _open(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Every use of the connection holds the cache's lock
+        self._connection = sqlite3.connect(self.path / "index.sqlite", check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "namespace TEXT NOT NULL, row INTEGER NOT NULL, context INTEGER NOT NULL, last_used INTEGER NOT NULL, "
+            "text TEXT NOT NULL, result TEXT NOT NULL, PRIMARY KEY (namespace, row))"
+        )
+        stored = self._connection.execute("SELECT value FROM meta WHERE key = 'dimensions'").fetchone()
+        if stored is None:
+            self._connection.execute("INSERT INTO meta VALUES ('dimensions', ?)", (str(self.embedder.dimensions),))
+        elif int(stored[0]) != self.embedder.dimensions:
+            raise ValueError(f"Index at {self.path} has {stored[0]} dimensions, the embedder {self.embedder.dimensions}")
+
+        rows = self._connection.execute("SELECT namespace, row, context, last_used, text FROM entries ORDER BY namespace, row").fetchall()
+        for name, row, context, last_used, text in rows:
+            namespace = self._namespace(name, at_least=row + 1)
+            namespace.contexts[row] = context
+            namespace.last_used[row] = last_used
+            namespace.texts.append(text)
+            namespace.results.append(None)
+            namespace.size = row + 1
+            self._tick = max(self._tick, last_used)
+
+    def _namespace(self, name: str, at_least: int = 1) -> _Namespace:
+        namespace = self._namespaces.get(name)
+        if namespace is None:
+            file = None
+            if self.path is not None:
+                file = self.path / f"{hashlib.sha256(name.encode('utf-8')).hexdigest()[:16]}.f32"
+            capacity = min(self.max_size, _INITIAL_CAPACITY)
+            if file is not None and file.exists():
+                capacity = max(capacity, file.stat().st_size // (self.embedder.dimensions * 4))
+            namespace = self._namespaces[name] = _Namespace(name, self.embedder.dimensions, max(capacity, at_least), file)
+        elif namespace.capacity < at_least:
+            namespace.grow(max(at_least, min(self.max_size, namespace.capacity * 2)))
+        return namespace
+
+    def _request(self, model_name: str, messages: Sequence[ModelMessage], tools: list[Tool] | None, output_schema: ObjectSchema | None) -> tuple[str, int] | None:
+        if not messages or messages[-1].role != Role.USER:
+            return None
+        content = messages[-1].content
+        if isinstance(content, str):
+            text = content
+        elif all(isinstance(part, TextPart) for part in content):
+            text = "\n".join(part.text for part in content)
+        else:
+            # Images and files are not embedded, so their requests are never matched
+            return None
+        # Everything but the final message must match exactly
+        key = make_cache_key(model_name, list(messages[:-1]), tools, output_schema)
+        return text, int(key[:16], 16) - 2 ** 63
+
+    def lookup(
+        self,
+        model_name: str,
+        messages: Sequence[ModelMessage],
+        tools: list[Tool] | None = None,
+        output_schema: ObjectSchema | None = None
+    ) -> SemanticLookup | None:
+        """
+        Find a cached reply to a request, or None if the request cannot be cached
+        (its final message is not a text user message).
+        """
+        request = self._request(model_name, messages, tools, output_schema)
+        if request is None:
+            return None
+        text, context = request
+        return self._search(model_name, text, context, self.embedder.embed([text])[0])
+
+    async def alookup(
+        self,
+        model_name: str,
+        messages: Sequence[ModelMessage],
+        tools: list[Tool] | None = None,
+        output_schema: ObjectSchema | None = None
+    ) -> SemanticLookup | None:
+        request = self._request(model_name, messages, tools, output_schema)
+        if request is None:
+            return None
+        text, context = request
+        vector = (await self.embedder.aembed([text]))[0]
+        if self._connection is None:
+            return self._search(model_name, text, context, vector)
+        return await asyncio.to_thread(self._search, model_name, text, context, vector)
+
+    def _search(self, model_name: str, text: str, context: int, vector: np.ndarray) -> SemanticLookup:
+        with self._lock:
+            namespace = self._namespaces.get(model_name)
+            if namespace is not None and namespace.size:
+                rows, scores = namespace.top(vector, 1, context)
+                if scores[0] >= self.threshold:
+                    row = int(rows[0])
+                    self._tick += 1
+                    namespace.last_used[row] = self._tick
+                    result = namespace.results[row]
+                    if self._connection is not None:
+                        self._connection.execute(
+                            "UPDATE entries SET last_used = ? WHERE namespace = ? AND row = ?", (self._tick, model_name, row)
+                        )
+                        if result is None:
+                            stored = self._connection.execute(
+                                "SELECT result FROM entries WHERE namespace = ? AND row = ?", (model_name, row)
+                            ).fetchone()
+                            result = namespace.results[row] = load_result(stored[0])
+                    self.stats.hits += 1
+                    return SemanticLookup(model_name, text, context, vector, result)
+            self.stats.misses += 1
+            return SemanticLookup(model_name, text, context, vector, None)
+
+    def store(self, lookup: SemanticLookup, result: GenerateTextResult) -> None:
+        """Add the reply to a request that `lookup` missed."""
+        with self._lock:
+            namespace = self._namespace(lookup.namespace)
+            if namespace.size < self.max_size:
+                row = namespace.size
+                if row == namespace.capacity:
+                    namespace.grow(min(self.max_size, namespace.capacity * 2))
+                namespace.size += 1
+                namespace.texts.append(lookup.text)
+                namespace.results.append(result)
+            else:
+                row = int(np.argmin(namespace.last_used[:namespace.size]))
+                namespace.texts[row] = lookup.text
+                namespace.results[row] = result
+                self.stats.evictions += 1
+
+            self._tick += 1
+            namespace.vectors[row] = lookup.vector
+            namespace.contexts[row] = lookup.context
+            namespace.last_used[row] = self._tick
+            if self._connection is not None:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO entries (namespace, row, context, last_used, text, result) VALUES (?, ?, ?, ?, ?, ?)",
+                    (lookup.namespace, row, lookup.context, self._tick, lookup.text, dump_result(result))
+                )
+
+    async def astore(self, lookup: SemanticLookup, result: GenerateTextResult) -> None:
+        if self._connection is None:
+            self.store(lookup, result)
+        else:
+            await asyncio.to_thread(self.store, lookup, result)
+
+    def search(self, model_name: str, text: str, k: int = 5) -> list[SemanticMatch]:
+        """The `k` cached user messages of a model most similar to `text`, whatever their context."""
+        vector = self.embedder.embed([text])[0]
+        with self._lock:
+            namespace = self._namespaces.get(model_name)
+            if namespace is None or not namespace.size:
+                return []
+            rows, scores = namespace.top(vector, k)
+            return [SemanticMatch(text=namespace.texts[row], score=float(score)) for row, score in zip(rows, scores)]
+
+    def flush(self) -> None:
+        """Write memory-mapped vectors to disk."""
+        with self._lock:
+            for namespace in self._namespaces.values():
+                if isinstance(namespace.vectors, np.memmap):
+                    namespace.vectors.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __len__(self) -> int:
+        return sum(namespace.size for namespace in self._namespaces.values())
@@ -0,0 +1,99 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from llms.cache.base import ResponseCache, dump_result, load_result
+from llms.types.results import GenerateTextResult
+
+
+class SQLiteCache(ResponseCache):
+    """
+    A persistent cache stored in a SQLite database. The database runs in WAL mode
+    so several processes can share one file. Entries are bounded by age and,
+    optionally, by count (evicting the least recently read). Stats are per process.
+    """
+
+    def __init__(self, path: str | Path, ttl: float | None = None, max_size: int | None = None, busy_timeout: float = 30.0):
+        """
+        Args:
+            path: Location of the database file, created if missing
+            ttl: Optional time to live of an entry, in seconds
+            max_size: Optional maximum number of entries
+            busy_timeout: Seconds to wait for another process's write lock
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.busy_timeout = busy_timeout
+        # sqlite3 connections are not shareable across threads
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _count(self, stat: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self.stats, stat, getattr(self.stats, stat) + amount)
+
+    def get(self, key: str) -> GenerateTextResult | None:
+        connection = self._connection()
+        row = connection.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+
+        value, created_at = row
+        now = time.time()
+        if self.ttl is not None and now - created_at > self.ttl:
+            deleted = connection.execute("DELETE FROM responses WHERE key = ? AND created_at = ?", (key, created_at)).rowcount
+            self._count("evictions", deleted)
+            self._count("misses")
+            return None
+
+        # Access times only drive size-based eviction
+        if self.max_size is not None:
+            connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        self._count("hits")
+        return load_result(value)
+
+    def set(self, key: str, result: GenerateTextResult) -> None:
+        connection = self._connection()
+        now = time.time()
+        connection.execute(
+            "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (key, dump_result(result), now, now)
+        )
+
+        if self.max_size is not None:
+            deleted = connection.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed_at ASC "
+                "LIMIT max(0, (SELECT COUNT(*) FROM responses) - ?))",
+                (self.max_size,)
+            ).rowcount
+            self._count("evictions", deleted)
+
+    async def aget(self, key: str) -> GenerateTextResult | None:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, result: GenerateTextResult) -> None:
+        await asyncio.to_thread(self.set, key, result)
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
@@ -0,0 +1,312 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from typing import Any, TextIO
+from llms.types.batches import BatchRequest, BatchResult
+from llms.types.enums import Role
+from llms.types.messages import SystemModelMessage, UserModelMessage, AssistantModelMessage, ToolModelMessage, ModelMessage
+
+
+MESSAGE_TYPES: dict[Role, type[ModelMessage]] = {
+    Role.SYSTEM: SystemModelMessage,
+    Role.USER: UserModelMessage,
+    Role.ASSISTANT: AssistantModelMessage,
+    Role.TOOL: ToolModelMessage
+}
+
+
+def parse_record(line: str, index: int) -> BatchRequest:
+    """Parse one input line into a BatchRequest; raises ValueError for invalid records."""
+    record: dict[str, Any] = json.loads(line)
+    model_name = record.get("model_name") or record.get("model")
+    if not model_name:
+        raise ValueError("Record has no model_name")
+    messages = [MESSAGE_TYPES[Role(message["role"])].model_validate(message) for message in record.get("messages") or []]
+    return BatchRequest(custom_id=str(record.get("custom_id", index)), model_name=model_name, messages=messages)
+
+
+class Checkpoint:
+    """
+    The records a run has finished, as lines of `<input line> <output size>`, with
+    ` failed` appended for records that failed. Each entry is written after its
+    output line, so on resume the output is cut back to the last recorded size
+    and every finished attempt appears in it exactly once. Failed records are not
+    `done`: a resumed run retries them, and their new line supersedes the failed one.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: set[int] = set()
+        self.output_size = 0
+        if os.path.exists(path):
+            self._load()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _load(self) -> None:
+        with open(self.path, "rb") as file:
+            data = file.read()
+        # A crash may leave the last entry half-written
+        complete = data[:data.rfind(b"\n") + 1]
+        for entry in complete.decode("utf-8").splitlines():
+            index, output_size, *failed = entry.split()
+            if failed:
+                self.done.discard(int(index))
+            else:
+                self.done.add(int(index))
+            self.output_size = int(output_size)
+        if len(complete) < len(data):
+            with open(self.path, "r+b") as file:
+                file.truncate(len(complete))
+
+    def record(self, index: int, output_size: int, failed: bool = False) -> None:
+        if not failed:
+            self.done.add(index)
+        self.output_size = output_size
+        self._file.write(f"{index} {output_size}{' failed' if failed else ''}\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class Progress:
+    """Throughput and ETA of a run, printed to stderr at most every `interval` seconds."""
+
+    def __init__(self, total: int | None, already_done: int, interval: float = 1.0, stream: TextIO | None = None):
+        self.total = total
+        self.already_done = already_done
+        self.completed = 0
+        self.failed = 0
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self._started = time.monotonic()
+        self._printed = 0.0
+        # Overwrite one status line on a terminal, append lines to logs
+        self._end = "\r" if self.stream.isatty() else "\n"
+
+    def update(self, failed: bool) -> None:
+        self.completed += 1
+        self.failed += failed
+        now = time.monotonic()
+        if now - self._printed >= self.interval:
+            self._printed = now
+            self.stream.write(self.line() + self._end)
+            self.stream.flush()
+
+    def line(self) -> str:
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        rate = self.completed / elapsed
+        done = self.already_done + self.completed
+        line = f"{done}/{self.total if self.total is not None else '?'} records, {self.failed} failed, {rate:.1f} records/s"
+        if self.total is not None and rate > 0:
+            line += f", ETA {_format_seconds((self.total - done) / rate)}"
+        return line
+
+    def finish(self) -> None:
+        self.stream.write(self.line() + "\n")
+        self.stream.flush()
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+def _count_records(path: str) -> int:
+    count = 0
+    with open(path, "rb") as file:
+        for line in file:
+            count += bool(line.strip())
+    return count
+
+
+def _iter_records(path: str) -> Iterator[tuple[int, str]]:
+    with open(path, encoding="utf-8") as file:
+        for index, line in enumerate(file):
+            if line.strip():
+                yield index, line
+
+
+def _worker(tasks: multiprocessing.Queue, results: multiprocessing.Queue, concurrency: int, client_options: dict[str, Any]) -> None:
+    asyncio.run(_run_worker(tasks, results, concurrency, client_options))
+
+
+async def _run_worker(tasks: multiprocessing.Queue, results: multiprocessing.Queue, concurrency: int, client_options: dict[str, Any]) -> None:
+    from llms._async.client import AsyncLLM
+    from llms.pool import AsyncHTTPPool, PoolConfig
+
+    pool = AsyncHTTPPool(PoolConfig(max_connections=concurrency, max_keepalive_connections=concurrency))
+    client = AsyncLLM(**client_options, http_pool=pool)
+    # generate_many numbers requests in the order it pulls them
+    lines: dict[int, int] = {}
+    pulled = 0
+
+    async def requests() -> AsyncIterator[BatchRequest]:
+        nonlocal pulled
+        while True:
+            task = await asyncio.to_thread(tasks.get)
+            if task is None:
+                return
+            index, line = task
+            try:
+                request = parse_record(line, index)
+            except Exception as error:
+                results.put((index, True, BatchResult(custom_id=str(index), error=f"Invalid record: {error}").model_dump_json()))
+                continue
+            lines[pulled] = index
+            pulled += 1
+            yield request
+
+    try:
+        async for outcome in client.generate_many(requests(), max_concurrency=concurrency, return_exceptions=True):
+            batch_result = BatchResult(
+                custom_id=outcome.request.custom_id,
+                result=outcome.result,
+                error=None if outcome.error is None else f"{type(outcome.error).__name__}: {outcome.error}"
+            )
+            results.put((lines.pop(outcome.index), outcome.error is not None, batch_result.model_dump_json()))
+    finally:
+        await pool.aclose()
+
+
+def run(
+    input_path: str,
+    output_path: str,
+    checkpoint_path: str | None = None,
+    workers: int = 1,
+    concurrency: int = 16,
+    client_options: dict[str, Any] | None = None,
+    progress_interval: float = 1.0
+) -> Progress:
+    """
+    Run every record of `input_path` that an earlier run has not completed,
+    failed ones included, across `workers` processes with up to `concurrency`
+    requests in flight each.
+
+    Args:
+        input_path: JSONL file of records
+        output_path: JSONL file the BatchResults are appended to
+        checkpoint_path: Checkpoint file, `<output_path>.checkpoint` by default
+        workers: Number of worker processes
+        concurrency: Requests in flight per worker
+        client_options: Keyword arguments for each worker's AsyncLLM
+        progress_interval: Seconds between progress lines
+
+    Returns:
+        The run's Progress
+    """
+    checkpoint = Checkpoint(checkpoint_path or output_path + ".checkpoint")
+    # Drop output written after the last checkpointed record
+    output = open(output_path, "ab")
+    output.truncate(checkpoint.output_size)
+    output.seek(checkpoint.output_size)
+
+    progress = Progress(_count_records(input_path), len(checkpoint.done), progress_interval)
+    context = multiprocessing.get_context()
+    # Bounded, so the input is read only as fast as the workers take it
+    tasks: multiprocessing.Queue = context.Queue(maxsize=workers * concurrency * 2)
+    results: multiprocessing.Queue = context.Queue()
+    processes = [
+        context.Process(target=_worker, args=(tasks, results, concurrency, client_options or {}), daemon=True)
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    submitted = 0
+    feeding = True
+
+    def feed() -> None:
+        nonlocal submitted, feeding
+        for index, line in _iter_records(input_path):
+            if index not in checkpoint.done:
+                tasks.put((index, line))
+                submitted += 1
+        for _ in processes:
+            tasks.put(None)
+        feeding = False
+
+    feeder = threading.Thread(target=feed, name="llms-run-feeder", daemon=True)
+    feeder.start()
+
+    received = 0
+    try:
+        while feeding or received < submitted:
+            try:
+                index, failed, payload = results.get(timeout=0.5)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    raise RuntimeError("All workers exited before the run finished")
+                continue
+            received += 1
+            output.write(payload.encode("utf-8") + b"\n")
+            output.flush()
+            checkpoint.record(index, output.tell(), failed)
+            progress.update(failed)
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        output.close()
+        checkpoint.close()
+    progress.finish()
+    return progress
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point of the `llms` console script."""
+    parser = argparse.ArgumentParser(prog="llms")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser(
+        "run",
+        help="Run a JSONL file of requests, resuming any earlier run",
+        description=(
+            "Run each record ({custom_id, model_name, messages}; custom_id defaults to the line number) "
+            "and append its BatchResult to OUTPUT as it completes. Completed records are kept in a "
+            "checkpoint file, so running the same command again resumes an interrupted run."
+        )
+    )
+    run_parser.add_argument("input", help="JSONL file of {custom_id, model_name, messages} records")
+    run_parser.add_argument("-o", "--output", required=True, help="JSONL file the results are appended to")
+    run_parser.add_argument("--checkpoint", help="Checkpoint file (default: OUTPUT.checkpoint)")
+    run_parser.add_argument("--workers", type=int, default=min(os.cpu_count() or 1, 4), help="Worker processes")
+    run_parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight per worker")
+    run_parser.add_argument("--progress-interval", type=float, default=1.0, help="Seconds between progress lines")
+    for provider in ("openai", "anthropic", "fireworks"):
+        run_parser.add_argument(f"--{provider}-key", default=os.environ.get(f"{provider.upper()}_API_KEY"))
+        run_parser.add_argument(f"--{provider}-base-url")
+
+    args = parser.parse_args(argv)
+    client_options: dict[str, Any] = {}
+    for provider in ("openai", "anthropic", "fireworks"):
+        client_options[f"{provider}_key"] = getattr(args, f"{provider}_key")
+        if getattr(args, f"{provider}_base_url"):
+            client_options[f"{provider}_base_url"] = getattr(args, f"{provider}_base_url")
+
+    try:
+        progress = run(
+            args.input,
+            args.output,
+            checkpoint_path=args.checkpoint,
+            workers=args.workers,
+            concurrency=args.concurrency,
+            client_options=client_options,
+            progress_interval=args.progress_interval
+        )
+    except KeyboardInterrupt:
+        print("\nInterrupted; run the same command again to resume", file=sys.stderr)
+        return 130
+    return 1 if progress.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from pydantic import BaseModel
+from llms.models import MODEL_MAP
+
+
+class AdaptiveLimit(BaseModel):
+    """
+    How a ConcurrencyLimiter adapts the number of requests it lets into flight.
+
+    While requests succeed with healthy latency and the limit is in use, it grows
+    by `increase` per limit's worth of completed requests (about once per round
+    trip). A 429, 5xx or connection error, or `latency_spikes` requests in a row
+    slower than `latency_tolerance` times the recent average, cuts it by
+    `decrease_factor`; requests that were already in flight at the cut do not
+    cut it again. Every latency enters the average, so a lasting rise becomes
+    the new normal after one cut instead of pinning the limit at `min_limit`.
+
+    LLM latency grows with the reply, so when the output tokens are known the
+    latency compared is per output token, with replies shorter than
+    `latency_min_tokens` counted as that long since their time goes into
+    reading the prompt.
+    """
+    initial_limit: int = 8
+    min_limit: int = 1
+    max_limit: int = 256
+    increase: float = 1.0
+    decrease_factor: float = 0.5
+    # None disables cuts on latency
+    latency_tolerance: float | None = 3.0
+    latency_spikes: int = 3
+    latency_min_tokens: int = 32
+    # Weight of each new latency in the moving average
+    latency_decay: float = 0.05
+
+
+class ConcurrencyStats(BaseModel):
+    limit: int
+    in_flight: int
+    queued: int
+    requests: int
+    decreases: int
+    # Moving average and maximum of the time requests waited for a slot, in seconds
+    queue_delay: float
+    max_queue_delay: float
+    # Moving average of latencies, in seconds, or seconds per output token when those are reported
+    latency: float | None
+
+
+class Permit:
+    """A slot held by one request, returned with `ConcurrencyLimiter.release`."""
+    __slots__ = ("key", "started", "saturated")
+
+    def __init__(self, key: str, started: float, saturated: bool):
+        self.key = key
+        self.started = started
+        # Whether the limit was in use when the request started; only those may grow it
+        self.saturated = saturated
+
+
+class _Waiter:
+    __slots__ = ("loop", "future", "granted")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.future = loop.create_future()
+        self.granted = False
+
+    def wake(self) -> None:
+        self.granted = True
+        self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class _LimitState:
+    __slots__ = ("limit", "in_flight", "waiters", "requests", "decreases", "decreased_at", "queue_delay", "max_queue_delay", "latency", "spikes")
+
+    def __init__(self, initial_limit: int):
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+        self.waiters: deque[_Waiter] = deque()
+        self.requests = 0
+        self.decreases = 0
+        self.decreased_at = 0.0
+        self.queue_delay = 0.0
+        self.max_queue_delay = 0.0
+        self.latency: float | None = None
+        # Consecutive requests slower than the tolerance
+        self.spikes = 0
+
+
+class ConcurrencyLimiter:
+    """
+    Adaptive (AIMD) limit on the requests in flight, with one limit per provider
+    and model. Requests over the limit wait in FIFO order, suspending the task in
+    `acquire_async`; a limiter may be shared between clients on different event
+    loops.
+    """
+
+    def __init__(self, policy: AdaptiveLimit | None = None):
+        self.policy = policy or AdaptiveLimit()
+        self._states: dict[str, _LimitState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, key: str) -> _LimitState:
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _LimitState(self.policy.initial_limit)
+        return state
+
+    def _key(self, model_name: str) -> str:
+        provider = MODEL_MAP.get(model_name)
+        return f"{provider.value}/{model_name}" if provider is not None else model_name
+
+    def _try_acquire(self, key: str) -> tuple[Permit | None, float]:
+        state = self._state(key)
+        now = time.monotonic()
+        state.requests += 1
+        if state.in_flight < int(state.limit) and not state.waiters:
+            state.in_flight += 1
+            state.queue_delay -= 0.1 * state.queue_delay
+            # Requests using less than half the limit say nothing about whether it is too low
+            return Permit(key, now, state.in_flight * 2 >= state.limit), now
+        return None, now
+
+    async def acquire_async(self, model_name: str) -> Permit:
+        """Take a slot for a request to `model_name`, suspending the task until one is free."""
+        key = self._key(model_name)
+        with self._lock:
+            permit, queued_at = self._try_acquire(key)
+            if permit is not None:
+                return permit
+            waiter = _Waiter(asyncio.get_running_loop())
+            self._states[key].waiters.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                state = self._states[key]
+                if not waiter.granted:
+                    state.waiters.remove(waiter)
+                    raise
+                # The slot was handed over as the task was cancelled; pass it on
+                state.in_flight -= 1
+                self._wake(state)
+            raise
+        return self._granted(key, queued_at)
+
+    def _granted(self, key: str, queued_at: float) -> Permit:
+        now = time.monotonic()
+        delay = now - queued_at
+        with self._lock:
+            state = self._states[key]
+            state.queue_delay += 0.1 * (delay - state.queue_delay)
+            state.max_queue_delay = max(state.max_queue_delay, delay)
+        # A queued request found the whole limit in use
+        return Permit(key, now, True)
+
+    def release(self, permit: Permit, seconds: float | None, overloaded: bool = False, output_tokens: int | None = None) -> None:
+        """
+        Return a slot and adapt the limit to the outcome. `seconds` is the request's
+        latency, None for requests that tell nothing about the provider's load
+        (cancelled or rejected as invalid); `overloaded` marks 429s, 5xx responses
+        and connection errors. `output_tokens` is the reply's length, if known; a
+        caller should report it for all of a model's requests or for none.
+        """
+        policy = self.policy
+        sample = seconds
+        if seconds is not None and output_tokens is not None:
+            sample = seconds / max(output_tokens, policy.latency_min_tokens)
+        with self._lock:
+            state = self._states[permit.key]
+            state.in_flight -= 1
+            spike = (
+                sample is not None
+                and policy.latency_tolerance is not None
+                and state.latency is not None
+                and sample > policy.latency_tolerance * state.latency
+            )
+            if sample is not None:
+                state.spikes = state.spikes + 1 if spike else 0
+                state.latency = sample if state.latency is None else state.latency + policy.latency_decay * (sample - state.latency)
+
+            if overloaded or state.spikes >= policy.latency_spikes:
+                state.spikes = 0
+                # One cut per congestion event: requests sent before the last cut saw the old limit
+                if permit.started >= state.decreased_at:
+                    state.limit = max(float(policy.min_limit), state.limit * policy.decrease_factor)
+                    state.decreased_at = time.monotonic()
+                    state.decreases += 1
+            elif sample is not None and not spike and permit.saturated:
+                state.limit = min(float(policy.max_limit), state.limit + policy.increase / state.limit)
+            self._wake(state)
+
+    def _wake(self, state: _LimitState) -> None:
+        # Hand free slots straight to the oldest waiters
+        while state.waiters and state.in_flight < int(state.limit):
+            state.in_flight += 1
+            state.waiters.popleft().wake()
+
+    def stats(self) -> dict[str, ConcurrencyStats]:
+        """The current limit, load and queueing delay per `provider/model`."""
+        with self._lock:
+            return {
+                key: ConcurrencyStats(
+                    limit=int(state.limit),
+                    in_flight=state.in_flight,
+                    queued=len(state.waiters),
+                    requests=state.requests,
+                    decreases=state.decreases,
+                    queue_delay=state.queue_delay,
+                    max_queue_delay=state.max_queue_delay,
+                    latency=state.latency
+                )
+                for key, state in self._states.items()
+            }
@@ -0,0 +1,106 @@
+import threading
+from collections.abc import Iterable, Sequence
+from typing import Any, overload
+from llms.types.enums import Role
+from llms.types.messages import ModelMessage, AssistantModelMessage
+from llms.types.results import GenerateTextResult
+from llms.utilities.casting import cast_messages_to_openai, cast_message_to_anthropic
+from llms.utilities.tokens import estimate_model_message_tokens
+
+
+class Conversation(Sequence[ModelMessage]):
+    """
+    A multi-turn message history that keeps each provider's request format up to
+    date incrementally. Every message is cast at most once per provider, when a
+    request first needs it, so a turn costs O(new messages) instead of re-casting
+    the whole history. Messages must not be changed once added.
+
+    Pass a Conversation wherever `messages` is accepted; generate_text and
+    stream_text append the reply to it. With `server_state`, OpenAI models go
+    through the Responses API with `previous_response_id`, so only the messages
+    the server has not stored yet are uploaded.
+    """
+
+    def __init__(self, messages: Iterable[ModelMessage] = (), server_state: bool = False):
+        """
+        Args:
+            messages: Initial messages, e.g. the system prompt
+            server_state: Keep the history server-side where the provider supports it
+        """
+        self.server_state = server_state
+        self.previous_response_id: str | None = None
+        self._messages: list[ModelMessage] = list(messages)
+        self._openai_messages: list[dict[str, Any]] = []
+        self._openai_cast = 0
+        self._anthropic_messages: list[dict[str, Any]] = []
+        self._anthropic_system: str | None = None
+        self._anthropic_cast = 0
+        self._estimated_tokens = 0
+        self._estimated = 0
+        # The leading messages held server-side under previous_response_id
+        self._stored = 0
+        # Hedged attempts may build requests from the same conversation concurrently
+        self._lock = threading.Lock()
+
+    @overload
+    def __getitem__(self, index: int) -> ModelMessage: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[ModelMessage]: ...
+    def __getitem__(self, index: int | slice) -> ModelMessage | list[ModelMessage]:
+        return self._messages[index]
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def append(self, message: ModelMessage) -> None:
+        with self._lock:
+            self._messages.append(message)
+
+    def extend(self, messages: Iterable[ModelMessage]) -> None:
+        with self._lock:
+            self._messages.extend(messages)
+
+    def add_result(self, result: GenerateTextResult) -> AssistantModelMessage:
+        """Append a generated reply as the assistant's turn."""
+        message = AssistantModelMessage(content=result.parts)
+        with self._lock:
+            self._messages.append(message)
+            if result.stored_response_id is not None:
+                self.previous_response_id = result.stored_response_id
+                self._stored = len(self._messages)
+        return message
+
+    def openai_messages(self) -> list[dict[str, Any]]:
+        """The history in OpenAI chat format, casting only messages added since the last call."""
+        with self._lock:
+            # Tool results cast to several messages, so progress is counted in input messages
+            self._openai_messages.extend(cast_messages_to_openai(self._messages[self._openai_cast:]))
+            self._openai_cast = len(self._messages)
+            return list(self._openai_messages)
+
+    def anthropic_messages(self) -> tuple[str | None, list[dict[str, Any]]]:
+        """
+        The system prompt and the remaining history in Anthropic format, casting only
+        messages added since the last call.
+        """
+        with self._lock:
+            for message in self._messages[self._anthropic_cast:]:
+                if message.role != Role.SYSTEM:
+                    self._anthropic_messages.append(cast_message_to_anthropic(message))
+                elif self._anthropic_system is None:
+                    self._anthropic_system = message.content
+            self._anthropic_cast = len(self._messages)
+            return self._anthropic_system, list(self._anthropic_messages)
+
+    def estimated_tokens(self) -> int:
+        """The estimated prompt tokens of the history, estimating only messages added since the last call."""
+        with self._lock:
+            for message in self._messages[self._estimated:]:
+                self._estimated_tokens += estimate_model_message_tokens(message)
+            self._estimated = len(self._messages)
+            return self._estimated_tokens
+
+    def unstored_messages(self) -> tuple[str | None, list[ModelMessage]]:
+        """The id of the last stored response and the messages added after it."""
+        with self._lock:
+            return self.previous_response_id, self._messages[self._stored:]
@@ -0,0 +1,71 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+# The absolute time.monotonic() deadline of the call running in this context
+_deadline: ContextVar[float | None] = ContextVar("llms_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """A call ran out of its `timeout`/`deadline` budget before it completed."""
+
+
+def resolve_deadline(timeout: float | None, deadline: float | None) -> float | None:
+    """
+    The earliest of `deadline` (a time.monotonic() timestamp), now plus `timeout`
+    seconds, and the deadline of any call this one runs inside.
+    """
+    candidates = [candidate for candidate in (deadline, _deadline.get()) if candidate is not None]
+    if timeout is not None:
+        candidates.append(time.monotonic() + timeout)
+    return min(candidates) if candidates else None
+
+
+@contextmanager
+def deadline_scope(deadline: float | None) -> Iterator[None]:
+    """Make `deadline` the budget of everything run inside the block; None leaves it as it was."""
+    if deadline is None:
+        yield
+        return
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def no_deadline() -> Iterator[None]:
+    """Run the block without the current deadline, e.g. work shared by callers with different budgets."""
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> float | None:
+    """The deadline of the call running in this context, if any."""
+    return _deadline.get()
+
+
+def remaining() -> float | None:
+    """
+    Seconds left before the current deadline, or None without one. Raises
+    DeadlineExceeded once the budget is spent.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded("Deadline exceeded")
+    return left
+
+
+def expired() -> bool:
+    """Whether the current deadline has passed."""
+    deadline = _deadline.get()
+    return deadline is not None and time.monotonic() >= deadline
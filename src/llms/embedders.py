@@ -0,0 +1,67 @@
+import re
+import zlib
+from abc import ABC, abstractmethod
+import numpy as np
+
+
+_WORD = re.compile(r"\w+")
+
+
+class Embedder(ABC):
+    """
+    Turns texts into vectors for similarity search. Backends implement the
+    blocking `embed`; backends calling a remote API override `aembed` to keep the
+    event loop free.
+    """
+    dimensions: int
+
+    @abstractmethod
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """A float32 matrix with one L2-normalized row per text."""
+
+    async def aembed(self, texts: list[str]) -> np.ndarray:
+        return self.embed(texts)
+
+
+class HashingEmbedder(Embedder):
+    """
+    A local embedder for offline use: words, word pairs and character trigrams of
+    each word are hashed into `dimensions` signed buckets. It measures shared
+    wording, not meaning: questions differing in one word that matters ("with" and
+    "without", two amounts or two cities) still score 0.7-0.85. With a
+    SemanticCache, use it only with a threshold of at least STRICT_THRESHOLD,
+    which matches differences in case, punctuation and spacing.
+    """
+
+    STRICT_THRESHOLD = 0.97
+
+    def __init__(self, dimensions: int = 512):
+        assert dimensions > 0, "dimensions must be positive"
+        self.dimensions = dimensions
+
+    def _features(self, text: str) -> tuple[list[int], list[float]]:
+        words = _WORD.findall(text.lower())
+        features: list[tuple[str, float]] = [(word, 1.0) for word in words]
+        features += [(f"{first} {second}", 1.0) for first, second in zip(words, words[1:])]
+        for word in words:
+            padded = f"<{word}>"
+            features += [(padded[start:start + 3], 0.5) for start in range(len(padded) - 2)]
+
+        buckets: list[int] = []
+        weights: list[float] = []
+        for feature, weight in features:
+            digest = zlib.crc32(feature.encode("utf-8"))
+            buckets.append(digest % self.dimensions)
+            # The top bit picks the sign, so colliding features tend to cancel out
+            weights.append(weight if digest & 0x80000000 else -weight)
+        return buckets, weights
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            buckets, weights = self._features(text)
+            if buckets:
+                vectors[row] = np.bincount(buckets, weights=weights, minlength=self.dimensions)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
@@ -0,0 +1,103 @@
+import random
+import sys
+import threading
+from collections import deque
+from pydantic import BaseModel, Field
+
+
+# Timeouts, lock conflicts and rate limits; every 5xx (incl. Anthropic's 529 overloaded) is retryable too
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+class FallbackPolicy(BaseModel):
+    """
+    How generate_text retries, hedges, and falls back between models.
+
+    A request first goes to the requested model. Retryable errors are retried
+    with jittered exponential backoff; once a model's retries are exhausted, the
+    next model of its chain is tried. If the current attempt is slower than the
+    `hedge_percentile` of that model's recent latencies, the next model of the
+    chain is started in parallel and the first success wins.
+    """
+    chains: dict[str, list[str]] = Field(default_factory=dict)
+    hedge_percentile: float | None = 95.0
+    hedge_initial_delay: float = 2.0
+    hedge_min_delay: float = 0.05
+    min_samples: int = 20
+    window: int = 200
+    max_retries: int = 2
+    backoff_base: float = 0.25
+    backoff_max: float = 8.0
+
+    def targets(self, model_name: str) -> list[str]:
+        """The requested model followed by its fallback chain."""
+        return [model_name, *self.chains.get(model_name, [])]
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number `attempt` (1-based)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+
+class LatencyTracker:
+    """
+    A thread-safe sliding window of recent latencies per model: those of
+    successful attempts, and lower bounds from attempts abandoned while running.
+    """
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model_name: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(model_name)
+            if samples is None:
+                samples = self._samples[model_name] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def record_censored(self, model_name: str, seconds: float) -> None:
+        """
+        Record an attempt abandoned after `seconds`, e.g. a hedged attempt that lost,
+        whose latency is only known to exceed `seconds`. Left out, the slowest
+        attempts would never be recorded and the hedge percentile would drift low.
+        It counts as a sample of `seconds` when that is above the window's median,
+        where it lifts the high percentiles hedging reads; a shorter one says
+        nothing about them and is dropped.
+        """
+        median = self.percentile(model_name, 50.0)
+        if median is None or seconds > median:
+            self.record(model_name, seconds)
+
+    def percentile(self, model_name: str, percentile: float) -> float | None:
+        """The given percentile of recorded latencies, or None if nothing was recorded."""
+        with self._lock:
+            samples = sorted(self._samples.get(model_name, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[index]
+
+    def hedge_delay(self, model_name: str, policy: FallbackPolicy) -> float | None:
+        """Seconds to wait on `model_name` before hedging, or None if hedging is off."""
+        if policy.hedge_percentile is None:
+            return None
+        with self._lock:
+            sample_count = len(self._samples.get(model_name, ()))
+        if sample_count < policy.min_samples:
+            return policy.hedge_initial_delay
+        return max(policy.hedge_min_delay, self.percentile(model_name, policy.hedge_percentile))
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Whether a provider error is transient and worth retrying or failing over."""
+    # An SDK that was never imported cannot have raised the error, so don't import it here
+    for sdk_name in ("openai", "anthropic"):
+        sdk = sys.modules.get(sdk_name)
+        if sdk is None:
+            continue
+        if isinstance(error, sdk.APIConnectionError):
+            return True
+        if isinstance(error, sdk.APIStatusError):
+            return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    return False
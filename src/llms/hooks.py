@@ -0,0 +1,64 @@
+from typing import Any
+from pydantic import BaseModel, ConfigDict, SkipValidation
+from llms.types.enums import Provider
+from llms.types.results import GenerateTextResult, Timings
+from llms.types.streams import DeltaEvent
+
+
+class BeforeRequestEvent(BaseModel):
+    """Fired once the request is built, right before it is sent."""
+    model_name: str
+    provider: Provider
+    # The exact parameters passed to the SDK; hooks may modify them in place
+    api_params: SkipValidation[dict[str, Any]]
+    timings: Timings
+
+
+class AfterResponseEvent(BaseModel):
+    """Fired once a call produced its result; `timings` is complete."""
+    model_name: str
+    provider: Provider
+    result: GenerateTextResult
+    timings: Timings
+
+
+class ErrorEvent(BaseModel):
+    """Fired when a call fails; `timings` holds the phases completed so far."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model_name: str
+    provider: Provider
+    error: Exception
+    timings: Timings
+
+
+class StreamChunkEvent(BaseModel):
+    """Fired for every delta event of a stream, `elapsed` seconds into the call."""
+    model_name: str
+    provider: Provider
+    event: SkipValidation[DeltaEvent]
+    elapsed: float
+    timings: Timings
+
+
+class Hooks:
+    """
+    Instrumentation and middleware for provider calls. Subclass and override the
+    events you need; the defaults do nothing.
+
+    Hooks fire once per provider call, so retries, hedges and fallbacks each get
+    their own events, and cache hits fire none. They run inline on the event loop,
+    SyncLLM's included, and should return quickly.
+    """
+
+    def before_request(self, event: BeforeRequestEvent) -> None:
+        pass
+
+    def after_response(self, event: AfterResponseEvent) -> None:
+        pass
+
+    def on_error(self, event: ErrorEvent) -> None:
+        pass
+
+    def on_stream_chunk(self, event: StreamChunkEvent) -> None:
+        pass
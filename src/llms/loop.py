@@ -0,0 +1,91 @@
+import asyncio
+import os
+import threading
+from collections.abc import AsyncIterator, Awaitable, Coroutine, Iterator
+from typing import Any, TypeVar
+
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    """
+    An asyncio event loop running on a daemon thread, on which synchronous code
+    runs coroutines. Any number of threads may submit to it at once; their
+    requests share the loop's connections and wait on it without a thread each.
+    """
+
+    def __init__(self, name: str = "llms-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    @property
+    def closed(self) -> bool:
+        return self.loop.is_closed()
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """
+        Run a coroutine on the loop and block the calling thread until it finishes.
+        The coroutine runs in a copy of the caller's context, so it keeps its deadline.
+        """
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("BackgroundLoop.run called from its own loop; await the coroutine instead")
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        try:
+            return future.result()
+        except BaseException:
+            # E.g. a KeyboardInterrupt in the caller: don't leave the coroutine running
+            future.cancel()
+            raise
+
+    def iterate(self, iterator: AsyncIterator[T]) -> Iterator[T]:
+        """Iterate an async iterator on the loop from the calling thread."""
+        try:
+            while True:
+                try:
+                    yield self.run(_next(iterator))
+                except StopAsyncIteration:
+                    return
+        finally:
+            # Abandoning the iteration closes the async generator, releasing its connection
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None and not self.closed:
+                self.run(_await(aclose()))
+
+    def close(self) -> None:
+        """Stop the loop and wait for its thread to exit."""
+        if self.closed:
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+async def _next(iterator: AsyncIterator[T]) -> T:
+    return await anext(iterator)
+
+
+async def _await(awaitable: Awaitable[T]) -> T:
+    return await awaitable
+
+
+_shared_loop: BackgroundLoop | None = None
+_shared_pid: int | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_loop() -> BackgroundLoop:
+    """The process-wide BackgroundLoop, started on first use and again in forked children."""
+    global _shared_loop, _shared_pid
+    with _shared_lock:
+        # A forked child inherits the loop but not its thread
+        if _shared_loop is None or _shared_loop.closed or _shared_pid != os.getpid():
+            _shared_loop = BackgroundLoop()
+            _shared_pid = os.getpid()
+        return _shared_loop
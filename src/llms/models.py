@@ -1,11 +1,95 @@
+from collections.abc import Iterator, Mapping
+from llms.types.embeddings import EmbeddingLimits
+from llms.types.endpoints import Endpoint
 from llms.types.enums import Provider
 
-MODEL_MAP: dict[str, str] = {
+
+class ModelRegistry(Mapping[str, Provider]):
+    """
+    The models the clients know, mapping each name to the provider whose API it is
+    called through. A model may also be registered with several endpoints, e.g.
+    API keys, regions or self-hosted OpenAI-compatible servers running it, which
+    clients balance requests across (see llms.routing).
+    """
+
+    def __init__(self, providers: dict[str, Provider]):
+        self._providers = dict(providers)
+        self._endpoints: dict[str, list[Endpoint]] = {}
+
+    def __getitem__(self, model_name: str) -> Provider:
+        return self._providers[model_name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._providers)
+
+    def __len__(self) -> int:
+        return len(self._providers)
+
+    def register(
+        self,
+        model_name: str,
+        provider: Provider,
+        endpoints: list[Endpoint] | None = None,
+        context_window: int | None = None,
+        embedding_limits: EmbeddingLimits | None = None
+    ) -> None:
+        """
+        Add a model, or replace how an existing one is served.
+
+        Args:
+            model_name: Name requests use for the model
+            provider: Provider whose API the model is called through; self-hosted
+                OpenAI-compatible servers use Provider.OPENAI
+            endpoints: Endpoints serving the model; without any, requests go to the
+                client's own endpoint for the provider
+            context_window: Context window in tokens, used by trim policies
+            embedding_limits: Request limits, for embedding models
+        """
+        self._providers[model_name] = provider
+        if endpoints:
+            assert len(set(endpoints)) == len(endpoints), "Endpoints must be distinct"
+            self._endpoints[model_name] = list(endpoints)
+        else:
+            self._endpoints.pop(model_name, None)
+        if context_window is not None:
+            CONTEXT_WINDOWS[model_name] = context_window
+        if embedding_limits is not None:
+            EMBEDDING_LIMITS[model_name] = embedding_limits
+
+    def endpoints(self, model_name: str) -> list[Endpoint]:
+        """The endpoints registered for a model, empty if it has none of its own."""
+        return self._endpoints.get(model_name, [])
+
+
+MODEL_MAP: ModelRegistry = ModelRegistry({
     "gpt-4o": Provider.OPENAI,
     "gpt-5": Provider.OPENAI,
     "claude-sonnet-4-5": Provider.ANTHROPIC,
     "deepseek-r1": Provider.FIREWORKS,
     "llama-v3p1-8b-instruct": Provider.FIREWORKS,
     "gpt-oss-120b": Provider.FIREWORKS,
+    "text-embedding-3-small": Provider.OPENAI,
+    "text-embedding-3-large": Provider.OPENAI,
+    "nomic-ai/nomic-embed-text-v1.5": Provider.FIREWORKS,
+})
+
+# Context window (prompt plus output) of each model, in tokens
+CONTEXT_WINDOWS: dict[str, int] = {
+    "gpt-4o": 128_000,
+    "gpt-5": 400_000,
+    "claude-sonnet-4-5": 200_000,
+    "deepseek-r1": 163_840,
+    "llama-v3p1-8b-instruct": 131_072,
+    "gpt-oss-120b": 131_072,
+    "text-embedding-3-small": 8_191,
+    "text-embedding-3-large": 8_191,
+    "nomic-ai/nomic-embed-text-v1.5": 8_192,
 }
 
+# Request limits of each embedding model. Token counts are estimated, so the
+# limits stay below the providers' own
+EMBEDDING_LIMITS: dict[str, EmbeddingLimits] = {
+    "text-embedding-3-small": EmbeddingLimits(max_items=2048, max_tokens=250_000),
+    "text-embedding-3-large": EmbeddingLimits(max_items=2048, max_tokens=250_000),
+    "nomic-ai/nomic-embed-text-v1.5": EmbeddingLimits(max_items=256, max_tokens=100_000),
+}
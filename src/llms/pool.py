@@ -0,0 +1,277 @@
+import asyncio
+import threading
+import weakref
+from collections.abc import AsyncIterator, Iterator
+from typing import Any, TypeVar
+import httpx
+from pydantic import BaseModel, ConfigDict
+from llms.utilities.timing import record_first_byte, arecord_first_byte
+
+
+SDKClient = TypeVar("SDKClient")
+
+
+class PoolConfig(BaseModel):
+    """
+    Connection pool and timeout settings. The defaults match the provider SDKs'
+    own. HTTP/2 needs the `h2` package (`pip install llms[http2]`).
+    """
+    model_config = ConfigDict(frozen=True)
+
+    max_connections: int = 1000
+    max_keepalive_connections: int = 100
+    keepalive_expiry: float = 5.0
+    http2: bool = False
+    connect_timeout: float = 5.0
+    read_timeout: float = 600.0
+    write_timeout: float = 600.0
+    pool_timeout: float = 600.0
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout
+        )
+
+
+class PoolStats(BaseModel):
+    """A snapshot of a pool's utilization."""
+    requests: int
+    in_flight: int
+    peak_in_flight: int
+    connections: int
+    idle_connections: int
+    max_connections: int
+
+    @property
+    def utilization(self) -> float:
+        """Share of the connection limit currently open."""
+        return self.connections / self.max_connections
+
+
+class _Counters:
+    __slots__ = ("requests", "in_flight", "peak_in_flight", "_lock")
+
+    def __init__(self):
+        self.requests = self.in_flight = self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+    def started(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finished(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+
+class _CountedStream(httpx.SyncByteStream):
+    # A request is in flight until its response body is closed
+    def __init__(self, stream: httpx.SyncByteStream, counters: _Counters):
+        self._stream = stream
+        self._counters: _Counters | None = counters
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self._stream)
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if self._counters is not None:
+                self._counters.finished()
+                self._counters = None
+
+
+class _AsyncCountedStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, counters: _Counters):
+        self._stream = stream
+        self._counters: _Counters | None = counters
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self._stream.__aiter__()
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._counters is not None:
+                self._counters.finished()
+                self._counters = None
+
+
+class _CountingTransport(httpx.HTTPTransport):
+    def __init__(self, counters: _Counters, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.counters = counters
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.counters.started()
+        try:
+            response = super().handle_request(request)
+        except BaseException:
+            self.counters.finished()
+            raise
+        response.stream = _CountedStream(response.stream, self.counters)
+        return response
+
+
+class _AsyncCountingTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, counters: _Counters, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.counters = counters
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.counters.started()
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            self.counters.finished()
+            raise
+        response.stream = _AsyncCountedStream(response.stream, self.counters)
+        return response
+
+
+def _stats(config: PoolConfig, counters: _Counters, transport: httpx.HTTPTransport | httpx.AsyncHTTPTransport) -> PoolStats:
+    # httpx keeps its httpcore connection pool private
+    connections = transport._pool.connections
+    return PoolStats(
+        requests=counters.requests,
+        in_flight=counters.in_flight,
+        peak_in_flight=counters.peak_in_flight,
+        connections=len(connections),
+        idle_connections=sum(1 for connection in connections if connection.is_idle()),
+        max_connections=config.max_connections
+    )
+
+
+class HTTPPool:
+    """
+    One httpx connection pool, shared by every provider client built from it.
+    Provider clients with the same SDK, API key and endpoint are built once and
+    reused, so clients created per request still reuse warm connections.
+    """
+
+    def __init__(self, config: PoolConfig | None = None):
+        self.config = config or PoolConfig()
+        self._counters = _Counters()
+        self._transport = _CountingTransport(
+            self._counters,
+            limits=self.config.limits(),
+            http2=self.config.http2
+        )
+        self.http_client = httpx.Client(
+            transport=self._transport,
+            timeout=self.config.timeout(),
+            follow_redirects=True,
+            event_hooks={"response": [record_first_byte]}
+        )
+        self._sdk_clients: dict[tuple[type, str | None, str | None], Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def closed(self) -> bool:
+        return self.http_client.is_closed
+
+    def sdk_client(self, sdk_class: type[SDKClient], api_key: str | None, base_url: str | None) -> SDKClient:
+        """Get the provider client for an SDK, API key and endpoint, building it on first use."""
+        key = (sdk_class, api_key, base_url)
+        with self._lock:
+            client = self._sdk_clients.get(key)
+            if client is None:
+                client = self._sdk_clients[key] = sdk_class(api_key=api_key, base_url=base_url, http_client=self.http_client)
+            return client
+
+    def stats(self) -> PoolStats:
+        return _stats(self.config, self._counters, self._transport)
+
+    def close(self) -> None:
+        self.http_client.close()
+
+
+class AsyncHTTPPool:
+    """
+    Async variant of HTTPPool. Its connections belong to the event loop that
+    first uses them, so share it only within one loop.
+    """
+
+    def __init__(self, config: PoolConfig | None = None):
+        self.config = config or PoolConfig()
+        self._counters = _Counters()
+        self._transport = _AsyncCountingTransport(
+            self._counters,
+            limits=self.config.limits(),
+            http2=self.config.http2
+        )
+        self.http_client = httpx.AsyncClient(
+            transport=self._transport,
+            timeout=self.config.timeout(),
+            follow_redirects=True,
+            event_hooks={"response": [arecord_first_byte]}
+        )
+        self._sdk_clients: dict[tuple[type, str | None, str | None], Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def closed(self) -> bool:
+        return self.http_client.is_closed
+
+    def sdk_client(self, sdk_class: type[SDKClient], api_key: str | None, base_url: str | None) -> SDKClient:
+        """Get the provider client for an SDK, API key and endpoint, building it on first use."""
+        key = (sdk_class, api_key, base_url)
+        with self._lock:
+            client = self._sdk_clients.get(key)
+            if client is None:
+                client = self._sdk_clients[key] = sdk_class(api_key=api_key, base_url=base_url, http_client=self.http_client)
+            return client
+
+    def stats(self) -> PoolStats:
+        return _stats(self.config, self._counters, self._transport)
+
+    async def aclose(self) -> None:
+        await self.http_client.aclose()
+
+
+_shared_pools: dict[PoolConfig, HTTPPool] = {}
+_shared_async_pools: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[PoolConfig, AsyncHTTPPool]] = weakref.WeakKeyDictionary()
+_shared_lock = threading.Lock()
+
+
+def shared_pool(config: PoolConfig | None = None) -> HTTPPool:
+    """The process-wide HTTPPool for `config`, for code using the sync SDK clients directly."""
+    config = config or PoolConfig()
+    with _shared_lock:
+        pool = _shared_pools.get(config)
+        if pool is None or pool.closed:
+            pool = _shared_pools[config] = HTTPPool(config)
+        return pool
+
+
+def shared_async_pool(config: PoolConfig | None = None) -> AsyncHTTPPool:
+    """
+    The AsyncHTTPPool for `config` shared within the running event loop, used by
+    AsyncLLM and SyncLLM unless given their own. Outside a running loop a new
+    pool is returned.
+    """
+    config = config or PoolConfig()
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return AsyncHTTPPool(config)
+    with _shared_lock:
+        pools = _shared_async_pools.setdefault(loop, {})
+        pool = pools.get(config)
+        if pool is None or pool.closed:
+            pool = pools[config] = AsyncHTTPPool(config)
+        return pool
@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+from pydantic import BaseModel, Field
+from llms.deadlines import DeadlineExceeded, remaining
+from llms.models import MODEL_MAP
+from llms.types.enums import Provider
+from llms.types.results import Usage
+
+
+class RateLimit(BaseModel):
+    requests_per_minute: int | None = None
+    tokens_per_minute: int | None = None
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket refilled continuously at `per_minute / 60` per second.
+
+    Callers reserve capacity up front and are told how long to wait for it. The
+    level may go negative, which queues later callers behind earlier ones
+    without polling.
+    """
+
+    def __init__(self, per_minute: int):
+        assert per_minute > 0, "per_minute must be positive"
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` from the bucket and return the seconds to wait before using it."""
+        # A single reservation can never need more than a full bucket
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            self.level -= amount
+            return 0.0 if self.level >= 0 else -self.level / self.rate
+
+    def adjust(self, amount: float) -> None:
+        """Return (positive) or charge (negative) capacity after the fact."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.level = min(self.capacity, self.level + amount)
+
+
+class Reservation(BaseModel):
+    """Capacity taken for one request, reconciled once its actual usage is known."""
+    model_name: str
+    estimated_tokens: int
+    delay: float
+    # Tokens taken from each token bucket, which caps the estimate at its capacity
+    charged_tokens: dict[str, float] = Field(default_factory=dict)
+
+
+class RateLimiter:
+    """
+    Client-side RPM/TPM limiting per provider and per model.
+
+    Limits keyed by a Provider apply to every model of that provider; limits keyed
+    by a model name apply to that model only. A request must clear every bucket
+    that applies to it. Prompt tokens are estimated before sending and reconciled
+    against the usage the provider reports.
+    """
+
+    def __init__(self, limits: dict[Provider | str, RateLimit]):
+        """
+        Args:
+            limits: Rate limits keyed by Provider or by model name
+        """
+        self.limits = limits
+        self._request_buckets: dict[str, TokenBucket] = {}
+        self._token_buckets: dict[str, TokenBucket] = {}
+        for key, limit in limits.items():
+            name = key.value if isinstance(key, Provider) else key
+            if limit.requests_per_minute:
+                self._request_buckets[name] = TokenBucket(limit.requests_per_minute)
+            if limit.tokens_per_minute:
+                self._token_buckets[name] = TokenBucket(limit.tokens_per_minute)
+
+    def _keys(self, model_name: str) -> tuple[str, ...]:
+        provider = MODEL_MAP.get(model_name)
+        return (provider.value, model_name) if provider is not None else (model_name,)
+
+    def reserve(self, model_name: str, estimated_tokens: int) -> Reservation:
+        """Reserve capacity for a request without waiting; the caller waits `delay` seconds."""
+        delay = 0.0
+        charged_tokens: dict[str, float] = {}
+        for key in self._keys(model_name):
+            if key in self._request_buckets:
+                delay = max(delay, self._request_buckets[key].reserve(1))
+            if key in self._token_buckets:
+                bucket = self._token_buckets[key]
+                delay = max(delay, bucket.reserve(estimated_tokens))
+                charged_tokens[key] = min(float(estimated_tokens), bucket.capacity)
+        return Reservation(model_name=model_name, estimated_tokens=estimated_tokens, delay=delay, charged_tokens=charged_tokens)
+
+    async def acquire_async(self, model_name: str, estimated_tokens: int) -> Reservation:
+        """
+        Reserve capacity and suspend the calling task until it is available. Raises
+        DeadlineExceeded without waiting if the capacity comes after the call's deadline.
+        """
+        reservation = self.reserve(model_name, estimated_tokens)
+        if reservation.delay > 0:
+            self._check_deadline(reservation)
+            await asyncio.sleep(reservation.delay)
+        return reservation
+
+    def release(self, reservation: Reservation) -> None:
+        """Return the capacity of a reservation that was never sent."""
+        for key in self._keys(reservation.model_name):
+            if key in self._request_buckets:
+                self._request_buckets[key].adjust(1)
+            if key in reservation.charged_tokens:
+                self._token_buckets[key].adjust(reservation.charged_tokens[key])
+
+    def _check_deadline(self, reservation: Reservation) -> None:
+        # Waiting out a delay the budget cannot cover would only hold capacity others could use
+        try:
+            left = remaining()
+        except DeadlineExceeded:
+            self.release(reservation)
+            raise
+        if left is not None and reservation.delay > left:
+            self.release(reservation)
+            raise DeadlineExceeded(f"Rate limit delay of {reservation.delay:.2f}s exceeds the remaining {left:.2f}s")
+
+    def reconcile(self, reservation: Reservation, usage: Usage | None) -> None:
+        """Correct the token buckets by the difference between estimated and actual usage."""
+        if usage is None:
+            return
+        actual_tokens = usage.input_tokens + usage.output_tokens
+        for key, charged in reservation.charged_tokens.items():
+            self._token_buckets[key].adjust(charged - actual_tokens)
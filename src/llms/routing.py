@@ -0,0 +1,202 @@
+import itertools
+import threading
+import time
+from collections.abc import Iterable
+from enum import Enum
+from pydantic import BaseModel
+from llms.models import MODEL_MAP
+from llms.types.endpoints import Endpoint
+from llms.types.enums import Provider
+
+
+class RoutingStrategy(str, Enum):
+    # Fewest requests in flight
+    LEAST_OUTSTANDING = "least-outstanding"
+    # Lowest recent latency, weighted by the requests in flight
+    EWMA_LATENCY = "ewma-latency"
+
+
+class EndpointStats(BaseModel):
+    label: str
+    outstanding: int
+    requests: int
+    errors: int
+    # Exponentially weighted moving average of successful latencies, in seconds
+    latency: float | None
+    ejected: bool
+
+
+class _EndpointState:
+    __slots__ = ("endpoint", "outstanding", "requests", "errors", "consecutive_errors", "latency", "ejected_until")
+
+    def __init__(self, endpoint: Endpoint):
+        self.endpoint = endpoint
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.latency: float | None = None
+        self.ejected_until = 0.0
+
+
+class EndpointPool:
+    """
+    A thread-safe pool of endpoints serving the same models, which picks one per
+    request by the routing strategy. Ties go round-robin, so idle endpoints share
+    load evenly.
+
+    An endpoint that fails `eject_after` times in a row with a retryable error
+    (connection errors, 429s, 5xx) is ejected for `eject_seconds`. It is then
+    readmitted on probation: one more failure ejects it again, one success restores
+    it. If every endpoint is ejected, the one due back soonest is used anyway.
+    """
+
+    def __init__(
+        self,
+        endpoints: Iterable[Endpoint],
+        strategy: RoutingStrategy = RoutingStrategy.LEAST_OUTSTANDING,
+        eject_after: int = 3,
+        eject_seconds: float = 30.0,
+        ewma_decay: float = 0.3
+    ):
+        """
+        Args:
+            endpoints: Distinct endpoints to balance across
+            strategy: How to pick between admitted endpoints
+            eject_after: Consecutive retryable errors that eject an endpoint
+            eject_seconds: How long an ejected endpoint is skipped
+            ewma_decay: Weight of each new latency in the moving average
+        """
+        self._states = [_EndpointState(endpoint) for endpoint in endpoints]
+        assert self._states, "An EndpointPool needs at least one endpoint"
+        self._by_endpoint = {state.endpoint: state for state in self._states}
+        assert len(self._by_endpoint) == len(self._states), "Endpoints must be distinct"
+        self.strategy = strategy
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self.ewma_decay = ewma_decay
+        self._rotation = itertools.count()
+        self._lock = threading.Lock()
+
+    def _score(self, state: _EndpointState) -> float:
+        if self.strategy == RoutingStrategy.EWMA_LATENCY:
+            # Endpoints without a latency yet score 0, so each is tried early
+            return (state.latency or 0.0) * (state.outstanding + 1)
+        return state.outstanding
+
+    def acquire(self) -> Endpoint:
+        """Pick an endpoint for a request; every acquire must be paired with a release."""
+        with self._lock:
+            now = time.monotonic()
+            candidates = [state for state in self._states if state.ejected_until <= now]
+            if not candidates:
+                candidates = [min(self._states, key=lambda state: state.ejected_until)]
+            # Start the scan at a rotating offset so ties go round-robin
+            offset = next(self._rotation) % len(candidates)
+            best = min(candidates[offset:] + candidates[:offset], key=self._score)
+            best.outstanding += 1
+            best.requests += 1
+            return best.endpoint
+
+    def release(self, endpoint: Endpoint, seconds: float | None, failed: bool = False) -> None:
+        """
+        Record the outcome of a request. `seconds` is its latency, or None when it
+        should not count towards the average (cancelled or failed requests).
+        """
+        with self._lock:
+            state = self._by_endpoint[endpoint]
+            state.outstanding -= 1
+            if failed:
+                state.errors += 1
+                state.consecutive_errors += 1
+                if state.consecutive_errors >= self.eject_after:
+                    state.ejected_until = time.monotonic() + self.eject_seconds
+                return
+            if seconds is not None:
+                state.consecutive_errors = 0
+                state.latency = seconds if state.latency is None else (
+                    self.ewma_decay * seconds + (1 - self.ewma_decay) * state.latency
+                )
+
+    def stats(self) -> list[EndpointStats]:
+        with self._lock:
+            now = time.monotonic()
+            return [
+                EndpointStats(
+                    label=state.endpoint.label,
+                    outstanding=state.outstanding,
+                    requests=state.requests,
+                    errors=state.errors,
+                    latency=state.latency,
+                    ejected=state.ejected_until > now
+                )
+                for state in self._states
+            ]
+
+
+class EndpointRouter:
+    """
+    Chooses the endpoint pool for each model. A model uses, in order, the endpoints
+    given here for its name, the endpoints registered for it in MODEL_MAP, or the
+    endpoints given here for its provider; otherwise it goes to the client's own
+    endpoint. A provider's pool is shared by all of its models, so load and health
+    are tracked per endpoint whichever model is asked for. A router may be shared
+    between clients to balance them together.
+    """
+
+    def __init__(
+        self,
+        endpoints: dict[Provider | str, list[Endpoint]] | None = None,
+        strategy: RoutingStrategy = RoutingStrategy.LEAST_OUTSTANDING,
+        eject_after: int = 3,
+        eject_seconds: float = 30.0,
+        ewma_decay: float = 0.3
+    ):
+        """
+        Args:
+            endpoints: Endpoints keyed by Provider or by model name
+            strategy: How each pool picks between its endpoints
+            eject_after: Consecutive retryable errors that eject an endpoint
+            eject_seconds: How long an ejected endpoint is skipped
+            ewma_decay: Weight of each new latency in the moving average
+        """
+        self.endpoints = {key.value if isinstance(key, Provider) else key: value for key, value in (endpoints or {}).items()}
+        self.strategy = strategy
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self.ewma_decay = ewma_decay
+        self._pools: dict[str, EndpointPool] = {}
+        # The endpoint list each pool was built from; re-registering a model replaces its pool
+        self._sources: dict[str, list[Endpoint]] = {}
+        self._lock = threading.Lock()
+
+    def pool(self, model_name: str) -> EndpointPool | None:
+        """The pool serving `model_name`, or None if it has no endpoints of its own."""
+        if model_name in self.endpoints:
+            key, endpoints = model_name, self.endpoints[model_name]
+        elif MODEL_MAP.endpoints(model_name):
+            key, endpoints = f"registry:{model_name}", MODEL_MAP.endpoints(model_name)
+        else:
+            provider = MODEL_MAP.get(model_name)
+            if provider is None or provider.value not in self.endpoints:
+                return None
+            key, endpoints = provider.value, self.endpoints[provider.value]
+
+        pool = self._pools.get(key)
+        if pool is None or self._sources[key] is not endpoints:
+            with self._lock:
+                pool = self._pools.get(key)
+                if pool is None or self._sources[key] is not endpoints:
+                    self._sources[key] = endpoints
+                    pool = self._pools[key] = EndpointPool(
+                        endpoints,
+                        strategy=self.strategy,
+                        eject_after=self.eject_after,
+                        eject_seconds=self.eject_seconds,
+                        ewma_decay=self.ewma_decay
+                    )
+        return pool
+
+    def stats(self) -> dict[str, list[EndpointStats]]:
+        """Per-endpoint stats of every pool used so far, keyed by model name or provider."""
+        return {key.removeprefix("registry:"): pool.stats() for key, pool in list(self._pools.items())}
@@ -0,0 +1,77 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+from pydantic import BaseModel
+
+
+T = TypeVar("T")
+
+
+class SingleFlightStats(BaseModel):
+    """
+    `calls` counts every call through the group, `requests` the ones that started a
+    provider request and `deduplicated` the ones that joined a request in flight.
+    `cancelled` counts shared requests cancelled because every waiter had gone.
+    """
+    calls: int = 0
+    requests: int = 0
+    deduplicated: int = 0
+    cancelled: int = 0
+
+
+class _Flight(Generic[T]):
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task[T]):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical requests: while a request for a key is in
+    flight, further calls with that key wait for it instead of starting their own,
+    and every caller gets the same result (or error).
+
+    A caller that is cancelled stops waiting without affecting the others; the
+    shared request is cancelled only once all of its callers have gone. Requests are
+    only shared while in flight; keeping results is the job of a ResponseCache.
+
+    Keys are the canonical request keys of `make_cache_key`, so a SingleFlight may
+    be shared between AsyncLLM clients that use the same provider accounts.
+    """
+
+    def __init__(self):
+        self.stats = SingleFlightStats()
+        self._flights: dict[str, _Flight] = {}
+
+    def in_flight(self) -> int:
+        """The number of shared requests currently in flight."""
+        return len(self._flights)
+
+    async def run(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Await `call()`, or the call already in flight for `key`."""
+        self.stats.calls += 1
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight(asyncio.ensure_future(call()))
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self.stats.requests += 1
+        else:
+            self.stats.deduplicated += 1
+
+        flight.waiters += 1
+        try:
+            # The shield keeps one caller's cancellation from cancelling the shared task
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller has gone; later calls start afresh
+                self._forget(key, flight)
+                flight.task.cancel()
+                self.stats.cancelled += 1
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
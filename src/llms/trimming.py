@@ -0,0 +1,197 @@
+import inspect
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from pydantic import BaseModel, ConfigDict, SkipValidation
+from llms.conversation import Conversation
+from llms.models import CONTEXT_WINDOWS
+from llms.types.enums import Role
+from llms.types.messages import ModelMessage, UserModelMessage
+from llms.utilities.tokens import estimate_model_message_tokens
+
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+class TrimResult(BaseModel):
+    """The history a TrimPolicy chose to send, and what trimming it saved."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    # The input itself when it already fit
+    messages: SkipValidation[list[ModelMessage] | Conversation]
+    tokens_before: int
+    tokens_after: int
+    messages_removed: int = 0
+
+    @property
+    def tokens_removed(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+def estimate_messages_tokens(messages: list[ModelMessage] | Conversation) -> int:
+    """Estimate the prompt tokens of a history; a Conversation keeps a running total."""
+    if isinstance(messages, Conversation):
+        return messages.estimated_tokens()
+    return sum(estimate_model_message_tokens(message) for message in messages)
+
+
+def split_turns(messages: list[ModelMessage] | Conversation) -> tuple[list[ModelMessage], list[list[ModelMessage]]]:
+    """
+    Split a history into its system messages and its turns. A turn starts at a user
+    message and holds the replies to it, so trimming whole turns never separates a
+    tool call from its result or leaves a reply without its question.
+    """
+    system: list[ModelMessage] = []
+    turns: list[list[ModelMessage]] = []
+    for message in messages:
+        if message.role == Role.SYSTEM:
+            system.append(message)
+        elif message.role == Role.USER or not turns:
+            turns.append([message])
+        else:
+            turns[-1].append(message)
+    return system, turns
+
+
+def _turn_tokens(turn: list[ModelMessage]) -> int:
+    return sum(estimate_model_message_tokens(message) for message in turn)
+
+
+def drop_oldest_turns(system: list[ModelMessage], turns: list[list[ModelMessage]], budget: int, keep: int = 0) -> list[ModelMessage]:
+    """Drop turns from the front, after the first `keep`, until the history fits `budget`; the last turn always stays."""
+    tokens = sum(estimate_model_message_tokens(message) for message in system) + sum(_turn_tokens(turn) for turn in turns)
+    turns = list(turns)
+    while len(turns) > keep + 1 and tokens > budget:
+        tokens -= _turn_tokens(turns.pop(keep))
+    return system + [message for turn in turns for message in turn]
+
+
+class TrimPolicy(ABC):
+    """
+    Fits a message history to a model's token budget before it is sent. Histories
+    that already fit are passed through untouched. Token counts are local estimates
+    (see llms.utilities.tokens).
+    """
+
+    def __init__(self, budget: int | None = None, reserve_output_tokens: int = 4096):
+        """
+        Args:
+            budget: Prompt token budget; defaults to the model's context window
+                minus `reserve_output_tokens`
+            reserve_output_tokens: Room left for the reply when deriving the budget
+        """
+        self.budget = budget
+        self.reserve_output_tokens = reserve_output_tokens
+
+    def budget_for(self, model_name: str) -> int:
+        """The prompt token budget for a model; raises ValueError if neither it nor the model's context window is known."""
+        if self.budget is not None:
+            return self.budget
+        if model_name not in CONTEXT_WINDOWS:
+            raise ValueError(
+                f"No context window is known for {model_name}; register it with context_window or give the policy a budget"
+            )
+        return CONTEXT_WINDOWS[model_name] - self.reserve_output_tokens
+
+    def trim(self, model_name: str, messages: list[ModelMessage] | Conversation) -> TrimResult:
+        budget = self.budget_for(model_name)
+        tokens = estimate_messages_tokens(messages)
+        if tokens <= budget:
+            return TrimResult(messages=messages, tokens_before=tokens, tokens_after=tokens)
+        return self._result(messages, self.fit(messages, budget), tokens)
+
+    async def atrim(self, model_name: str, messages: list[ModelMessage] | Conversation) -> TrimResult:
+        """Async variant of trim, for policies that call out (e.g. to summarize)."""
+        return self.trim(model_name, messages)
+
+    @abstractmethod
+    def fit(self, messages: list[ModelMessage] | Conversation, budget: int) -> list[ModelMessage]:
+        """Choose the messages to send for a history over `budget`."""
+
+    def _result(self, messages: list[ModelMessage] | Conversation, trimmed: list[ModelMessage], tokens_before: int) -> TrimResult:
+        return TrimResult(
+            messages=trimmed,
+            tokens_before=tokens_before,
+            tokens_after=estimate_messages_tokens(trimmed),
+            messages_removed=max(len(messages) - len(trimmed), 0)
+        )
+
+
+class DropOldestPolicy(TrimPolicy):
+    """Drop the oldest turns until the history fits, keeping the system prompt."""
+
+    def fit(self, messages: list[ModelMessage] | Conversation, budget: int) -> list[ModelMessage]:
+        system, turns = split_turns(messages)
+        return drop_oldest_turns(system, turns, budget)
+
+
+class KeepLastPolicy(TrimPolicy):
+    """
+    Keep the system prompt and the last `last_messages` messages, moved forward to
+    a user turn; older turns among those are dropped too if they still do not fit.
+    """
+
+    def __init__(self, last_messages: int, budget: int | None = None, reserve_output_tokens: int = 4096):
+        super().__init__(budget, reserve_output_tokens)
+        self.last_messages = last_messages
+
+    def fit(self, messages: list[ModelMessage] | Conversation, budget: int) -> list[ModelMessage]:
+        system, turns = split_turns(messages)
+        recent = [message for turn in turns for message in turn][-self.last_messages:]
+        # Start at a user message, as the providers expect
+        start = next((index for index, message in enumerate(recent) if message.role == Role.USER), 0)
+        _, recent_turns = split_turns(recent[start:])
+        return drop_oldest_turns(system, recent_turns, budget)
+
+
+class SummarizePolicy(TrimPolicy):
+    """
+    Replace all but the last `keep_last_turns` turns with a summary of them, sent as
+    a user message after the system prompt. `summarizer` turns the replaced
+    messages into the summary text, e.g. with a call to a small model; with
+    AsyncLLM it may be a coroutine function.
+    """
+
+    def __init__(
+        self,
+        summarizer: Callable[[list[ModelMessage]], str | Awaitable[str]],
+        keep_last_turns: int = 2,
+        budget: int | None = None,
+        reserve_output_tokens: int = 4096
+    ):
+        super().__init__(budget, reserve_output_tokens)
+        self.summarizer = summarizer
+        self.keep_last_turns = keep_last_turns
+
+    def fit(self, messages: list[ModelMessage] | Conversation, budget: int) -> list[ModelMessage]:
+        system, turns = split_turns(messages)
+        older, recent = self._partition(turns)
+        if not older:
+            return drop_oldest_turns(system, turns, budget)
+        summary = self.summarizer(older)
+        if inspect.isawaitable(summary):
+            raise TypeError("An async summarizer needs AsyncLLM")
+        return self._assemble(system, recent, summary, budget)
+
+    async def atrim(self, model_name: str, messages: list[ModelMessage] | Conversation) -> TrimResult:
+        budget = self.budget_for(model_name)
+        tokens = estimate_messages_tokens(messages)
+        if tokens <= budget:
+            return TrimResult(messages=messages, tokens_before=tokens, tokens_after=tokens)
+
+        system, turns = split_turns(messages)
+        older, recent = self._partition(turns)
+        if not older:
+            return self._result(messages, drop_oldest_turns(system, turns, budget), tokens)
+        summary = self.summarizer(older)
+        if inspect.isawaitable(summary):
+            summary = await summary
+        return self._result(messages, self._assemble(system, recent, summary, budget), tokens)
+
+    def _partition(self, turns: list[list[ModelMessage]]) -> tuple[list[ModelMessage], list[list[ModelMessage]]]:
+        split = max(len(turns) - self.keep_last_turns, 0)
+        return [message for turn in turns[:split] for message in turn], turns[split:]
+
+    def _assemble(self, system: list[ModelMessage], recent: list[list[ModelMessage]], summary: str, budget: int) -> list[ModelMessage]:
+        # The summary stays first even if recent turns still have to be dropped
+        summary_turn = [UserModelMessage(content=SUMMARY_PREFIX + summary)]
+        return drop_oldest_turns(system, [summary_turn, *recent], budget, keep=1)
@@ -0,0 +1,51 @@
+from enum import Enum
+from pydantic import BaseModel
+from llms.types.enums import Provider
+from llms.types.requests import GenerateTextRequest
+from llms.types.results import GenerateTextResult
+
+
+class BatchStatus(str, Enum):
+    IN_PROGRESS = "in-progress"
+    CANCELLING = "cancelling"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    EXPIRED = "expired"
+    CANCELLED = "cancelled"
+
+
+BATCH_TERMINAL_STATUSES: frozenset[BatchStatus] = frozenset({
+    BatchStatus.COMPLETED, BatchStatus.FAILED, BatchStatus.EXPIRED, BatchStatus.CANCELLED
+})
+
+
+class BatchRequest(GenerateTextRequest):
+    """A request in a provider batch job; `custom_id` ties it to its result."""
+    custom_id: str
+
+
+class BatchJob(BaseModel):
+    """
+    A provider batch job, normalized across providers. A COMPLETED job may still
+    hold failed requests; their results carry an error.
+    """
+    id: str
+    provider: Provider
+    status: BatchStatus
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    # OpenAI keeps successful and failed results in separate files
+    output_file_id: str | None = None
+    error_file_id: str | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in BATCH_TERMINAL_STATUSES
+
+
+class BatchResult(BaseModel):
+    """The outcome of one BatchRequest, found by its `custom_id`."""
+    custom_id: str
+    result: GenerateTextResult | None = None
+    error: str | None = None
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class EmbeddingLimits(BaseModel):
+    """Per-request limits of an embeddings endpoint, which `embed` packs its inputs by."""
+    max_items: int
+    # Estimated tokens across all inputs of a request
+    max_tokens: int
@@ -0,0 +1,25 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class Endpoint(BaseModel):
+    """
+    One place a model can be served from: an API key, a base URL, or both. Unset
+    fields fall back to the client's own key and base URL for the model's provider,
+    so an Endpoint may name just a second key or just another server. `model_name`
+    is the name the endpoint serves the model under, e.g. a vLLM deployment's.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    api_key: str | None = None
+    base_url: str | None = None
+    model_name: str | None = None
+    # Label for stats; defaults to the base URL
+    name: str | None = None
+
+    @property
+    def label(self) -> str:
+        return self.name or self.base_url or "default"
+
+    def __repr__(self) -> str:
+        # Keep API keys out of logs and tracebacks
+        return f"Endpoint(label={self.label!r}, model_name={self.model_name!r})"
@@ -8,4 +8,12 @@ class Provider(str, Enum):
 class Role(str, Enum): 
     USER = "user"
     ASSISTANT = "assistant"
-    SYSTEM = "system"
\ No newline at end of file
+    SYSTEM = "system"
+    TOOL = "tool"
+
+class FinishReason(str, Enum):
+    STOP = "stop"
+    LENGTH = "length"
+    TOOL_CALLS = "tool-calls"
+    CONTENT_FILTER = "content-filter"
+    OTHER = "other"
@@ -19,4 +19,10 @@ class UserModelMessage(ModelMessage):
 
 class AssistantModelMessage(ModelMessage):
     role: Role = Role.ASSISTANT
-    content: str | list[TextPart | ImagePart | FilePart | ReasoningPart | ToolCallPart | ToolResultPart]
\ No newline at end of file
+    content: str | list[TextPart | ImagePart | FilePart | ReasoningPart | ToolCallPart | ToolResultPart]
+
+
+class ToolModelMessage(ModelMessage):
+    """The results of the tool calls in the preceding assistant message."""
+    role: Role = Role.TOOL
+    content: list[ToolResultPart]
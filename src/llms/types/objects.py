@@ -0,0 +1,12 @@
+from typing import Any
+from pydantic import BaseModel, ConfigDict, SkipValidation
+
+
+class ObjectSchema(BaseModel):
+    """The pydantic model generate_object asks for, with the JSON schema sent to the provider."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model: SkipValidation[type[BaseModel]]
+    name: str
+    description: str = ""
+    json_schema: dict[str, Any]
@@ -1,6 +1,10 @@
+import binascii
+import mmap
+import os
 from types import UnionType
 from typing import Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, GetCoreSchemaHandler, field_validator
+from pydantic_core import core_schema
 from enum import Enum
 
 class PartType(str, Enum):
@@ -17,19 +21,135 @@ class TextPart(BaseModel):
     provider_options: dict[str, Any]
 
 
+# Files at least this large are memory-mapped rather than read
+MMAP_THRESHOLD = 1 << 20
+
+
+class InlineData:
+    """
+    Raw attachment bytes held without copying: bytes, a memoryview, or a read-only
+    memory-mapped file. The base64 form is encoded on first use and cached, so every
+    provider cast of every request shares one encoded copy; data URLs are built
+    from it per request rather than kept alongside it.
+
+    ImagePart and FilePart accept bytes, memoryview or a `pathlib.Path` (loaded
+    with `from_path`) and wrap them in InlineData; a `str` stays a URL or base64.
+    A mapped file holds a file descriptor until `close` is called, or the
+    InlineData is used as a context manager, or it is garbage collected.
+    """
+    __slots__ = ("data", "_base64")
+
+    def __init__(self, data: bytes | bytearray | memoryview | mmap.mmap):
+        self.data = data
+        self._base64: str | None = None
+
+    @classmethod
+    def from_path(cls, path: str | os.PathLike[str]) -> "InlineData":
+        """
+        Load a file. Files of `MMAP_THRESHOLD` bytes or more are memory-mapped, and
+        their pages are read only when the data is encoded; smaller ones are read.
+        """
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < MMAP_THRESHOLD:
+                return cls(file.read())
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def close(self) -> None:
+        """Unmap a memory-mapped file and release its file descriptor; the encoded form stays usable."""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self) -> "InlineData":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def base64(self) -> str:
+        if self._base64 is None:
+            self._base64 = binascii.b2a_base64(self.data, newline=False).decode("ascii")
+        return self._base64
+
+    def data_url(self, media_type: str) -> str:
+        return f"data:{media_type};base64,{self.base64()}"
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, InlineData):
+            return NotImplemented
+        return memoryview(self.data) == memoryview(other.data)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"InlineData({len(self.data)} bytes)"
+
+    def __reduce__(self) -> tuple[type, tuple[bytes]]:
+        # Memory maps cannot be pickled; send the bytes instead
+        return (InlineData, (bytes(self.data),))
+
+    @classmethod
+    def _validate(cls, value: Any) -> "InlineData":
+        if isinstance(value, InlineData):
+            return value
+        if isinstance(value, (bytes, bytearray, memoryview, mmap.mmap)):
+            return cls(value)
+        if isinstance(value, os.PathLike):
+            return cls.from_path(value)
+        raise ValueError("expected bytes, bytearray, memoryview, mmap or a path")
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda value: value.base64(), when_used="json")
+        )
+
+
+def inline_base64(data: str | InlineData) -> str:
+    """The base64 form of part data given as a base64 string or InlineData."""
+    return data if isinstance(data, str) else data.base64()
+
+
+def inline_data_url(data: str | InlineData, media_type: str) -> str:
+    """A data URL for part data given as a base64 string or InlineData."""
+    return f"data:{media_type};base64,{data}" if isinstance(data, str) else data.data_url(media_type)
+
+
+def _not_a_local_path(value: Any) -> Any:
+    # A str is sent as-is, so a path given as one would reach the provider as a URL or base64
+    if isinstance(value, str) and len(value) < 4096 and os.path.isfile(value):
+        raise ValueError(f"{value!r} is a local file; pass pathlib.Path({value!r}) to attach its contents")
+    return value
+
+
 class ImagePart(BaseModel):
     type: PartType = PartType.IMAGE
-    image: str
+    # A URL or base64 string, or raw bytes (see InlineData)
+    image: str | InlineData
     media_type: str | None
     provider_options: dict[str, Any]
 
+    @field_validator("image", mode="before")
+    @classmethod
+    def _reject_local_path(cls, value: Any) -> Any:
+        return _not_a_local_path(value)
+
 class FilePart(BaseModel):
     type: PartType = PartType.FILE
-    data: str
+    # A base64 string, or raw bytes (see InlineData)
+    data: str | InlineData
     filename: str | None = None
     media_type: str
     provider_options: dict[str, Any]
 
+    @field_validator("data", mode="before")
+    @classmethod
+    def _reject_local_path(cls, value: Any) -> Any:
+        return _not_a_local_path(value)
+
 
 class ReasoningPart(BaseModel):
     type: PartType = PartType.REASONING
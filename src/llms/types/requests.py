@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+from llms.types.messages import ModelMessage
+
+
+class GenerateTextRequest(BaseModel):
+    model_name: str
+    messages: list[ModelMessage]
@@ -1,7 +1,86 @@
-from pydantic import BaseModel
+from typing import Any
+from pydantic import BaseModel, ConfigDict
+from llms.types.enums import FinishReason
 from llms.types.parts import ContentPart
+from llms.types.requests import GenerateTextRequest
+
+
+class Usage(BaseModel):
+    """
+    Token usage normalized across providers. `input_tokens` is the full prompt,
+    including the tokens read from or written to the provider's prompt cache.
+    """
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+
+
+class Timings(BaseModel):
+    """
+    Where the time of one provider call went, in seconds. `waiting` is spent in
+    before-request work such as rate limiting; `request` runs from sending to the
+    full response. For streams, `request` and `total` are wall-clock and include
+    the time the caller spent between events.
+    """
+    message_casting: float = 0.0
+    waiting: float = 0.0
+    time_to_first_byte: float | None = None
+    request: float = 0.0
+    response_casting: float = 0.0
+    total: float = 0.0
 
 
 class GenerateTextResult(BaseModel):
     text: str
-    parts: list[ContentPart]
\ No newline at end of file
+    parts: list[ContentPart]
+    usage: Usage | None = None
+    finish_reason: FinishReason | None = None
+    request_id: str | None = None
+    timings: Timings | None = None
+    # Set when the reply is stored server-side (OpenAI Responses) and can be chained to
+    stored_response_id: str | None = None
+    # Estimated prompt tokens the client's TrimPolicy removed before sending
+    trimmed_tokens: int = 0
+    # Set by the tool loop: every model call in order, the last being this reply; usage sums them
+    steps: list["Step"] | None = None
+    # Set when a stream was cut off by its deadline; the parts hold what had arrived
+    truncated: bool = False
+
+
+class GenerateObjectResult(GenerateTextResult):
+    """A generate_object reply. `text` is the object's JSON and `object` the validated model instance."""
+    object: Any
+
+
+class ToolExecution(BaseModel):
+    """One tool call run by the tool loop. `output` is what was sent back to the model."""
+    tool_call_id: str
+    tool_name: str
+    output: Any = None
+    error: str | None = None
+    seconds: float = 0.0
+
+
+class Step(BaseModel):
+    """
+    One model call of a tool loop and the tool calls run on its reply, with the
+    seconds spent in each. Tools requested on the last step are not run.
+    """
+    result: GenerateTextResult
+    tool_executions: list[ToolExecution] = []
+    generate_seconds: float = 0.0
+    tools_seconds: float = 0.0
+
+
+GenerateTextResult.model_rebuild()
+
+
+class GenerateManyResult(BaseModel):
+    """The outcome of one request in a generate_many batch, tagged with its input position."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    index: int
+    request: GenerateTextRequest
+    result: GenerateTextResult | None = None
+    error: Exception | None = None
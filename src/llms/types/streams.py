@@ -0,0 +1,59 @@
+from types import UnionType
+from typing import Any
+from enum import Enum
+from pydantic import BaseModel
+from llms.types.results import GenerateTextResult
+
+
+class StreamEventType(str, Enum):
+    TEXT_DELTA = "text-delta"
+    REASONING_DELTA = "reasoning-delta"
+    TOOL_CALL_DELTA = "tool-call-delta"
+    PARTIAL_OBJECT = "partial-object"
+    FINISH = "finish"
+
+
+class TextDeltaEvent(BaseModel):
+    """A fragment of a TextPart. `index` identifies the part within the stream."""
+    type: StreamEventType = StreamEventType.TEXT_DELTA
+    index: int
+    text: str
+
+
+class ReasoningDeltaEvent(BaseModel):
+    """A fragment of a ReasoningPart. `index` identifies the part within the stream."""
+    type: StreamEventType = StreamEventType.REASONING_DELTA
+    index: int
+    text: str
+
+
+class ToolCallDeltaEvent(BaseModel):
+    """
+    A fragment of a ToolCallPart. The id and name are set on the first fragment
+    of a tool call; `input_delta` carries the raw argument JSON fragment.
+    """
+    type: StreamEventType = StreamEventType.TOOL_CALL_DELTA
+    index: int
+    tool_call_id: str | None = None
+    tool_name: str | None = None
+    input_delta: str
+
+
+class PartialObjectEvent(BaseModel):
+    """
+    The object a stream_object call has produced so far, as parsed JSON. Members
+    appear as they complete, and the string being streamed as it grows.
+    """
+    type: StreamEventType = StreamEventType.PARTIAL_OBJECT
+    object: Any
+
+
+class FinishEvent(BaseModel):
+    """The last event of a stream, carrying the aggregated result."""
+    type: StreamEventType = StreamEventType.FINISH
+    result: GenerateTextResult
+
+
+DeltaEvent: UnionType = TextDeltaEvent | ReasoningDeltaEvent | ToolCallDeltaEvent
+StreamEvent: UnionType = TextDeltaEvent | ReasoningDeltaEvent | ToolCallDeltaEvent | FinishEvent
+ObjectStreamEvent: UnionType = PartialObjectEvent | FinishEvent
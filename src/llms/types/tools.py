@@ -0,0 +1,19 @@
+from collections.abc import Callable
+from typing import Any
+from pydantic import BaseModel, ConfigDict, Field, SkipValidation
+
+
+class Tool(BaseModel):
+    """
+    A Python function the model may call. `parameters` is the JSON schema of the
+    function's keyword arguments. Coroutine functions are awaited on the event loop,
+    plain functions run on worker threads.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    name: str
+    description: str = ""
+    parameters: dict[str, Any] = Field(default_factory=lambda: {"type": "object", "properties": {}})
+    function: SkipValidation[Callable[..., Any]]
+    # Seconds to wait for the function; a timed-out call is reported to the model as an error
+    timeout: float | None = None
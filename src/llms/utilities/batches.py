@@ -0,0 +1,167 @@
+import json
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any
+import httpx
+from llms.models import MODEL_MAP
+from llms.types.batches import BatchRequest, BatchJob, BatchResult, BatchStatus
+from llms.types.enums import Provider
+from llms.utilities.casting import cast_openai_response_to_result, cast_anthropic_response_to_result
+from llms.utilities.params import build_openai_params, build_anthropic_params
+
+
+OPENAI_BATCH_ENDPOINT = "/v1/chat/completions"
+OPENAI_BATCH_COMPLETION_WINDOW = "24h"
+ANTHROPIC_BATCHES_PATH = "v1/messages/batches"
+
+OPENAI_BATCH_STATUSES: dict[str, BatchStatus] = {
+    "validating": BatchStatus.IN_PROGRESS,
+    "in_progress": BatchStatus.IN_PROGRESS,
+    "finalizing": BatchStatus.IN_PROGRESS,
+    "completed": BatchStatus.COMPLETED,
+    "failed": BatchStatus.FAILED,
+    "expired": BatchStatus.EXPIRED,
+    "cancelling": BatchStatus.CANCELLING,
+    "cancelled": BatchStatus.CANCELLED,
+}
+
+ANTHROPIC_BATCH_STATUSES: dict[str, BatchStatus] = {
+    "in_progress": BatchStatus.IN_PROGRESS,
+    "canceling": BatchStatus.CANCELLING,
+    "ended": BatchStatus.COMPLETED,
+}
+
+
+def _check_provider(request: BatchRequest, provider: Provider) -> None:
+    if MODEL_MAP.get(request.model_name) != provider:
+        raise ValueError(f"Model {request.model_name} is not a {provider.value} model; a batch goes to a single provider")
+
+
+def build_openai_batch_line(request: BatchRequest, prompt_caching: bool = False) -> bytes:
+    """Build one line of an OpenAI Batch input file."""
+    _check_provider(request, Provider.OPENAI)
+    line = {
+        "custom_id": request.custom_id,
+        "method": "POST",
+        "url": OPENAI_BATCH_ENDPOINT,
+        "body": build_openai_params(request.model_name, request.messages, prompt_caching)
+    }
+    return json.dumps(line).encode() + b"\n"
+
+
+def iter_anthropic_batch_body(requests: Iterable[BatchRequest], prompt_caching: bool = False) -> Iterator[bytes]:
+    """
+    Produce the JSON body of an Anthropic Message Batches create call one request at
+    a time, so it can be streamed without holding the whole job in memory.
+    """
+    yield b'{"requests":['
+    for index, request in enumerate(requests):
+        _check_provider(request, Provider.ANTHROPIC)
+        item = {
+            "custom_id": request.custom_id,
+            "params": build_anthropic_params(request.model_name, request.messages, prompt_caching)
+        }
+        yield (b"," if index else b"") + json.dumps(item).encode()
+    yield b"]}"
+
+
+def build_anthropic_batch_request(anthropic_client: Any, content: Any, content_length: int) -> httpx.Request:
+    """
+    Build the Message Batches create request on the SDK client's own HTTP client,
+    so the streamed body shares its connection pool, transport, base URL, headers
+    and timeout. The SDK's request methods only take a body held in memory, so
+    this reaches into its HTTP client; pyproject pins the SDK to the minor
+    version this is tested against.
+    """
+    headers = {name: value for name, value in anthropic_client.default_headers.items() if isinstance(value, str)}
+    headers["Content-Length"] = str(content_length)
+    return anthropic_client._client.build_request(
+        "POST",
+        anthropic_client.base_url.join(ANTHROPIC_BATCHES_PATH),
+        content=content,
+        headers=headers,
+        timeout=anthropic_client.timeout
+    )
+
+
+@contextmanager
+def anthropic_transport_errors(request: httpx.Request) -> Iterator[None]:
+    """Raise httpx transport failures of a request sent outside the SDK as the SDK's own errors."""
+    from anthropic import APIConnectionError, APITimeoutError
+
+    try:
+        yield
+    except httpx.TimeoutException as error:
+        raise APITimeoutError(request=request) from error
+    except httpx.TransportError as error:
+        raise APIConnectionError(request=request) from error
+
+
+def cast_anthropic_batch_response(anthropic_client: Any, response: httpx.Response) -> BatchJob:
+    """Cast a Message Batches create response, raising the SDK's APIStatusError subclass for a failed one."""
+    from anthropic.types.messages import MessageBatch
+
+    if response.is_error:
+        raise anthropic_client._make_status_error_from_response(response)
+    return cast_anthropic_batch(MessageBatch.model_validate(response.json()))
+
+
+def cast_openai_batch(batch: Any) -> BatchJob:
+    """Convert an OpenAI Batch to internal BatchJob."""
+    counts = batch.request_counts
+    return BatchJob(
+        id=batch.id,
+        provider=Provider.OPENAI,
+        status=OPENAI_BATCH_STATUSES.get(batch.status, BatchStatus.IN_PROGRESS),
+        total=counts.total if counts else 0,
+        succeeded=counts.completed if counts else 0,
+        failed=counts.failed if counts else 0,
+        output_file_id=batch.output_file_id,
+        error_file_id=batch.error_file_id
+    )
+
+
+def cast_anthropic_batch(batch: Any) -> BatchJob:
+    """Convert an Anthropic MessageBatch to internal BatchJob."""
+    counts = batch.request_counts
+    failed = counts.errored + counts.canceled + counts.expired
+    return BatchJob(
+        id=batch.id,
+        provider=Provider.ANTHROPIC,
+        status=ANTHROPIC_BATCH_STATUSES.get(batch.processing_status, BatchStatus.IN_PROGRESS),
+        total=counts.processing + counts.succeeded + failed,
+        succeeded=counts.succeeded,
+        failed=failed
+    )
+
+
+def cast_openai_batch_line(line: str | bytes) -> BatchResult:
+    """Convert one line of an OpenAI Batch output or error file to internal BatchResult."""
+    # The SDK is already loaded: reading results needs its client
+    from openai.types.chat import ChatCompletion
+
+    data: dict[str, Any] = json.loads(line)
+    response: dict[str, Any] = data.get("response") or {}
+    body: dict[str, Any] = response.get("body") or {}
+    if data.get("error") is None and response.get("status_code") == 200:
+        result = cast_openai_response_to_result(ChatCompletion.model_validate(body))
+        result.request_id = response.get("request_id")
+        return BatchResult(custom_id=data["custom_id"], result=result)
+
+    error: dict[str, Any] = data.get("error") or body.get("error") or {}
+    return BatchResult(
+        custom_id=data["custom_id"],
+        error=error.get("message") or f"Request failed with status {response.get('status_code')}"
+    )
+
+
+def cast_anthropic_batch_result(item: Any) -> BatchResult:
+    """Convert one Anthropic Message Batches result to internal BatchResult."""
+    match item.result.type:
+        case "succeeded":
+            return BatchResult(custom_id=item.custom_id, result=cast_anthropic_response_to_result(item.result.message))
+        case "errored":
+            return BatchResult(custom_id=item.custom_id, error=item.result.error.error.message)
+        case outcome:
+            # Canceled or expired before it was processed
+            return BatchResult(custom_id=item.custom_id, error=f"Request {outcome}")
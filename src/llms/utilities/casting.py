@@ -1,61 +1,116 @@
+import json
+from collections.abc import Callable, Iterable
 from typing import Any
 from llms.types.messages import ModelMessage, SystemModelMessage, UserModelMessage, AssistantModelMessage
 from llms.types.parts import (
     TextPart, ImagePart, FilePart, ReasoningPart, ToolCallPart, ToolResultPart,
-    ContentPart, PartType
+    ContentPart, PartType, inline_base64, inline_data_url
 )
-from llms.types.enums import Role
+from llms.types.enums import Role, FinishReason
+from llms.types.results import Usage, Timings, GenerateTextResult
+from llms.types.tools import Tool
+from llms.types.objects import ObjectSchema
+from llms.types.streams import DeltaEvent, TextDeltaEvent, ReasoningDeltaEvent, ToolCallDeltaEvent
+
+
+_new_object = object.__new__
+_set_attribute = object.__setattr__
+
+
+def _construct_part(part_class: type[ContentPart], fields: dict[str, Any]) -> ContentPart:
+    """
+    Build a Part without validation. Only for parts built from provider responses,
+    whose fields are already typed by the SDK; `fields` must list every field.
+    """
+    # Same attributes BaseModel.model_construct sets, minus its per-field default
+    # handling; test_casting pins them to the installed pydantic
+    part = _new_object(part_class)
+    _set_attribute(part, '__dict__', fields)
+    _set_attribute(part, '__pydantic_fields_set__', set(fields))
+    _set_attribute(part, '__pydantic_extra__', None)
+    _set_attribute(part, '__pydantic_private__', None)
+    return part
+
+
+def _construct_text_part(text: str) -> TextPart:
+    return _construct_part(TextPart, {"type": PartType.TEXT, "text": text, "provider_options": {}})
+
+
+def _construct_reasoning_part(text: str) -> ReasoningPart:
+    return _construct_part(ReasoningPart, {"type": PartType.REASONING, "text": text, "provider_options": {}})
+
+
+def _construct_tool_call_part(tool_call_id: str, tool_name: str, input: Any) -> ToolCallPart:
+    return _construct_part(ToolCallPart, {
+        "type": PartType.TOOL_CALL,
+        "tool_call_id": tool_call_id,
+        "tool_name": tool_name,
+        "input": input,
+        "provider_options": {},
+        "provider_executed": None
+    })
+
+
+def _text_to_openai(part: TextPart) -> dict[str, Any]:
+    return {"type": "text", "text": part.text}
+
+
+def _image_to_openai(part: ImagePart) -> dict[str, Any]:
+    # Raw bytes go inline as a data URL; strings are passed through as given
+    image_url = {"url": part.image if isinstance(part.image, str) else part.image.data_url(part.media_type or "image/jpeg")}
+    if "detail" in part.provider_options:
+        image_url["detail"] = part.provider_options["detail"]
+    return {"type": "image_url", "image_url": image_url}
+
+
+def _file_to_openai(part: FilePart) -> dict[str, Any]:
+    # OpenAI doesn't have native file support in this way, treating as data URL
+    if part.media_type.startswith("image/"):
+        return {"type": "image_url", "image_url": {"url": inline_data_url(part.data, part.media_type)}, "text": ""}
+    return {"type": "text", "image_url": {}, "text": f"File: {part.filename}"}
+
+
+def _reasoning_to_openai(part: ReasoningPart) -> dict[str, Any]:
+    # Reasoning might be represented as text in the request
+    return {"type": "text", "text": f"[Reasoning] {part.text}"}
+
+
+def _tool_call_to_openai(part: ToolCallPart) -> dict[str, Any]:
+    # Tool calls are handled separately in OpenAI API
+    return {
+        "type": "tool_call",
+        "id": part.tool_call_id,
+        "function": {
+            "name": part.tool_name,
+            "arguments": part.input
+        }
+    }
+
+
+def _tool_result_to_openai(part: ToolResultPart) -> dict[str, Any]:
+    # Tool results are handled separately
+    return {"type": "tool_result", "tool_call_id": part.tool_call_id, "content": part.output}
+
+
+OPENAI_PART_CASTERS: dict[PartType, Callable[[Any], dict[str, Any]]] = {
+    PartType.TEXT: _text_to_openai,
+    PartType.IMAGE: _image_to_openai,
+    PartType.FILE: _file_to_openai,
+    PartType.REASONING: _reasoning_to_openai,
+    PartType.TOOL_CALL: _tool_call_to_openai,
+    PartType.TOOL_RESULT: _tool_result_to_openai,
+}
+
+# Content types OpenAI accepts inline in a message's content list
+OPENAI_INLINE_CONTENT_TYPES = frozenset({"text", "image_url"})
 
 
 def cast_part_to_openai_content(part: ContentPart) -> dict[str, Any]:
     """Convert an internal Part to OpenAI content format."""
-    match part.type:
-        case PartType.TEXT:
-            return {
-                "type": "text",
-                "text": part.text
-            }
-        case PartType.IMAGE:
-            return {
-                "type": "image_url",
-                "image_url": {
-                    "url": part.image,
-                    **({"detail": part.provider_options.get("detail")} if "detail" in part.provider_options else {})
-                }
-            }
-        case PartType.FILE:
-            # OpenAI doesn't have native file support in this way, treating as data URL
-            data_url = f"data:{part.media_type};base64,{part.data}"
-            return {
-                "type": "image_url" if part.media_type.startswith("image/") else "text",
-                "image_url": {"url": data_url} if part.media_type.startswith("image/") else {},
-                "text": f"File: {part.filename}" if not part.media_type.startswith("image/") else ""
-            }
-        case PartType.REASONING:
-            # Reasoning might be represented as text in the request
-            return {
-                "type": "text",
-                "text": f"[Reasoning] {part.text}"
-            }
-        case PartType.TOOL_CALL:
-            # Tool calls are handled separately in OpenAI API
-            return {
-                "type": "tool_call",
-                "id": part.tool_call_id,
-                "function": {
-                    "name": part.tool_name,
-                    "arguments": part.input
-                }
-            }
-        case PartType.TOOL_RESULT:
-            # Tool results are handled separately
-            return {
-                "type": "tool_result",
-                "tool_call_id": part.tool_call_id,
-                "content": part.output
-            }
-        case _:
-            raise ValueError(f"Unknown part type: {part.type}")
+    caster = OPENAI_PART_CASTERS.get(part.type)
+    if caster is None:
+        raise ValueError(f"Unknown part type: {part.type}")
+    return caster(part)
 
 
 def cast_message_to_openai(message: ModelMessage) -> dict[str, Any]:
@@ -79,12 +134,12 @@ def cast_message_to_openai(message: ModelMessage) -> dict[str, Any]:
                     "type": "function",
                     "function": {
                         "name": part.tool_name,
-                        "arguments": str(part.input)
+                        "arguments": _tool_input_json(part.input)
                     }
                 })
             else:
                 openai_content = cast_part_to_openai_content(part)
-                if openai_content.get("type") in ["text", "image_url"]:
+                if openai_content["type"] in OPENAI_INLINE_CONTENT_TYPES:
                     content_items.append(openai_content)
         
         if content_items:
@@ -96,51 +151,145 @@ def cast_message_to_openai(message: ModelMessage) -> dict[str, Any]:
     return openai_message
 
 
+def cast_tool_message_to_openai(message: ModelMessage) -> list[dict[str, Any]]:
+    """Convert an internal ToolModelMessage to OpenAI `tool` messages, one per result."""
+    return [
+        {"role": "tool", "tool_call_id": part.tool_call_id, "content": _tool_output_text(part.output)}
+        for part in message.content
+    ]
+
+
+def cast_messages_to_openai(messages: Iterable[ModelMessage]) -> list[dict[str, Any]]:
+    """Convert internal ModelMessages to OpenAI message format."""
+    openai_messages: list[dict[str, Any]] = []
+    for message in messages:
+        if message.role == Role.TOOL:
+            openai_messages.extend(cast_tool_message_to_openai(message))
+        else:
+            openai_messages.append(cast_message_to_openai(message))
+    return openai_messages
+
+
+def _tool_input_json(input: Any) -> str:
+    # OpenAI returns arguments as a JSON string, Anthropic as an object
+    return input if isinstance(input, str) else json.dumps(input)
+
+
+def _tool_input_object(input: Any) -> Any:
+    return (json.loads(input) if input else {}) if isinstance(input, str) else input
+
+
+def _tool_output_text(output: Any) -> str:
+    return output if isinstance(output, str) else json.dumps(output, default=str)
+
+
+def cast_tool_to_openai(tool: Tool) -> dict[str, Any]:
+    """Convert a Tool to an OpenAI chat completions function definition."""
+    return {"type": "function", "function": {"name": tool.name, "description": tool.description, "parameters": tool.parameters}}
+
+
+def cast_tool_to_openai_responses(tool: Tool) -> dict[str, Any]:
+    """Convert a Tool to an OpenAI Responses function definition."""
+    return {"type": "function", "name": tool.name, "description": tool.description, "parameters": tool.parameters}
+
+
+def cast_tool_to_anthropic(tool: Tool) -> dict[str, Any]:
+    """Convert a Tool to an Anthropic tool definition."""
+    return {"name": tool.name, "description": tool.description, "input_schema": tool.parameters}
+
+
+def cast_object_schema_to_openai(output_schema: ObjectSchema) -> dict[str, Any]:
+    """Convert an ObjectSchema to an OpenAI chat completions `response_format`."""
+    return {"type": "json_schema", "json_schema": {
+        "name": output_schema.name,
+        "description": output_schema.description,
+        # Strict mode rejects common pydantic schemas (defaults, optional fields)
+        "schema": output_schema.json_schema,
+        "strict": False
+    }}
+
+
+def cast_object_schema_to_openai_responses(output_schema: ObjectSchema) -> dict[str, Any]:
+    """Convert an ObjectSchema to an OpenAI Responses `text.format`."""
+    return {
+        "type": "json_schema",
+        "name": output_schema.name,
+        "description": output_schema.description,
+        "schema": output_schema.json_schema,
+        "strict": False
+    }
+
+
+def cast_object_schema_to_anthropic(output_schema: ObjectSchema) -> dict[str, Any]:
+    """Convert an ObjectSchema to the Anthropic tool the model is forced to call."""
+    return {"name": output_schema.name, "description": output_schema.description, "input_schema": output_schema.json_schema}
+
+
+def cast_message_to_openai_responses(message: ModelMessage) -> list[dict[str, Any]]:
+    """
+    Convert an internal ModelMessage to OpenAI Responses API input items. Tool calls
+    and tool results are items of their own rather than message content.
+    """
+    if isinstance(message.content, str):
+        return [{"role": message.role.value, "content": message.content}]
+
+    text_type = "output_text" if message.role == Role.ASSISTANT else "input_text"
+    content: list[dict[str, Any]] = []
+    items: list[dict[str, Any]] = []
+    for part in message.content:
+        match part.type:
+            case PartType.TEXT:
+                content.append({"type": text_type, "text": part.text})
+            case PartType.IMAGE:
+                image_url = part.image if isinstance(part.image, str) else part.image.data_url(part.media_type or "image/jpeg")
+                content.append({"type": "input_image", "image_url": image_url, "detail": part.provider_options.get("detail", "auto")})
+            case PartType.FILE:
+                data_url = inline_data_url(part.data, part.media_type)
+                if part.media_type.startswith("image/"):
+                    content.append({"type": "input_image", "image_url": data_url, "detail": "auto"})
+                else:
+                    content.append({"type": "input_file", "filename": part.filename or "file", "file_data": data_url})
+            case PartType.TOOL_CALL:
+                items.append({"type": "function_call", "call_id": part.tool_call_id, "name": part.tool_name, "arguments": _tool_input_json(part.input)})
+            case PartType.TOOL_RESULT:
+                items.append({"type": "function_call_output", "call_id": part.tool_call_id, "output": _tool_output_text(part.output)})
+            # Reasoning is kept by the server and cannot be sent back as input
+
+    if content:
+        items.insert(0, {"role": message.role.value, "content": content})
+    return items
+
+
 def cast_openai_response_to_parts(response: Any) -> list[ContentPart]:
     """Convert OpenAI response to internal Parts format."""
     parts: list[ContentPart] = []
-    
-    # Handle the response based on its structure
-    if hasattr(response, 'choices') and response.choices:
-        choice = response.choices[0]
-        message = choice.message
-        
+
+    # Handle the response based on its structure; one getattr per field instead of hasattr plus access
+    choices = getattr(response, 'choices', None)
+    if choices:
+        message = choices[0].message
+
         # Handle text content
-        if hasattr(message, 'content') and message.content:
-            parts.append(TextPart(
-                type=PartType.TEXT,
-                text=message.content,
-                provider_options={}
-            ))
-        
+        content = getattr(message, 'content', None)
+        if content:
+            parts.append(_construct_text_part(content))
+
         # Handle tool calls
-        if hasattr(message, 'tool_calls') and message.tool_calls:
-            for tool_call in message.tool_calls:
-                parts.append(ToolCallPart(
-                    type=PartType.TOOL_CALL,
-                    tool_call_id=tool_call.id,
-                    tool_name=tool_call.function.name,
-                    input=tool_call.function.arguments,
-                    provider_options={},
-                    provider_executed=None
-                ))
-        
+        tool_calls = getattr(message, 'tool_calls', None)
+        if tool_calls:
+            for tool_call in tool_calls:
+                function = tool_call.function
+                parts.append(_construct_tool_call_part(tool_call.id, function.name, function.arguments))
+
         # Handle reasoning (if present in extended thinking response)
-        if hasattr(message, 'reasoning') and message.reasoning:
-            parts.append(ReasoningPart(
-                type=PartType.REASONING,
-                text=message.reasoning,
-                provider_options={}
-            ))
-    
+        reasoning = getattr(message, 'reasoning', None)
+        if reasoning:
+            parts.append(_construct_reasoning_part(reasoning))
+
     # If no parts were extracted, add an empty text part
     if not parts:
-        parts.append(TextPart(
-            type=PartType.TEXT,
-            text="",
-            provider_options={}
-        ))
-    
+        parts.append(_construct_text_part(""))
+
     return parts
 
 
@@ -166,71 +315,84 @@ def cast_parts_to_text(parts: list[ContentPart]) -> str:
     return " ".join(text_parts).strip()
 
 
+PART_TYPE_TO_CLASS: dict[PartType, type[ContentPart]] = {
+    PartType.TEXT: TextPart,
+    PartType.IMAGE: ImagePart,
+    PartType.FILE: FilePart,
+    PartType.REASONING: ReasoningPart,
+    PartType.TOOL_CALL: ToolCallPart,
+    PartType.TOOL_RESULT: ToolResultPart,
+}
+
+
+def cast_dict_to_part(data: dict[str, Any]) -> ContentPart:
+    """Rebuild a serialized Part, using its `type` to pick the right class."""
+    return PART_TYPE_TO_CLASS[PartType(data["type"])].model_validate(data)
+
+
+def _text_to_anthropic(part: TextPart | ReasoningPart) -> dict[str, Any]:
+    # Anthropic doesn't have native reasoning type, so reasoning is sent as text too
+    return {"type": "text", "text": part.text}
+
+
+def _image_to_anthropic(part: ImagePart) -> dict[str, Any]:
+    # Anthropic expects image data or source
+    if isinstance(part.image, str) and part.image.startswith(("http://", "https://")):
+        return {"type": "image", "source": {"type": "url", "url": part.image}}
+    # Assume base64 encoded data
+    return {
+        "type": "image",
+        "source": {
+            "type": "base64",
+            "media_type": part.media_type or "image/jpeg",
+            "data": inline_base64(part.image)
+        }
+    }
+
+
+def _file_to_anthropic(part: FilePart) -> dict[str, Any]:
+    # Anthropic supports document/file content
+    return {
+        "type": "document",
+        "source": {
+            "type": "base64",
+            "media_type": part.media_type,
+            "data": inline_base64(part.data)
+        }
+    }
+
+
+def _tool_call_to_anthropic(part: ToolCallPart) -> dict[str, Any]:
+    return {"type": "tool_use", "id": part.tool_call_id, "name": part.tool_name, "input": _tool_input_object(part.input)}
+
+
+def _tool_result_to_anthropic(part: ToolResultPart) -> dict[str, Any]:
+    return {"type": "tool_result", "tool_use_id": part.tool_call_id, "content": _tool_output_text(part.output)}
+
+
+ANTHROPIC_PART_CASTERS: dict[PartType, Callable[[Any], dict[str, Any]]] = {
+    PartType.TEXT: _text_to_anthropic,
+    PartType.IMAGE: _image_to_anthropic,
+    PartType.FILE: _file_to_anthropic,
+    PartType.REASONING: _text_to_anthropic,
+    PartType.TOOL_CALL: _tool_call_to_anthropic,
+    PartType.TOOL_RESULT: _tool_result_to_anthropic,
+}
+
+
 def cast_part_to_anthropic_content(part: ContentPart) -> dict[str, Any]:
     """Convert an internal Part to Anthropic content format."""
-    match part.type:
-        case PartType.TEXT:
-            return {
-                "type": "text",
-                "text": part.text
-            }
-        case PartType.IMAGE:
-            # Anthropic expects image data or source
-            if part.image.startswith("http://") or part.image.startswith("https://"):
-                return {
-                    "type": "image",
-                    "source": {
-                        "type": "url",
-                        "url": part.image
-                    }
-                }
-            else:
-                # Assume base64 encoded data
-                return {
-                    "type": "image",
-                    "source": {
-                        "type": "base64",
-                        "media_type": part.media_type or "image/jpeg",
-                        "data": part.image
-                    }
-                }
-        case PartType.FILE:
-            # Anthropic supports document/file content
-            return {
-                "type": "document",
-                "source": {
-                    "type": "base64",
-                    "media_type": part.media_type,
-                    "data": part.data
-                }
-            }
-        case PartType.TOOL_CALL:
-            return {
-                "type": "tool_use",
-                "id": part.tool_call_id,
-                "name": part.tool_name,
-                "input": part.input
-            }
-        case PartType.TOOL_RESULT:
-            return {
-                "type": "tool_result",
-                "tool_use_id": part.tool_call_id,
-                "content": part.output
-            }
-        case PartType.REASONING:
-            # Anthropic doesn't have native reasoning type, treat as text
-            return {
-                "type": "text",
-                "text": part.text
-            }
-        case _:
-            raise ValueError(f"Unknown part type: {part.type}")
+    caster = ANTHROPIC_PART_CASTERS.get(part.type)
+    if caster is None:
+        raise ValueError(f"Unknown part type: {part.type}")
+    return caster(part)
 
 
 def cast_message_to_anthropic(message: ModelMessage) -> dict[str, Any]:
     """Convert an internal ModelMessage to Anthropic message format."""
     anthropic_message: dict[str, Any] = {
-        "role": message.role.value
+        # Tool results go back to Anthropic in a user message
+        "role": Role.USER.value if message.role == Role.TOOL else message.role.value
     }
     
     # Handle content based on type
@@ -238,13 +400,7 @@ def cast_message_to_anthropic(message: ModelMessage) -> dict[str, Any]:
         anthropic_message["content"] = message.content
     elif isinstance(message.content, list):
         # Convert list of parts to Anthropic content format
-        content_items = []
-        
-        for part in message.content:
-            anthropic_content = cast_part_to_anthropic_content(part)
-            content_items.append(anthropic_content)
-        
-        anthropic_message["content"] = content_items
+        anthropic_message["content"] = [cast_part_to_anthropic_content(part) for part in message.content]
     
     return anthropic_message
 
@@ -252,36 +408,226 @@ def cast_message_to_anthropic(message: ModelMessage) -> dict[str, Any]:
 def cast_anthropic_response_to_parts(response: Any) -> list[ContentPart]:
     """Convert Anthropic response to internal Parts format."""
     parts: list[ContentPart] = []
-    
+
     # Handle the response content
-    if hasattr(response, 'content') and response.content:
-        for content_block in response.content:
+    for content_block in getattr(response, 'content', None) or ():
+        match getattr(content_block, 'type', None):
             # Handle text content
-            if hasattr(content_block, 'type') and content_block.type == 'text':
-                parts.append(TextPart(
-                    type=PartType.TEXT,
-                    text=content_block.text,
-                    provider_options={}
-                ))
-            
+            case "text":
+                parts.append(_construct_text_part(content_block.text))
             # Handle tool use
-            elif hasattr(content_block, 'type') and content_block.type == 'tool_use':
-                parts.append(ToolCallPart(
-                    type=PartType.TOOL_CALL,
-                    tool_call_id=content_block.id,
-                    tool_name=content_block.name,
-                    input=content_block.input,
-                    provider_options={},
-                    provider_executed=None
-                ))
-    
+            case "tool_use":
+                parts.append(_construct_tool_call_part(content_block.id, content_block.name, content_block.input))
+
     # If no parts were extracted, add an empty text part
     if not parts:
-        parts.append(TextPart(
-            type=PartType.TEXT,
-            text="",
-            provider_options={}
-        ))
-    
+        parts.append(_construct_text_part(""))
+
     return parts
 
+
+def cast_openai_chunk_to_events(chunk: Any) -> list[DeltaEvent]:
+    """Convert an OpenAI streaming chunk to internal delta events."""
+    events: list[DeltaEvent] = []
+
+    # Usage-only chunks carry no choices
+    if not getattr(chunk, 'choices', None):
+        return events
+
+    delta = chunk.choices[0].delta
+    if delta is None:
+        return events
+
+    # Handle text content
+    if delta.content:
+        events.append(TextDeltaEvent(index=0, text=delta.content))
+
+    # Handle reasoning (OpenAI-compatible providers stream it as an extra field)
+    reasoning = getattr(delta, 'reasoning_content', None) or getattr(delta, 'reasoning', None)
+    if reasoning:
+        events.append(ReasoningDeltaEvent(index=0, text=reasoning))
+
+    # Handle tool call fragments, which are keyed by their position in the message
+    if delta.tool_calls:
+        for tool_call in delta.tool_calls:
+            function = tool_call.function
+            events.append(ToolCallDeltaEvent(
+                index=tool_call.index,
+                tool_call_id=tool_call.id,
+                tool_name=function.name if function else None,
+                input_delta=(function.arguments or "") if function else ""
+            ))
+
+    return events
+
+
+def cast_anthropic_event_to_events(event: Any) -> list[DeltaEvent]:
+    """Convert an Anthropic raw stream event to internal delta events."""
+    events: list[DeltaEvent] = []
+
+    match getattr(event, 'type', None):
+        case "content_block_start":
+            block = event.content_block
+            if block.type == "text" and block.text:
+                events.append(TextDeltaEvent(index=event.index, text=block.text))
+            elif block.type == "thinking" and block.thinking:
+                events.append(ReasoningDeltaEvent(index=event.index, text=block.thinking))
+            elif block.type == "tool_use":
+                # The id and name arrive up front; the input follows as JSON fragments
+                events.append(ToolCallDeltaEvent(
+                    index=event.index,
+                    tool_call_id=block.id,
+                    tool_name=block.name,
+                    input_delta=""
+                ))
+        case "content_block_delta":
+            delta = event.delta
+            match delta.type:
+                case "text_delta":
+                    events.append(TextDeltaEvent(index=event.index, text=delta.text))
+                case "thinking_delta":
+                    events.append(ReasoningDeltaEvent(index=event.index, text=delta.thinking))
+                case "input_json_delta":
+                    events.append(ToolCallDeltaEvent(index=event.index, input_delta=delta.partial_json))
+
+    return events
+
+
+def cast_openai_usage(usage: Any) -> Usage | None:
+    """Convert OpenAI usage (response or final stream chunk) to internal Usage."""
+    if usage is None:
+        return None
+
+    details = getattr(usage, 'prompt_tokens_details', None)
+    return Usage(
+        input_tokens=usage.prompt_tokens or 0,
+        output_tokens=usage.completion_tokens or 0,
+        cache_read_tokens=(getattr(details, 'cached_tokens', None) or 0) if details else 0,
+        # OpenAI writes to its prompt cache implicitly and does not report it
+        cache_write_tokens=0
+    )
+
+
+def cast_anthropic_usage(usage: Any) -> Usage | None:
+    """Convert Anthropic usage to internal Usage."""
+    if usage is None:
+        return None
+
+    # Anthropic reports uncached input separately from cache reads and writes
+    cache_read_tokens = getattr(usage, 'cache_read_input_tokens', None) or 0
+    cache_write_tokens = getattr(usage, 'cache_creation_input_tokens', None) or 0
+    return Usage(
+        input_tokens=(usage.input_tokens or 0) + cache_read_tokens + cache_write_tokens,
+        output_tokens=usage.output_tokens or 0,
+        cache_read_tokens=cache_read_tokens,
+        cache_write_tokens=cache_write_tokens
+    )
+
+
+OPENAI_FINISH_REASONS: dict[str, FinishReason] = {
+    "stop": FinishReason.STOP,
+    "length": FinishReason.LENGTH,
+    "tool_calls": FinishReason.TOOL_CALLS,
+    "function_call": FinishReason.TOOL_CALLS,
+    "content_filter": FinishReason.CONTENT_FILTER,
+}
+
+ANTHROPIC_STOP_REASONS: dict[str, FinishReason] = {
+    "end_turn": FinishReason.STOP,
+    "stop_sequence": FinishReason.STOP,
+    "max_tokens": FinishReason.LENGTH,
+    "tool_use": FinishReason.TOOL_CALLS,
+    "refusal": FinishReason.CONTENT_FILTER,
+}
+
+
+def cast_openai_finish_reason(finish_reason: str | None) -> FinishReason | None:
+    """Convert an OpenAI finish reason to internal FinishReason."""
+    if finish_reason is None:
+        return None
+    return OPENAI_FINISH_REASONS.get(finish_reason, FinishReason.OTHER)
+
+
+def cast_anthropic_finish_reason(stop_reason: str | None) -> FinishReason | None:
+    """Convert an Anthropic stop reason to internal FinishReason."""
+    if stop_reason is None:
+        return None
+    return ANTHROPIC_STOP_REASONS.get(stop_reason, FinishReason.OTHER)
+
+
+def cast_openai_response_to_result(response: Any, timings: Timings | None = None) -> GenerateTextResult:
+    """Convert an OpenAI chat completion to an internal GenerateTextResult."""
+    parts = cast_openai_response_to_parts(response)
+    return GenerateTextResult(
+        # Convert parts to text for backward compatibility
+        text=cast_parts_to_text(parts),
+        parts=parts,
+        usage=cast_openai_usage(getattr(response, 'usage', None)),
+        finish_reason=cast_openai_finish_reason(response.choices[0].finish_reason if response.choices else None),
+        request_id=getattr(response, '_request_id', None),
+        timings=timings
+    )
+
+
+def cast_anthropic_response_to_result(response: Any, timings: Timings | None = None) -> GenerateTextResult:
+    """Convert an Anthropic message to an internal GenerateTextResult."""
+    parts = cast_anthropic_response_to_parts(response)
+    return GenerateTextResult(
+        # Convert parts to text for backward compatibility
+        text=cast_parts_to_text(parts),
+        parts=parts,
+        usage=cast_anthropic_usage(getattr(response, 'usage', None)),
+        finish_reason=cast_anthropic_finish_reason(response.stop_reason),
+        request_id=getattr(response, '_request_id', None),
+        timings=timings
+    )
+
+
+def cast_openai_responses_usage(usage: Any) -> Usage | None:
+    """Convert OpenAI Responses API usage to internal Usage."""
+    if usage is None:
+        return None
+
+    details = getattr(usage, 'input_tokens_details', None)
+    return Usage(
+        input_tokens=usage.input_tokens or 0,
+        output_tokens=usage.output_tokens or 0,
+        cache_read_tokens=(getattr(details, 'cached_tokens', None) or 0) if details else 0,
+        cache_write_tokens=0
+    )
+
+
+def cast_openai_responses_response_to_result(response: Any, timings: Timings | None = None) -> GenerateTextResult:
+    """Convert an OpenAI Responses API response to an internal GenerateTextResult."""
+    parts: list[ContentPart] = []
+    for item in getattr(response, 'output', None) or ():
+        match item.type:
+            case "message":
+                for content in item.content:
+                    if content.type == "output_text":
+                        parts.append(_construct_text_part(content.text))
+            case "function_call":
+                parts.append(_construct_tool_call_part(item.call_id, item.name, item.arguments))
+            case "reasoning":
+                for summary in getattr(item, 'summary', None) or ():
+                    parts.append(_construct_reasoning_part(summary.text))
+    if not parts:
+        parts.append(_construct_text_part(""))
+
+    if response.status == "incomplete":
+        reason = getattr(response.incomplete_details, 'reason', None)
+        finish_reason = FinishReason.LENGTH if reason == "max_output_tokens" else FinishReason.CONTENT_FILTER if reason == "content_filter" else FinishReason.OTHER
+    elif any(part.type == PartType.TOOL_CALL for part in parts):
+        finish_reason = FinishReason.TOOL_CALLS
+    else:
+        finish_reason = FinishReason.STOP if response.status == "completed" else FinishReason.OTHER
+
+    return GenerateTextResult(
+        text=cast_parts_to_text(parts),
+        parts=parts,
+        usage=cast_openai_responses_usage(getattr(response, 'usage', None)),
+        finish_reason=finish_reason,
+        request_id=getattr(response, '_request_id', None),
+        timings=timings,
+        stored_response_id=response.id
+    )
@@ -0,0 +1,72 @@
+import base64
+from collections.abc import Iterable, Iterator
+from typing import Any
+import numpy as np
+from llms.models import EMBEDDING_LIMITS
+from llms.types.embeddings import EmbeddingLimits
+from llms.utilities.params import FIREWORKS_MODEL_PREFIX
+from llms.utilities.tokens import estimate_text_tokens
+
+
+def embedding_limits(model_name: str) -> EmbeddingLimits:
+    """The request limits of an embedding model; raises ValueError for other models."""
+    limits = EMBEDDING_LIMITS.get(model_name)
+    if limits is None:
+        raise ValueError(f"Model {model_name} is not an embedding model")
+    return limits
+
+
+def iter_embedding_chunks(texts: Iterable[str], limits: EmbeddingLimits) -> Iterator[tuple[int, list[str]]]:
+    """
+    Pack texts, in order, into chunks within a request's item and token limits.
+    Yields each chunk with the position of its first text; texts are read lazily,
+    so only one chunk is held at a time.
+    """
+    chunk: list[str] = []
+    tokens = 0
+    offset = 0
+    for text in texts:
+        text_tokens = estimate_text_tokens(text)
+        # A text over the token limit on its own still gets a request, for the provider to judge
+        if chunk and (len(chunk) == limits.max_items or tokens + text_tokens > limits.max_tokens):
+            yield offset, chunk
+            offset += len(chunk)
+            chunk = []
+            tokens = 0
+        chunk.append(text)
+        tokens += text_tokens
+    if chunk:
+        yield offset, chunk
+
+
+def build_openai_embedding_params(model_name: str, texts: list[str], dimensions: int | None = None) -> dict[str, Any]:
+    """Build the keyword arguments for an OpenAI embeddings call."""
+    # Base64 float32 decodes straight into an array, without parsing a JSON number per value
+    api_params: dict[str, Any] = {"model": model_name, "input": texts, "encoding_format": "base64"}
+    if dimensions is not None:
+        api_params["dimensions"] = dimensions
+    return api_params
+
+
+def build_fireworks_embedding_params(model_name: str, texts: list[str], dimensions: int | None = None) -> dict[str, Any]:
+    """Build the keyword arguments for a Fireworks embeddings call."""
+    # Fireworks serves third-party embedding models under their publisher's name
+    qualified_name = model_name if "/" in model_name else FIREWORKS_MODEL_PREFIX + model_name
+    return build_openai_embedding_params(qualified_name, texts, dimensions)
+
+
+def cast_openai_embeddings(data: list[Any], count: int) -> np.ndarray:
+    """Cast the `data` of an OpenAI-format embeddings response to a float32 matrix in input order."""
+    if len(data) != count:
+        raise ValueError(f"Expected {count} embeddings, got {len(data)}")
+    vectors: np.ndarray | None = None
+    for item in data:
+        # Servers that ignore the requested encoding return plain floats
+        if isinstance(item.embedding, str):
+            vector = np.frombuffer(base64.b64decode(item.embedding), dtype=np.float32)
+        else:
+            vector = np.asarray(item.embedding, dtype=np.float32)
+        if vectors is None:
+            vectors = np.empty((count, len(vector)), dtype=np.float32)
+        vectors[item.index] = vector
+    return vectors if vectors is not None else np.empty((0, 0), dtype=np.float32)
@@ -0,0 +1,39 @@
+import functools
+import json
+from pydantic import BaseModel
+from llms.types.objects import ObjectSchema
+from llms.types.parts import TextPart, PartType
+from llms.types.results import GenerateTextResult, GenerateObjectResult
+
+
+@functools.cache
+def object_schema(model: type[BaseModel]) -> ObjectSchema:
+    """The ObjectSchema of a pydantic model, built once per model."""
+    return ObjectSchema(
+        model=model,
+        name=model.__name__,
+        description=(model.__doc__ or "").strip(),
+        json_schema=model.model_json_schema()
+    )
+
+
+def cast_result_to_object(result: GenerateTextResult, output_schema: ObjectSchema) -> GenerateObjectResult:
+    """
+    Validate the object in a structured-output reply: the forced tool call's input
+    (Anthropic) or the reply text (OpenAI, Fireworks). The returned result holds the
+    object's JSON as its only part, so it can be recorded like any text reply.
+    """
+    tool_call = next(
+        (part for part in result.parts if part.type == PartType.TOOL_CALL and part.tool_name == output_schema.name),
+        None
+    )
+    if tool_call is None:
+        text = result.text
+    else:
+        text = tool_call.input if isinstance(tool_call.input, str) else json.dumps(tool_call.input)
+
+    instance = output_schema.model.model_validate_json(text)
+    return GenerateObjectResult(
+        **{**dict(result), "text": text, "parts": [TextPart(text=text, provider_options={})]},
+        object=instance
+    )
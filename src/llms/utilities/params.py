@@ -0,0 +1,179 @@
+import hashlib
+from typing import Any
+from llms.conversation import Conversation
+from llms.types.messages import ModelMessage
+from llms.types.objects import ObjectSchema
+from llms.types.tools import Tool
+from llms.utilities.casting import (
+    cast_messages_to_openai,
+    cast_message_to_anthropic,
+    cast_message_to_openai_responses,
+    cast_tool_to_openai,
+    cast_tool_to_openai_responses,
+    cast_tool_to_anthropic,
+    cast_object_schema_to_openai,
+    cast_object_schema_to_openai_responses,
+    cast_object_schema_to_anthropic
+)
+
+
+FIREWORKS_MODEL_PREFIX = "accounts/fireworks/models/"
+
+# Anthropic's only cache type; entries live for five minutes after their last read
+ANTHROPIC_CACHE_CONTROL: dict[str, str] = {"type": "ephemeral"}
+
+
+def derive_prompt_cache_key(model_name: str, messages: list[ModelMessage] | Conversation) -> str:
+    """
+    Derive a prompt-cache routing key from the model and the system prompt, the
+    part of the request that stays stable across turns and conversations.
+    """
+    digest = hashlib.sha256(model_name.encode("utf-8"))
+    for msg in messages:
+        if msg.role.value == "system":
+            digest.update(msg.content.encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def build_openai_params(
+    model_name: str,
+    messages: list[ModelMessage] | Conversation,
+    prompt_caching: bool = False,
+    prompt_cache_key: str | None = None,
+    tools: list[Tool] | None = None,
+    output_schema: ObjectSchema | None = None
+) -> dict[str, Any]:
+    """Build the keyword arguments for an OpenAI chat completions call."""
+    api_params: dict[str, Any] = {
+        "model": model_name,
+        # A Conversation keeps its cast messages, so only new turns are cast
+        "messages": messages.openai_messages() if isinstance(messages, Conversation) else cast_messages_to_openai(messages)
+    }
+
+    if tools:
+        api_params["tools"] = [cast_tool_to_openai(tool) for tool in tools]
+    if output_schema is not None:
+        api_params["response_format"] = cast_object_schema_to_openai(output_schema)
+
+    # OpenAI caches prefixes automatically; the key routes similar prompts to the same cache
+    if prompt_caching:
+        api_params["prompt_cache_key"] = prompt_cache_key or derive_prompt_cache_key(model_name, messages)
+
+    return api_params
+
+
+def build_fireworks_params(
+    model_name: str,
+    messages: list[ModelMessage] | Conversation,
+    prompt_caching: bool = False,
+    prompt_cache_key: str | None = None,
+    tools: list[Tool] | None = None,
+    output_schema: ObjectSchema | None = None
+) -> dict[str, Any]:
+    """Build the keyword arguments for a Fireworks chat completions call."""
+    # Fireworks uses OpenAI-compatible API format with fully qualified model names
+    api_params = build_openai_params(FIREWORKS_MODEL_PREFIX + model_name, messages, tools=tools, output_schema=output_schema)
+
+    # Fireworks caches prefixes per replica; session affinity pins a prompt family to one replica
+    if prompt_caching:
+        api_params["extra_headers"] = {
+            "x-session-affinity": prompt_cache_key or derive_prompt_cache_key(model_name, messages)
+        }
+
+    return api_params
+
+
+def build_anthropic_params(
+    model_name: str,
+    messages: list[ModelMessage] | Conversation,
+    prompt_caching: bool = False,
+    prompt_cache_key: str | None = None,
+    tools: list[Tool] | None = None,
+    output_schema: ObjectSchema | None = None
+) -> dict[str, Any]:
+    """
+    Build the keyword arguments for an Anthropic messages call.
+
+    With prompt caching, cache breakpoints go on the system prompt and on the last
+    stable message, i.e. the one before the newest turn. The next turn then reads
+    the whole shared prefix from the cache. Anthropic has no cache key, so
+    `prompt_cache_key` is ignored.
+    """
+    # Note: Anthropic separates system messages from the messages array
+    if isinstance(messages, Conversation):
+        system, anthropic_messages = messages.anthropic_messages()
+    else:
+        system_messages = [msg for msg in messages if msg.role.value == "system"]
+        system = system_messages[0].content if system_messages else None
+        anthropic_messages = [cast_message_to_anthropic(msg) for msg in messages if msg.role.value != "system"]
+
+    if prompt_caching and len(anthropic_messages) >= 2:
+        anthropic_messages[-2] = _with_cache_control(anthropic_messages[-2])
+
+    api_params: dict[str, Any] = {
+        "model": model_name,
+        "max_tokens": 1024,  # Required parameter for Anthropic
+        "messages": anthropic_messages
+    }
+    if tools:
+        api_params["tools"] = [cast_tool_to_anthropic(tool) for tool in tools]
+    # Anthropic has no JSON mode; forcing a tool whose input is the object has the same effect
+    if output_schema is not None:
+        api_params["tools"] = [*api_params.get("tools", []), cast_object_schema_to_anthropic(output_schema)]
+        api_params["tool_choice"] = {"type": "tool", "name": output_schema.name}
+
+    # Add system message if present
+    if system is not None:
+        if prompt_caching:
+            api_params["system"] = [{
+                "type": "text",
+                "text": system,
+                "cache_control": ANTHROPIC_CACHE_CONTROL
+            }]
+        else:
+            api_params["system"] = system
+
+    return api_params
+
+
+def build_openai_responses_params(
+    model_name: str,
+    conversation: Conversation,
+    prompt_caching: bool = False,
+    prompt_cache_key: str | None = None,
+    tools: list[Tool] | None = None,
+    output_schema: ObjectSchema | None = None
+) -> dict[str, Any]:
+    """
+    Build the keyword arguments for an OpenAI Responses call that continues a
+    Conversation's server-side state: only the messages added since its last
+    stored response are sent.
+    """
+    previous_response_id, messages = conversation.unstored_messages()
+    api_params: dict[str, Any] = {
+        "model": model_name,
+        "input": [item for msg in messages for item in cast_message_to_openai_responses(msg)],
+        "store": True
+    }
+    if previous_response_id is not None:
+        api_params["previous_response_id"] = previous_response_id
+    if tools:
+        api_params["tools"] = [cast_tool_to_openai_responses(tool) for tool in tools]
+    if output_schema is not None:
+        api_params["text"] = {"format": cast_object_schema_to_openai_responses(output_schema)}
+
+    if prompt_caching:
+        api_params["prompt_cache_key"] = prompt_cache_key or derive_prompt_cache_key(model_name, conversation)
+
+    return api_params
+
+
+def _with_cache_control(anthropic_message: dict[str, Any]) -> dict[str, Any]:
+    # Breakpoints attach to content blocks, so string content is expanded to a block
+    content = anthropic_message["content"]
+    blocks = [{"type": "text", "text": content}] if isinstance(content, str) else list(content)
+    if not blocks:
+        return anthropic_message
+
+    blocks[-1] = {**blocks[-1], "cache_control": ANTHROPIC_CACHE_CONTROL}
+    return {**anthropic_message, "content": blocks}
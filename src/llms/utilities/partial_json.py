@@ -0,0 +1,230 @@
+import json
+import re
+from typing import Any
+
+
+# Runs the parser consumes without stopping at every character
+_STRING_RUN = re.compile(r'[^"\\]+')
+_SCALAR_RUN = re.compile(r'[-+.0-9a-zA-Z]+')
+_WHITESPACE = re.compile(r'[ \t\n\r]+')
+
+_VALUE = 0            # Expecting a value
+_VALUE_OR_END = 1     # After '[': a value or ']'
+_KEY = 2              # After ',' in an object: a key
+_KEY_OR_END = 3       # After '{': a key or '}'
+_COLON = 4            # After a key
+_COMMA_OR_END = 5     # After a value inside a container
+_DONE = 6             # The top-level value is complete
+
+_MISSING = object()
+
+
+class PartialJSONParser:
+    """
+    Parses a JSON document fed in fragments, e.g. the deltas of a streamed
+    completion, and exposes the value parsed so far.
+
+    Every character is scanned once: containers are built in place as they open,
+    and complete values are attached as they close, so parsing a whole stream is
+    linear in its length rather than re-parsing the buffer per fragment. The
+    string being streamed is extended in place at each snapshot rather than
+    re-joined from its start.
+    """
+
+    def __init__(self):
+        self._root: Any = _MISSING
+        self._stack: list[dict[str, Any] | list[Any]] = []
+        # The key each open object is waiting to assign
+        self._keys: list[str | None] = []
+        self._state = _VALUE
+        # Fragments of the open string not yet in a snapshot, the part that is,
+        # and whether it is an object key
+        self._string: list[str] | None = None
+        self._string_prefix = ""
+        self._string_is_key = False
+        self._string_has_escapes = False
+        # Whether the open string already has a slot in its array
+        self._string_shown = False
+        self._escape: str | None = None
+        # Characters of the open number or literal
+        self._scalar: list[str] | None = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the top-level value is complete."""
+        return self._state == _DONE
+
+    def feed(self, fragment: str) -> None:
+        """Parse the next fragment of the document."""
+        index, end = 0, len(fragment)
+        while index < end:
+            if self._string is not None:
+                index = self._feed_string(fragment, index)
+                continue
+            if self._scalar is not None:
+                run = _SCALAR_RUN.match(fragment, index)
+                if run is not None:
+                    self._scalar.append(run.group())
+                    index = run.end()
+                    continue
+                # Any other character ends the number or literal
+                self._close_scalar()
+                continue
+
+            whitespace = _WHITESPACE.match(fragment, index)
+            if whitespace is not None:
+                index = whitespace.end()
+                continue
+            self._feed_structure(fragment[index], index)
+            index += 1
+
+    def partial(self) -> Any:
+        """
+        The value parsed so far, or None before any value has started. Objects and
+        arrays hold their complete members plus the string being streamed; numbers
+        and literals appear once complete. The returned containers are the parser's
+        own and keep filling as more fragments are fed.
+        """
+        if self._string is not None and not self._string_is_key:
+            self._attach_open_string()
+        return None if self._root is _MISSING else self._root
+
+    def finish(self) -> Any:
+        """Complete the document and return its value; raises ValueError if it is incomplete."""
+        if self._scalar is not None and not self._stack:
+            self._close_scalar()
+        if self._state != _DONE:
+            raise ValueError("Incomplete JSON document")
+        return self._root
+
+    def _feed_string(self, fragment: str, index: int) -> int:
+        if self._escape is not None:
+            self._escape += fragment[index]
+            # A \u escape is complete with four hex digits
+            if self._escape[1] != "u" or len(self._escape) == 6:
+                self._string.append(json.loads(f'"{self._escape}"'))
+                self._string_has_escapes = True
+                self._escape = None
+            return index + 1
+
+        run = _STRING_RUN.match(fragment, index)
+        if run is not None:
+            self._string.append(run.group())
+            return run.end()
+        if fragment[index] == "\\":
+            self._escape = "\\"
+        else:
+            self._close_string()
+        return index + 1
+
+    def _feed_structure(self, char: str, index: int) -> None:
+        state = self._state
+        if state in (_VALUE, _VALUE_OR_END):
+            if char == "{":
+                self._open({}, _KEY_OR_END)
+            elif char == "[":
+                self._open([], _VALUE_OR_END)
+            elif char == '"':
+                self._open_string(is_key=False)
+            elif char == "]" and state == _VALUE_OR_END:
+                self._close_container()
+            elif char == "-" or char.isalnum():
+                self._scalar = [char]
+            else:
+                self._invalid(char, index)
+        elif state in (_KEY, _KEY_OR_END):
+            if char == '"':
+                self._open_string(is_key=True)
+            elif char == "}" and state == _KEY_OR_END:
+                self._close_container()
+            else:
+                self._invalid(char, index)
+        elif state == _COLON and char == ":":
+            self._state = _VALUE
+        elif state == _COMMA_OR_END and char == ",":
+            self._state = _KEY if isinstance(self._stack[-1], dict) else _VALUE
+        elif state == _COMMA_OR_END and char == ("}" if isinstance(self._stack[-1], dict) else "]"):
+            self._close_container()
+        else:
+            self._invalid(char, index)
+
+    def _open(self, container: dict[str, Any] | list[Any], state: int) -> None:
+        self._attach(container)
+        self._stack.append(container)
+        self._keys.append(None)
+        self._state = state
+
+    def _close_container(self) -> None:
+        self._stack.pop()
+        self._keys.pop()
+        self._state = _COMMA_OR_END if self._stack else _DONE
+
+    def _open_string(self, is_key: bool) -> None:
+        self._string = []
+        self._string_prefix = ""
+        self._string_is_key = is_key
+        self._string_has_escapes = False
+        self._string_shown = False
+
+    def _close_string(self) -> None:
+        value = self._string_prefix + "".join(self._string)
+        self._string_prefix = ""
+        # Surrogate pairs arrive as two separate \u escapes
+        if self._string_has_escapes:
+            value = value.encode("utf-16", "surrogatepass").decode("utf-16")
+        self._string = None
+        if self._string_is_key:
+            self._keys[-1] = value
+            self._state = _COLON
+        else:
+            self._attach(value)
+            self._state = _COMMA_OR_END if self._stack else _DONE
+
+    def _attach_open_string(self) -> None:
+        # Drop the parser's references to the last snapshot first: CPython then
+        # grows the string in place, keeping a stream of snapshots linear
+        value, self._string_prefix = self._string_prefix, ""
+        if not self._stack:
+            self._root = _MISSING
+        elif isinstance(self._stack[-1], dict):
+            self._stack[-1][self._keys[-1]] = None
+        elif self._string_shown:
+            self._stack[-1][-1] = None
+        value += "".join(self._string)
+        self._string.clear()
+        self._string_prefix = value
+        if not self._stack:
+            self._root = value
+        elif isinstance(self._stack[-1], dict):
+            self._stack[-1][self._keys[-1]] = value
+        # An array gets a slot for the open string when it first shows
+        elif self._string_shown:
+            self._stack[-1][-1] = value
+        else:
+            self._stack[-1].append(value)
+            self._string_shown = True
+
+    def _close_scalar(self) -> None:
+        raw = "".join(self._scalar)
+        self._scalar = None
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            raise ValueError(f"Invalid JSON value {raw!r}") from None
+        self._attach(value)
+        self._state = _COMMA_OR_END if self._stack else _DONE
+
+    def _attach(self, value: Any) -> None:
+        if not self._stack:
+            self._root = value
+        elif isinstance(self._stack[-1], dict):
+            self._stack[-1][self._keys[-1]] = value
+        elif self._string_shown:
+            # Replace the snapshot of the string that just closed
+            self._stack[-1][-1] = value
+            self._string_shown = False
+        else:
+            self._stack[-1].append(value)
+
+    def _invalid(self, char: str, index: int) -> None:
+        raise ValueError(f"Unexpected {char!r} in JSON at fragment offset {index}")
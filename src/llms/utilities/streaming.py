@@ -0,0 +1,106 @@
+import json
+from typing import Any
+from llms.types.parts import TextPart, ReasoningPart, ToolCallPart, ContentPart, PartType
+from llms.types.enums import FinishReason
+from llms.types.results import GenerateTextResult, Usage, Timings
+from llms.types.streams import DeltaEvent, StreamEventType
+from llms.utilities.casting import cast_parts_to_text
+
+
+class _PartBuffer:
+    """Fragments collected for a single part of a streamed response."""
+    __slots__ = ("event_type", "fragments", "tool_call_id", "tool_name")
+
+    def __init__(self, event_type: StreamEventType):
+        self.event_type = event_type
+        self.fragments: list[str] = []
+        self.tool_call_id: str | None = None
+        self.tool_name: str | None = None
+
+
+class StreamAccumulator:
+    """
+    Incrementally aggregates delta events into the final list of Parts.
+
+    Each delta is appended to the fragment list of its part in O(1); fragments are
+    joined exactly once when the result is built, so aggregation stays linear in
+    the length of the stream. Parts are ordered by their first delta.
+    """
+
+    def __init__(self, parse_tool_input: bool = False):
+        """
+        Args:
+            parse_tool_input: Whether to decode the accumulated tool call arguments
+                as JSON (Anthropic) or keep them as a raw string (OpenAI).
+        """
+        self.parse_tool_input = parse_tool_input
+        # Set by the handler from the provider's usage, stop and header data
+        self.usage: Usage | None = None
+        self.finish_reason: FinishReason | None = None
+        self.request_id: str | None = None
+        self._buffers: dict[tuple[StreamEventType, int], _PartBuffer] = {}
+
+    def add(self, event: DeltaEvent) -> None:
+        """Record a single delta event."""
+        key = (event.type, event.index)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = _PartBuffer(event.type)
+
+        if event.type == StreamEventType.TOOL_CALL_DELTA:
+            if event.tool_call_id:
+                buffer.tool_call_id = event.tool_call_id
+            if event.tool_name:
+                buffer.tool_name = event.tool_name
+            buffer.fragments.append(event.input_delta)
+        else:
+            buffer.fragments.append(event.text)
+
+    def build_parts(self) -> list[ContentPart]:
+        """Join the buffered fragments into Parts."""
+        parts: list[ContentPart] = []
+
+        for buffer in self._buffers.values():
+            joined = "".join(buffer.fragments)
+            match buffer.event_type:
+                case StreamEventType.TEXT_DELTA:
+                    parts.append(TextPart(type=PartType.TEXT, text=joined, provider_options={}))
+                case StreamEventType.REASONING_DELTA:
+                    parts.append(ReasoningPart(type=PartType.REASONING, text=joined, provider_options={}))
+                case StreamEventType.TOOL_CALL_DELTA:
+                    parts.append(ToolCallPart(
+                        type=PartType.TOOL_CALL,
+                        tool_call_id=buffer.tool_call_id or "",
+                        tool_name=buffer.tool_name or "",
+                        input=self._decode_tool_input(joined),
+                        provider_options={},
+                        provider_executed=None
+                    ))
+
+        # If no parts were streamed, add an empty text part
+        if not parts:
+            parts.append(TextPart(type=PartType.TEXT, text="", provider_options={}))
+
+        return parts
+
+    def build_result(self, timings: Timings | None = None) -> GenerateTextResult:
+        """Build the aggregated GenerateTextResult."""
+        parts = self.build_parts()
+        return GenerateTextResult(
+            text=cast_parts_to_text(parts),
+            parts=parts,
+            usage=self.usage,
+            finish_reason=self.finish_reason,
+            request_id=self.request_id,
+            timings=timings
+        )
+
+    def _decode_tool_input(self, raw: str) -> Any:
+        if not self.parse_tool_input:
+            return raw
+        if not raw:
+            return {}
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return raw
@@ -0,0 +1,82 @@
+import time
+from contextvars import ContextVar, Token
+from typing import Any
+from llms.types.results import Timings
+
+
+# The Timings of the request currently being sent in this context, and when it was sent
+_SENDING: ContextVar[tuple[Timings, float] | None] = ContextVar("llms_sending", default=None)
+
+
+def record_first_byte(response: Any) -> None:
+    """
+    httpx response hook, installed on the clients' HTTP clients. It runs once the
+    response headers arrive and before the body is read, which is the only point
+    where the time to first byte of a non-streamed request can be observed.
+    """
+    sending = _SENDING.get()
+    if sending is not None:
+        timings, sent_at = sending
+        timings.time_to_first_byte = time.perf_counter() - sent_at
+
+
+async def arecord_first_byte(response: Any) -> None:
+    """Async variant of record_first_byte for httpx.AsyncClient."""
+    record_first_byte(response)
+
+
+class CallTimer:
+    """
+    Stamps the phases of one provider call onto its Timings. Handlers call
+    `messages_cast` after building the request, wrap the SDK call in `request`,
+    and call `finished` once the result is built.
+    """
+    __slots__ = ("timings", "_started", "_mark", "_sent_at", "_token", "_chunk_casting")
+
+    def __init__(self, timings: Timings | None = None):
+        self.timings = timings if timings is not None else Timings()
+        self._started = self._mark = self._sent_at = time.perf_counter()
+        self._token: Token | None = None
+        self._chunk_casting = 0.0
+
+    def messages_cast(self) -> None:
+        now = time.perf_counter()
+        self.timings.message_casting = now - self._mark
+        self._mark = now
+
+    def request(self) -> "CallTimer":
+        """Time the SDK call in a `with` block; for streams this covers opening the stream only."""
+        return self
+
+    # A plain context manager rather than @contextmanager: this runs on every call
+    def __enter__(self) -> None:
+        self._sent_at = time.perf_counter()
+        self.timings.waiting = self._sent_at - self._mark
+        self._token = _SENDING.set((self.timings, self._sent_at))
+
+    def __exit__(self, *exc_info: object) -> None:
+        _SENDING.reset(self._token)
+        self._mark = time.perf_counter()
+        self.timings.request = self._mark - self._sent_at
+
+    def stream_opened(self) -> None:
+        """A stream's response headers arrived when the SDK returned the stream."""
+        if self.timings.time_to_first_byte is None:
+            self.timings.time_to_first_byte = self.timings.request
+
+    def chunk_received(self) -> None:
+        self._mark = time.perf_counter()
+
+    def chunk_cast(self) -> None:
+        # Summed locally; Timings is only written once, when the stream is finished
+        self._chunk_casting += time.perf_counter() - self._mark
+
+    def stream_closed(self) -> None:
+        self._mark = time.perf_counter()
+        self.timings.request = self._mark - self._sent_at
+
+    def finished(self) -> Timings:
+        now = time.perf_counter()
+        self.timings.response_casting = self._chunk_casting + now - self._mark
+        self.timings.total = now - self._started
+        return self.timings
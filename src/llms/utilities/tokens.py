@@ -0,0 +1,80 @@
+from typing import Any
+from llms.types.messages import ModelMessage
+from llms.types.parts import PartType
+
+
+# A rough average for English text across current tokenizers
+CHARS_PER_TOKEN = 4
+# Fixed per-message framing cost (role markers and separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+# Images and documents are billed by dimensions or pages, not by their base64 length
+ATTACHMENT_TOKENS = 1000
+
+_ATTACHMENT_TYPES = {"image_url", "image", "document", "file", "input_image", "input_file"}
+
+
+def estimate_text_tokens(text: str) -> int:
+    """Estimate the token count of a string."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def estimate_content_tokens(content: Any) -> int:
+    """Estimate the token count of casted message content (a string or content blocks)."""
+    if content is None:
+        return 0
+    if isinstance(content, str):
+        return estimate_text_tokens(content)
+
+    tokens = 0
+    for block in content:
+        if not isinstance(block, dict):
+            tokens += estimate_text_tokens(str(block))
+        elif block.get("type") in _ATTACHMENT_TYPES:
+            tokens += ATTACHMENT_TOKENS
+        elif "text" in block:
+            tokens += estimate_text_tokens(block["text"])
+        elif "content" in block:
+            # Tool results nest their own content
+            tokens += estimate_content_tokens(block["content"])
+        elif "input" in block:
+            tokens += estimate_text_tokens(str(block["input"]))
+    return tokens
+
+
+def estimate_message_tokens(message: dict[str, Any]) -> int:
+    """Estimate the token count of one casted (OpenAI or Anthropic format) message."""
+    tokens = MESSAGE_OVERHEAD_TOKENS + estimate_content_tokens(message.get("content"))
+    for tool_call in message.get("tool_calls") or []:
+        function = tool_call.get("function", {})
+        tokens += estimate_text_tokens(function.get("name", "")) + estimate_text_tokens(str(function.get("arguments", "")))
+    return tokens
+
+
+def estimate_request_tokens(api_params: dict[str, Any]) -> int:
+    """Estimate the prompt tokens of a provider request built by llms.utilities.params."""
+    tokens = sum(estimate_message_tokens(message) for message in api_params.get("messages", []))
+    # OpenAI Responses calls send input items; history stored server-side is not counted
+    tokens += sum(estimate_message_tokens(item) for item in api_params.get("input", []))
+    # Anthropic carries the system prompt outside the messages array
+    if "system" in api_params:
+        tokens += MESSAGE_OVERHEAD_TOKENS + estimate_content_tokens(api_params["system"])
+    return tokens
+
+
+def estimate_model_message_tokens(message: ModelMessage) -> int:
+    """Estimate the token count of an internal ModelMessage without casting it."""
+    if isinstance(message.content, str):
+        return MESSAGE_OVERHEAD_TOKENS + estimate_text_tokens(message.content)
+
+    tokens = MESSAGE_OVERHEAD_TOKENS
+    for part in message.content:
+        match part.type:
+            case PartType.TEXT | PartType.REASONING:
+                tokens += estimate_text_tokens(part.text)
+            case PartType.IMAGE | PartType.FILE:
+                tokens += ATTACHMENT_TOKENS
+            case PartType.TOOL_CALL:
+                tokens += estimate_text_tokens(part.tool_name) + estimate_text_tokens(str(part.input))
+            case PartType.TOOL_RESULT:
+                tokens += estimate_text_tokens(str(part.output))
+    return tokens
@@ -0,0 +1,70 @@
+import json
+import time
+from collections.abc import Iterable
+from typing import Any
+from llms.types.messages import ToolModelMessage
+from llms.types.parts import ToolCallPart, ToolResultPart, PartType
+from llms.types.results import GenerateTextResult, ToolExecution, Step, Usage
+from llms.types.tools import Tool
+
+
+def tool_calls(result: GenerateTextResult) -> list[ToolCallPart]:
+    """The tool calls a reply asks for, in order."""
+    return [part for part in result.parts if part.type == PartType.TOOL_CALL]
+
+
+def tool_arguments(call: ToolCallPart) -> dict[str, Any]:
+    """The keyword arguments of a tool call; OpenAI sends them as JSON text, Anthropic as an object."""
+    if isinstance(call.input, str):
+        return json.loads(call.input) if call.input else {}
+    return dict(call.input or {})
+
+
+def tool_execution(call: ToolCallPart, started: float, output: Any = None, error: str | None = None) -> ToolExecution:
+    return ToolExecution(
+        tool_call_id=call.tool_call_id,
+        tool_name=call.tool_name,
+        # The model reads the error in place of the output
+        output=f"Error: {error}" if error is not None else output,
+        error=error,
+        seconds=time.perf_counter() - started
+    )
+
+
+def unknown_tool_execution(call: ToolCallPart, started: float) -> ToolExecution:
+    return tool_execution(call, started, error=f"Unknown tool {call.tool_name}")
+
+
+def timed_out_execution(call: ToolCallPart, tool: Tool, started: float) -> ToolExecution:
+    return tool_execution(call, started, error=f"Tool {tool.name} timed out after {tool.timeout}s")
+
+
+def failed_execution(call: ToolCallPart, error: Exception, started: float) -> ToolExecution:
+    return tool_execution(call, started, error=f"{type(error).__name__}: {error}")
+
+
+def tool_results_message(executions: Iterable[ToolExecution]) -> ToolModelMessage:
+    """The message that sends a step's tool outputs back to the model."""
+    return ToolModelMessage(content=[
+        ToolResultPart(
+            tool_call_id=execution.tool_call_id,
+            tool_name=execution.tool_name,
+            output=execution.output,
+            provider_options={},
+            provider_executed=False
+        )
+        for execution in executions
+    ])
+
+
+def total_usage(steps: list[Step]) -> Usage | None:
+    """The usage of all model calls of a tool loop."""
+    usages = [step.result.usage for step in steps if step.result.usage is not None]
+    if not usages:
+        return None
+    return Usage(
+        input_tokens=sum(usage.input_tokens for usage in usages),
+        output_tokens=sum(usage.output_tokens for usage in usages),
+        cache_read_tokens=sum(usage.cache_read_tokens for usage in usages),
+        cache_write_tokens=sum(usage.cache_write_tokens for usage in usages)
+    )
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import threading
+from collections.abc import Awaitable, Callable, Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, TypeVar
+import httpx
+import pytest
+from anthropic import AsyncAnthropic
+from openai import AsyncOpenAI
+from llms.types.parts import ReasoningPart, TextPart
+from llms.types.results import GenerateTextResult
+
+
+SDKClient = TypeVar("SDKClient")
+Respond = Callable[[httpx.Request], httpx.Response | Awaitable[httpx.Response]]
+# Builds the reply to a parsed request body: a dict is sent as JSON, bytes as an event
+# stream, and an int as that error status, which the SDKs are told not to retry
+Reply = Callable[[dict[str, Any], BaseHTTPRequestHandler], dict[str, Any] | bytes | int]
+
+
+def _completion(
+    content: str | None = "Hi",
+    model: str = "gpt-4o",
+    finish_reason: str = "stop",
+    tool_calls: list[dict[str, Any]] | None = None,
+    usage: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    message: dict[str, Any] = {"role": "assistant", "content": content}
+    if tool_calls is not None:
+        message["tool_calls"] = tool_calls
+    body: dict[str, Any] = {
+        "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": model,
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}]
+    }
+    if usage is not None:
+        body["usage"] = usage
+    return body
+
+
+@pytest.fixture
+def completion() -> Callable[..., dict[str, Any]]:
+    """Build an OpenAI chat.completion body with a single choice."""
+    return _completion
+
+
+@pytest.fixture
+def mock_client() -> Iterator[Callable[..., Any]]:
+    """
+    Build a provider SDK client, e.g. `mock_client(OpenAI, respond)`, whose requests
+    are answered by `respond` (or a ready httpx.MockTransport) instead of the network.
+    Keyword arguments go to the SDK client. The clients are closed after the test.
+    """
+    http_clients: list[httpx.Client | httpx.AsyncClient] = []
+
+    def build(sdk_class: type[SDKClient], respond: Respond | httpx.MockTransport, **options: Any) -> SDKClient:
+        transport = respond if isinstance(respond, httpx.MockTransport) else httpx.MockTransport(respond)
+        is_async = issubclass(sdk_class, (AsyncOpenAI, AsyncAnthropic))
+        http_client = httpx.AsyncClient(transport=transport) if is_async else httpx.Client(transport=transport)
+        http_clients.append(http_client)
+        return sdk_class(api_key="test", http_client=http_client, **options)
+
+    yield build
+    for http_client in http_clients:
+        if isinstance(http_client, httpx.AsyncClient):
+            asyncio.run(http_client.aclose())
+        else:
+            http_client.close()
+
+
+@pytest.fixture
+def make_result() -> Callable[..., GenerateTextResult]:
+    """Build a GenerateTextResult with `text`, after a reasoning part if `reasoning` is given."""
+    def build(text: str, reasoning: str | None = None) -> GenerateTextResult:
+        parts = [TextPart(text=text, provider_options={})]
+        if reasoning is not None:
+            parts.insert(0, ReasoningPart(text=reasoning, provider_options={}))
+        return GenerateTextResult(text=text, parts=parts)
+
+    return build
+
+
+class _ReplyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_ReplyServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        reply = self.server.reply(json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0)))), self)
+        status = 200
+        if isinstance(reply, int):
+            status, reply = reply, {"error": {"message": f"Status {reply}"}}
+        body = reply if isinstance(reply, bytes) else json.dumps(reply).encode()
+        self.send_response(status)
+        if status != 200:
+            self.send_header("x-should-retry", "false")
+        self.send_header("Content-Type", "text/event-stream" if isinstance(reply, bytes) else "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _ReplyServer(ThreadingHTTPServer):
+    daemon_threads = True
+    reply: Reply
+
+
+@pytest.fixture
+def serve() -> Iterator[Callable[..., list[str]]]:
+    """
+    Start local HTTP servers answering POSTs with `reply(request_body, handler)`, for
+    tests that need real sockets; returns their OpenAI-style base URLs.
+    """
+    servers: list[_ReplyServer] = []
+
+    def start(reply: Reply, count: int = 1) -> list[str]:
+        for _ in range(count):
+            server = _ReplyServer(("127.0.0.1", 0), _ReplyHandler)
+            server.reply = reply
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            servers.append(server)
+        return [f"http://127.0.0.1:{server.server_address[1]}/v1" for server in servers[-count:]]
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,280 @@
+import asyncio
+import json
+import threading
+import tomllib
+from collections.abc import Callable, Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+import httpx
+import pytest
+from packaging.requirements import Requirement
+from anthropic import Anthropic, AsyncAnthropic, APIConnectionError, BadRequestError
+from llms._async.client import AsyncLLM
+from llms._sync.client import SyncLLM
+from llms.types.batches import BatchRequest, BatchJob, BatchResult, BatchStatus
+from llms.types.enums import Role, Provider, FinishReason
+from llms.types.messages import ModelMessage
+
+
+def make_requests(model_name: str, count: int) -> Iterator[BatchRequest]:
+    for index in range(count):
+        yield BatchRequest(
+            custom_id=f"request-{index}",
+            model_name=model_name,
+            messages=[ModelMessage(role=Role.USER, content=f"Question {index}")]
+        )
+
+
+def _text(content: str | list[dict[str, Any]]) -> str:
+    return content if isinstance(content, str) else content[0]["text"]
+
+
+class _BatchServer(ThreadingHTTPServer):
+    daemon_threads = True
+    uploads: dict[str, list[dict[str, Any]]]
+    batches: dict[str, list[dict[str, Any]]]
+
+
+class _BatchHandler(BaseHTTPRequestHandler):
+    """A stand-in for the OpenAI Batch and Anthropic Message Batches APIs that completes every job on first poll."""
+    server: _BatchServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding") != "chunked":
+            return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b""
+        while size := int(self.rfile.readline().strip(), 16):
+            body += self.rfile.read(size)
+            self.rfile.readline()
+        self.rfile.readline()
+        return body
+
+    def _send(self, payload: dict[str, Any] | bytes) -> None:
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self) -> None:
+        body = self._read_body()
+        if self.path == "/v1/files":
+            file_id = f"file-{len(self.server.uploads)}"
+            self.server.uploads[file_id] = [
+                json.loads(line) for line in body.splitlines() if line.startswith(b'{"custom_id"')
+            ]
+            self._send({"id": file_id, "object": "file", "bytes": len(body), "created_at": 0,
+                        "filename": "batch.jsonl", "purpose": "batch", "status": "processed"})
+        elif self.path == "/v1/batches":
+            params = json.loads(body)
+            batch_id = f"batch_{len(self.server.batches)}"
+            self.server.batches[batch_id] = self.server.uploads[params["input_file_id"]]
+            self._send(self._openai_batch(batch_id, params["input_file_id"], "validating"))
+        elif self.path == "/v1/messages/batches":
+            batch_id = f"msgbatch_{len(self.server.batches)}"
+            self.server.batches[batch_id] = json.loads(body)["requests"]
+            self._send(self._anthropic_batch(batch_id, "in_progress"))
+        else:
+            self.send_error(404)
+
+    def do_GET(self) -> None:
+        parts = self.path.strip("/").split("/")
+        match parts:
+            case ["v1", "batches", batch_id]:
+                self._send(self._openai_batch(batch_id, "file-0", "completed"))
+            case ["v1", "files", file_id, "content"]:
+                batch_id, kind = file_id.rsplit("-", 1)
+                self._send(b"\n".join(
+                    json.dumps(line).encode() for line in self._openai_results(batch_id) if (line["error"] is None) == (kind == "output")
+                ) + b"\n")
+            case ["v1", "messages", "batches", batch_id]:
+                self._send(self._anthropic_batch(batch_id, "ended"))
+            case ["v1", "messages", "batches", batch_id, "results"]:
+                self._send(b"\n".join(json.dumps(item).encode() for item in self._anthropic_results(batch_id)))
+            case _:
+                self.send_error(404)
+
+    def _openai_batch(self, batch_id: str, input_file_id: str, status: str) -> dict[str, Any]:
+        lines = self.server.batches[batch_id]
+        done = status == "completed"
+        return {
+            "id": batch_id, "object": "batch", "endpoint": "/v1/chat/completions", "input_file_id": input_file_id,
+            "completion_window": "24h", "status": status, "created_at": 0,
+            "request_counts": {"total": len(lines), "completed": len(lines) - 1 if done else 0, "failed": 1 if done else 0},
+            "output_file_id": f"{batch_id}-output" if done else None,
+            "error_file_id": f"{batch_id}-error" if done else None
+        }
+
+    def _openai_results(self, batch_id: str) -> Iterator[dict[str, Any]]:
+        for index, line in enumerate(self.server.batches[batch_id]):
+            if index == 0:
+                yield {"id": "batch_req_0", "custom_id": line["custom_id"], "response": None,
+                       "error": {"code": "invalid_request", "message": "Bad request"}}
+                continue
+            question = _text(line["body"]["messages"][0]["content"])
+            yield {"id": f"batch_req_{index}", "custom_id": line["custom_id"], "error": None, "response": {
+                "status_code": 200, "request_id": f"req_{index}", "body": {
+                    "id": f"chatcmpl-{index}", "object": "chat.completion", "created": 0, "model": line["body"]["model"],
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": f"Answer to {question}"}, "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": 3, "completion_tokens": 3, "total_tokens": 6}
+                }
+            }}
+
+    def _anthropic_batch(self, batch_id: str, status: str) -> dict[str, Any]:
+        requests = self.server.batches[batch_id]
+        done = status == "ended"
+        return {
+            "id": batch_id, "type": "message_batch", "processing_status": status,
+            "request_counts": {"processing": 0 if done else len(requests), "succeeded": len(requests) - 1 if done else 0,
+                               "errored": 1 if done else 0, "canceled": 0, "expired": 0},
+            "created_at": "2024-01-01T00:00:00Z", "expires_at": "2024-01-02T00:00:00Z",
+            "ended_at": "2024-01-01T01:00:00Z" if done else None, "archived_at": None, "cancel_initiated_at": None,
+            "results_url": f"http://{self.headers['Host']}/v1/messages/batches/{batch_id}/results" if done else None
+        }
+
+    def _anthropic_results(self, batch_id: str) -> Iterator[dict[str, Any]]:
+        for index, request in enumerate(self.server.batches[batch_id]):
+            if index == 0:
+                yield {"custom_id": request["custom_id"], "result": {"type": "errored", "error": {
+                    "type": "error", "error": {"type": "invalid_request_error", "message": "Bad request"}}}}
+                continue
+            question = _text(request["params"]["messages"][0]["content"])
+            yield {"custom_id": request["custom_id"], "result": {"type": "succeeded", "message": {
+                "id": f"msg_{index}", "type": "message", "role": "assistant", "model": request["params"]["model"],
+                "content": [{"type": "text", "text": f"Answer to {question}"}], "stop_reason": "max_tokens",
+                "stop_sequence": None, "usage": {"input_tokens": 3, "output_tokens": 3}
+            }}}
+
+
+@pytest.fixture
+def batch_server() -> Iterator[str]:
+    server = _BatchServer(("127.0.0.1", 0), _BatchHandler)
+    server.uploads = {}
+    server.batches = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def check_results(job: BatchJob, results: list[BatchResult], count: int) -> None:
+    assert job.status == BatchStatus.COMPLETED and job.done
+    assert (job.total, job.succeeded, job.failed) == (count, count - 1, 1)
+    by_id: dict[str, BatchResult] = {result.custom_id: result for result in results}
+    assert len(by_id) == count
+    assert by_id["request-0"].result is None and by_id["request-0"].error == "Bad request"
+    for index in range(1, count):
+        result = by_id[f"request-{index}"].result
+        assert result is not None and result.text == f"Answer to Question {index}"
+        assert result.usage is not None and result.usage.output_tokens == 3
+
+
+def test_sync_batches_round_trip(batch_server: str):
+    client: SyncLLM = SyncLLM(
+        openai_key="test",
+        anthropic_key="test",
+        openai_base_url=batch_server + "/v1",
+        anthropic_base_url=batch_server
+    )
+
+    openai_job: BatchJob = client.submit_batch(make_requests("gpt-4o", 5))
+    anthropic_job: BatchJob = client.submit_batch(make_requests("claude-sonnet-4-5", 5))
+
+    assert (openai_job.provider, openai_job.status, openai_job.total) == (Provider.OPENAI, BatchStatus.IN_PROGRESS, 5)
+    assert (anthropic_job.provider, anthropic_job.status, anthropic_job.total) == (Provider.ANTHROPIC, BatchStatus.IN_PROGRESS, 5)
+
+    openai_job = client.poll_batch(openai_job, wait=True, poll_interval=0)
+    anthropic_job = client.poll_batch(anthropic_job, wait=True, poll_interval=0)
+    openai_results: list[BatchResult] = list(client.iter_batch_results(openai_job))
+    anthropic_results: list[BatchResult] = list(client.iter_batch_results(anthropic_job))
+
+    check_results(openai_job, openai_results, 5)
+    check_results(anthropic_job, anthropic_results, 5)
+    assert {result.result.request_id for result in openai_results if result.result} == {"req_1", "req_2", "req_3", "req_4"}
+    assert {result.result.finish_reason for result in anthropic_results if result.result} == {FinishReason.LENGTH}
+
+
+def test_async_batches_round_trip(batch_server: str):
+    threads: list[threading.Thread] = []
+
+    def tracked(requests: Iterator[BatchRequest]) -> Iterator[BatchRequest]:
+        for request in requests:
+            threads.append(threading.current_thread())
+            yield request
+
+    async def run() -> None:
+        client: AsyncLLM = AsyncLLM(
+            openai_key="test",
+            anthropic_key="test",
+            openai_base_url=batch_server + "/v1",
+            anthropic_base_url=batch_server
+        )
+        for model_name in ("gpt-4o", "claude-sonnet-4-5"):
+            job: BatchJob = await client.submit_batch(tracked(make_requests(model_name, 3)))
+            job = await client.poll_batch(job, wait=True, poll_interval=0)
+            results: list[BatchResult] = [result async for result in client.iter_batch_results(job)]
+            check_results(job, results, 3)
+        await client.openai_client.close()
+        await client.anthropic_client.close()
+
+    asyncio.run(run())
+    # Past the first request, peeked to choose the provider, both bodies are spooled off the event loop's thread
+    assert threading.main_thread() not in threads[1:3] + threads[4:6] and len(threads) == 6
+
+
+def test_batches_go_to_a_single_supported_provider():
+    client: SyncLLM = SyncLLM(openai_key="test", fireworks_key="test")
+    mixed: list[BatchRequest] = [*make_requests("gpt-4o", 1), *make_requests("claude-sonnet-4-5", 1)]
+
+    with pytest.raises(ValueError):
+        client.submit_batch([])
+    with pytest.raises(ValueError):
+        client.submit_batch(make_requests("llama-v3p1-8b-instruct", 1))
+    with pytest.raises(ValueError):
+        client.submit_batch(mixed)
+
+
+def test_anthropic_batches_go_through_the_sdk_client(mock_client: Callable[..., Any]):
+    urls: list[str] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        urls.append(str(request.url))
+        if len(urls) == 3:
+            raise httpx.ConnectError("Connection refused", request=request)
+        return httpx.Response(400, json={"type": "error", "error": {"type": "invalid_request_error", "message": "Bad batch"}})
+
+    base_url: str = "https://gateway.example/anthropic"
+    client: SyncLLM = SyncLLM(anthropic_key="test")
+    client.anthropic_client = mock_client(Anthropic, respond, base_url=base_url)
+    with pytest.raises(BadRequestError, match="Bad batch"):
+        client.submit_batch(make_requests("claude-sonnet-4-5", 2))
+
+    async def run() -> None:
+        async_client: AsyncLLM = AsyncLLM(anthropic_key="test")
+        async_client.anthropic_client = AsyncAnthropic(
+            api_key="test", base_url=base_url, http_client=httpx.AsyncClient(transport=httpx.MockTransport(respond))
+        )
+        with pytest.raises(BadRequestError, match="Bad batch"):
+            await async_client.submit_batch(make_requests("claude-sonnet-4-5", 2))
+        with pytest.raises(APIConnectionError):
+            await async_client.submit_batch(make_requests("claude-sonnet-4-5", 2))
+
+    asyncio.run(run())
+    assert urls == [f"{base_url}/v1/messages/batches"] * 3
+
+
+def test_anthropic_sdk_is_within_the_pinned_range():
+    # Streamed batch bodies use the SDK's HTTP client directly, which is tested against this range only
+    with open(Path(__file__).parents[1] / "pyproject.toml", "rb") as file:
+        dependencies: list[str] = tomllib.load(file)["project"]["dependencies"]
+    pin = next(Requirement(dependency) for dependency in dependencies if Requirement(dependency).name == "anthropic")
+
+    assert pin.specifier.contains(version("anthropic"))
+    assert any(spec.operator == "<" for spec in pin.specifier)
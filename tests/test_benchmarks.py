@@ -0,0 +1,25 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+
+BENCHMARKS: Path = Path(__file__).parent.parent / "benchmarks"
+
+
+def test_client_benchmark_runs_offline(tmp_path: Path):
+    output: Path = tmp_path / "results.json"
+    subprocess.run(
+        [
+            sys.executable, str(BENCHMARKS / "bench_client.py"),
+            "--calls", "2", "--concurrency", "2", "--requests-per-worker", "2",
+            "--latency", "0", "--in-flight", "2", "--hold", "0.3", "--output", str(output)
+        ],
+        check=True, capture_output=True, text=True, timeout=120
+    )
+    results: dict[str, Any] = json.loads(output.read_text())
+
+    assert set(results["metrics"]) == {"overhead", "throughput_rps", "memory_kb_per_request"}
+    assert results["metrics"]["throughput_rps"]["async"]["anthropic"]["2"] > 0
+    assert results["metrics"]["overhead"]["openai"]["stream_us"] > 0
@@ -0,0 +1,91 @@
+import json
+import time
+from collections.abc import Callable
+from pathlib import Path
+import httpx
+from openai import OpenAI
+from llms._sync.client import SyncLLM
+from llms.cache.base import dump_result, load_result, make_cache_key
+from llms.cache.memory import InMemoryCache
+from llms.cache.sqlite import SQLiteCache
+from llms.types.enums import Role
+from llms.types.messages import ModelMessage, UserModelMessage
+from llms.types.parts import TextPart, ReasoningPart, ToolCallPart
+from llms.types.results import GenerateTextResult, Step, ToolExecution
+
+
+def test_cache_key_is_canonical():
+    as_string = [ModelMessage(role=Role.USER, content="hi")]
+    as_part = [UserModelMessage(content=[TextPart(text="hi", provider_options={})])]
+
+    assert make_cache_key("gpt-4o", as_string) == make_cache_key("gpt-4o", as_string)
+    assert make_cache_key("gpt-4o", as_string) == make_cache_key("gpt-4o", as_part)
+    assert make_cache_key("gpt-4o", as_string) != make_cache_key("gpt-5", as_string)
+
+
+def test_in_memory_cache_lru_and_ttl(make_result: Callable[..., GenerateTextResult]):
+    cache = InMemoryCache(max_size=2, ttl=0.05)
+    cache.set("a", make_result("a"))
+    cache.set("b", make_result("b"))
+    assert cache.get("a").text == "a"
+    cache.set("c", make_result("c"))
+
+    assert cache.get("b") is None
+    assert cache.stats.evictions == 1
+
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 2
+
+
+def test_sqlite_cache_is_shared_and_bounded(tmp_path: Path, make_result: Callable[..., GenerateTextResult]):
+    writer = SQLiteCache(tmp_path / "cache.db", max_size=2)
+    writer.set("a", make_result("a", reasoning="thinking"))
+    writer.set("b", make_result("b", reasoning="thinking"))
+    writer.set("c", make_result("c", reasoning="thinking"))
+
+    reader = SQLiteCache(tmp_path / "cache.db")
+    result = reader.get("c")
+
+    assert writer.stats.evictions == 1
+    assert reader.get("a") is None
+    assert isinstance(result.parts[0], ReasoningPart)
+    assert result.text == "c"
+
+
+def test_tool_loop_steps_round_trip(make_result: Callable[..., GenerateTextResult]):
+    call = ToolCallPart(tool_call_id="call_1", tool_name="weather", input={"city": "Paris"}, provider_options={}, provider_executed=None)
+    first = GenerateTextResult(text="", parts=[ReasoningPart(text="Look it up", provider_options={}), call])
+    last = make_result("Sunny", reasoning="Got it")
+    last.steps = [
+        Step(result=first, tool_executions=[ToolExecution(tool_call_id="call_1", tool_name="weather", output={"sky": "clear"})]),
+        Step(result=last.model_copy())
+    ]
+
+    loaded: GenerateTextResult = load_result(dump_result(last))
+
+    assert loaded == last
+    assert [type(part) for part in loaded.steps[0].result.parts] == [ReasoningPart, ToolCallPart]
+    assert [type(part) for part in loaded.steps[1].result.parts] == [ReasoningPart, TextPart]
+    assert loaded.steps[0].tool_executions[0].output == {"sky": "clear"}
+
+
+def test_client_serves_from_cache_and_honours_bypass(completion: Callable[..., dict], mock_client: Callable[..., OpenAI]):
+    client: SyncLLM = SyncLLM(openai_key="test", anthropic_key="test", fireworks_key="test", cache=InMemoryCache())
+    calls: list[dict] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        calls.append(json.loads(request.content))
+        return httpx.Response(200, json=completion("fresh"))
+
+    client.openai_client = mock_client(OpenAI, respond)
+    messages = [ModelMessage(role=Role.USER, content="Hello")]
+
+    client.generate_text(model_name="gpt-4o", messages=messages)
+    cached: GenerateTextResult = client.generate_text(model_name="gpt-4o", messages=messages)
+    client.generate_text(model_name="gpt-4o", messages=messages, bypass_cache=True)
+
+    assert len(calls) == 2
+    assert client.cache.stats.hits == 1
+    assert cached.text == "fresh"
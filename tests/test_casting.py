@@ -0,0 +1,146 @@
+import base64
+import mmap
+from pathlib import Path
+import pytest
+from anthropic.types import Message
+from openai.types.chat import ChatCompletion
+from pydantic import BaseModel, ValidationError
+from llms.types.parts import TextPart, ImagePart, FilePart, ReasoningPart, ToolCallPart, ToolResultPart, ContentPart, InlineData, MMAP_THRESHOLD
+from llms.utilities.casting import (
+    cast_part_to_openai_content,
+    cast_part_to_anthropic_content,
+    cast_openai_response_to_parts,
+    cast_anthropic_response_to_parts,
+    _construct_text_part,
+    _construct_reasoning_part,
+    _construct_tool_call_part
+)
+
+
+def test_response_parts_match_validated_parts():
+    openai_response: ChatCompletion = ChatCompletion.model_validate({
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [{
+            "index": 0,
+            "finish_reason": "tool_calls",
+            "message": {
+                "role": "assistant",
+                "content": "Looking it up.",
+                "tool_calls": [{"id": "call_0", "type": "function", "function": {"name": "search", "arguments": '{"q": "x"}'}}]
+            }
+        }]
+    })
+    anthropic_response: Message = Message.model_validate({
+        "id": "msg_test",
+        "type": "message",
+        "role": "assistant",
+        "model": "claude-sonnet-4-5",
+        "stop_reason": "tool_use",
+        "usage": {"input_tokens": 1, "output_tokens": 1},
+        "content": [
+            {"type": "text", "text": "Looking it up."},
+            {"type": "tool_use", "id": "toolu_0", "name": "search", "input": {"q": "x"}}
+        ]
+    })
+
+    openai_parts: list[ContentPart] = cast_openai_response_to_parts(openai_response)
+    anthropic_parts: list[ContentPart] = cast_anthropic_response_to_parts(anthropic_response)
+
+    assert openai_parts == [
+        TextPart(text="Looking it up.", provider_options={}),
+        ToolCallPart(tool_call_id="call_0", tool_name="search", input='{"q": "x"}', provider_options={}, provider_executed=None)
+    ]
+    assert anthropic_parts == [
+        TextPart(text="Looking it up.", provider_options={}),
+        ToolCallPart(tool_call_id="toolu_0", tool_name="search", input={"q": "x"}, provider_options={}, provider_executed=None)
+    ]
+    for part in openai_parts + anthropic_parts:
+        assert type(part).model_validate(part.model_dump()) == part
+        assert part.model_fields_set == set(type(part).model_fields)
+
+    # Parts stay independent, mutable models
+    openai_parts[0].provider_options["seen"] = True
+    assert cast_openai_response_to_parts(openai_response)[0].provider_options == {}
+
+
+def test_constructed_parts_match_pydantic_model_construct():
+    # _construct_part sets BaseModel's instance slots itself; a pydantic release
+    # that adds or changes one has to fail here
+    assert BaseModel.__slots__ == ("__dict__", "__pydantic_fields_set__", "__pydantic_extra__", "__pydantic_private__")
+    for part in (_construct_text_part("Hi"), _construct_reasoning_part("Hmm"), _construct_tool_call_part("call_0", "search", {"q": "x"})):
+        reference: ContentPart = type(part).model_construct(**part.__dict__)
+        for slot in BaseModel.__slots__:
+            assert getattr(part, slot) == getattr(reference, slot)
+        assert part == reference and part.model_copy(update={"provider_options": {"a": 1}}).provider_options == {"a": 1}
+
+
+def test_empty_responses_yield_an_empty_text_part():
+    assert cast_openai_response_to_parts(object()) == [TextPart(text="", provider_options={})]
+    assert cast_anthropic_response_to_parts(object()) == [TextPart(text="", provider_options={})]
+
+
+def test_part_casters_cover_every_part_type():
+    parts: list[ContentPart] = [
+        TextPart(text="hi", provider_options={}),
+        ImagePart(image="https://example.com/a.png", media_type="image/png", provider_options={"detail": "low"}),
+        ImagePart(image="aGk=", media_type=None, provider_options={}),
+        FilePart(data="aGk=", filename="a.pdf", media_type="application/pdf", provider_options={}),
+        ReasoningPart(text="because", provider_options={}),
+        ToolCallPart(tool_call_id="call_0", tool_name="search", input={"q": "x"}, provider_options={}, provider_executed=None),
+        ToolResultPart(tool_call_id="call_0", tool_name="search", output="found", provider_options={}, provider_executed=None)
+    ]
+
+    assert [cast_part_to_openai_content(part)["type"] for part in parts] == [
+        "text", "image_url", "image_url", "text", "text", "tool_call", "tool_result"
+    ]
+    assert cast_part_to_openai_content(parts[1])["image_url"] == {"url": "https://example.com/a.png", "detail": "low"}
+    assert [cast_part_to_anthropic_content(part)["type"] for part in parts] == [
+        "text", "image", "image", "document", "text", "tool_use", "tool_result"
+    ]
+    assert cast_part_to_anthropic_content(parts[2])["source"]["media_type"] == "image/jpeg"
+
+
+def test_binary_parts_are_encoded_once_and_shared_across_providers(tmp_path: Path):
+    payload: bytes = b"%PDF-1.7 not really a pdf" * 100
+    path: Path = tmp_path / "a.pdf"
+    path.write_bytes(payload)
+    encoded: str = base64.b64encode(payload).decode()
+    parts: list[FilePart] = [
+        FilePart(data=source, filename="a.pdf", media_type="application/pdf", provider_options={})
+        for source in (payload, memoryview(payload), path)
+    ]
+
+    for part in parts:
+        assert isinstance(part.data, InlineData) and len(part.data) == len(payload)
+        anthropic_data: str = cast_part_to_anthropic_content(part)["source"]["data"]
+        assert anthropic_data == encoded
+        # A second cast, for any provider, reuses the cached encoding
+        assert cast_part_to_anthropic_content(part)["source"]["data"] is anthropic_data
+        assert part.model_dump(mode="json")["data"] == encoded
+    assert parts[0] == parts[2]
+    # Small files are read; only large ones are mapped
+    assert isinstance(parts[2].data.data, bytes)
+
+    image: ImagePart = ImagePart(image=payload, media_type="image/png", provider_options={})
+    assert cast_part_to_openai_content(image)["image_url"]["url"] == f"data:image/png;base64,{encoded}"
+    assert cast_part_to_anthropic_content(image)["source"]["data"] is image.image.base64()
+    # Data URLs are built per cast; the base64 string is the only encoded copy kept
+    assert [slot for slot in InlineData.__slots__ if isinstance(getattr(image.image, slot), str)] == ["_base64"]
+    assert ImagePart(image="aGk=", media_type=None, provider_options={}).image == "aGk="
+    with pytest.raises(ValidationError, match="local file"):
+        FilePart(data=str(path), media_type="application/pdf", provider_options={})
+
+
+def test_large_files_are_mapped_until_closed(tmp_path: Path):
+    path: Path = tmp_path / "large.bin"
+    path.write_bytes(b"x" * MMAP_THRESHOLD)
+
+    with InlineData.from_path(path) as data:
+        assert isinstance(data.data, mmap.mmap)
+        encoded: str = data.base64()
+    assert data.data.closed
+    # The encoding outlives the mapping
+    assert ImagePart(image=data, media_type="image/png", provider_options={}).image.base64() is encoded
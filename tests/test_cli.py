@@ -0,0 +1,102 @@
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+import pytest
+from llms.cli import main, run, parse_record
+from llms.types.batches import BatchResult
+
+
+@pytest.fixture
+def prompts() -> list[str]:
+    return []
+
+
+@pytest.fixture
+def rate_limited() -> set[str]:
+    """Prompts answered with a 429 the next time they are sent."""
+    return set()
+
+
+@pytest.fixture
+def base_url(serve: Callable[..., list[str]], completion: Callable[..., dict], prompts: list[str], rate_limited: set[str]) -> str:
+    def reply(request: dict, handler: Any) -> dict | int:
+        prompt = request["messages"][-1]["content"]
+        prompts.append(prompt)
+        if prompt in rate_limited:
+            rate_limited.remove(prompt)
+            return 429
+        return completion(prompt.upper())
+
+    return serve(reply)[0]
+
+
+def write_records(path: Path, count: int) -> None:
+    with path.open("w") as file:
+        for number in range(count):
+            file.write(json.dumps({"custom_id": f"r{number}", "model": "gpt-4o", "messages": [{"role": "user", "content": f"record {number}"}]}) + "\n")
+
+
+def read_results(path: Path) -> dict[str, BatchResult]:
+    results = [BatchResult.model_validate_json(line) for line in path.read_text().splitlines()]
+    return {result.custom_id: result for result in results}
+
+
+def test_parse_record_defaults_the_custom_id_to_the_line_number():
+    request = parse_record('{"model_name": "gpt-4o", "messages": [{"role": "system", "content": "Be terse."}]}', 7)
+
+    assert (request.custom_id, request.model_name, request.messages[0].content) == ("7", "gpt-4o", "Be terse.")
+    with pytest.raises(ValueError):
+        parse_record('{"messages": []}', 0)
+
+
+def test_run_writes_every_result_across_workers(tmp_path: Path, base_url: str, prompts: list[str]):
+    write_records(tmp_path / "in.jsonl", 40)
+    with (tmp_path / "in.jsonl").open("a") as file:
+        file.write("not json\n")
+
+    code: int = main([
+        "run", str(tmp_path / "in.jsonl"), "-o", str(tmp_path / "out.jsonl"),
+        "--workers", "2", "--concurrency", "4", "--openai-key", "test", "--openai-base-url", base_url
+    ])
+    results: dict[str, BatchResult] = read_results(tmp_path / "out.jsonl")
+
+    # The invalid line is reported and fails the run
+    assert code == 1
+    assert len(results) == 41 and results["40"].error.startswith("Invalid record")
+    assert results["r7"].result.text == "RECORD 7"
+    assert len(prompts) == 40
+
+
+def test_run_resumes_from_the_checkpoint(tmp_path: Path, base_url: str, prompts: list[str]):
+    write_records(tmp_path / "in.jsonl", 10)
+    done_line: str = BatchResult(custom_id="r0").model_dump_json() + "\n"
+    # A run that recorded line 0, then crashed halfway through writing another result
+    (tmp_path / "out.jsonl").write_text(done_line + '{"custom_id": "r1", "res')
+    (tmp_path / "out.jsonl.checkpoint").write_text(f"0 {len(done_line)}\n3 ")
+
+    progress = run(str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl"), client_options={"openai_key": "test", "openai_base_url": base_url})
+    results: dict[str, BatchResult] = read_results(tmp_path / "out.jsonl")
+
+    assert sorted(prompts) == sorted(f"record {number}" for number in range(1, 10))
+    assert len(results) == 10 and results["r0"].result is None and results["r1"].result.text == "RECORD 1"
+    assert (progress.already_done, progress.completed, progress.failed) == (1, 9, 0)
+    assert len((tmp_path / "out.jsonl.checkpoint").read_text().splitlines()) == 10
+
+
+def test_failed_records_are_retried_on_resume(tmp_path: Path, base_url: str, prompts: list[str], rate_limited: set[str]):
+    write_records(tmp_path / "in.jsonl", 5)
+    rate_limited.add("record 3")
+    client_options: dict[str, Any] = {"openai_key": "test", "openai_base_url": base_url}
+
+    first = run(str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl"), client_options=client_options)
+    assert read_results(tmp_path / "out.jsonl")["r3"].error.startswith("RateLimitError")
+
+    resumed = run(str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl"), client_options=client_options)
+    results: dict[str, BatchResult] = read_results(tmp_path / "out.jsonl")
+
+    assert (first.completed, first.failed) == (5, 1)
+    assert (resumed.already_done, resumed.completed, resumed.failed) == (4, 1, 0)
+    assert prompts.count("record 3") == 2 and len(prompts) == 6
+    # The retry's line supersedes the failed one
+    assert results["r3"].result.text == "RECORD 3"
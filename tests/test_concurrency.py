@@ -0,0 +1,157 @@
+import asyncio
+from collections.abc import Callable
+from typing import Any
+import httpx
+import pytest
+from openai import OpenAI, RateLimitError
+from llms._sync.client import SyncLLM
+from llms.concurrency import AdaptiveLimit, ConcurrencyLimiter, ConcurrencyStats, Permit
+from llms.types.messages import UserModelMessage
+
+
+def test_limit_grows_additively_while_saturated_and_healthy():
+    limiter: ConcurrencyLimiter = ConcurrencyLimiter(AdaptiveLimit(initial_limit=4))
+    limits: list[int] = [4]
+
+    async def main() -> None:
+        for _ in range(4):
+            permits = [await limiter.acquire_async("gpt-4o") for _ in range(limits[-1])]
+            for permit in permits:
+                limiter.release(permit, 0.1)
+            limits.append(limiter.stats()["openai/gpt-4o"].limit)
+
+        # Under one more slot per limit's worth of requests
+        assert limits == sorted(limits) and 4 < limits[-1] <= 8
+
+        # Requests that leave most of the limit unused do not grow it
+        for _ in range(20):
+            limiter.release(await limiter.acquire_async("gpt-4o"), 0.1)
+
+    asyncio.run(main())
+    assert limiter.stats()["openai/gpt-4o"].limit == limits[-1]
+
+
+def test_overload_cuts_the_limit_once_per_congestion_event():
+    limiter: ConcurrencyLimiter = ConcurrencyLimiter(AdaptiveLimit(initial_limit=8))
+
+    async def main() -> None:
+        permits: list[Permit] = [await limiter.acquire_async("claude-sonnet-4-5") for _ in range(8)]
+        for permit in permits:
+            limiter.release(permit, None, overloaded=True)
+
+        stats: ConcurrencyStats = limiter.stats()["anthropic/claude-sonnet-4-5"]
+        assert (stats.limit, stats.decreases, stats.in_flight) == (4, 1, 0)
+
+        # Requests sent after the cut cut it again, down to the minimum
+        for _ in range(5):
+            limiter.release(await limiter.acquire_async("claude-sonnet-4-5"), None, overloaded=True)
+
+    asyncio.run(main())
+    assert limiter.stats()["anthropic/claude-sonnet-4-5"].limit == 1
+
+
+def test_repeated_latency_spikes_cut_the_limit():
+    limiter: ConcurrencyLimiter = ConcurrencyLimiter(AdaptiveLimit(initial_limit=8, latency_tolerance=2.0))
+
+    async def main() -> None:
+        for _ in range(10):
+            limiter.release(await limiter.acquire_async("gpt-4o"), 0.1)
+        # A single slow request is noise
+        limiter.release(await limiter.acquire_async("gpt-4o"), 0.5)
+        assert limiter.stats()["openai/gpt-4o"].decreases == 0
+
+        for _ in range(3):
+            limiter.release(await limiter.acquire_async("gpt-4o"), 0.5)
+
+    asyncio.run(main())
+    stats: ConcurrencyStats = limiter.stats()["openai/gpt-4o"]
+    assert (stats.limit, stats.decreases) == (4, 1)
+    assert 0.1 < stats.latency < 0.5
+
+
+def test_a_lasting_latency_rise_becomes_the_new_normal():
+    limiter: ConcurrencyLimiter = ConcurrencyLimiter(AdaptiveLimit(initial_limit=8))
+
+    async def main() -> None:
+        for _ in range(50):
+            limiter.release(await limiter.acquire_async("gpt-4o"), 1.0)
+        for _ in range(50):
+            limiter.release(await limiter.acquire_async("gpt-4o"), 4.0)
+
+        stats: ConcurrencyStats = limiter.stats()["openai/gpt-4o"]
+        assert (stats.limit, stats.decreases) == (4, 1)
+        assert stats.latency > 3.5
+
+        # Per output token, long and short replies at the same speed are alike
+        for _ in range(20):
+            limiter.release(await limiter.acquire_async("claude-sonnet-4-5"), 0.5, output_tokens=1)
+            limiter.release(await limiter.acquire_async("claude-sonnet-4-5"), 20.0, output_tokens=1000)
+
+    asyncio.run(main())
+    assert limiter.stats()["anthropic/claude-sonnet-4-5"].decreases == 0
+
+
+def test_requests_over_the_limit_queue_in_order():
+    limiter: ConcurrencyLimiter = ConcurrencyLimiter(AdaptiveLimit(initial_limit=1, latency_tolerance=None))
+    order: list[int] = []
+
+    async def request(number: int) -> None:
+        permit = await limiter.acquire_async("gpt-4o")
+        order.append(number)
+        limiter.release(permit, 0.01)
+
+    async def main() -> None:
+        first = await limiter.acquire_async("gpt-4o")
+        tasks = []
+        for number in range(3):
+            tasks.append(asyncio.create_task(request(number)))
+            await asyncio.sleep(0.02)
+        assert limiter.stats()["openai/gpt-4o"].queued == 3
+        limiter.release(first, 0.01)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    stats: ConcurrencyStats = limiter.stats()["openai/gpt-4o"]
+    assert order == [0, 1, 2]
+    assert (stats.in_flight, stats.queued, stats.requests) == (0, 0, 4)
+    assert stats.max_queue_delay >= 0.02 and stats.queue_delay > 0
+
+
+def test_cancelled_waiters_do_not_leak_slots():
+    limiter: ConcurrencyLimiter = ConcurrencyLimiter(AdaptiveLimit(initial_limit=1))
+
+    async def main() -> None:
+        held = await limiter.acquire_async("gpt-4o")
+        waiter = asyncio.create_task(limiter.acquire_async("gpt-4o"))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release(held, None)
+        # The slot is free again for the next request
+        limiter.release(await asyncio.wait_for(limiter.acquire_async("gpt-4o"), 1.0), None)
+
+    asyncio.run(main())
+    assert (limiter.stats()["openai/gpt-4o"].in_flight, limiter.stats()["openai/gpt-4o"].queued) == (0, 0)
+
+
+def test_client_adapts_to_rate_limit_responses(completion: Callable[..., dict], mock_client: Callable[..., Any]):
+    status = {"code": 200}
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        if status["code"] == 429:
+            return httpx.Response(429, headers={"x-should-retry": "false"}, json={"error": {"message": "Slow down"}})
+        return httpx.Response(200, json=completion())
+
+    limiter: ConcurrencyLimiter = ConcurrencyLimiter(AdaptiveLimit(initial_limit=4))
+    client: SyncLLM = SyncLLM(openai_key="test", concurrency_limiter=limiter)
+    client.openai_client = mock_client(OpenAI, respond)
+    messages = [UserModelMessage(content="Hello")]
+
+    client.generate_text(model_name="gpt-4o", messages=messages)
+    status["code"] = 429
+    with pytest.raises(RateLimitError):
+        client.generate_text(model_name="gpt-4o", messages=messages)
+
+    stats: ConcurrencyStats = limiter.stats()["openai/gpt-4o"]
+    assert (stats.limit, stats.decreases, stats.in_flight, stats.requests) == (2, 1, 0, 2)
@@ -0,0 +1,104 @@
+import json
+from collections.abc import Callable
+from typing import Any
+import httpx
+import pytest
+from openai import OpenAI
+import llms.conversation
+from llms._sync.client import SyncLLM
+from llms.conversation import Conversation
+from llms.types.messages import SystemModelMessage, UserModelMessage, AssistantModelMessage, ModelMessage
+from llms.utilities.params import build_anthropic_params, build_openai_params
+
+
+MESSAGES: list[ModelMessage] = [
+    SystemModelMessage(content="You are terse."),
+    UserModelMessage(content="First question"),
+    AssistantModelMessage(content="First answer"),
+    UserModelMessage(content="Second question"),
+]
+
+
+def test_conversation_builds_the_same_params_as_a_message_list():
+    conversation: Conversation = Conversation(MESSAGES)
+
+    for prompt_caching in (False, True):
+        assert build_openai_params("gpt-4o", conversation, prompt_caching) == build_openai_params("gpt-4o", MESSAGES, prompt_caching)
+        assert build_anthropic_params("claude-sonnet-4-5", conversation, prompt_caching) == build_anthropic_params("claude-sonnet-4-5", MESSAGES, prompt_caching)
+
+
+def test_each_message_is_cast_once_per_provider(monkeypatch: pytest.MonkeyPatch):
+    casts: list[str] = []
+    cast_openai = llms.conversation.cast_messages_to_openai
+    cast_anthropic = llms.conversation.cast_message_to_anthropic
+    monkeypatch.setattr(llms.conversation, "cast_messages_to_openai", lambda messages: casts.extend("openai" for _ in messages) or cast_openai(messages))
+    monkeypatch.setattr(llms.conversation, "cast_message_to_anthropic", lambda message: casts.append("anthropic") or cast_anthropic(message))
+    conversation: Conversation = Conversation(MESSAGES[:2])
+
+    for message in MESSAGES[2:]:
+        build_openai_params("gpt-4o", conversation)
+        build_anthropic_params("claude-sonnet-4-5", conversation)
+        conversation.append(message)
+    build_openai_params("gpt-4o", conversation)
+    build_anthropic_params("claude-sonnet-4-5", conversation)
+
+    assert casts.count("openai") == 4
+    # The system prompt is split off, not cast
+    assert casts.count("anthropic") == 3
+
+
+def test_generate_text_appends_the_reply(completion: Callable[..., dict], mock_client: Callable[..., Any]):
+    requests: list[dict] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json=completion(f"Answer {len(requests)}"))
+
+    client: SyncLLM = SyncLLM(openai_key="test")
+    client.openai_client = mock_client(OpenAI, respond)
+    conversation: Conversation = Conversation([SystemModelMessage(content="You are terse.")])
+
+    conversation.append(UserModelMessage(content="First question"))
+    client.generate_text(model_name="gpt-4o", messages=conversation)
+    conversation.append(UserModelMessage(content="Second question"))
+    client.generate_text(model_name="gpt-4o", messages=conversation)
+
+    assert len(conversation) == 5
+    assert requests[1]["messages"][2] == {"role": "assistant", "content": "Answer 1"}
+    assert conversation[-1].content[0].text == "Answer 2"
+
+
+def test_server_state_sends_only_unstored_messages(mock_client: Callable[..., Any]):
+    requests: list[dict] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/v1/responses"
+        requests.append(json.loads(request.content))
+        number = len(requests)
+        return httpx.Response(200, json={
+            "id": f"resp_{number}", "object": "response", "created_at": 0, "model": "gpt-4o", "status": "completed",
+            "parallel_tool_calls": True, "tool_choice": "auto", "tools": [],
+            "output": [{
+                "id": f"msg_{number}", "type": "message", "role": "assistant", "status": "completed",
+                "content": [{"type": "output_text", "text": f"Answer {number}", "annotations": []}]
+            }],
+            "usage": {"input_tokens": 10, "output_tokens": 2, "total_tokens": 12,
+                      "input_tokens_details": {"cached_tokens": 8}, "output_tokens_details": {"reasoning_tokens": 0}}
+        })
+
+    client: SyncLLM = SyncLLM(openai_key="test")
+    client.openai_client = mock_client(OpenAI, respond)
+    conversation: Conversation = Conversation([SystemModelMessage(content="You are terse.")], server_state=True)
+
+    conversation.append(UserModelMessage(content="First question"))
+    first = client.generate_text(model_name="gpt-4o", messages=conversation)
+    conversation.append(UserModelMessage(content="Second question"))
+    second = client.generate_text(model_name="gpt-4o", messages=conversation)
+
+    assert "previous_response_id" not in requests[0]
+    assert [item["role"] for item in requests[0]["input"]] == ["system", "user"]
+    assert requests[1]["previous_response_id"] == "resp_1"
+    assert requests[1]["input"] == [{"role": "user", "content": "Second question"}]
+    assert (first.text, second.text, second.stored_response_id) == ("Answer 1", "Answer 2", "resp_2")
+    assert second.usage.cache_read_tokens == 8
+    assert conversation.previous_response_id == "resp_2" and len(conversation) == 5
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from typing import Any
+import httpx
+import pytest
+from openai import OpenAI, AsyncOpenAI
+from llms._async.client import AsyncLLM
+from llms._sync.client import SyncLLM
+from llms.concurrency import AdaptiveLimit, ConcurrencyLimiter
+from llms.deadlines import DeadlineExceeded, current_deadline, deadline_scope, resolve_deadline
+from llms.ratelimit import RateLimit, RateLimiter
+from llms.types.enums import Provider
+from llms.types.messages import UserModelMessage
+from llms.types.streams import FinishEvent, StreamEvent
+
+MESSAGES = [UserModelMessage(content="Hello")]
+
+
+def sse_chunk(text: str) -> bytes:
+    chunk = {"id": "chatcmpl-1", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4o",
+             "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}]}
+    return f"data: {json.dumps(chunk)}\n\n".encode()
+
+
+@pytest.fixture
+def slow_base_url(serve: Callable[..., list[str]], completion: Callable[..., dict]) -> str:
+    def reply(request: dict, handler: Any) -> dict:
+        time.sleep(2.0)
+        return completion()
+
+    return serve(reply)[0]
+
+
+def test_nested_deadlines_keep_the_earliest():
+    outer: float = time.monotonic() + 1.0
+    with deadline_scope(outer):
+        assert resolve_deadline(10.0, None) == outer
+        inner = resolve_deadline(0.1, None)
+        assert inner < outer
+        with deadline_scope(inner):
+            assert current_deadline() == inner
+        assert current_deadline() == outer
+    assert current_deadline() is None and resolve_deadline(None, None) is None
+
+
+def test_provider_calls_get_the_remaining_budget_without_sdk_retries(mock_client: Callable[..., Any]):
+    timeouts: list[float] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        timeouts.append(request.extensions["timeout"]["read"])
+        return httpx.Response(500, json={"error": {"message": "Overloaded"}})
+
+    client: SyncLLM = SyncLLM(openai_key="test")
+    client.openai_client = mock_client(OpenAI, respond)
+
+    with pytest.raises(Exception):
+        client.generate_text(model_name="gpt-4o", messages=MESSAGES, timeout=5.0)
+
+    # One request, sent with what was left of the five seconds
+    assert len(timeouts) == 1
+    assert 4.0 < timeouts[0] <= 5.0
+
+
+def test_sync_deadline_aborts_a_slow_request(slow_base_url: str):
+    client: SyncLLM = SyncLLM(openai_key="test", openai_base_url=slow_base_url)
+
+    started: float = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        client.generate_text(model_name="gpt-4o", messages=MESSAGES, timeout=0.3)
+
+    assert time.monotonic() - started < 1.5
+
+
+def test_async_deadline_cancels_the_request_in_flight(completion: Callable[..., dict], mock_client: Callable[..., Any]):
+    cancelled: list[bool] = []
+
+    async def respond(request: httpx.Request) -> httpx.Response:
+        try:
+            await asyncio.sleep(5.0)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return httpx.Response(200, json=completion())
+
+    async def main() -> float:
+        client: AsyncLLM = AsyncLLM(openai_key="test")
+        client.openai_client = mock_client(AsyncOpenAI, respond)
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            await client.generate_text(model_name="gpt-4o", messages=MESSAGES, deadline=time.monotonic() + 0.2)
+        return time.monotonic() - started
+
+    elapsed: float = asyncio.run(main())
+
+    assert elapsed < 1.0
+    assert cancelled == [True]
+
+
+def test_queueing_counts_against_the_deadline(completion: Callable[..., dict], mock_client: Callable[..., Any]):
+    limiter: ConcurrencyLimiter = ConcurrencyLimiter(AdaptiveLimit(initial_limit=1, min_limit=1))
+    rate_limiter: RateLimiter = RateLimiter({Provider.OPENAI: RateLimit(requests_per_minute=1)})
+    client: SyncLLM = SyncLLM(openai_key="test", concurrency_limiter=limiter)
+    client.openai_client = mock_client(OpenAI, lambda request: httpx.Response(200, json=completion()))
+
+    # The only slot is taken, so the call gives up once its budget is spent
+    permit = asyncio.run(limiter.acquire_async("gpt-4o"))
+    started: float = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        client.generate_text(model_name="gpt-4o", messages=MESSAGES, timeout=0.2)
+    assert 0.2 <= time.monotonic() - started < 1.0
+    assert limiter.stats()["openai/gpt-4o"].queued == 0
+    limiter.release(permit, 0.1, False)
+
+    # A rate limit delay longer than the budget fails at once and returns its capacity
+    client.rate_limiter = rate_limiter
+    client.generate_text(model_name="gpt-4o", messages=MESSAGES)
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        client.generate_text(model_name="gpt-4o", messages=MESSAGES, timeout=5.0)
+    assert time.monotonic() - started < 1.0
+    assert rate_limiter.reserve("gpt-4o", 0).delay < 61.0
+
+
+def test_streams_past_their_deadline_finish_truncated(mock_client: Callable[..., Any]):
+    sent: list[int] = []
+
+    def sync_chunks() -> Iterator[bytes]:
+        for index in range(20):
+            sent.append(index)
+            time.sleep(0.1)
+            yield sse_chunk(f"{index} ")
+        yield b"data: [DONE]\n\n"
+
+    async def async_chunks() -> AsyncIterator[bytes]:
+        yield sse_chunk("Hel")
+        await asyncio.sleep(5.0)
+        yield sse_chunk("lo")
+        yield b"data: [DONE]\n\n"
+
+    client: SyncLLM = SyncLLM(openai_key="test")
+    client.openai_client = mock_client(
+        OpenAI, lambda request: httpx.Response(200, headers={"Content-Type": "text/event-stream"}, content=sync_chunks())
+    )
+    events: list[StreamEvent] = list(client.stream_text(model_name="gpt-4o", messages=MESSAGES, timeout=0.35))
+
+    async def main() -> list[StreamEvent]:
+        async_client = AsyncLLM(openai_key="test")
+        async_client.openai_client = mock_client(
+            AsyncOpenAI, lambda request: httpx.Response(200, headers={"Content-Type": "text/event-stream"}, content=async_chunks())
+        )
+        return [event async for event in async_client.stream_text(model_name="gpt-4o", messages=MESSAGES, timeout=0.3)]
+
+    async_events: list[StreamEvent] = asyncio.run(main())
+
+    assert isinstance(events[-1], FinishEvent) and events[-1].result.truncated
+    assert events[-1].result.text == "".join(event.text for event in events[:-1]).strip()
+    assert 0 < len(events) - 1 < 20 and len(sent) < 20
+    assert isinstance(async_events[-1], FinishEvent) and async_events[-1].result.truncated
+    assert async_events[-1].result.text == "Hel"
@@ -0,0 +1,109 @@
+import asyncio
+import base64
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+import httpx
+import numpy as np
+import pytest
+from openai import OpenAI, AsyncOpenAI
+from llms._async.client import AsyncLLM
+from llms._sync.client import SyncLLM
+from llms.models import EMBEDDING_LIMITS
+from llms.types.embeddings import EmbeddingLimits
+from llms.utilities.embeddings import iter_embedding_chunks
+
+
+def vector_for(text: str) -> np.ndarray:
+    # Each text "t<n>" embeds to [n, n + 0.5, -n]
+    number = float(text.removeprefix("t"))
+    return np.array([number, number + 0.5, -number], dtype=np.float32)
+
+
+def embeddings_response(request: httpx.Request) -> httpx.Response:
+    body = json.loads(request.content)
+    data = [
+        {"object": "embedding", "index": index, "embedding": base64.b64encode(vector_for(text).tobytes()).decode()}
+        for index, text in enumerate(body["input"])
+    ]
+    # Providers may list embeddings out of order; `index` says where each belongs
+    return httpx.Response(200, json={
+        "object": "list", "data": data[::-1], "model": body["model"],
+        "usage": {"prompt_tokens": 1, "total_tokens": 1}
+    })
+
+
+@pytest.fixture
+def small_limits(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(EMBEDDING_LIMITS, "text-embedding-3-small", EmbeddingLimits(max_items=4, max_tokens=1000))
+
+
+def test_chunks_respect_item_and_token_limits_in_order():
+    texts = ["a" * 40] * 5 + ["b" * 400] + ["c"] * 3
+    chunks = list(iter_embedding_chunks(iter(texts), EmbeddingLimits(max_items=3, max_tokens=100)))
+
+    assert [(offset, len(chunk)) for offset, chunk in chunks] == [(0, 3), (3, 2), (5, 1), (6, 3)]
+    assert [text for _, chunk in chunks for text in chunk] == texts
+
+
+def test_embed_returns_one_float32_array_in_input_order(small_limits: None, mock_client: Callable[..., Any]):
+    requests: list[int] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        requests.append(len(json.loads(request.content)["input"]))
+        return embeddings_response(request)
+
+    client: SyncLLM = SyncLLM(openai_key="test")
+    client.openai_client = mock_client(OpenAI, respond)
+    texts = [f"t{number}" for number in range(10)]
+
+    vectors: np.ndarray = client.embed("text-embedding-3-small", texts, max_concurrency=2)
+
+    assert vectors.dtype == np.float32 and vectors.shape == (10, 3)
+    assert np.array_equal(vectors, np.stack([vector_for(text) for text in texts]))
+    assert sorted(requests) == [2, 4, 4]
+    assert client.embed("text-embedding-3-small", []).shape[0] == 0
+
+
+def test_embed_rejects_models_without_embeddings():
+    client: SyncLLM = SyncLLM(openai_key="test", anthropic_key="test")
+
+    with pytest.raises(ValueError):
+        client.embed("gpt-4o", ["hi"])
+
+
+def test_embed_to_file_streams_into_a_memory_mapped_array(small_limits: None, tmp_path: Path, mock_client: Callable[..., Any]):
+    client: SyncLLM = SyncLLM(openai_key="test")
+    client.openai_client = mock_client(OpenAI, embeddings_response)
+    path = tmp_path / "vectors.npy"
+
+    array = client.embed_to_file("text-embedding-3-small", (f"t{number}" for number in range(25)), path, count=25)
+
+    assert isinstance(array, np.memmap)
+    stored = np.load(path, mmap_mode="r")
+    assert stored.shape == (25, 3) and stored[24, 0] == 24.0
+    assert np.array_equal(stored[:, 0], np.arange(25, dtype=np.float32))
+    with pytest.raises(ValueError):
+        client.embed_to_file("text-embedding-3-small", (f"t{number}" for number in range(5)), tmp_path / "short.npy", count=6)
+
+
+def test_async_embed_runs_chunks_concurrently(small_limits: None, mock_client: Callable[..., Any]):
+    in_flight = {"now": 0, "peak": 0}
+
+    async def respond(request: httpx.Request) -> httpx.Response:
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return embeddings_response(request)
+
+    async def main() -> np.ndarray:
+        client: AsyncLLM = AsyncLLM(openai_key="test")
+        client.openai_client = mock_client(AsyncOpenAI, respond)
+        return await client.embed("text-embedding-3-small", [f"t{number}" for number in range(40)], max_concurrency=3)
+
+    vectors: np.ndarray = asyncio.run(main())
+
+    assert np.array_equal(vectors[:, 0], np.arange(40, dtype=np.float32))
+    assert in_flight["peak"] == 3
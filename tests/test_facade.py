@@ -0,0 +1,142 @@
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+import httpx
+import pytest
+from anthropic import AsyncAnthropic
+from openai import OpenAI, AsyncOpenAI
+from llms._sync.client import SyncLLM
+from llms.deadlines import DeadlineExceeded, deadline_scope
+from llms.loop import BackgroundLoop, shared_loop
+from llms.types.enums import FinishReason
+from llms.types.messages import UserModelMessage
+from llms.types.requests import GenerateTextRequest
+from llms.types.results import GenerateTextResult
+from llms.types.streams import FinishEvent, TextDeltaEvent
+
+
+@pytest.fixture
+def make_client(mock_client: Callable[..., Any]) -> Callable[..., SyncLLM]:
+    def build(respond: Callable[[httpx.Request], Any]) -> SyncLLM:
+        client: SyncLLM = SyncLLM(openai_key="test")
+        client.openai_client = mock_client(AsyncOpenAI, respond)
+        return client
+
+    return build
+
+
+def test_threads_share_one_event_loop(completion: Callable[..., dict], make_client: Callable[..., SyncLLM]):
+    threads: set[str] = set()
+
+    async def respond(request: httpx.Request) -> httpx.Response:
+        threads.add(threading.current_thread().name)
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, json=completion(json.loads(request.content)["messages"][-1]["content"]))
+
+    client: SyncLLM = make_client(respond)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(20) as executor:
+        replies = list(executor.map(
+            lambda number: client.generate_text("gpt-4o", [UserModelMessage(content=str(number))]).text, range(20)
+        ))
+
+    assert replies == [str(number) for number in range(20)]
+    # Every request waited on the loop's thread, at the same time
+    assert threads == {"llms-loop"}
+    assert time.perf_counter() - started < 1.0
+    assert client.loop is shared_loop()
+
+
+def test_streams_and_fan_out_iterate_synchronously(completion: Callable[..., dict], make_client: Callable[..., SyncLLM]):
+    def respond(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if not body.get("stream"):
+            return httpx.Response(200, json=completion(body["messages"][-1]["content"].upper()))
+        chunks = [
+            {"id": "chatcmpl-1", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4o",
+             "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}]}
+            for text in ("Hel", "lo")
+        ]
+        chunks[-1]["choices"][0]["finish_reason"] = "stop"
+        stream = "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks) + "data: [DONE]\n\n"
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=stream.encode())
+
+    client: SyncLLM = make_client(respond)
+
+    events = list(client.stream_text("gpt-4o", [UserModelMessage(content="Hi")]))
+    results = list(client.generate_many(
+        [GenerateTextRequest(model_name="gpt-4o", messages=[UserModelMessage(content=word)]) for word in ("a", "b", "c")],
+        ordered=True
+    ))
+
+    assert "".join(event.text for event in events if isinstance(event, TextDeltaEvent)) == "Hello"
+    assert isinstance(events[-1], FinishEvent) and events[-1].result.text == "Hello"
+    assert [result.result.text for result in results] == ["A", "B", "C"]
+
+
+@pytest.mark.parametrize("model_name", ["gpt-4o", "claude-sonnet-4-5", "gpt-oss-120b"])
+def test_every_provider_runs_on_the_async_core(model_name: str, completion: Callable[..., dict], mock_client: Callable[..., Any]):
+    def respond(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/messages"):
+            return httpx.Response(200, headers={"request-id": "req_1"}, json={
+                "id": "msg_1", "type": "message", "role": "assistant", "model": model_name, "stop_reason": "end_turn",
+                "content": [{"type": "text", "text": "Hi"}], "usage": {"input_tokens": 5, "output_tokens": 1}
+            })
+        usage = {"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6}
+        return httpx.Response(200, headers={"x-request-id": "req_1"}, json=completion(usage=usage))
+
+    client: SyncLLM = SyncLLM(openai_key="test", anthropic_key="test", fireworks_key="test")
+    client.openai_client = mock_client(AsyncOpenAI, respond)
+    client.anthropic_client = mock_client(AsyncAnthropic, respond)
+    client.fireworks_client = mock_client(AsyncOpenAI, respond)
+    result: GenerateTextResult = client.generate_text(model_name, [UserModelMessage(content="Hello")])
+
+    assert (result.text, result.finish_reason, result.request_id) == ("Hi", FinishReason.STOP, "req_1")
+    assert (result.usage.input_tokens, result.usage.output_tokens) == (5, 1)
+    assert result.timings.total > 0
+
+
+def test_sync_sdk_clients_send_from_worker_threads(completion: Callable[..., dict], mock_client: Callable[..., Any]):
+    threads: list[str] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        threads.append(threading.current_thread().name)
+        return httpx.Response(200, json=completion())
+
+    client: SyncLLM = SyncLLM(openai_key="test")
+    client.openai_client = mock_client(OpenAI, respond, max_retries=0)
+
+    assert isinstance(client.openai_client, AsyncOpenAI) and client.openai_client.max_retries == 0
+    assert client.generate_text("gpt-4o", [UserModelMessage(content="Hello")]).text == "Hi"
+    assert len(threads) == 1 and threads[0] not in ("llms-loop", threading.current_thread().name)
+
+
+def test_the_callers_deadline_reaches_the_loop(completion: Callable[..., dict], make_client: Callable[..., SyncLLM]):
+    async def respond(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(5.0)
+        return httpx.Response(200, json=completion())
+
+    client: SyncLLM = make_client(respond)
+    started: float = time.monotonic()
+    with deadline_scope(time.monotonic() + 0.2), pytest.raises(DeadlineExceeded):
+        client.generate_text("gpt-4o", [UserModelMessage(content="Hello")])
+
+    assert time.monotonic() - started < 1.0
+
+
+def test_run_from_the_loop_itself_is_refused():
+    loop: BackgroundLoop = BackgroundLoop(name="test-loop")
+
+    async def nested() -> None:
+        async def inner() -> int:
+            return 1
+        loop.run(inner())
+
+    with pytest.raises(RuntimeError):
+        loop.run(nested())
+    loop.close()
+    assert loop.closed
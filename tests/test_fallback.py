@@ -0,0 +1,159 @@
+import asyncio
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+import httpx
+import pytest
+from anthropic import Anthropic, AsyncAnthropic
+from openai import OpenAI, AsyncOpenAI, BadRequestError
+from llms._async.client import AsyncLLM
+from llms._async.hedging import run_with_fallback
+from llms._sync.client import SyncLLM
+from llms.fallback import FallbackPolicy, LatencyTracker
+from llms.types.enums import Role
+from llms.types.messages import ModelMessage
+from llms.types.results import GenerateTextResult
+from llms.utilities.params import FIREWORKS_MODEL_PREFIX
+
+
+MESSAGES: list[ModelMessage] = [ModelMessage(role=Role.USER, content="Hello")]
+POLICY = FallbackPolicy(
+    chains={"gpt-oss-120b": ["gpt-4o", "claude-sonnet-4-5"]},
+    hedge_initial_delay=0.05,
+    max_retries=1,
+    backoff_base=0.001
+)
+
+
+def model_of(request: httpx.Request) -> str:
+    return json.loads(request.content)["model"].removeprefix(FIREWORKS_MODEL_PREFIX)
+
+
+@pytest.fixture
+def reply(completion: Callable[..., dict]) -> Callable[[httpx.Request], httpx.Response]:
+    """A completion whose text names the model asked, in the API format of the provider asked."""
+    def respond(request: httpx.Request) -> httpx.Response:
+        model_name: str = model_of(request)
+        if request.url.path.endswith("/messages"):
+            return httpx.Response(200, json={
+                "id": "msg_1", "type": "message", "role": "assistant", "model": model_name, "stop_reason": "end_turn",
+                "content": [{"type": "text", "text": model_name}], "usage": {"input_tokens": 1, "output_tokens": 1}
+            })
+        return httpx.Response(200, json=completion(model_name, model=model_name))
+
+    return respond
+
+
+@pytest.fixture
+def fake_providers(mock_client: Callable[..., Any]) -> Callable[..., None]:
+    """Send all of a client's provider requests to `respond`, leaving retries to the fallback policy."""
+    def install(client: SyncLLM | AsyncLLM, respond: Callable[[httpx.Request], Any]) -> None:
+        is_sync = isinstance(client, SyncLLM)
+        client.openai_client = mock_client(OpenAI if is_sync else AsyncOpenAI, respond, max_retries=0)
+        client.fireworks_client = mock_client(OpenAI if is_sync else AsyncOpenAI, respond, max_retries=0)
+        client.anthropic_client = mock_client(Anthropic if is_sync else AsyncAnthropic, respond, max_retries=0)
+
+    return install
+
+
+def test_async_hedge_wins_and_cancels_slow_primary(fake_providers: Callable[..., None], reply: Callable[[httpx.Request], httpx.Response]):
+    cancelled: list[str] = []
+
+    async def respond(request: httpx.Request) -> httpx.Response:
+        try:
+            await asyncio.sleep(1.0 if model_of(request) == "gpt-oss-120b" else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(model_of(request))
+            raise
+        return reply(request)
+
+    client: AsyncLLM = AsyncLLM(openai_key="test", anthropic_key="test", fireworks_key="test", fallback_policy=POLICY)
+    fake_providers(client, respond)
+
+    started = time.monotonic()
+    result = asyncio.run(client.generate_text(model_name="gpt-oss-120b", messages=MESSAGES))
+
+    assert result.text == "gpt-4o"
+    assert cancelled == ["gpt-oss-120b"]
+    assert time.monotonic() - started < 0.5
+    # The cancelled primary's time still counts towards its hedge delay
+    assert client._latency_tracker.percentile("gpt-oss-120b", 50) >= 0.05
+
+
+def test_a_success_wins_over_an_error_finishing_alongside_it(make_result: Callable[..., GenerateTextResult]):
+    started: list[str] = []
+
+    async def main() -> GenerateTextResult:
+        both_running = asyncio.Event()
+
+        async def call(model_name: str) -> GenerateTextResult:
+            started.append(model_name)
+            if len(started) == 2:
+                both_running.set()
+            await both_running.wait()
+            if model_name == "gpt-oss-120b":
+                raise ValueError("Bad request")
+            return make_result(model_name)
+
+        return await run_with_fallback(call, "gpt-oss-120b", POLICY, LatencyTracker())
+
+    assert asyncio.run(main()).text == "gpt-4o"
+    assert started == ["gpt-oss-120b", "gpt-4o"]
+
+
+def test_sync_retries_then_falls_back_on_retryable_errors(fake_providers: Callable[..., None], reply: Callable[[httpx.Request], httpx.Response]):
+    calls: list[str] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        calls.append(model_of(request))
+        if calls[-1] != "claude-sonnet-4-5":
+            raise httpx.ConnectError("Connection refused", request=request)
+        return reply(request)
+
+    policy = POLICY.model_copy(update={"hedge_percentile": None})
+    client: SyncLLM = SyncLLM(openai_key="test", anthropic_key="test", fireworks_key="test", fallback_policy=policy)
+    fake_providers(client, respond)
+
+    result = client.generate_text(model_name="gpt-oss-120b", messages=MESSAGES)
+
+    assert result.text == "claude-sonnet-4-5"
+    assert calls == ["gpt-oss-120b", "gpt-oss-120b", "gpt-4o", "gpt-4o", "claude-sonnet-4-5"]
+
+
+def test_sync_non_retryable_errors_are_raised(fake_providers: Callable[..., None]):
+    calls: list[str] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        calls.append(model_of(request))
+        return httpx.Response(400, json={"error": {"message": "Bad request"}})
+
+    client: SyncLLM = SyncLLM(openai_key="test", anthropic_key="test", fireworks_key="test", fallback_policy=POLICY)
+    fake_providers(client, respond)
+
+    with pytest.raises(BadRequestError):
+        client.generate_text(model_name="gpt-oss-120b", messages=MESSAGES)
+    assert calls == ["gpt-oss-120b"]
+
+
+def test_hedge_delay_follows_latency_percentile():
+    tracker = LatencyTracker()
+    policy = FallbackPolicy(min_samples=10, hedge_percentile=90)
+
+    assert tracker.hedge_delay("gpt-4o", policy) == policy.hedge_initial_delay
+    for index in range(100):
+        tracker.record("gpt-4o", index / 100)
+
+    assert tracker.hedge_delay("gpt-4o", policy) == pytest.approx(0.9)
+
+
+def test_censored_latencies_only_count_above_the_median():
+    tracker = LatencyTracker()
+    for _ in range(10):
+        tracker.record("gpt-4o", 1.0)
+
+    tracker.record_censored("gpt-4o", 0.2)
+    tracker.record_censored("gpt-4o", 3.0)
+
+    assert tracker.percentile("gpt-4o", 0) == 1.0
+    assert tracker.percentile("gpt-4o", 100) == 3.0
@@ -0,0 +1,126 @@
+import asyncio
+import itertools
+import pytest
+from llms._async.client import AsyncLLM
+from llms.types.enums import Provider, Role
+from llms.types.messages import ModelMessage
+from llms.types.parts import TextPart
+from llms.types.requests import GenerateTextRequest
+from llms.types.results import GenerateTextResult
+
+
+class FakeGenerate:
+    def __init__(self):
+        self.in_flight: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+
+    async def __call__(self, model_name: str, messages: list[ModelMessage]) -> GenerateTextResult:
+        self.in_flight[model_name] = self.in_flight.get(model_name, 0) + 1
+        self.peak[model_name] = max(self.peak.get(model_name, 0), self.in_flight[model_name])
+        try:
+            index = int(messages[0].content)
+            if index == 3:
+                raise RuntimeError("boom")
+            # Later requests finish first to exercise reordering
+            await asyncio.sleep(0.001 * (10 - index % 10))
+            return GenerateTextResult(text=messages[0].content, parts=[TextPart(text=messages[0].content, provider_options={})])
+        finally:
+            self.in_flight[model_name] -= 1
+
+
+def make_requests(count: int):
+    models = itertools.cycle(["gpt-4o", "claude-sonnet-4-5"])
+    for index in range(count):
+        yield GenerateTextRequest(model_name=next(models), messages=[ModelMessage(role=Role.USER, content=str(index))])
+
+
+def make_client() -> tuple[AsyncLLM, FakeGenerate]:
+    client: AsyncLLM = AsyncLLM(openai_key="test", anthropic_key="test", fireworks_key="test")
+    fake = FakeGenerate()
+    client.generate_text = fake
+    return client, fake
+
+
+def test_generate_many_ordered_with_limits():
+    async def run() -> tuple[list, FakeGenerate]:
+        client, fake = make_client()
+        items = [item async for item in client.generate_many(
+            make_requests(40),
+            max_concurrency=8,
+            per_provider_limits={Provider.ANTHROPIC: 2},
+            ordered=True,
+            return_exceptions=True
+        )]
+        return items, fake
+
+    items, fake = asyncio.run(run())
+
+    assert [item.index for item in items] == list(range(40))
+    assert isinstance(items[3].error, RuntimeError)
+    assert items[5].result.text == "5"
+    assert fake.peak["claude-sonnet-4-5"] <= 2
+    assert fake.peak["gpt-4o"] <= 8
+
+
+def test_generate_many_pulls_lazily():
+    pulled: list[int] = []
+
+    def tracked():
+        for index, request in enumerate(make_requests(1_000_000)):
+            pulled.append(index)
+            yield request
+
+    async def run() -> None:
+        client, _ = make_client()
+        stream = client.generate_many(tracked(), max_concurrency=4, return_exceptions=True)
+        seen = 0
+        async for item in stream:
+            if item.result is not None:
+                seen += 1
+            if seen == 2:
+                break
+        await stream.aclose()
+
+    asyncio.run(run())
+
+    assert len(pulled) < 10
+
+
+def test_generate_many_raises_without_return_exceptions():
+    async def run() -> None:
+        client, _ = make_client()
+        async for _ in client.generate_many(make_requests(10), max_concurrency=4):
+            pass
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+
+
+def test_a_saturated_provider_does_not_hold_up_the_others():
+    model_names: list[str] = ["claude-sonnet-4-5"] * 4 + ["gpt-4o"] * 10
+    requests: list[GenerateTextRequest] = [
+        GenerateTextRequest(model_name=model_name, messages=[ModelMessage(role=Role.USER, content=str(index))])
+        for index, model_name in enumerate(model_names)
+    ]
+
+    async def run() -> list[str]:
+        unblocked = asyncio.Event()
+        client, _ = make_client()
+
+        async def generate(model_name: str, messages: list[ModelMessage]) -> GenerateTextResult:
+            if model_name == "claude-sonnet-4-5":
+                await unblocked.wait()
+            return GenerateTextResult(text=model_name, parts=[TextPart(text=model_name, provider_options={})])
+
+        client.generate_text = generate
+        finished: list[str] = []
+        # Anthropic's one slot is held until every OpenAI request is done; its other requests wait without taking slots
+        async for item in client.generate_many(requests, max_concurrency=4, per_provider_limits={Provider.ANTHROPIC: 1}):
+            finished.append(item.result.text)
+            if len(finished) == 10:
+                unblocked.set()
+        return finished
+
+    finished: list[str] = asyncio.run(asyncio.wait_for(run(), 5.0))
+
+    assert finished == ["gpt-4o"] * 10 + ["claude-sonnet-4-5"] * 4
@@ -0,0 +1,138 @@
+import asyncio
+import json
+from collections.abc import Callable
+from typing import Any
+import httpx
+import pytest
+from openai import OpenAI, AsyncOpenAI, BadRequestError
+from anthropic import Anthropic
+from llms._async.client import AsyncLLM
+from llms._sync.client import SyncLLM
+from llms.hooks import Hooks, BeforeRequestEvent, AfterResponseEvent, ErrorEvent, StreamChunkEvent
+from llms.types.enums import Role, FinishReason, Provider
+from llms.types.messages import ModelMessage
+from llms.types.results import GenerateTextResult
+from llms.utilities.timing import record_first_byte
+
+
+MESSAGES: list[ModelMessage] = [ModelMessage(role=Role.USER, content="Hello")]
+
+
+ANTHROPIC_STREAM: bytes = "".join(
+    f"event: {event['type']}\ndata: {json.dumps(event)}\n\n" for event in [
+        {"type": "message_start", "message": {
+            "id": "msg_1", "type": "message", "role": "assistant", "model": "claude-sonnet-4-5", "content": [],
+            "stop_reason": None, "stop_sequence": None, "usage": {"input_tokens": 1, "output_tokens": 1}}},
+        {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+        {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "Hi "}},
+        {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "there"}},
+        {"type": "content_block_stop", "index": 0},
+        {"type": "message_delta", "delta": {"stop_reason": "tool_use", "stop_sequence": None}, "usage": {"output_tokens": 2}},
+        {"type": "message_stop"}
+    ]
+).encode()
+
+
+class RecordingHooks(Hooks):
+    def __init__(self):
+        self.events: list = []
+
+    def before_request(self, event: BeforeRequestEvent) -> None:
+        event.api_params["temperature"] = 0
+        self.events.append(event)
+
+    def after_response(self, event: AfterResponseEvent) -> None:
+        self.events.append(event)
+
+    def on_error(self, event: ErrorEvent) -> None:
+        self.events.append(event)
+
+    def on_stream_chunk(self, event: StreamChunkEvent) -> None:
+        self.events.append(event)
+
+
+@pytest.fixture
+def completion_transport(completion: Callable[..., dict]) -> Callable[..., httpx.MockTransport]:
+    """A transport recording each request into `sent` and answering with `status`."""
+    def build(sent: list[dict], status: int = 200) -> httpx.MockTransport:
+        def respond(request: httpx.Request) -> httpx.Response:
+            sent.append(json.loads(request.content))
+            body = (
+                completion(finish_reason="length", usage={"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6}) if status == 200
+                else {"error": {"message": "bad", "type": "invalid_request_error"}}
+            )
+            return httpx.Response(status, json=body, headers={"x-request-id": "req_123"})
+        return httpx.MockTransport(respond)
+
+    return build
+
+
+def test_sync_hooks_see_request_response_and_timings(completion_transport: Callable[..., httpx.MockTransport]):
+    hooks = RecordingHooks()
+    sent: list[dict] = []
+    client: SyncLLM = SyncLLM(openai_key="test", hooks=[hooks])
+    client.openai_client = OpenAI(api_key="test", http_client=httpx.Client(
+        transport=completion_transport(sent), event_hooks={"response": [record_first_byte]}
+    ))
+
+    result: GenerateTextResult = client.generate_text(model_name="gpt-4o", messages=MESSAGES)
+
+    assert [type(event) for event in hooks.events] == [BeforeRequestEvent, AfterResponseEvent]
+    assert hooks.events[1].result is result
+    assert hooks.events[1].provider == Provider.OPENAI
+    # Hooks may rewrite the request before it is sent
+    assert sent[0]["temperature"] == 0
+    assert result.finish_reason == FinishReason.LENGTH
+    assert result.request_id == "req_123"
+    assert result.usage.input_tokens == 5
+    timings = result.timings
+    assert timings.message_casting > 0
+    assert 0 < timings.time_to_first_byte <= timings.request
+    assert timings.total >= timings.message_casting + timings.waiting + timings.request + timings.response_casting
+
+
+def test_sync_on_error_carries_partial_timings(completion_transport: Callable[..., httpx.MockTransport], mock_client: Callable[..., Any]):
+    hooks = RecordingHooks()
+    client: SyncLLM = SyncLLM(openai_key="test", hooks=[hooks])
+    client.openai_client = mock_client(OpenAI, completion_transport([], status=400), max_retries=0)
+
+    with pytest.raises(BadRequestError):
+        client.generate_text(model_name="gpt-4o", messages=MESSAGES)
+
+    assert isinstance(hooks.events[-1], ErrorEvent)
+    assert isinstance(hooks.events[-1].error, BadRequestError)
+    assert hooks.events[-1].timings.request > 0
+
+
+def test_sync_stream_hooks_fire_per_chunk(mock_client: Callable[..., Any]):
+    hooks = RecordingHooks()
+    client: SyncLLM = SyncLLM(anthropic_key="test", hooks=[hooks])
+    client.anthropic_client = mock_client(
+        Anthropic,
+        lambda request: httpx.Response(200, content=ANTHROPIC_STREAM, headers={"content-type": "text/event-stream", "request-id": "req_456"})
+    )
+
+    events = list(client.stream_text(model_name="claude-sonnet-4-5", messages=MESSAGES))
+
+    chunk_events = [event for event in hooks.events if isinstance(event, StreamChunkEvent)]
+    assert [chunk.event for chunk in chunk_events] == events[:-1]
+    assert chunk_events[0].elapsed <= chunk_events[-1].elapsed
+    assert isinstance(hooks.events[-1], AfterResponseEvent)
+    result: GenerateTextResult = events[-1].result
+    assert result.finish_reason == FinishReason.TOOL_CALLS
+    assert result.request_id == "req_456"
+    assert result.timings.time_to_first_byte is not None
+    assert result.timings.response_casting > 0
+
+
+def test_async_results_carry_timings_without_hooks(completion_transport: Callable[..., httpx.MockTransport], mock_client: Callable[..., Any]):
+    async def run() -> GenerateTextResult:
+        client: AsyncLLM = AsyncLLM(fireworks_key="test")
+        client.fireworks_client = mock_client(AsyncOpenAI, completion_transport([]))
+        return await client.generate_text(model_name="gpt-oss-120b", messages=MESSAGES)
+
+    result: GenerateTextResult = asyncio.run(run())
+
+    assert result.text == "Hi"
+    assert result.request_id == "req_123"
+    assert result.timings.total > 0
@@ -0,0 +1,192 @@
+import asyncio
+import json
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+import httpx
+import pytest
+from anthropic import Anthropic
+from openai import OpenAI, AsyncOpenAI
+from pydantic import BaseModel
+from llms._async.client import AsyncLLM
+from llms._sync.client import SyncLLM
+from llms.conversation import Conversation
+from llms.types.messages import UserModelMessage, ModelMessage
+from llms.types.results import GenerateObjectResult
+from llms.types.streams import PartialObjectEvent, FinishEvent
+from llms.utilities.partial_json import PartialJSONParser
+
+
+MESSAGES: list[ModelMessage] = [UserModelMessage(content="Describe a city")]
+
+
+class City(BaseModel):
+    """A city and its landmarks."""
+    name: str
+    population: int
+    landmarks: list[str]
+
+
+CITY: dict = {"name": "Paris", "population": 2100000, "landmarks": ["Eiffel Tower", "Louvre"]}
+
+
+def sse(events: list[tuple[str | None, dict]], done: bool = False) -> bytes:
+    lines = []
+    for name, data in events:
+        if name:
+            lines.append(f"event: {name}")
+        lines.append(f"data: {json.dumps(data)}")
+        lines.append("")
+    if done:
+        lines.extend(["data: [DONE]", ""])
+    return ("\n".join(lines) + "\n").encode()
+
+
+def openai_stream(text: str, size: int) -> bytes:
+    return sse([
+        (None, {
+            "id": "chatcmpl-1", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4o",
+            "choices": [{"index": 0, "delta": {"content": text[start:start + size]}, "finish_reason": None}]
+        })
+        for start in range(0, len(text), size)
+    ], done=True)
+
+
+def test_parser_matches_json_loads_for_any_fragmentation():
+    document: dict = {
+        "text": "Quote \" slash \\ newline \n emoji 😀 é",
+        "numbers": [0, -1.5, 2e10, 3],
+        "flags": [True, False, None],
+        "nested": {"empty": {}, "list": [[], [{}]], "key with spaces": "value"}
+    }
+    rng: random.Random = random.Random(0)
+    for text in (json.dumps(document), json.dumps(document, ensure_ascii=False, indent=2)):
+        for _ in range(50):
+            parser: PartialJSONParser = PartialJSONParser()
+            start: int = 0
+            while start < len(text):
+                size: int = rng.randint(1, 8)
+                parser.feed(text[start:start + size])
+                parser.partial()
+                start += size
+            assert parser.done
+            assert parser.finish() == document
+
+
+def test_parser_exposes_complete_members_and_the_open_string():
+    parser: PartialJSONParser = PartialJSONParser()
+    snapshots: list = []
+    for fragment in ('{"name": "Pa', 'ris", "population": 21', '00000, "landmarks": ["Eiffel', ' Tower"'):
+        parser.feed(fragment)
+        snapshots.append(json.loads(json.dumps(parser.partial())))
+
+    assert snapshots == [
+        {"name": "Pa"},
+        # The number may still continue, so it is not shown yet
+        {"name": "Paris"},
+        {"name": "Paris", "population": 2100000, "landmarks": ["Eiffel"]},
+        {"name": "Paris", "population": 2100000, "landmarks": ["Eiffel Tower"]}
+    ]
+    with pytest.raises(ValueError):
+        parser.finish()
+    with pytest.raises(ValueError):
+        PartialJSONParser().feed('{"a" 1}')
+
+
+def test_parser_snapshots_of_a_long_string_scale_linearly():
+    def stream_seconds(fragments: int) -> float:
+        best: float = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            for prefix in ('{"text": "', '["'):
+                parser = PartialJSONParser()
+                parser.feed(prefix)
+                for _ in range(fragments):
+                    parser.feed("word word ")
+                    parser.partial()
+            best = min(best, time.perf_counter() - started)
+        return best
+
+    # Four times the fragments takes about four times as long, not sixteen
+    assert stream_seconds(80_000) < 8 * stream_seconds(20_000)
+
+    parser: PartialJSONParser = PartialJSONParser()
+    for fragment in ('["a', 'b', '", "c', 'd"]'):
+        parser.feed(fragment)
+        parser.partial()
+    assert parser.finish() == ["ab", "cd"]
+
+
+def test_generate_object_uses_the_openai_response_format(completion: Callable[..., dict], mock_client: Callable[..., Any]):
+    requests: list[dict] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json=completion(json.dumps(CITY)))
+
+    client: SyncLLM = SyncLLM(openai_key="test")
+    client.openai_client = mock_client(OpenAI, respond)
+    result: GenerateObjectResult = client.generate_object(model_name="gpt-4o", messages=MESSAGES, schema=City)
+
+    assert result.object == City(**CITY)
+    assert requests[0]["response_format"] == {"type": "json_schema", "json_schema": {
+        "name": "City", "description": "A city and its landmarks.", "schema": City.model_json_schema(), "strict": False
+    }}
+
+
+def test_generate_object_forces_an_anthropic_tool(mock_client: Callable[..., Any]):
+    requests: list[dict] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json={
+            "id": "msg_1", "type": "message", "role": "assistant", "model": "claude-sonnet-4-5", "stop_reason": "tool_use",
+            "content": [{"type": "tool_use", "id": "toolu_1", "name": "City", "input": CITY}],
+            "usage": {"input_tokens": 10, "output_tokens": 5}
+        })
+
+    client: SyncLLM = SyncLLM(anthropic_key="test")
+    client.anthropic_client = mock_client(Anthropic, respond)
+    conversation: Conversation = Conversation(MESSAGES)
+    result: GenerateObjectResult = client.generate_object(model_name="claude-sonnet-4-5", messages=conversation, schema=City)
+
+    assert result.object == City(**CITY) and json.loads(result.text) == CITY
+    assert requests[0]["tool_choice"] == {"type": "tool", "name": "City"}
+    assert requests[0]["tools"][0]["input_schema"] == City.model_json_schema()
+    # The conversation records the object as text, not as a tool call awaiting its result
+    assert conversation[-1].content[0].text == result.text
+
+
+def test_stream_object_yields_growing_partial_objects(mock_client: Callable[..., Any]):
+    text: str = json.dumps(CITY)
+    client: SyncLLM = SyncLLM(openai_key="test")
+    client.openai_client = mock_client(
+        OpenAI, lambda request: httpx.Response(200, content=openai_stream(text, 6), headers={"content-type": "text/event-stream"})
+    )
+
+    events: list = []
+    for event in client.stream_object(model_name="gpt-4o", messages=MESSAGES, schema=City):
+        events.append(json.loads(json.dumps(event.object)) if isinstance(event, PartialObjectEvent) else event)
+
+    partials: list[dict] = events[:-1]
+    assert len(partials) == -(-len(text) // 6)
+    assert partials[1] == {"name": "Pa"} and partials[-1] == CITY
+    assert all(set(earlier) <= set(later) for earlier, later in zip(partials, partials[1:]))
+    assert isinstance(events[-1], FinishEvent) and events[-1].result.object == City(**CITY)
+
+
+def test_async_stream_object(mock_client: Callable[..., Any]):
+    text: str = json.dumps(CITY)
+
+    async def run() -> list:
+        client: AsyncLLM = AsyncLLM(openai_key="test")
+        client.openai_client = mock_client(
+            AsyncOpenAI, lambda request: httpx.Response(200, content=openai_stream(text, 10), headers={"content-type": "text/event-stream"})
+        )
+        return [event async for event in client.stream_object(model_name="gpt-4o", messages=MESSAGES, schema=City)]
+
+    events: list = asyncio.run(run())
+
+    assert events[-2].object == CITY
+    assert events[-1].result.object == City(**CITY)
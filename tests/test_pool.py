@@ -0,0 +1,77 @@
+import asyncio
+from collections.abc import Callable
+import pytest
+from llms._async.client import AsyncLLM
+from llms._sync.client import SyncLLM
+from llms.pool import PoolConfig, PoolStats, HTTPPool, AsyncHTTPPool, shared_async_pool
+from llms.types.enums import Role
+from llms.types.messages import ModelMessage
+
+
+MESSAGES: list[ModelMessage] = [ModelMessage(role=Role.USER, content="Hello")]
+
+@pytest.fixture
+def base_url(serve: Callable[..., list[str]], completion: Callable[..., dict]) -> str:
+    return serve(lambda request, handler: completion())[0]
+
+
+def test_clients_share_the_loop_wide_pool():
+    first: SyncLLM = SyncLLM(openai_key="a", openai_base_url="http://127.0.0.1:1/v1")
+    second: SyncLLM = SyncLLM(openai_key="a", openai_base_url="http://127.0.0.1:1/v1")
+    other_key: SyncLLM = SyncLLM(openai_key="b", openai_base_url="http://127.0.0.1:1/v1")
+
+    async def loop_pool() -> AsyncHTTPPool:
+        return shared_async_pool()
+
+    assert first.openai_client is second.openai_client
+    assert other_key.openai_client is not first.openai_client
+    assert other_key.openai_client._client is first.openai_client._client is first.loop.run(loop_pool()).http_client
+
+
+def test_pool_config_reaches_the_provider_clients():
+    pool: AsyncHTTPPool = AsyncHTTPPool(PoolConfig(max_connections=4, max_keepalive_connections=2, connect_timeout=1.0, read_timeout=7.0))
+    client: SyncLLM = SyncLLM(openai_key="test", openai_base_url="http://127.0.0.1:1/v1", http_pool=pool)
+
+    assert client.openai_client._client is pool.http_client
+    assert (client.openai_client.timeout.connect, client.openai_client.timeout.read) == (1.0, 7.0)
+    assert pool.stats() == PoolStats(requests=0, in_flight=0, peak_in_flight=0, connections=0, idle_connections=0, max_connections=4)
+    client.loop.run(pool.aclose())
+    assert pool.closed
+
+
+def test_pool_stats_track_requests_and_reused_connections(base_url: str):
+    pool: AsyncHTTPPool = AsyncHTTPPool(PoolConfig(max_connections=10))
+    clients: list[SyncLLM] = [SyncLLM(openai_key="test", openai_base_url=base_url, http_pool=pool) for _ in range(3)]
+
+    for client in clients:
+        assert client.generate_text(model_name="gpt-4o", messages=MESSAGES).text == "Hi"
+    stats: PoolStats = pool.stats()
+
+    assert (stats.requests, stats.in_flight, stats.peak_in_flight) == (3, 0, 1)
+    # Every client went over the one kept-alive connection
+    assert (stats.connections, stats.idle_connections) == (1, 1)
+    assert stats.utilization == 0.1
+    clients[0].loop.run(pool.aclose())
+
+
+def test_pools_for_sync_sdk_clients_still_serve_sync_clients(base_url: str):
+    pool: HTTPPool = HTTPPool(PoolConfig(max_connections=10))
+    client: SyncLLM = SyncLLM(openai_key="test", openai_base_url=base_url, http_pool=pool)
+
+    assert [client.generate_text(model_name="gpt-4o", messages=MESSAGES).text for _ in range(2)] == ["Hi", "Hi"]
+    assert client.openai_client is client.openai_client
+    assert (pool.stats().requests, pool.stats().connections) == (2, 1)
+    pool.close()
+
+
+def test_async_pools_are_shared_within_an_event_loop():
+    async def pools() -> tuple[object, object, object]:
+        first: AsyncLLM = AsyncLLM(openai_key="test")
+        second: AsyncLLM = AsyncLLM(openai_key="test")
+        return first.openai_client, second.openai_client, shared_async_pool()
+
+    first_client, second_client, first_pool = asyncio.run(pools())
+    _, _, second_pool = asyncio.run(pools())
+
+    assert first_client is second_client
+    assert first_pool is not second_pool
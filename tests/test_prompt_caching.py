@@ -0,0 +1,73 @@
+import json
+from collections.abc import Callable
+from typing import Any
+import httpx
+from anthropic import Anthropic
+from openai import OpenAI
+from llms._sync.client import SyncLLM
+from llms.types.messages import SystemModelMessage, UserModelMessage, AssistantModelMessage, ModelMessage
+from llms.utilities.params import build_anthropic_params, build_openai_params, build_fireworks_params
+
+
+MESSAGES: list[ModelMessage] = [
+    SystemModelMessage(content="You are a very long, very stable system prompt."),
+    UserModelMessage(content="First question"),
+    AssistantModelMessage(content="First answer"),
+    UserModelMessage(content="Second question"),
+]
+
+
+def test_anthropic_breakpoints_on_system_and_last_stable_message():
+    api_params = build_anthropic_params("claude-sonnet-4-5", MESSAGES, prompt_caching=True)
+
+    assert api_params["system"][0]["cache_control"] == {"type": "ephemeral"}
+    assert api_params["messages"][1]["content"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert api_params["messages"][2]["content"] == "Second question"
+    assert build_anthropic_params("claude-sonnet-4-5", MESSAGES)["system"] == MESSAGES[0].content
+
+
+def test_openai_and_fireworks_cache_keys_are_stable():
+    first = build_openai_params("gpt-4o", MESSAGES, prompt_caching=True)
+    second = build_openai_params("gpt-4o", MESSAGES[:2], prompt_caching=True)
+    explicit = build_fireworks_params("gpt-oss-120b", MESSAGES, prompt_caching=True, prompt_cache_key="tenant-1")
+
+    assert first["prompt_cache_key"] == second["prompt_cache_key"]
+    assert explicit["extra_headers"] == {"x-session-affinity": "tenant-1"}
+    assert "prompt_cache_key" not in build_openai_params("gpt-4o", MESSAGES)
+
+
+def test_cache_usage_is_surfaced_on_result(mock_client: Callable[..., Any]):
+    requests: list[dict] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json={
+            "id": "msg_1", "type": "message", "role": "assistant", "model": "claude-sonnet-4-5",
+            "content": [{"type": "text", "text": "Second answer"}],
+            "stop_reason": "end_turn", "stop_sequence": None,
+            "usage": {"input_tokens": 10, "output_tokens": 4, "cache_read_input_tokens": 900, "cache_creation_input_tokens": 50}
+        })
+
+    client: SyncLLM = SyncLLM(openai_key="test", anthropic_key="test", fireworks_key="test", prompt_caching=True)
+    client.anthropic_client = mock_client(Anthropic, respond)
+
+    result = client.generate_text(model_name="claude-sonnet-4-5", messages=MESSAGES)
+
+    assert requests[0]["system"][0]["cache_control"] == {"type": "ephemeral"}
+    assert result.usage.cache_read_tokens == 900
+    assert result.usage.cache_write_tokens == 50
+    assert result.usage.input_tokens == 960
+
+
+def test_openai_cached_tokens_are_surfaced_on_result(completion: Callable[..., dict], mock_client: Callable[..., Any]):
+    def respond(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["prompt_cache_key"] == "tenant-1"
+        return httpx.Response(200, json=completion(usage={"prompt_tokens": 2000, "completion_tokens": 3, "total_tokens": 2003, "prompt_tokens_details": {"cached_tokens": 1920}}))
+
+    client: SyncLLM = SyncLLM(openai_key="test", anthropic_key="test", fireworks_key="test")
+    client.openai_client = mock_client(OpenAI, respond)
+
+    result = client.generate_text(model_name="gpt-4o", messages=MESSAGES, prompt_cache_key="tenant-1")
+
+    assert result.usage.cache_read_tokens == 1920
+    assert result.usage.input_tokens == 2000
@@ -0,0 +1,91 @@
+import asyncio
+from collections.abc import Callable
+from typing import Any
+import httpx
+from openai import OpenAI
+from llms._sync.client import SyncLLM
+from llms.ratelimit import RateLimit, RateLimiter, TokenBucket
+from llms.types.enums import Provider, Role
+from llms.types.messages import ModelMessage
+from llms.types.results import Usage
+from llms.utilities.params import build_anthropic_params
+from llms.utilities.tokens import estimate_request_tokens
+
+
+def test_token_bucket_queues_reservations():
+    bucket = TokenBucket(per_minute=60)
+
+    assert bucket.reserve(60) == 0.0
+    first = bucket.reserve(1)
+    second = bucket.reserve(1)
+
+    assert 0.9 < first <= 1.0
+    assert 1.9 < second <= 2.0
+
+
+def test_limiter_applies_provider_and_model_limits_and_reconciles():
+    limiter = RateLimiter({
+        Provider.OPENAI: RateLimit(requests_per_minute=600),
+        "gpt-4o": RateLimit(tokens_per_minute=1000),
+    })
+
+    reservation = limiter.reserve("gpt-4o", estimated_tokens=1000)
+    assert reservation.delay == 0.0
+    assert limiter.reserve("gpt-5", estimated_tokens=10_000).delay == 0.0
+
+    # The request used far fewer tokens than estimated, so capacity comes back
+    limiter.reconcile(reservation, Usage(input_tokens=100, output_tokens=50))
+    assert limiter.reserve("gpt-4o", estimated_tokens=800).delay == 0.0
+    assert limiter.reserve("gpt-4o", estimated_tokens=600).delay > 20
+
+
+def test_oversized_estimates_return_only_what_they_took():
+    limiter = RateLimiter({"gpt-4o": RateLimit(tokens_per_minute=1000)})
+
+    # Capped at a full bucket, so the queued request behind it waits for 600 tokens
+    oversized = limiter.reserve("gpt-4o", estimated_tokens=5000)
+    queued = limiter.reserve("gpt-4o", estimated_tokens=600)
+    assert queued.delay > 30
+
+    limiter.release(oversized)
+    assert limiter.reserve("gpt-4o", estimated_tokens=600).delay > 10
+
+    oversized = limiter.reserve("gpt-4o", estimated_tokens=5000)
+    limiter.reconcile(oversized, Usage(input_tokens=100, output_tokens=0))
+    assert limiter.reserve("gpt-4o", estimated_tokens=600).delay > 10
+
+
+def test_async_acquire_sleeps_instead_of_spinning():
+    limiter = RateLimiter({"claude-sonnet-4-5": RateLimit(requests_per_minute=1200)})
+    for _ in range(1200):
+        limiter.reserve("claude-sonnet-4-5", estimated_tokens=0)
+
+    async def run() -> float:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await limiter.acquire_async("claude-sonnet-4-5", estimated_tokens=0)
+        return loop.time() - started
+
+    assert 0.03 < asyncio.run(run()) < 0.2
+
+
+def test_estimate_counts_system_and_attachments():
+    messages = [
+        ModelMessage(role=Role.SYSTEM, content="x" * 400),
+        ModelMessage(role=Role.USER, content="y" * 40),
+    ]
+
+    assert estimate_request_tokens(build_anthropic_params("claude-sonnet-4-5", messages)) == 100 + 10 + 8
+
+
+def test_client_reconciles_against_reported_usage(completion: Callable[..., dict], mock_client: Callable[..., Any]):
+    def respond(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=completion(usage={"prompt_tokens": 500, "completion_tokens": 500, "total_tokens": 1000}))
+
+    limiter = RateLimiter({"gpt-4o": RateLimit(tokens_per_minute=2000)})
+    client: SyncLLM = SyncLLM(openai_key="test", anthropic_key="test", fireworks_key="test", rate_limiter=limiter)
+    client.openai_client = mock_client(OpenAI, respond)
+
+    client.generate_text(model_name="gpt-4o", messages=[ModelMessage(role=Role.USER, content="Hello")])
+
+    assert 990 < limiter._token_buckets["gpt-4o"].level < 1010
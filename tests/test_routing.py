@@ -0,0 +1,158 @@
+import asyncio
+import json
+import time
+from collections.abc import Callable, Iterator
+from typing import Any
+import pytest
+from llms._async.client import AsyncLLM
+from llms._sync.client import SyncLLM
+from llms.models import MODEL_MAP, CONTEXT_WINDOWS
+from llms.pool import HTTPPool, AsyncHTTPPool
+from llms.routing import EndpointPool, EndpointRouter, RoutingStrategy
+from llms.types.endpoints import Endpoint
+from llms.types.enums import Provider
+from llms.types.messages import UserModelMessage
+from llms.types.streams import FinishEvent
+
+
+@pytest.fixture
+def requests() -> list[tuple[int, str, str]]:
+    """The (port, model, Authorization) of each request the servers received."""
+    return []
+
+
+@pytest.fixture
+def base_urls(serve: Callable[..., list[str]], completion: Callable[..., dict], requests: list[tuple[int, str, str]]) -> list[str]:
+    def reply(request: dict, handler: Any) -> dict | bytes:
+        port = handler.server.server_address[1]
+        requests.append((port, request["model"], handler.headers.get("Authorization", "")))
+        if request.get("stream"):
+            chunk = {"id": "chatcmpl-1", "object": "chat.completion.chunk", "created": 0, "model": request["model"],
+                     "choices": [{"index": 0, "delta": {"role": "assistant", "content": str(port)}, "finish_reason": "stop"}]}
+            return f"data: {json.dumps(chunk)}\n\ndata: [DONE]\n\n".encode()
+        return completion(str(port), model=request["model"])
+
+    return serve(reply, count=2)
+
+
+@pytest.fixture
+def registry() -> Iterator[None]:
+    providers, endpoints, windows = dict(MODEL_MAP._providers), dict(MODEL_MAP._endpoints), dict(CONTEXT_WINDOWS)
+    yield
+    MODEL_MAP._providers, MODEL_MAP._endpoints = providers, endpoints
+    CONTEXT_WINDOWS.clear()
+    CONTEXT_WINDOWS.update(windows)
+
+
+def test_least_outstanding_spreads_load_round_robin():
+    endpoints: list[Endpoint] = [Endpoint(name="a"), Endpoint(name="b"), Endpoint(name="c")]
+    pool: EndpointPool = EndpointPool(endpoints)
+
+    held = [pool.acquire() for _ in range(3)]
+    assert set(held) == set(endpoints)
+    # With "a" still busy, the next requests go to the idle endpoints
+    for endpoint in held[1:]:
+        pool.release(endpoint, 0.1)
+    assert pool.acquire() != held[0]
+    assert [stats.outstanding for stats in pool.stats()].count(0) == 1
+
+
+def test_ewma_latency_prefers_the_faster_endpoint():
+    fast, slow = Endpoint(name="fast"), Endpoint(name="slow")
+    pool: EndpointPool = EndpointPool([fast, slow], strategy=RoutingStrategy.EWMA_LATENCY)
+    # Endpoints without a latency are tried first
+    for endpoint in (pool.acquire(), pool.acquire()):
+        pool.release(endpoint, 0.1 if endpoint == fast else 0.45)
+
+    picks = [pool.acquire() for _ in range(5)]
+
+    # The slow endpoint only gets a request once the fast one has enough in flight
+    assert picks == [fast, fast, fast, fast, slow]
+    assert [stats.latency for stats in pool.stats()] == [0.1, 0.45]
+
+
+def test_endpoints_are_ejected_after_repeated_errors_and_readmitted():
+    bad, good = Endpoint(name="bad"), Endpoint(name="good")
+    pool: EndpointPool = EndpointPool([bad, good], eject_after=2, eject_seconds=0.05)
+
+    def call(fail: bool = True) -> Endpoint:
+        endpoint = pool.acquire()
+        pool.release(endpoint, None if endpoint == bad and fail else 0.1, failed=endpoint == bad and fail)
+        return endpoint
+
+    # Ties alternate, so "bad" fails twice in four requests
+    assert [call() for _ in range(4)].count(bad) == 2
+    assert [stats.ejected for stats in pool.stats()] == [True, False]
+    assert {call() for _ in range(4)} == {good}
+
+    time.sleep(0.06)
+    # Readmitted on probation: one more failure ejects it again
+    while call() != bad:
+        pass
+    assert pool.stats()[0].ejected
+    time.sleep(0.06)
+    # A success restores it fully
+    while call(fail=False) != bad:
+        pass
+    while call() != bad:
+        pass
+    assert not pool.stats()[0].ejected
+    assert [(stats.errors, stats.outstanding) for stats in pool.stats()] == [(4, 0), (0, 0)]
+
+
+def test_every_endpoint_ejected_falls_back_to_the_soonest_due():
+    first, second = Endpoint(name="first"), Endpoint(name="second")
+    pool: EndpointPool = EndpointPool([first, second], eject_after=1, eject_seconds=10.0)
+    for endpoint in (pool.acquire(), pool.acquire())[::-1]:
+        pool.release(endpoint, None, failed=True)
+        time.sleep(0.01)
+
+    assert pool.acquire() == second
+
+
+def test_client_balances_requests_across_endpoints(base_urls: list[str], requests: list[tuple[int, str, str]]):
+    router: EndpointRouter = EndpointRouter({Provider.OPENAI: [
+        Endpoint(api_key="key-a", base_url=base_urls[0]),
+        Endpoint(api_key="key-b", base_url=base_urls[1])
+    ]})
+    pool: HTTPPool = HTTPPool()
+    client: SyncLLM = SyncLLM(openai_key="unused", router=router, http_pool=pool)
+    messages = [UserModelMessage(content="Hello")]
+
+    replies = [client.generate_text(model_name="gpt-4o", messages=messages).text for _ in range(4)]
+    events = list(client.stream_text(model_name="gpt-5", messages=messages))
+
+    ports = [int(url.split(":")[-1].removesuffix("/v1")) for url in base_urls]
+    assert sorted(replies) == sorted(str(port) for port in ports * 2)
+    assert {auth for _, _, auth in requests[:4]} == {"Bearer key-a", "Bearer key-b"}
+    assert isinstance(events[-1], FinishEvent)
+    # One pool per provider, shared by its models
+    assert [stats.requests for stats in router.stats()["openai"]] == [3, 2]
+    assert all(stats.outstanding == 0 and stats.latency is not None for stats in router.stats()["openai"])
+    pool.close()
+
+
+def test_registered_model_routes_to_its_servers(base_urls: list[str], requests: list[tuple[int, str, str]], registry: None):
+    MODEL_MAP.register(
+        "llama-local",
+        Provider.OPENAI,
+        endpoints=[Endpoint(base_url=url, model_name="meta-llama/Llama-3.1-8B-Instruct") for url in base_urls],
+        context_window=131_072
+    )
+    client: AsyncLLM = AsyncLLM(openai_key="local")
+
+    async def main() -> list[str]:
+        client.http_pool = AsyncHTTPPool()
+        results = await asyncio.gather(*[
+            client.generate_text(model_name="llama-local", messages=[UserModelMessage(content=f"Hello {number}")])
+            for number in range(6)
+        ])
+        await client.http_pool.aclose()
+        return [result.text for result in results]
+
+    replies = asyncio.run(main())
+
+    assert MODEL_MAP["llama-local"] == Provider.OPENAI and CONTEXT_WINDOWS["llama-local"] == 131_072
+    assert len(set(replies)) == 2
+    assert {model for _, model, _ in requests} == {"meta-llama/Llama-3.1-8B-Instruct"}
+    assert [stats.requests for stats in client.router.stats()["llama-local"]] == [3, 3]
@@ -0,0 +1,142 @@
+from collections.abc import Callable
+import httpx
+import numpy as np
+import pytest
+from pathlib import Path
+from openai import OpenAI
+from llms._sync.client import SyncLLM
+from llms.cache import semantic
+from llms.cache.semantic import SemanticCache, SemanticLookup
+from llms.embedders import HashingEmbedder
+from llms.types.messages import SystemModelMessage, UserModelMessage, ModelMessage
+from llms.types.results import GenerateTextResult
+
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self):
+        super().__init__(dimensions=64)
+        self.texts: list[str] = []
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        self.texts.extend(texts)
+        return super().embed(texts)
+
+
+def make_cache(**options) -> SemanticCache:
+    return SemanticCache(HashingEmbedder(), HashingEmbedder.STRICT_THRESHOLD, **options)
+
+
+def ask(question: str, system: str = "You are a support bot.") -> list[ModelMessage]:
+    return [SystemModelMessage(content=system), UserModelMessage(content=question)]
+
+
+@pytest.fixture
+def remember(make_result: Callable[..., GenerateTextResult]) -> Callable[..., None]:
+    """Store `answer` for a question the cache has not seen."""
+    def store(cache: SemanticCache, model_name: str, question: str, answer: str, system: str = "You are a support bot.") -> None:
+        lookup: SemanticLookup = cache.lookup(model_name, ask(question, system))
+        assert lookup.result is None
+        cache.store(lookup, make_result(answer))
+
+    return store
+
+
+def test_hashing_embedder_places_rephrasings_close():
+    vectors: np.ndarray = HashingEmbedder().embed(["How do I reset my password?", "how do I reset my password", "What are your opening hours?", ""])
+
+    assert vectors.dtype == np.float32 and vectors.shape == (4, 512)
+    assert np.allclose(np.linalg.norm(vectors[:3], axis=1), 1.0) and not vectors[3].any()
+    assert vectors[0] @ vectors[1] > HashingEmbedder.STRICT_THRESHOLD > 0.1 > vectors[0] @ vectors[2]
+
+
+def test_questions_differing_in_one_word_do_not_match(remember: Callable[..., None]):
+    cache: SemanticCache = make_cache()
+    near_misses = [
+        ("Is it safe to take aspirin with ibuprofen?", "Is it safe to take aspirin without ibuprofen?"),
+        ("What is the capital of France?", "What is the capital of Spain?"),
+        ("Convert 100 USD to EUR", "Convert 500 USD to EUR"),
+        ("How do I reset my password?", "How do I reset my pasword?")
+    ]
+    for question, _ in near_misses:
+        remember(cache, "gpt-4o", question, question)
+
+    assert [cache.lookup("gpt-4o", ask(other)).result for _, other in near_misses] == [None] * 4
+    assert cache.lookup("gpt-4o", ask("what is the capital of France")).result.text == "What is the capital of France?"
+
+
+def test_similar_questions_hit_within_the_same_model_and_context(remember: Callable[..., None]):
+    cache: SemanticCache = make_cache()
+    remember(cache, "gpt-4o", "How do I reset my password?", "Use the link.")
+
+    assert cache.lookup("gpt-4o", ask("how do I reset my password")).result.text == "Use the link."
+    assert cache.lookup("gpt-4o", ask("What are your opening hours?")).result is None
+    # Other models and other system prompts have their own entries
+    assert cache.lookup("gpt-5", ask("How do I reset my password?")).result is None
+    assert cache.lookup("gpt-4o", ask("How do I reset my password?", system="You are a pirate.")).result is None
+    # Only text user messages are looked up
+    assert cache.lookup("gpt-4o", [SystemModelMessage(content="Hi")]) is None
+    assert (cache.stats.hits, cache.stats.misses) == (1, 4)
+
+
+def test_search_returns_the_top_k_by_similarity(remember: Callable[..., None]):
+    cache: SemanticCache = make_cache()
+    for question in ("How do I reset my password?", "How do I change my email?", "Where is my order?", "Reset password link expired"):
+        remember(cache, "gpt-4o", question, "...")
+
+    matches = cache.search("gpt-4o", "reset my password", k=2)
+
+    assert [match.text for match in matches] == ["How do I reset my password?", "Reset password link expired"]
+    assert matches[0].score >= matches[1].score
+    assert cache.search("gpt-5", "reset my password") == []
+
+
+def test_least_recently_used_entries_are_evicted(monkeypatch: pytest.MonkeyPatch, remember: Callable[..., None]):
+    monkeypatch.setattr(semantic, "_INITIAL_CAPACITY", 2)
+    cache: SemanticCache = make_cache(max_size=3)
+    for number, question in enumerate(("Where is my order?", "How do I change my email?", "What are your opening hours?")):
+        remember(cache, "gpt-4o", question, str(number))
+    cache.lookup("gpt-4o", ask("Where is my order?"))
+
+    remember(cache, "gpt-4o", "Can I pay by invoice?", "3")
+
+    assert len(cache) == 3 and cache.stats.evictions == 1
+    assert cache.lookup("gpt-4o", ask("Where is my order?")).result.text == "0"
+    assert cache.lookup("gpt-4o", ask("How do I change my email?")).result is None
+    assert cache.lookup("gpt-4o", ask("Can I pay by invoice?")).result.text == "3"
+
+
+def test_index_is_reopened_from_disk_without_embedding_again(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, remember: Callable[..., None]):
+    monkeypatch.setattr(semantic, "_INITIAL_CAPACITY", 2)
+    questions = ["Where is my order?", "How do I change my email?", "What are your opening hours?", "Can I pay by invoice?", "Do you ship abroad?"]
+    cache: SemanticCache = SemanticCache(CountingEmbedder(), 0.9, path=tmp_path)
+    for number, question in enumerate(questions):
+        remember(cache, "gpt-4o", question, str(number))
+    remember(cache, "claude-sonnet-4-5", "Where is my order?", "claude")
+    cache.close()
+
+    embedder: CountingEmbedder = CountingEmbedder()
+    reopened: SemanticCache = SemanticCache(embedder, 0.9, path=tmp_path)
+
+    assert len(reopened) == 6 and embedder.texts == []
+    assert [reopened.lookup("gpt-4o", ask(question)).result.text for question in questions] == ["0", "1", "2", "3", "4"]
+    assert reopened.lookup("claude-sonnet-4-5", ask("where is my order")).result.text == "claude"
+    with pytest.raises(ValueError):
+        SemanticCache(HashingEmbedder(dimensions=32), 0.9, path=tmp_path)
+
+
+def test_client_answers_similar_questions_from_the_semantic_cache(completion: Callable[..., dict], mock_client: Callable[..., OpenAI]):
+    requests: list[httpx.Request] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=completion("Use the reset link."))
+
+    client: SyncLLM = SyncLLM(openai_key="test", semantic_cache=make_cache())
+    client.openai_client = mock_client(OpenAI, respond)
+
+    first = client.generate_text(model_name="gpt-4o", messages=ask("How do I reset my password?"))
+    second = client.generate_text(model_name="gpt-4o", messages=ask("how do i reset my password"))
+    client.generate_text(model_name="gpt-4o", messages=ask("how do i reset my password"), bypass_cache=True)
+
+    assert first.text == second.text == "Use the reset link."
+    assert len(requests) == 2
@@ -0,0 +1,134 @@
+import asyncio
+import json
+from collections.abc import Callable
+from typing import Any
+import httpx
+import pytest
+from openai import AsyncOpenAI
+from llms._async.client import AsyncLLM
+from llms.deadlines import DeadlineExceeded
+from llms.singleflight import SingleFlight, SingleFlightStats
+from llms.types.enums import Role
+from llms.types.messages import ModelMessage
+from llms.types.results import GenerateTextResult
+
+
+def messages(text: str) -> list[ModelMessage]:
+    return [ModelMessage(role=Role.USER, content=text)]
+
+
+@pytest.fixture
+def make_client(completion: Callable[..., dict], mock_client: Callable[..., Any]) -> Callable[..., AsyncLLM]:
+    """A single-flight client whose replies shout the question back after `delay`."""
+    def build(requests: list[dict], delay: float = 0.1, status: int = 200) -> AsyncLLM:
+        async def respond(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            requests.append(body)
+            await asyncio.sleep(delay)
+            reply = completion(body["messages"][0]["content"].upper()) if status == 200 else {"error": {"message": "bad request"}}
+            return httpx.Response(status, json=reply)
+
+        client: AsyncLLM = AsyncLLM(openai_key="test", single_flight=SingleFlight())
+        client.openai_client = mock_client(AsyncOpenAI, respond, max_retries=0)
+        return client
+
+    return build
+
+
+def test_concurrent_identical_calls_share_one_request(make_client: Callable[..., AsyncLLM]):
+    requests: list[dict] = []
+
+    async def run() -> tuple[list[GenerateTextResult], SingleFlight]:
+        client: AsyncLLM = make_client(requests)
+        calls = [client.generate_text(model_name="gpt-4o", messages=messages("spam?")) for _ in range(20)]
+        calls.append(client.generate_text(model_name="gpt-4o", messages=messages("ham?")))
+        return await asyncio.gather(*calls), client.single_flight
+
+    results, single_flight = asyncio.run(run())
+
+    assert len(requests) == 2
+    assert all(result is results[0] for result in results[:20]) and results[0].text == "SPAM?"
+    assert results[20].text == "HAM?"
+    assert single_flight.stats == SingleFlightStats(calls=21, requests=2, deduplicated=19, cancelled=0)
+    assert single_flight.in_flight() == 0
+
+
+def test_cancelling_one_waiter_keeps_the_shared_request(make_client: Callable[..., AsyncLLM]):
+    requests: list[dict] = []
+
+    async def run() -> tuple[GenerateTextResult, SingleFlight]:
+        client: AsyncLLM = make_client(requests)
+        first = asyncio.create_task(client.generate_text(model_name="gpt-4o", messages=messages("spam?")))
+        second = asyncio.create_task(client.generate_text(model_name="gpt-4o", messages=messages("spam?")))
+        await asyncio.sleep(0.02)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second, client.single_flight
+
+    result, single_flight = asyncio.run(run())
+
+    assert result.text == "SPAM?" and len(requests) == 1
+    assert single_flight.stats.cancelled == 0
+
+
+def test_the_shared_request_is_cancelled_when_every_waiter_has_gone(make_client: Callable[..., AsyncLLM]):
+    requests: list[dict] = []
+
+    async def run() -> tuple[GenerateTextResult, SingleFlight]:
+        client: AsyncLLM = make_client(requests)
+        waiters = [asyncio.create_task(client.generate_text(model_name="gpt-4o", messages=messages("spam?"))) for _ in range(3)]
+        await asyncio.sleep(0.02)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        assert client.single_flight.in_flight() == 0
+        # A later call starts a request of its own
+        return await client.generate_text(model_name="gpt-4o", messages=messages("spam?")), client.single_flight
+
+    result, single_flight = asyncio.run(run())
+
+    assert result.text == "SPAM?" and len(requests) == 2
+    assert (single_flight.stats.requests, single_flight.stats.deduplicated, single_flight.stats.cancelled) == (2, 2, 1)
+
+
+def test_errors_reach_every_waiter(make_client: Callable[..., AsyncLLM]):
+    requests: list[dict] = []
+
+    async def run() -> list:
+        client: AsyncLLM = make_client(requests, status=400)
+        return await asyncio.gather(
+            *(client.generate_text(model_name="gpt-4o", messages=messages("spam?")) for _ in range(3)),
+            return_exceptions=True
+        )
+
+    errors: list = asyncio.run(run())
+
+    assert len(requests) == 1
+    assert all(isinstance(error, Exception) and error is errors[0] for error in errors)
+
+
+def test_waiters_keep_their_own_deadlines(completion: Callable[..., dict], mock_client: Callable[..., Any]):
+    timeouts: list[float] = []
+
+    async def respond(request: httpx.Request) -> httpx.Response:
+        timeouts.append(request.extensions["timeout"]["read"])
+        await asyncio.sleep(0.5)
+        return httpx.Response(200, json=completion("SPAM!"))
+
+    async def run() -> tuple[list, SingleFlight]:
+        client: AsyncLLM = AsyncLLM(openai_key="test", single_flight=SingleFlight())
+        client.openai_client = mock_client(AsyncOpenAI, respond, timeout=30.0)
+        outcomes = await asyncio.gather(
+            client.generate_text(model_name="gpt-4o", messages=messages("spam?"), timeout=0.1),
+            client.generate_text(model_name="gpt-4o", messages=messages("spam?")),
+            return_exceptions=True
+        )
+        return outcomes, client.single_flight
+
+    (bounded, unbounded), single_flight = asyncio.run(run())
+
+    # The first caller's budget ends its own wait, not the request shared with the other
+    assert isinstance(bounded, DeadlineExceeded)
+    assert unbounded.text == "SPAM!"
+    assert timeouts == [30.0] and single_flight.stats.cancelled == 0
@@ -0,0 +1,24 @@
+import subprocess
+import sys
+from llms._sync.client import SyncLLM
+
+
+def test_importing_clients_does_not_import_sdks():
+    snippet: str = (
+        "import sys\n"
+        "import llms._sync.client, llms._async.client\n"
+        "from llms._sync.client import SyncLLM\n"
+        "SyncLLM(openai_key='test')\n"
+        "print(sorted(name for name in ('openai', 'anthropic') if name in sys.modules))\n"
+    )
+    output: str = subprocess.run([sys.executable, "-c", snippet], check=True, capture_output=True, text=True).stdout
+
+    assert output.strip() == "[]"
+
+
+def test_provider_clients_are_built_once_on_first_use():
+    client: SyncLLM = SyncLLM(openai_key="test", openai_base_url="http://127.0.0.1:1/v1")
+
+    assert "openai_client" not in vars(client.client)
+    assert client.openai_client is client.openai_client
+    assert str(client.openai_client.base_url) == "http://127.0.0.1:1/v1/"
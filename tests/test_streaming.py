@@ -0,0 +1,101 @@
+import json
+import asyncio
+from collections.abc import Callable
+from typing import Any
+import httpx
+from openai import OpenAI, AsyncOpenAI
+from anthropic import Anthropic
+from llms._sync.client import SyncLLM
+from llms._async.client import AsyncLLM
+from llms.types.messages import ModelMessage
+from llms.types.enums import Role
+from llms.types.parts import PartType
+from llms.types.streams import StreamEventType, FinishEvent
+
+
+MESSAGES: list[ModelMessage] = [ModelMessage(role=Role.USER, content="Hello, how are you?")]
+
+
+def sse(events: list[tuple[str | None, dict]], done: bool = False) -> bytes:
+    lines = []
+    for name, data in events:
+        if name:
+            lines.append(f"event: {name}")
+        lines.append(f"data: {json.dumps(data)}")
+        lines.append("")
+    if done:
+        lines.extend(["data: [DONE]", ""])
+    return ("\n".join(lines) + "\n").encode()
+
+
+def openai_chunk(delta: dict) -> tuple[None, dict]:
+    return None, {
+        "id": "chatcmpl-1", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4o",
+        "choices": [{"index": 0, "delta": delta, "finish_reason": None}]
+    }
+
+
+OPENAI_STREAM: bytes = sse([
+    openai_chunk({"role": "assistant", "content": "Hel"}),
+    openai_chunk({"content": "lo"}),
+    openai_chunk({"tool_calls": [{"index": 0, "id": "call_1", "type": "function", "function": {"name": "lookup", "arguments": "{\"q\":"}}]}),
+    openai_chunk({"tool_calls": [{"index": 0, "function": {"arguments": " 1}"}}]}),
+], done=True)
+
+ANTHROPIC_STREAM: bytes = sse([
+    ("message_start", {"type": "message_start", "message": {
+        "id": "msg_1", "type": "message", "role": "assistant", "model": "claude-sonnet-4-5", "content": [],
+        "stop_reason": None, "stop_sequence": None, "usage": {"input_tokens": 1, "output_tokens": 1}}}),
+    ("content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}),
+    ("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "Hi "}}),
+    ("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "there"}}),
+    ("content_block_stop", {"type": "content_block_stop", "index": 0}),
+    ("content_block_start", {"type": "content_block_start", "index": 1, "content_block": {"type": "tool_use", "id": "toolu_1", "name": "lookup", "input": {}}}),
+    ("content_block_delta", {"type": "content_block_delta", "index": 1, "delta": {"type": "input_json_delta", "partial_json": "{\"q\": "}}),
+    ("content_block_delta", {"type": "content_block_delta", "index": 1, "delta": {"type": "input_json_delta", "partial_json": "1}"}}),
+    ("content_block_stop", {"type": "content_block_stop", "index": 1}),
+    ("message_delta", {"type": "message_delta", "delta": {"stop_reason": "tool_use", "stop_sequence": None}, "usage": {"output_tokens": 5}}),
+    ("message_stop", {"type": "message_stop"}),
+])
+
+
+def stream_transport(body: bytes) -> httpx.MockTransport:
+    return httpx.MockTransport(lambda request: httpx.Response(200, content=body, headers={"content-type": "text/event-stream"}))
+
+
+def test_sync_openai_stream_text(mock_client: Callable[..., Any]):
+    client: SyncLLM = SyncLLM(openai_key="test", anthropic_key="test", fireworks_key="test")
+    client.openai_client = mock_client(OpenAI, stream_transport(OPENAI_STREAM))
+
+    events = list(client.stream_text(model_name="gpt-4o", messages=MESSAGES))
+
+    assert [event.type for event in events[:2]] == [StreamEventType.TEXT_DELTA, StreamEventType.TEXT_DELTA]
+    assert isinstance(events[-1], FinishEvent)
+    result = events[-1].result
+    assert result.parts[0].text == "Hello"
+    assert result.parts[1].type == PartType.TOOL_CALL
+    assert result.parts[1].tool_call_id == "call_1"
+    assert result.parts[1].input == "{\"q\": 1}"
+
+
+def test_sync_anthropic_stream_text(mock_client: Callable[..., Any]):
+    client: SyncLLM = SyncLLM(openai_key="test", anthropic_key="test", fireworks_key="test")
+    client.anthropic_client = mock_client(Anthropic, stream_transport(ANTHROPIC_STREAM))
+
+    events = list(client.stream_text(model_name="claude-sonnet-4-5", messages=MESSAGES))
+
+    result = events[-1].result
+    assert result.text.startswith("Hi there")
+    assert result.parts[1].tool_name == "lookup"
+    assert result.parts[1].input == {"q": 1}
+
+
+def test_async_openai_stream_text(mock_client: Callable[..., Any]):
+    async def run() -> list:
+        client: AsyncLLM = AsyncLLM(openai_key="test", anthropic_key="test", fireworks_key="test")
+        client.fireworks_client = mock_client(AsyncOpenAI, stream_transport(OPENAI_STREAM))
+        return [event async for event in client.stream_text(model_name="gpt-oss-120b", messages=MESSAGES)]
+
+    events = asyncio.run(run())
+
+    assert events[-1].result.parts[0].text == "Hello"
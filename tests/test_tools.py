@@ -0,0 +1,182 @@
+import asyncio
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+import httpx
+import pytest
+from anthropic import AsyncAnthropic
+from openai import OpenAI
+from llms._async.client import AsyncLLM
+from llms._sync.client import SyncLLM
+from llms.conversation import Conversation
+from llms.deadlines import DeadlineExceeded
+from llms.types.enums import Role
+from llms.types.messages import UserModelMessage, ModelMessage
+from llms.types.results import GenerateTextResult
+from llms.types.tools import Tool
+
+
+MESSAGES: list[ModelMessage] = [UserModelMessage(content="Weather in Paris and Rome?")]
+
+WEATHER_SCHEMA: dict = {"type": "object", "properties": {"city": {"type": "string"}}, "required": ["city"]}
+
+
+def openai_tool_calls(*calls: tuple[str, str, dict]) -> dict:
+    """The completion() arguments of a reply calling tools."""
+    return {
+        "content": None,
+        "finish_reason": "tool_calls",
+        "tool_calls": [
+            {"id": call_id, "type": "function", "function": {"name": name, "arguments": json.dumps(arguments)}}
+            for call_id, name, arguments in calls
+        ],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+    }
+
+
+def openai_text(text: str) -> dict:
+    """The completion() arguments of a text reply."""
+    return {"content": text, "usage": {"prompt_tokens": 20, "completion_tokens": 3, "total_tokens": 23}}
+
+
+@pytest.fixture
+def openai_client(completion: Callable[..., dict], mock_client: Callable[..., Any]) -> Callable[..., OpenAI]:
+    """An OpenAI client answering the n-th request with the n-th reply, recording requests into `requests`."""
+    def build(replies: list[dict], requests: list[dict]) -> OpenAI:
+        def respond(request: httpx.Request) -> httpx.Response:
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, json=completion(**replies[len(requests) - 1]))
+        return mock_client(OpenAI, respond)
+
+    return build
+
+
+def slow_weather(city: str) -> str:
+    time.sleep(0.3)
+    return f"Sunny in {city}"
+
+
+def test_tool_calls_of_a_step_run_concurrently(openai_client: Callable[..., OpenAI]):
+    requests: list[dict] = []
+    client: SyncLLM = SyncLLM(openai_key="test")
+    client.openai_client = openai_client([
+        openai_tool_calls(("call_1", "weather", {"city": "Paris"}), ("call_2", "weather", {"city": "Rome"})),
+        openai_text("Sunny in both")
+    ], requests)
+    tools: list[Tool] = [Tool(name="weather", description="Current weather", parameters=WEATHER_SCHEMA, function=slow_weather)]
+
+    result: GenerateTextResult = client.generate_text(model_name="gpt-4o", messages=MESSAGES, tools=tools)
+
+    assert result.text == "Sunny in both"
+    assert requests[0]["tools"] == [{"type": "function", "function": {"name": "weather", "description": "Current weather", "parameters": WEATHER_SCHEMA}}]
+    # The follow-up carries the tool calls and one tool message per result
+    assert [message["role"] for message in requests[1]["messages"]] == ["user", "assistant", "tool", "tool"]
+    assert requests[1]["messages"][1]["tool_calls"][1]["function"]["arguments"] == '{"city": "Rome"}'
+    assert requests[1]["messages"][3] == {"role": "tool", "tool_call_id": "call_2", "content": "Sunny in Rome"}
+    # Two 0.3s calls side by side
+    assert len(result.steps) == 2 and result.steps[0].tools_seconds < 0.55
+    assert [execution.seconds >= 0.3 for execution in result.steps[0].tool_executions] == [True, True]
+    assert result.usage.input_tokens == 30 and result.usage.output_tokens == 8
+    # The caller's list is not modified
+    assert len(MESSAGES) == 1
+
+
+def test_failures_and_timeouts_are_reported_to_the_model(openai_client: Callable[..., OpenAI]):
+    requests: list[dict] = []
+    client: SyncLLM = SyncLLM(openai_key="test")
+    client.openai_client = openai_client([
+        openai_tool_calls(("call_1", "slow", {}), ("call_2", "broken", {}), ("call_3", "missing", {})),
+        openai_text("Sorry")
+    ], requests)
+
+    def broken() -> str:
+        raise RuntimeError("no connection")
+
+    tools: list[Tool] = [
+        Tool(name="slow", function=lambda: time.sleep(1.0), timeout=0.1),
+        Tool(name="broken", function=broken)
+    ]
+    result: GenerateTextResult = client.generate_text(model_name="gpt-4o", messages=MESSAGES, tools=tools)
+
+    errors: list[str | None] = [execution.error for execution in result.steps[0].tool_executions]
+    assert errors == ["Tool slow timed out after 0.1s", "RuntimeError: no connection", "Unknown tool missing"]
+    assert result.steps[0].tools_seconds < 0.5
+    assert [message["content"] for message in requests[1]["messages"][2:]] == [f"Error: {error}" for error in errors]
+
+
+def test_max_steps_returns_unrun_tool_calls(openai_client: Callable[..., OpenAI]):
+    requests: list[dict] = []
+    client: SyncLLM = SyncLLM(openai_key="test")
+    client.openai_client = openai_client([openai_tool_calls(("call_1", "weather", {"city": "Paris"}))] * 2, requests)
+    conversation: Conversation = Conversation(MESSAGES)
+
+    result: GenerateTextResult = client.generate_text(
+        model_name="gpt-4o", messages=conversation, tools=[Tool(name="weather", function=lambda city: "Sunny")], max_steps=2
+    )
+
+    assert len(requests) == 2 and result.steps[-1].tool_executions == []
+    assert result.parts[0].tool_name == "weather"
+    assert [message.role for message in conversation] == [Role.USER, Role.ASSISTANT, Role.TOOL, Role.ASSISTANT]
+
+
+def test_async_client_runs_tools_on_the_event_loop(mock_client: Callable[..., Any]):
+    requests: list[dict] = []
+    replies: list[dict] = [
+        {
+            "id": "msg_1", "type": "message", "role": "assistant", "model": "claude-sonnet-4-5", "stop_reason": "tool_use",
+            "content": [
+                {"type": "tool_use", "id": "toolu_1", "name": "weather", "input": {"city": "Paris"}},
+                {"type": "tool_use", "id": "toolu_2", "name": "weather", "input": {"city": "Rome"}}
+            ],
+            "usage": {"input_tokens": 10, "output_tokens": 5}
+        },
+        {
+            "id": "msg_2", "type": "message", "role": "assistant", "model": "claude-sonnet-4-5", "stop_reason": "end_turn",
+            "content": [{"type": "text", "text": "Sunny in both"}],
+            "usage": {"input_tokens": 20, "output_tokens": 3}
+        }
+    ]
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json=replies[len(requests) - 1])
+
+    async def weather(city: str) -> str:
+        await asyncio.sleep(0.3)
+        return f"Sunny in {city}"
+
+    async def run() -> GenerateTextResult:
+        client: AsyncLLM = AsyncLLM(anthropic_key="test")
+        client.anthropic_client = mock_client(AsyncAnthropic, respond)
+        tools: list[Tool] = [Tool(name="weather", parameters=WEATHER_SCHEMA, function=weather)]
+        return await client.generate_text(model_name="claude-sonnet-4-5", messages=MESSAGES, tools=tools)
+
+    result: GenerateTextResult = asyncio.run(run())
+
+    assert result.text == "Sunny in both"
+    assert result.steps[0].tools_seconds < 0.55
+    assert requests[0]["tools"] == [{"name": "weather", "description": "", "input_schema": WEATHER_SCHEMA}]
+    # Tool results go back in a user message
+    assert requests[1]["messages"][2] == {"role": "user", "content": [
+        {"type": "tool_result", "tool_use_id": "toolu_1", "content": "Sunny in Paris"},
+        {"type": "tool_result", "tool_use_id": "toolu_2", "content": "Sunny in Rome"}
+    ]}
+
+
+def test_tool_steps_count_against_the_deadline(openai_client: Callable[..., OpenAI]):
+    requests: list[dict] = []
+    client: SyncLLM = SyncLLM(openai_key="test")
+    client.openai_client = openai_client([openai_tool_calls(("call_1", "weather", {"city": "Paris"})), openai_text("Sunny")], requests)
+
+    def stuck_weather(city: str) -> str:
+        time.sleep(1.0)
+        return f"Sunny in {city}"
+
+    tools: list[Tool] = [Tool(name="weather", description="Current weather", parameters=WEATHER_SCHEMA, function=stuck_weather, timeout=60.0)]
+    started: float = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        client.generate_text(model_name="gpt-4o", messages=MESSAGES, tools=tools, timeout=0.3)
+
+    assert time.monotonic() - started < 0.8
+    assert len(requests) == 1
@@ -0,0 +1,107 @@
+import asyncio
+import json
+from collections.abc import Callable
+from typing import Any
+import httpx
+import pytest
+from openai import OpenAI
+from llms._sync.client import SyncLLM
+from llms.conversation import Conversation
+from llms.models import MODEL_MAP, CONTEXT_WINDOWS
+from llms.trimming import TrimResult, DropOldestPolicy, KeepLastPolicy, SummarizePolicy, estimate_messages_tokens
+from llms.types.enums import Provider, Role
+from llms.types.messages import SystemModelMessage, UserModelMessage, AssistantModelMessage, ModelMessage
+
+
+def make_history(turns: int) -> list[ModelMessage]:
+    messages: list[ModelMessage] = [SystemModelMessage(content="You are terse.")]
+    for turn in range(turns):
+        messages.append(UserModelMessage(content=f"Question {turn} " + "x" * 400))
+        messages.append(AssistantModelMessage(content=f"Answer {turn} " + "y" * 400))
+    return messages
+
+
+def test_every_model_has_a_context_window():
+    assert set(CONTEXT_WINDOWS) == set(MODEL_MAP)
+
+
+def test_histories_within_budget_pass_through():
+    messages: list[ModelMessage] = make_history(3)
+    trim: TrimResult = DropOldestPolicy().trim("gpt-4o", messages)
+
+    assert trim.messages is messages
+    assert trim.tokens_removed == 0
+
+
+def test_models_without_a_context_window_need_a_budget():
+    MODEL_MAP.register("my-vllm", Provider.OPENAI)
+    try:
+        with pytest.raises(ValueError, match="context window"):
+            DropOldestPolicy().trim("my-vllm", make_history(3))
+        assert DropOldestPolicy(budget=500).trim("my-vllm", make_history(6)).tokens_after <= 500
+    finally:
+        MODEL_MAP._providers.pop("my-vllm")
+
+
+def test_drop_oldest_keeps_system_and_whole_recent_turns():
+    messages: list[ModelMessage] = make_history(6)
+    trim: TrimResult = DropOldestPolicy(budget=500).trim("gpt-4o", messages)
+
+    assert trim.tokens_after <= 500 < trim.tokens_before
+    assert trim.tokens_removed == trim.tokens_before - trim.tokens_after == estimate_messages_tokens(messages) - estimate_messages_tokens(trim.messages)
+    assert trim.messages[0] == messages[0]
+    assert trim.messages[1].role == Role.USER
+    assert trim.messages[-2:] == messages[-2:]
+    assert trim.messages_removed == len(messages) - len(trim.messages)
+
+
+def test_keep_last_starts_at_a_user_turn():
+    messages: list[ModelMessage] = make_history(6)
+    trim: TrimResult = KeepLastPolicy(last_messages=5, budget=1000).trim("gpt-4o", messages)
+
+    assert [message.role for message in trim.messages] == [Role.SYSTEM, Role.USER, Role.ASSISTANT, Role.USER, Role.ASSISTANT]
+    assert trim.messages[1:] == messages[-4:]
+
+
+def test_summarize_replaces_older_turns():
+    summarized: list[list[ModelMessage]] = []
+
+    def summarizer(older: list[ModelMessage]) -> str:
+        summarized.append(older)
+        return "The user asked four questions."
+
+    async def async_summarizer(older: list[ModelMessage]) -> str:
+        return summarizer(older)
+
+    messages: list[ModelMessage] = make_history(6)
+    trim: TrimResult = SummarizePolicy(summarizer, keep_last_turns=2, budget=1000).trim("gpt-4o", messages)
+    async_trim: TrimResult = asyncio.run(SummarizePolicy(async_summarizer, keep_last_turns=2, budget=1000).atrim("gpt-4o", messages))
+
+    assert summarized[0] == messages[1:9]
+    assert trim.messages[1].content.endswith("The user asked four questions.")
+    assert trim.messages[2:] == messages[-4:]
+    assert async_trim.messages == trim.messages
+    assert trim.tokens_removed > 0
+
+
+def test_generate_text_sends_the_trimmed_history(completion: Callable[..., dict], mock_client: Callable[..., Any]):
+    requests: list[dict] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json=completion())
+
+    client: SyncLLM = SyncLLM(openai_key="test", trim_policy=DropOldestPolicy(budget=500))
+    client.openai_client = mock_client(OpenAI, respond)
+    conversation: Conversation = Conversation(make_history(6))
+    conversation.append(UserModelMessage(content="Last question"))
+
+    result = client.generate_text(model_name="gpt-4o", messages=conversation)
+    short = client.generate_text(model_name="gpt-4o", messages=make_history(1))
+
+    assert result.trimmed_tokens > 0 and short.trimmed_tokens == 0
+    assert requests[0]["messages"][0]["role"] == "system"
+    assert requests[0]["messages"][-1]["content"] == "Last question"
+    assert len(requests[0]["messages"]) < 14 and len(requests[1]["messages"]) == 3
+    # The conversation keeps its full history and records the reply
+    assert len(conversation) == 15